@@ -60,6 +60,10 @@ class Settings:
                 'cache_duration_hours': 24,
                 'fundamentals_cache_persist': True,
                 'fundamentals_cache_ttl_hours': 12,
+                'fetch_max_workers': 5,  # Concurrent ticker fetches in PriceService
+                'source_rate_limits': {'yahoo': 5.0, 'stooq': 2.0},  # Max requests/second per source
+                'fetch_mode': 'sequential',  # 'hedged' races fallback strategies after hedge_delay_seconds
+                'hedge_delay_seconds': 1.5,
                 'historical_window_days': 90,  # Days of historical data for volume calculations
                 'average_volume_period_days': 30,  # Days for average volume calculation
                 'volume_format_threshold': 1000  # Threshold for formatting volume in thousands
@@ -4,7 +4,8 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import List, Optional, Tuple
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
 
 from ..models.portfolio import Position, PortfolioSnapshot
 from ..models.trade import Trade
@@ -76,7 +77,39 @@ class BaseRepository(ABC):
             RepositoryError: If update operation fails
         """
         self.save_portfolio_snapshot(snapshot)
-    
+
+    def save_portfolio_snapshots(self, snapshots: List[PortfolioSnapshot]) -> None:
+        """Save several complete snapshots in one bulk operation.
+
+        Each snapshot replaces any existing snapshot for its date. Intended for
+        rebuilds, so market-close protection is not applied. Default implementation
+        saves snapshots one at a time; backends override this with a bulk write.
+
+        Args:
+            snapshots: Complete snapshots to save, one per date
+
+        Raises:
+            RepositoryError: If save operation fails
+        """
+        for snapshot in snapshots:
+            self.save_portfolio_snapshot(snapshot, is_trade_execution=True)
+
+    def get_fund_nav_history(self, dates: List[datetime]) -> Optional[Tuple[Dict[str, Decimal], Dict[str, Decimal]]]:
+        """Get fund value and cost basis on specific dates from a daily NAV store.
+        
+        Backends that maintain one (Supabase ``fund_nav_daily``) read only the
+        rows for the requested dates. Default implementation has no store and
+        returns None, so callers derive the values from portfolio snapshots.
+        
+        Args:
+            dates: Dates to look up (e.g. contribution timestamps)
+            
+        Returns:
+            ({date: fund value}, {date: cost basis}) keyed by 'YYYY-MM-DD', or
+            None if no NAV store is available
+        """
+        return None
+
     @abstractmethod
     def get_latest_portfolio_snapshot(self) -> Optional[PortfolioSnapshot]:
         """Get the most recent portfolio snapshot.
@@ -0,0 +1,162 @@
+"""Partitioned on-disk layout for the portfolio CSV.
+
+The single-file layout keeps every snapshot in ``llm_portfolio_update.csv``,
+so replacing one day means reading and rewriting the whole history. The
+partitioned layout splits the same rows into one CSV per month (or year)
+under ``<fund>/portfolio/`` plus a small ``manifest.json``::
+
+    portfolio/
+        manifest.json
+        2025-08.csv
+        2025-09.csv
+
+Partitions have the same columns and Date format as the single file. A day
+always lives in exactly one partition, and partitions and the manifest are
+replaced with an atomic rename, so a crash mid-write leaves either the old
+or the new version of a day, never a truncated file. The manifest is
+written last and lists the partitions that make up the portfolio; readers
+only open the partitions covering the dates they need.
+
+CSVRepository uses this layout when the manifest exists. Convert a fund
+with ``scripts/partition_portfolio_csv.py``.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+# Partition key format per granularity
+GRANULARITIES = {
+    'month': '%Y-%m',
+    'year': '%Y',
+}
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    """Write ``text`` to ``path`` through a temporary file and an atomic rename."""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', newline='') as handle:
+            handle.write(text)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+class PortfolioPartitions:
+    """Manifest and partition files of a partitioned portfolio CSV.
+
+    Works on raw frames (Date column as written to the CSV); parsing is left
+    to the repository.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.manifest_file = self.directory / MANIFEST_NAME
+
+    def exists(self) -> bool:
+        """Whether the fund uses the partitioned layout."""
+        return self.manifest_file.exists()
+
+    def manifest(self) -> Dict:
+        """Read the manifest."""
+        with open(self.manifest_file) as handle:
+            return json.load(handle)
+
+    def manifest_mtime(self) -> int:
+        """Modification time of the manifest, which changes on every write."""
+        return os.stat(self.manifest_file).st_mtime_ns
+
+    def create(self, granularity: str = 'month', utc_offset: Optional[str] = None) -> None:
+        """Create an empty partitioned layout.
+
+        Args:
+            granularity: 'month' or 'year'
+            utc_offset: Offset (e.g. "-08:00") the Date column is localized to
+                when read, see CSVRepository._parse_portfolio_dates
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Unknown partition granularity: {granularity}")
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._write_manifest({
+            'version': MANIFEST_VERSION,
+            'granularity': granularity,
+            'utc_offset': utc_offset,
+            'partitions': {},
+        })
+
+    def partition_key(self, day: date, granularity: Optional[str] = None) -> str:
+        """Key of the partition holding ``day``."""
+        return day.strftime(GRANULARITIES[granularity or self.manifest()['granularity']])
+
+    def partition_path(self, key: str) -> Path:
+        return self.directory / f"{key}.csv"
+
+    def keys(self, start: Optional[date] = None, end: Optional[date] = None) -> List[str]:
+        """Partition keys in date order, optionally only those overlapping [start, end]."""
+        manifest = self.manifest()
+        keys = sorted(manifest['partitions'])
+        if start is not None:
+            first = self.partition_key(start, manifest['granularity'])
+            keys = [key for key in keys if key >= first]
+        if end is not None:
+            last = self.partition_key(end, manifest['granularity'])
+            keys = [key for key in keys if key <= last]
+        return keys
+
+    def read(self, keys: Optional[List[str]] = None) -> pd.DataFrame:
+        """Concatenate the given partitions (all by default) into one raw frame."""
+        keys = self.keys() if keys is None else keys
+        frames = [pd.read_csv(self.partition_path(key)) for key in keys]
+        frames = [frame for frame in frames if not frame.empty]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    def write(self, partitions: Dict[str, pd.DataFrame], utc_offset: Optional[str] = None) -> None:
+        """Replace whole partitions, then publish them in the manifest.
+
+        Args:
+            partitions: Raw frames by partition key; an empty frame removes
+                the partition
+            utc_offset: Stored in the manifest if it has none yet
+        """
+        manifest = self.manifest()
+        removed = []
+        for key, frame in partitions.items():
+            if frame.empty:
+                manifest['partitions'].pop(key, None)
+                removed.append(key)
+                continue
+            atomic_write_text(self.partition_path(key), frame.to_csv(index=False))
+            days = frame['Date'].astype(str).str[:10]
+            manifest['partitions'][key] = {
+                'file': self.partition_path(key).name,
+                'rows': len(frame),
+                'first_day': days.min(),
+                'last_day': days.max(),
+            }
+        if manifest.get('utc_offset') is None:
+            manifest['utc_offset'] = utc_offset
+        self._write_manifest(manifest)
+
+        # Unlisted partitions are ignored by readers, so they are only deleted once the manifest is out
+        for key in removed:
+            if self.partition_path(key).exists():
+                self.partition_path(key).unlink()
+
+    def _write_manifest(self, manifest: Dict) -> None:
+        manifest['updated_at'] = datetime.now().isoformat(timespec='seconds')
+        atomic_write_text(self.manifest_file, json.dumps(manifest, indent=2) + "\n")
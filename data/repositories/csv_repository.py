@@ -5,14 +5,16 @@ from __future__ import annotations
 import csv
 import os
 import shutil
-from datetime import datetime
+from datetime import datetime, timedelta, timezone, tzinfo
 from decimal import Decimal
 from pathlib import Path
-from typing import List, Optional, Tuple, Dict, Any
+from typing import Iterator, List, Optional, Tuple, Dict, Any
+import numpy as np
 import pandas as pd
 import logging
 
 from .base_repository import BaseRepository, RepositoryError, DataValidationError, DataNotFoundError
+from .csv_partitions import GRANULARITIES, PortfolioPartitions
 from ..models.portfolio import Position, PortfolioSnapshot
 from ..models.trade import Trade
 from ..models.market_data import MarketData
@@ -47,10 +49,14 @@ class CSVRepository(BaseRepository):
         self.portfolio_file = self.data_dir / "llm_portfolio_update.csv"
         self.trade_log_file = self.data_dir / "llm_trade_log.csv"
         self.cash_balances_file = self.data_dir / "cash_balances.json"
+        # Partitioned layout of the portfolio file, used when its manifest exists (see csv_partitions)
+        self.portfolio_partitions = PortfolioPartitions(self.data_dir / "portfolio")
         
         # Cache for portfolio data to avoid repeated reads/parsing
         self._portfolio_cache = None
         self._portfolio_mtime = 0
+        # Parsed partitions of the partitioned layout: key -> (file mtime, DataFrame)
+        self._partition_cache: Dict[str, Tuple[int, pd.DataFrame]] = {}
 
         # Ensure data directory exists
         self.data_dir.mkdir(exist_ok=True)
@@ -61,6 +67,13 @@ class CSVRepository(BaseRepository):
         Returns:
             Cached DataFrame or None if file doesn't exist/is empty
         """
+        if self.portfolio_partitions.exists():
+            current_mtime = self._portfolio_source_mtime()
+            if self._portfolio_cache is None or self._portfolio_mtime != current_mtime:
+                self._portfolio_cache = self._read_partitions(self.portfolio_partitions.keys())
+                self._portfolio_mtime = current_mtime
+            return self._portfolio_cache
+
         if not self.portfolio_file.exists():
             return None
 
@@ -78,14 +91,8 @@ class CSVRepository(BaseRepository):
                 self._portfolio_mtime = current_mtime
                 return df
 
-            # Parse timestamps with timezone awareness
-            # _parse_csv_timestamp returns timezone-aware pandas Timestamps
-            parsed_dates = df['Date'].apply(self._parse_csv_timestamp)
-            # Convert to datetime64 by extracting components (avoids timezone conversion issues)
-            df['Date'] = pd.to_datetime(parsed_dates.apply(lambda x: x.strftime('%Y-%m-%d %H:%M:%S') if hasattr(x, 'strftime') else str(x)))
-            # Add timezone info back
-            if not parsed_dates.empty and hasattr(parsed_dates.iloc[0], 'tz'):
-                df['Date'] = df['Date'].dt.tz_localize(parsed_dates.iloc[0].tz)
+            # Parse timestamps with timezone awareness in one vectorized pass
+            df['Date'], _ = self._parse_portfolio_dates(df['Date'])
 
             self._portfolio_cache = df
             self._portfolio_mtime = current_mtime
@@ -104,12 +111,16 @@ class CSVRepository(BaseRepository):
             List of PortfolioSnapshot objects
         """
         try:
-            if not self.portfolio_file.exists():
+            if not self._has_portfolio_data():
                 logger.info(f"Portfolio file does not exist: {self.portfolio_file}")
                 return []
             
-            # Use cached dataframe
-            cached_df = self._load_portfolio_cache()
+            if date_range and self.portfolio_partitions.exists():
+                # Only the partitions covering the range
+                cached_df = self._read_partitions(self._partition_keys_for_range(date_range))
+            else:
+                # Use cached dataframe
+                cached_df = self._load_portfolio_cache()
             if cached_df is None or cached_df.empty:
                 logger.info("Portfolio CSV file is empty")
                 return []
@@ -119,56 +130,232 @@ class CSVRepository(BaseRepository):
             
             # Ensure Date column is datetime (in case cache has string dates)
             if df['Date'].dtype == 'object' or not pd.api.types.is_datetime64_any_dtype(df['Date']):
-                # Re-parse dates if they're strings
-                from utils.timezone_utils import get_trading_timezone
-                trading_tz = get_trading_timezone()
-                parsed_dates = df['Date'].apply(self._parse_csv_timestamp)
-                df['Date'] = pd.to_datetime(parsed_dates.apply(lambda x: x.strftime('%Y-%m-%d %H:%M:%S') if hasattr(x, 'strftime') else str(x)))
-                if not parsed_dates.empty and hasattr(parsed_dates.iloc[0], 'tz'):
-                    df['Date'] = df['Date'].dt.tz_localize(parsed_dates.iloc[0].tz)
-            
+                df['Date'], _ = self._parse_portfolio_dates(df['Date'])
+
             # Filter by date range if provided
-            if date_range:
-                start_date, end_date = date_range
-                # Ensure date range parameters are timezone-aware for comparison
-                from utils.timezone_utils import get_trading_timezone
-                trading_tz = get_trading_timezone()
-                
-                if start_date.tzinfo is None:
-                    start_date = start_date.replace(tzinfo=trading_tz)
-                if end_date.tzinfo is None:
-                    end_date = end_date.replace(tzinfo=trading_tz)
-                
-                df = df[(df['Date'] >= start_date) & (df['Date'] <= end_date)]
-            
-            # Group by date to create snapshots (group by date only, not exact timestamp)
-            df['Date_Only'] = df['Date'].dt.date
-            snapshots = []
-            for date, group in df.groupby('Date_Only'):
-                positions = []
-                total_value = Decimal('0')
-                
-                for _, row in group.iterrows():
-                    position = Position.from_csv_dict(row.to_dict())
-                    positions.append(position)
-                    if position.market_value:
-                        total_value += position.market_value
-                
-                # Use the latest timestamp from the group for the snapshot
-                latest_timestamp = group['Date'].max()
-                snapshot = PortfolioSnapshot(
-                    positions=positions,
-                    timestamp=latest_timestamp,
-                    total_value=total_value
-                )
-                snapshots.append(snapshot)
-            
-            return sorted(snapshots, key=lambda x: x.timestamp)
+            df = self._filter_date_range(df, date_range)
+
+            return self._build_snapshots(df)
             
         except Exception as e:
             logger.error(f"Failed to load portfolio data: {e}")
             raise RepositoryError(f"Failed to load portfolio data: {e}") from e
     
+    def iter_portfolio_snapshots(self, date_range: Optional[Tuple[datetime, datetime]] = None,
+                                 chunksize: int = 100_000) -> Iterator[PortfolioSnapshot]:
+        """Stream portfolio snapshots from the CSV file in chunks.
+
+        Streaming counterpart of get_portfolio_data for portfolio files too large
+        to hold in memory: the file is read ``chunksize`` rows at a time and each
+        day's snapshot is yielded as soon as all of its rows have been read. Rows
+        are expected in date order, as save_portfolio_snapshot writes them. The
+        portfolio cache is neither used nor filled.
+
+        Args:
+            date_range: Optional tuple of (start_date, end_date) to filter results
+            chunksize: Number of CSV rows to read at a time
+
+        Yields:
+            PortfolioSnapshot objects in date order
+        """
+        if not self._has_portfolio_data():
+            logger.info(f"Portfolio file does not exist: {self.portfolio_file}")
+            return
+
+        try:
+            tz = None
+            if self.portfolio_partitions.exists():
+                tz = self._partitions_timezone()
+                paths = [self.portfolio_partitions.partition_path(key)
+                         for key in self._partition_keys_for_range(date_range)]
+            else:
+                paths = [self.portfolio_file]
+
+            pending = None
+            for chunk in self._iter_csv_chunks(paths, chunksize):
+                # All chunks share the timezone of the file's first row, like the cache
+                chunk['Date'], tz = self._parse_portfolio_dates(chunk['Date'], tz)
+                chunk = self._filter_date_range(chunk, date_range)
+                if pending is not None:
+                    chunk = pd.concat([pending, chunk], ignore_index=True)
+                if chunk.empty:
+                    continue
+
+                # The latest day may continue in the next chunk; hold its rows back
+                days = chunk['Date'].dt.date
+                is_last_day = days == days.max()
+                pending = chunk[is_last_day]
+                yield from self._build_snapshots(chunk[~is_last_day])
+
+            if pending is not None:
+                yield from self._build_snapshots(pending)
+
+        except Exception as e:
+            logger.error(f"Failed to stream portfolio data: {e}")
+            raise RepositoryError(f"Failed to stream portfolio data: {e}") from e
+
+    def _iter_csv_chunks(self, paths: List[Path], chunksize: int) -> Iterator[pd.DataFrame]:
+        """Read the given CSV files ``chunksize`` rows at a time, skipping empty files."""
+        for path in paths:
+            try:
+                reader = pd.read_csv(path, chunksize=chunksize)
+            except pd.errors.EmptyDataError:
+                continue
+            with reader:
+                yield from reader
+
+    def _has_portfolio_data(self) -> bool:
+        """Whether the portfolio exists in either layout."""
+        return self.portfolio_partitions.exists() or self.portfolio_file.exists()
+
+    def _portfolio_source_mtime(self):
+        """Modification marker of the portfolio storage, used to validate the cache."""
+        if self.portfolio_partitions.exists():
+            return self.portfolio_partitions.manifest_mtime()
+        return os.path.getmtime(self.portfolio_file)
+
+    def _partitions_timezone(self) -> Optional[tzinfo]:
+        """Timezone the partitioned Date column is localized to, from the manifest."""
+        utc_offset = self.portfolio_partitions.manifest().get('utc_offset')
+        if not utc_offset:
+            return None
+        return datetime.strptime(utc_offset.replace(':', ''), '%z').tzinfo
+
+    def _partition_keys_for_range(self, date_range: Optional[Tuple[datetime, datetime]]) -> List[str]:
+        """Keys of the partitions that can hold rows within date_range."""
+        if not date_range:
+            return self.portfolio_partitions.keys()
+        start_date, end_date = date_range
+        # Rows are partitioned by their local day; widen by a day to cover any timezone difference
+        return self.portfolio_partitions.keys(start_date.date() - timedelta(days=1),
+                                              end_date.date() + timedelta(days=1))
+
+    def _read_partitions(self, keys: List[str]) -> pd.DataFrame:
+        """Parsed rows of the given partitions, re-reading only partitions that changed."""
+        tz = self._partitions_timezone()
+        frames = []
+        for key in keys:
+            path = self.portfolio_partitions.partition_path(key)
+            mtime = os.stat(path).st_mtime_ns
+            cached = self._partition_cache.get(key)
+            if cached is None or cached[0] != mtime:
+                df = pd.read_csv(path)
+                if not df.empty:
+                    df['Date'], tz = self._parse_portfolio_dates(df['Date'], tz)
+                cached = self._partition_cache[key] = (mtime, df)
+            frames.append(cached[1])
+        frames = [frame for frame in frames if not frame.empty]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    def _write_partitions(self, df: pd.DataFrame, changed_dates) -> None:
+        """Write the partitions holding ``changed_dates`` from the full portfolio frame.
+
+        Only those partitions are rewritten, each with an atomic replace.
+
+        Args:
+            df: Complete portfolio rows, Date as timestamps or CSV strings
+            changed_dates: Dates whose rows were added, replaced or removed
+        """
+        fmt = GRANULARITIES[self.portfolio_partitions.manifest()['granularity']]
+        if pd.api.types.is_datetime64_any_dtype(df['Date']):
+            row_keys = df['Date'].dt.strftime(fmt)
+        else:
+            row_keys = df['Date'].map(lambda x: pd.Timestamp(x[:10] if isinstance(x, str) else x).strftime(fmt))
+
+        partitions = {}
+        for key in {changed.strftime(fmt) for changed in changed_dates}:
+            partition = df[row_keys == key].copy()
+            partition['Date'] = partition['Date'].apply(
+                lambda x: x if isinstance(x, str) else (self._format_timestamp_for_csv(x) if pd.notna(x) else '')
+            )
+            partitions[key] = partition
+
+        first_date = df['Date'].iloc[0] if not df.empty else None
+        utc_offset = first_date.strftime('%z') if hasattr(first_date, 'strftime') else None
+        if utc_offset:
+            utc_offset = f"{utc_offset[:3]}:{utc_offset[3:]}"
+        self.portfolio_partitions.write(partitions, utc_offset=utc_offset)
+
+    def _parse_portfolio_dates(self, dates: pd.Series, tz: Optional[tzinfo] = None) -> Tuple[pd.Series, tzinfo]:
+        """Parse the Date column of the portfolio file.
+
+        Every row keeps its local wall-clock time and the column is localized to
+        a single timezone (the offset of the first row unless ``tz`` is given),
+        so that ``.dt.date`` is the trading day the row was written for. Rows
+        split_csv_timestamps does not recognize fall back to _parse_csv_timestamp.
+
+        Args:
+            dates: Date column as read from the CSV file
+            tz: Timezone to localize to, defaults to the first row's offset
+
+        Returns:
+            Tuple of (timezone-aware datetime64 column, timezone used)
+        """
+        from utils.timezone_utils import get_trading_timezone, split_csv_timestamps
+
+        local, offsets = split_csv_timestamps(dates)
+
+        unparsed = local.isna()
+        if unparsed.any():
+            fallback = dates[unparsed].apply(self._parse_csv_timestamp)
+            local[unparsed] = pd.to_datetime(fallback.apply(lambda x: x.strftime('%Y-%m-%d %H:%M:%S')))
+            offsets[unparsed] = pd.to_timedelta(fallback.apply(lambda x: x.utcoffset()))
+
+        if tz is None:
+            first_offset = offsets.iloc[0] if not offsets.empty else pd.NaT
+            tz = timezone(first_offset.to_pytimedelta()) if pd.notna(first_offset) else get_trading_timezone()
+
+        return local.dt.tz_localize(tz), tz
+
+    def _filter_date_range(self, df: pd.DataFrame,
+                           date_range: Optional[Tuple[datetime, datetime]]) -> pd.DataFrame:
+        """Keep the rows of a parsed portfolio frame that fall within date_range."""
+        if not date_range:
+            return df
+
+        start_date, end_date = date_range
+        # Ensure date range parameters are timezone-aware for comparison
+        from utils.timezone_utils import get_trading_timezone
+        trading_tz = get_trading_timezone()
+
+        if start_date.tzinfo is None:
+            start_date = start_date.replace(tzinfo=trading_tz)
+        if end_date.tzinfo is None:
+            end_date = end_date.replace(tzinfo=trading_tz)
+
+        return df[(df['Date'] >= start_date) & (df['Date'] <= end_date)]
+
+    def _build_snapshots(self, df: pd.DataFrame) -> List[PortfolioSnapshot]:
+        """Group parsed portfolio rows into one snapshot per day, in date order.
+
+        Rows are grouped with a single factorize/argsort over the day column
+        rather than a groupby + iterrows loop.
+        """
+        if df.empty:
+            return []
+
+        # Group by date to create snapshots (group by date only, not exact timestamp)
+        day_codes, _ = pd.factorize(df['Date'].dt.date, sort=True)
+        # Use the latest timestamp of each day for the snapshot
+        latest_timestamps = df['Date'].groupby(day_codes).max()
+
+        positions = [Position.from_csv_dict(record) for record in df.to_dict('records')]
+
+        order = np.argsort(day_codes, kind='stable')
+        boundaries = np.flatnonzero(np.diff(day_codes[order])) + 1
+
+        snapshots = []
+        for code, rows in enumerate(np.split(order, boundaries)):
+            day_positions = [positions[i] for i in rows]
+            total_value = sum((p.market_value for p in day_positions if p.market_value), Decimal('0'))
+            snapshots.append(PortfolioSnapshot(
+                positions=day_positions,
+                timestamp=latest_timestamps.iloc[code],
+                total_value=total_value
+            ))
+
+        return snapshots
+
     def save_portfolio_snapshot(self, snapshot: PortfolioSnapshot, is_trade_execution: bool = False) -> None:
         """Save portfolio snapshot to CSV file.
         
@@ -276,44 +463,127 @@ class CSVRepository(BaseRepository):
                     # Both existing_df and df have datetimes now
                     combined_df = pd.concat([existing_df, df], ignore_index=True)
 
-                    # Convert to string for CSV
-                    write_df = combined_df.copy()
-                    write_df['Date'] = write_df['Date'].apply(
-                        lambda x: self._format_timestamp_for_csv(x) if pd.notna(x) else ''
-                    )
-                    write_df.to_csv(self.portfolio_file, index=False)
+                    if self.portfolio_partitions.exists():
+                        # Only today's partition is rewritten
+                        self._write_partitions(combined_df, {today})
+                    else:
+                        # Convert to string for CSV
+                        write_df = combined_df.copy()
+                        write_df['Date'] = write_df['Date'].apply(
+                            lambda x: self._format_timestamp_for_csv(x) if pd.notna(x) else ''
+                        )
+                        write_df.to_csv(self.portfolio_file, index=False)
                     # Only update cache after successful write to avoid phantom data on write failure
                     self._portfolio_cache = combined_df.copy()
-                    self._portfolio_mtime = os.path.getmtime(self.portfolio_file)
+                    self._portfolio_mtime = self._portfolio_source_mtime()
                 else:
                     # No duplicates, append normally
+                    combined_df = pd.concat([existing_df_cache, df], ignore_index=True)
+                    if self.portfolio_partitions.exists():
+                        self._write_partitions(combined_df, {today})
+                    else:
+                        # Write to CSV
+                        write_df = df.copy()
+                        write_df['Date'] = write_df['Date'].apply(
+                            lambda x: self._format_timestamp_for_csv(x) if pd.notna(x) else ''
+                        )
+                        write_df.to_csv(self.portfolio_file, mode='a', header=False, index=False)
+                    # Only update cache after successful write to avoid phantom data on write failure
+                    self._portfolio_cache = combined_df
+                    self._portfolio_mtime = self._portfolio_source_mtime()
+            else:
+                # File doesn't exist or is empty, create new
+                if self.portfolio_partitions.exists():
+                    self._write_partitions(df, {normalized_timestamp.date()})
+                else:
                     # Write to CSV
                     write_df = df.copy()
                     write_df['Date'] = write_df['Date'].apply(
                         lambda x: self._format_timestamp_for_csv(x) if pd.notna(x) else ''
                     )
-                    write_df.to_csv(self.portfolio_file, mode='a', header=False, index=False)
-                    # Only update cache after successful write to avoid phantom data on write failure
-                    self._portfolio_cache = pd.concat([existing_df_cache, df], ignore_index=True)
-                    self._portfolio_mtime = os.path.getmtime(self.portfolio_file)
-            else:
-                # File doesn't exist or is empty, create new
-                # Write to CSV
-                write_df = df.copy()
-                write_df['Date'] = write_df['Date'].apply(
-                    lambda x: self._format_timestamp_for_csv(x) if pd.notna(x) else ''
-                )
-                write_df.to_csv(self.portfolio_file, index=False)
+                    write_df.to_csv(self.portfolio_file, index=False)
                 # Only update cache after successful write to avoid phantom data on write failure
                 self._portfolio_cache = df.copy()
-                self._portfolio_mtime = os.path.getmtime(self.portfolio_file)
+                self._portfolio_mtime = self._portfolio_source_mtime()
             
             logger.info(f"Saved portfolio snapshot with {len(snapshot.positions)} positions")
             
         except Exception as e:
             logger.error(f"Failed to save portfolio snapshot: {e}")
             raise RepositoryError(f"Failed to save portfolio snapshot: {e}") from e
-    
+
+    def save_portfolio_snapshots(self, snapshots: List[PortfolioSnapshot]) -> None:
+        """Save several snapshots with a single read and a single write of the CSV.
+
+        Existing rows for every date in ``snapshots`` are replaced. Used by
+        rebuilds, so market-close protection is not applied.
+
+        Args:
+            snapshots: Complete snapshots to save, one per date
+        """
+        if not snapshots:
+            return
+
+        try:
+            from utils.timezone_utils import get_trading_timezone
+            trading_tz = get_trading_timezone()
+
+            expected_columns = [
+                'Date', 'Ticker', 'Shares', 'Average Price', 'Cost Basis',
+                'Stop Loss', 'Current Price', 'Total Value', 'PnL', 'Action',
+                'Company', 'Currency'
+            ]
+
+            rows = []
+            replaced_dates = set()
+            for snapshot in snapshots:
+                if snapshot.timestamp.tzinfo is None:
+                    normalized_timestamp = snapshot.timestamp.replace(tzinfo=trading_tz)
+                else:
+                    normalized_timestamp = snapshot.timestamp.astimezone(trading_tz)
+                replaced_dates.add(normalized_timestamp.date())
+                for position in snapshot.positions:
+                    row = position.to_csv_dict()
+                    row['Date'] = normalized_timestamp
+                    row['Action'] = 'HOLD'
+                    rows.append(row)
+
+            df = pd.DataFrame(rows)
+            for col in expected_columns:
+                if col not in df.columns:
+                    df[col] = ''
+            df = df[expected_columns]
+
+            existing_df_cache = self._load_portfolio_cache()
+            if existing_df_cache is not None and not existing_df_cache.empty:
+                existing_df = existing_df_cache
+                if existing_df['Date'].dtype == 'object':
+                    existing_df = existing_df.copy()
+                    existing_df['Date'] = pd.to_datetime(existing_df['Date'], utc=True).dt.tz_convert(trading_tz)
+                keep_mask = ~existing_df['Date'].dt.date.isin(replaced_dates)
+                combined_df = pd.concat([existing_df[keep_mask], df], ignore_index=True)
+                combined_df = combined_df.sort_values('Date', kind='stable').reset_index(drop=True)
+            else:
+                combined_df = df
+
+            if self.portfolio_partitions.exists():
+                self._write_partitions(combined_df, replaced_dates)
+            else:
+                write_df = combined_df.copy()
+                write_df['Date'] = write_df['Date'].apply(
+                    lambda x: self._format_timestamp_for_csv(x) if pd.notna(x) else ''
+                )
+                write_df.to_csv(self.portfolio_file, index=False)
+            # Only update cache after successful write to avoid phantom data on write failure
+            self._portfolio_cache = combined_df
+            self._portfolio_mtime = self._portfolio_source_mtime()
+
+            logger.info(f"Saved {len(snapshots)} portfolio snapshots ({len(rows)} positions)")
+
+        except Exception as e:
+            logger.error(f"Failed to save portfolio snapshots: {e}")
+            raise RepositoryError(f"Failed to save portfolio snapshots: {e}") from e
+
     def update_daily_portfolio_snapshot(self, snapshot: PortfolioSnapshot) -> None:
         """Update today's portfolio snapshot or create new one if it doesn't exist.
         
@@ -426,12 +696,16 @@ class CSVRepository(BaseRepository):
                     # Save the updated DataFrame
                     existing_df = existing_df.drop('Date_Only', axis=1)  # Remove helper column
 
-                    # Ensure Date column is formatted as string for CSV
-                    existing_df['Date'] = existing_df['Date'].apply(
-                        lambda x: self._format_timestamp_for_csv(x) if hasattr(x, 'strftime') else (x if isinstance(x, str) else self._format_timestamp_for_csv(pd.to_datetime(x)))
-                    )
+                    if self.portfolio_partitions.exists():
+                        # Only today's partition is rewritten
+                        self._write_partitions(existing_df, {today})
+                    else:
+                        # Ensure Date column is formatted as string for CSV
+                        existing_df['Date'] = existing_df['Date'].apply(
+                            lambda x: self._format_timestamp_for_csv(x) if hasattr(x, 'strftime') else (x if isinstance(x, str) else self._format_timestamp_for_csv(pd.to_datetime(x)))
+                        )
 
-                    existing_df.to_csv(self.portfolio_file, index=False)
+                        existing_df.to_csv(self.portfolio_file, index=False)
                     # Invalidate cache
                     self._portfolio_cache = None
                     self._portfolio_mtime = 0
@@ -662,6 +936,11 @@ class CSVRepository(BaseRepository):
                     backup_file = backup_dir / file_path.name
                     shutil.copy2(file_path, backup_file)
                     logger.info(f"Backed up {file_path.name}")
+
+            if self.portfolio_partitions.exists():
+                shutil.copytree(self.portfolio_partitions.directory,
+                                backup_dir / self.portfolio_partitions.directory.name, dirs_exist_ok=True)
+                logger.info(f"Backed up {self.portfolio_partitions.directory.name}/")
             
             logger.info(f"Backup completed to {backup_path}")
             
@@ -692,6 +971,11 @@ class CSVRepository(BaseRepository):
                 if backup_file.exists():
                     shutil.copy2(backup_file, target_path)
                     logger.info(f"Restored {backup_name}")
+
+            backup_partitions = backup_dir / self.portfolio_partitions.directory.name
+            if (backup_partitions / self.portfolio_partitions.manifest_file.name).exists():
+                shutil.copytree(backup_partitions, self.portfolio_partitions.directory, dirs_exist_ok=True)
+                logger.info(f"Restored {backup_partitions.name}/")
             
             logger.info(f"Restore completed from {backup_path}")
             
@@ -709,8 +993,11 @@ class CSVRepository(BaseRepository):
         
         try:
             # Check portfolio file
-            if self.portfolio_file.exists():
-                df = pd.read_csv(self.portfolio_file)
+            if self.portfolio_partitions.exists() or self.portfolio_file.exists():
+                if self.portfolio_partitions.exists():
+                    df = self.portfolio_partitions.read()
+                else:
+                    df = pd.read_csv(self.portfolio_file)
                 required_columns = ['Date', 'Ticker', 'Shares', 'Average Price']
                 missing_columns = [col for col in required_columns if col not in df.columns]
                 if missing_columns:
@@ -88,6 +88,19 @@ class DualWriteRepository(BaseRepository):
             logger.error(f"Failed to save portfolio snapshot: {e}")
             raise RepositoryError(f"Failed to save portfolio snapshot: {e}") from e
     
+    def save_portfolio_snapshots(self, snapshots: List[PortfolioSnapshot]) -> None:
+        """Bulk-save snapshots to both CSV and Supabase."""
+        try:
+            self.csv_repo.save_portfolio_snapshots(snapshots)
+            logger.info(f"Saved {len(snapshots)} portfolio snapshots to CSV")
+            
+            self.supabase_repo.save_portfolio_snapshots(snapshots)
+            logger.info(f"Saved {len(snapshots)} portfolio snapshots to Supabase")
+            
+        except Exception as e:
+            logger.error(f"Failed to save portfolio snapshots: {e}")
+            raise RepositoryError(f"Failed to save portfolio snapshots: {e}") from e
+    
     def get_trade_history(self, ticker: Optional[str] = None, date_range: Optional[Tuple[datetime, datetime]] = None) -> List[Trade]:
         """Get trade history from CSV."""
         return self.csv_repo.get_trade_history(ticker, date_range)
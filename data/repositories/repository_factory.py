@@ -74,7 +74,10 @@ class RepositoryFactory:
         elif repository_type == 'supabase':
             # Supabase repository accepts fund_name and supabase config
             clean_kwargs = {k: v for k, v in clean_kwargs.items() if k in ['fund_name', 'url', 'key', 'supabase']}
-        elif repository_type in ['dual-write', 'supabase-dual-write']:
+        elif repository_type == 'supabase-dual-write':
+            # Supabase dual-write also accepts write_behind for queued CSV backup writes
+            clean_kwargs = {k: v for k, v in clean_kwargs.items() if k in ['fund_name', 'data_directory', 'write_behind']}
+        elif repository_type == 'dual-write':
             # Dual-write repositories accept fund_name and optional data_directory
             clean_kwargs = {k: v for k, v in clean_kwargs.items() if k in ['fund_name', 'data_directory']}
         
@@ -8,6 +8,7 @@ from __future__ import annotations
 
 from datetime import datetime
 from decimal import Decimal
+from pathlib import Path
 from typing import List, Optional, Tuple, Dict, Any
 import logging
 
@@ -17,6 +18,7 @@ from .supabase_repository import SupabaseRepository
 from ..models.portfolio import Position, PortfolioSnapshot
 from ..models.trade import Trade
 from ..models.market_data import MarketData
+from ..write_journal import SyncLag, WriteBehindQueue, WriteJournal
 
 logger = logging.getLogger(__name__)
 
@@ -25,14 +27,17 @@ class SupabaseDualWriteRepository(BaseRepository):
     """Repository that reads from Supabase but writes to both CSV and Supabase.
     
     This provides cloud-first access while maintaining CSV backup for reliability.
+    With ``write_behind`` the CSV backup writes of trades and snapshots are
+    journaled and applied in the background (see data/write_journal.py).
     """
     
-    def __init__(self, fund_name: str, data_directory: str = None, **kwargs):
+    def __init__(self, fund_name: str, data_directory: str = None, write_behind: bool = False, **kwargs):
         """Initialize Supabase dual-write repository.
         
         Args:
             fund_name: Name of the fund
             data_directory: Optional path to CSV data directory (defaults to trading_data/funds/{fund_name})
+            write_behind: Queue CSV backup writes instead of waiting for them
         """
         self.fund_name = fund_name
         
@@ -50,12 +55,43 @@ class SupabaseDualWriteRepository(BaseRepository):
         # Initialize CSV repository (backup write target)
         self.csv_repo = CSVRepository(fund_name=fund_name, data_directory=self.data_directory)
         
-        logger.info(f"Initialized Supabase dual-write repository: Supabase read, CSV+Supabase write")
+        self.write_queue: Optional[WriteBehindQueue] = None
+        if write_behind:
+            journal = WriteJournal(Path(self.data_directory) / ".cache" / "csv_write_journal.db")
+            self.write_queue = WriteBehindQueue(self.csv_repo, journal)
+            self.write_queue.start()
+        
+        logger.info(f"Initialized Supabase dual-write repository: Supabase read, CSV+Supabase write"
+                    f"{' (CSV write-behind)' if write_behind else ''}")
+    
+    def _write_csv(self, operation: str, *args) -> None:
+        """Write to the CSV backup, or journal the write in write-behind mode."""
+        if self.write_queue:
+            self.write_queue.submit(operation, *args)
+            logger.info(f"Queued CSV {operation}")
+        else:
+            getattr(self.csv_repo, operation)(*args)
+            logger.info(f"CSV {operation} complete")
+    
+    def sync_lag(self) -> Optional[SyncLag]:
+        """Pending CSV backup writes in write-behind mode, None otherwise."""
+        return self.write_queue.sync_lag() if self.write_queue else None
+    
+    def close(self) -> None:
+        """Stop the write-behind worker after applying what it can."""
+        if self.write_queue:
+            self.write_queue.stop()
+            self.write_queue.journal.close()
+            self.write_queue = None
     
     def get_portfolio_data(self, date_range: Optional[Tuple[datetime, datetime]] = None) -> List[PortfolioSnapshot]:
         """Get portfolio data from Supabase (primary source)."""
         return self.supabase_repo.get_portfolio_data(date_range)
     
+    def get_fund_nav_history(self, dates: List[datetime]) -> Optional[Tuple[Dict[str, Decimal], Dict[str, Decimal]]]:
+        """Get historical fund values from the Supabase NAV store."""
+        return self.supabase_repo.get_fund_nav_history(dates)
+    
     def get_latest_portfolio_snapshot(self) -> Optional[PortfolioSnapshot]:
         """Get latest portfolio snapshot from Supabase."""
         return self.supabase_repo.get_latest_portfolio_snapshot()
@@ -79,13 +115,26 @@ class SupabaseDualWriteRepository(BaseRepository):
             logger.info(f"Saved portfolio snapshot to Supabase")
             
             # Save to CSV (backup)
-            self.csv_repo.save_portfolio_snapshot(snapshot, is_trade_execution)
-            logger.info(f"Saved portfolio snapshot to CSV")
+            self._write_csv('save_portfolio_snapshot', snapshot, is_trade_execution)
             
         except Exception as e:
             logger.error(f"Failed to save portfolio snapshot: {e}")
             raise RepositoryError(f"Failed to save portfolio snapshot: {e}") from e
     
+    def save_portfolio_snapshots(self, snapshots: List[PortfolioSnapshot]) -> None:
+        """Bulk-save snapshots to both Supabase and CSV."""
+        try:
+            # Save to Supabase first (primary)
+            self.supabase_repo.save_portfolio_snapshots(snapshots)
+            logger.info(f"Saved {len(snapshots)} portfolio snapshots to Supabase")
+            
+            # Save to CSV (backup)
+            self._write_csv('save_portfolio_snapshots', snapshots)
+            
+        except Exception as e:
+            logger.error(f"Failed to save portfolio snapshots: {e}")
+            raise RepositoryError(f"Failed to save portfolio snapshots: {e}") from e
+    
     def get_trade_history(self, ticker: Optional[str] = None, date_range: Optional[Tuple[datetime, datetime]] = None) -> List[Trade]:
         """Get trade history from Supabase."""
         return self.supabase_repo.get_trade_history(ticker, date_range)
@@ -98,8 +147,7 @@ class SupabaseDualWriteRepository(BaseRepository):
             logger.info(f"Saved trade to Supabase: {trade.ticker}")
             
             # Save to CSV (backup)
-            self.csv_repo.save_trade(trade)
-            logger.info(f"Saved trade to CSV: {trade.ticker}")
+            self._write_csv('save_trade', trade)
             
         except Exception as e:
             logger.error(f"Failed to save trade: {e}")
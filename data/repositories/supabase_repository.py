@@ -33,6 +33,10 @@ class SupabaseRepository(BaseRepository):
     This implementation provides the same interface as CSVRepository but
     uses Supabase as the backend storage.
     """
+
+    # Supabase rejects requests above 1000 rows; keep IN-lists short for URL length
+    BULK_ROW_CHUNK = 1000
+    BULK_DATE_CHUNK = 100
     
     def __init__(self, fund_name: str, url: str = None, key: str = None, use_service_role: bool = False, **kwargs):
         """Initialize Supabase repository.
@@ -236,40 +240,20 @@ class SupabaseRepository(BaseRepository):
                 logger.info(f"   Note: Full history available but limited for faster loading")
             
             # Supabase Python client has a 1000-row default limit
-            # We need to paginate to get all data
+            # Stream all rows with keyset pagination on (date, id)
+            iter_pages = self._load_keyset_reader()
             all_data = []
-            page_size = 1000
-            offset = 0
-            batch_num = 1
+            filters = [("eq", "fund", self.fund)]
             
             if date_range:
                 start_date, end_date = date_range
                 days_diff = (end_date - start_date).days
                 logger.info(f"📊 Loading portfolio data from {start_date.date()} to {end_date.date()} ({days_diff} days)...")
+                filters += [("gte", "date", start_date.isoformat()), ("lte", "date", end_date.isoformat())]
             
-            while True:
-                query = self.supabase.table("portfolio_positions") \
-                    .select("*") \
-                    .eq("fund", self.fund) \
-                    .range(offset, offset + page_size - 1)
-                
-                if date_range:
-                    query = query.gte("date", start_date.isoformat()).lte("date", end_date.isoformat())
-                
-                result = query.execute()
-                
-                if not result.data:
-                    break
-                
-                all_data.extend(result.data)
-                logger.debug(f"   Fetched batch {batch_num}: {len(result.data)} positions (total: {len(all_data)})")
-                
-                # If we got less than page_size rows, we're done
-                if len(result.data) < page_size:
-                    break
-                
-                offset += page_size
-                batch_num += 1
+            for batch_num, rows in enumerate(iter_pages(self.supabase, "portfolio_positions", "*", filters), 1):
+                all_data.extend(rows)
+                logger.debug(f"   Fetched batch {batch_num}: {len(rows)} positions (total: {len(all_data)})")
             
             elapsed_time = time.time() - start_time
             logger.info(f"✅ Fetched {len(all_data)} portfolio positions in {elapsed_time:.2f}s")
@@ -355,95 +339,14 @@ class SupabaseRepository(BaseRepository):
                     logger.warning(f"   Skipping save to preserve market close snapshot at 16:00:00")
                     return  # Don't save, preserve market close snapshot
             
-            # Get fund's base currency for pre-conversion
-            base_currency = 'CAD'  # Default
-            try:
-                fund_result = self.supabase.table("funds")\
-                    .select("base_currency")\
-                    .eq("name", self.fund)\
-                    .limit(1)\
-                    .execute()
-                if fund_result.data and fund_result.data[0].get('base_currency'):
-                    base_currency = fund_result.data[0]['base_currency'].upper()
-            except Exception as e:
-                logger.warning(f"Could not get base_currency for fund {self.fund}, using default CAD: {e}")
-            
-            # Get exchange rates for this date (for currency conversion)
-            # Import exchange rate utility
-            try:
-                import sys
-                from pathlib import Path
-                project_root = Path(__file__).resolve().parent.parent.parent
-                web_dashboard_path = project_root / 'web_dashboard'
-                if str(web_dashboard_path) not in sys.path:
-                    sys.path.insert(0, str(web_dashboard_path))
-                from exchange_rates_utils import get_exchange_rate_for_date_from_db
-            except ImportError:
-                logger.warning("Could not import exchange_rates_utils - pre-converted values will be None")
-                get_exchange_rate_for_date_from_db = None
+            base_currency = self._get_base_currency()
+            get_exchange_rate_for_date_from_db = self._load_exchange_rate_lookup()
             
             # Use PositionMapper to convert positions to Supabase format with pre-converted values
-            positions_data = []
-            snapshot_date = snapshot.timestamp.date()
-            
-            # Collect unique tickers to ensure existence
-            unique_tickers = set()
-            ticker_currencies = {}
-
-            for position in snapshot.positions:
-                ticker = position.ticker
-                currency = (position.currency or 'CAD').upper()
-
-                unique_tickers.add(ticker)
-                if ticker not in ticker_currencies:
-                    ticker_currencies[ticker] = currency
-
-                exchange_rate = None
-                
-                # Calculate exchange rate if needed
-                if base_currency and currency != base_currency:
-                    if get_exchange_rate_for_date_from_db:
-                        try:
-                            # Get exchange rate for this date
-                            if currency == 'USD' and base_currency != 'USD':
-                                # Converting USD to base currency
-                                rate = get_exchange_rate_for_date_from_db(
-                                    snapshot.timestamp,
-                                    'USD',
-                                    base_currency
-                                )
-                                if rate is not None:
-                                    exchange_rate = float(rate)
-                            elif base_currency == 'USD' and currency != 'USD':
-                                # Converting from position currency to USD
-                                rate = get_exchange_rate_for_date_from_db(
-                                    snapshot.timestamp,
-                                    currency,
-                                    'USD'
-                                )
-                                if rate is not None:
-                                    exchange_rate = float(rate)
-                                else:
-                                    # Try inverse rate
-                                    inverse_rate = get_exchange_rate_for_date_from_db(
-                                        snapshot.timestamp,
-                                        'USD',
-                                        currency
-                                    )
-                                    if inverse_rate is not None and inverse_rate != 0:
-                                        exchange_rate = 1.0 / float(inverse_rate)
-                        except Exception as e:
-                            logger.warning(f"Could not get exchange rate for {currency}→{base_currency} on {snapshot_date}: {e}")
-                
-                # Convert position with pre-converted values
-                position_data = PositionMapper.model_to_db(
-                    position, 
-                    self.fund, 
-                    snapshot.timestamp,
-                    base_currency=base_currency,
-                    exchange_rate=exchange_rate
-                )
-                positions_data.append(position_data)
+            positions_data, ticker_currencies = self._snapshot_to_rows(
+                snapshot, base_currency, get_exchange_rate_for_date_from_db
+            )
+            unique_tickers = set(ticker_currencies)
             
             # Ensure all tickers exist in securities table
             for ticker in unique_tickers:
@@ -473,6 +376,252 @@ class SupabaseRepository(BaseRepository):
         except Exception as e:
             logger.error(f"Failed to save portfolio data: {e}")
             raise RepositoryError(f"Failed to save portfolio data: {e}")
+
+    def _get_base_currency(self) -> str:
+        """Get the fund's base currency used for pre-converted values (defaults to CAD)."""
+        base_currency = 'CAD'  # Default
+        try:
+            fund_result = self.supabase.table("funds")\
+                .select("base_currency")\
+                .eq("name", self.fund)\
+                .limit(1)\
+                .execute()
+            if fund_result.data and fund_result.data[0].get('base_currency'):
+                base_currency = fund_result.data[0]['base_currency'].upper()
+        except Exception as e:
+            logger.warning(f"Could not get base_currency for fund {self.fund}, using default CAD: {e}")
+        return base_currency
+
+    @staticmethod
+    def _load_keyset_reader():
+        """Import the shared keyset-paginated reader for large tables.
+
+        Returns:
+            ``keyset_pagination.iter_pages``
+        """
+        import sys
+        from pathlib import Path
+        project_root = Path(__file__).resolve().parent.parent.parent
+        web_dashboard_path = project_root / 'web_dashboard'
+        if str(web_dashboard_path) not in sys.path:
+            sys.path.insert(0, str(web_dashboard_path))
+        from keyset_pagination import iter_pages
+        return iter_pages
+
+    @staticmethod
+    def _load_fund_nav():
+        """Import the fund NAV store helpers.
+
+        Returns:
+            ``fund_nav`` module
+        """
+        import sys
+        from pathlib import Path
+        project_root = Path(__file__).resolve().parent.parent.parent
+        web_dashboard_path = project_root / 'web_dashboard'
+        if str(web_dashboard_path) not in sys.path:
+            sys.path.insert(0, str(web_dashboard_path))
+        import fund_nav
+        return fund_nav
+
+    def _invalidate_trade_log_cache(self) -> None:
+        """Publish a ``trade_log`` invalidation for this fund to the dashboard caches."""
+        try:
+            import sys
+            from pathlib import Path
+            project_root = Path(__file__).resolve().parent.parent.parent
+            web_dashboard_path = project_root / 'web_dashboard'
+            if str(web_dashboard_path) not in sys.path:
+                sys.path.insert(0, str(web_dashboard_path))
+            from cache_version import invalidate, cache_tag
+            invalidate(cache_tag("trade_log", self.fund))
+        except ImportError as e:
+            logger.warning(f"Could not import cache_version - dashboard trade caches not invalidated: {e}")
+
+    def get_fund_nav_history(self, dates: List[datetime]) -> Optional[Tuple[Dict[str, Decimal], Dict[str, Decimal]]]:
+        """Get fund value and cost basis on specific dates from fund_nav_daily.
+        
+        Args:
+            dates: Dates to look up (e.g. contribution timestamps)
+            
+        Returns:
+            ({date: fund value}, {date: cost basis}) keyed by 'YYYY-MM-DD', or
+            None if the store has no rows for this fund
+        """
+        try:
+            history = self._load_fund_nav().get_nav_history(self.supabase, self.fund, dates)
+        except ImportError as e:
+            logger.warning(f"Could not import fund_nav - NAV store unavailable: {e}")
+            return None
+        if history is None:
+            return None
+        values, cost_basis = history
+        return (
+            {day: Decimal(str(value)) for day, value in values.items()},
+            {day: Decimal(str(value)) for day, value in cost_basis.items()},
+        )
+
+    @staticmethod
+    def _load_exchange_rate_lookup():
+        """Import the exchange rate lookup used for pre-converted values.
+
+        Returns:
+            ``get_exchange_rate_for_date_from_db`` or None if it cannot be imported
+        """
+        try:
+            import sys
+            from pathlib import Path
+            project_root = Path(__file__).resolve().parent.parent.parent
+            web_dashboard_path = project_root / 'web_dashboard'
+            if str(web_dashboard_path) not in sys.path:
+                sys.path.insert(0, str(web_dashboard_path))
+            from exchange_rates_utils import get_exchange_rate_for_date_from_db
+            return get_exchange_rate_for_date_from_db
+        except ImportError:
+            logger.warning("Could not import exchange_rates_utils - pre-converted values will be None")
+            return None
+
+    def _snapshot_to_rows(self, snapshot: PortfolioSnapshot, base_currency: str,
+                          get_exchange_rate_for_date_from_db=None,
+                          rate_cache: Optional[Dict[Tuple[Any, str], Optional[float]]] = None
+                          ) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+        """Convert a snapshot to portfolio_positions rows with pre-converted values.
+
+        Args:
+            snapshot: Snapshot to convert
+            base_currency: Fund base currency
+            get_exchange_rate_for_date_from_db: Optional exchange rate lookup
+            rate_cache: Optional dict reused across snapshots, keyed by (date, currency)
+
+        Returns:
+            Tuple of (rows, {ticker: currency})
+        """
+        positions_data = []
+        ticker_currencies: Dict[str, str] = {}
+        snapshot_date = snapshot.timestamp.date()
+        if rate_cache is None:
+            rate_cache = {}
+
+        for position in snapshot.positions:
+            ticker = position.ticker
+            currency = (position.currency or 'CAD').upper()
+
+            if ticker not in ticker_currencies:
+                ticker_currencies[ticker] = currency
+
+            exchange_rate = None
+            
+            # Calculate exchange rate if needed
+            if base_currency and currency != base_currency and get_exchange_rate_for_date_from_db:
+                cache_key = (snapshot_date, currency)
+                if cache_key in rate_cache:
+                    exchange_rate = rate_cache[cache_key]
+                else:
+                    try:
+                        # Get exchange rate for this date
+                        if currency == 'USD' and base_currency != 'USD':
+                            # Converting USD to base currency
+                            rate = get_exchange_rate_for_date_from_db(
+                                snapshot.timestamp,
+                                'USD',
+                                base_currency
+                            )
+                            if rate is not None:
+                                exchange_rate = float(rate)
+                        elif base_currency == 'USD' and currency != 'USD':
+                            # Converting from position currency to USD
+                            rate = get_exchange_rate_for_date_from_db(
+                                snapshot.timestamp,
+                                currency,
+                                'USD'
+                            )
+                            if rate is not None:
+                                exchange_rate = float(rate)
+                            else:
+                                # Try inverse rate
+                                inverse_rate = get_exchange_rate_for_date_from_db(
+                                    snapshot.timestamp,
+                                    'USD',
+                                    currency
+                                )
+                                if inverse_rate is not None and inverse_rate != 0:
+                                    exchange_rate = 1.0 / float(inverse_rate)
+                    except Exception as e:
+                        logger.warning(f"Could not get exchange rate for {currency}→{base_currency} on {snapshot_date}: {e}")
+                    rate_cache[cache_key] = exchange_rate
+            
+            # Convert position with pre-converted values
+            position_data = PositionMapper.model_to_db(
+                position, 
+                self.fund, 
+                snapshot.timestamp,
+                base_currency=base_currency,
+                exchange_rate=exchange_rate
+            )
+            positions_data.append(position_data)
+
+        return positions_data, ticker_currencies
+
+    def save_portfolio_snapshots(self, snapshots: List[PortfolioSnapshot]) -> None:
+        """Save several snapshots with bulk delete and chunked upserts.
+
+        Base currency is resolved once, exchange rates once per (date, currency)
+        and securities once per ticker. Existing positions for every snapshot
+        date are replaced. Market-close protection is not applied (rebuild path).
+
+        Args:
+            snapshots: Complete snapshots to save, one per date
+
+        Raises:
+            RepositoryError: If data saving fails
+        """
+        if not snapshots:
+            return
+
+        try:
+            base_currency = self._get_base_currency()
+            get_exchange_rate_for_date_from_db = self._load_exchange_rate_lookup()
+            rate_cache: Dict[Tuple[Any, str], Optional[float]] = {}
+
+            all_rows: List[Dict[str, Any]] = []
+            ticker_currencies: Dict[str, str] = {}
+            snapshot_dates = set()
+            for snapshot in snapshots:
+                rows, currencies = self._snapshot_to_rows(
+                    snapshot, base_currency, get_exchange_rate_for_date_from_db, rate_cache
+                )
+                all_rows.extend(rows)
+                for ticker, currency in currencies.items():
+                    ticker_currencies.setdefault(ticker, currency)
+                # date_only is the UTC date of the stored timestamp
+                stamp = snapshot.timestamp
+                if stamp.tzinfo is not None:
+                    from datetime import timezone
+                    stamp = stamp.astimezone(timezone.utc)
+                snapshot_dates.add(stamp.date().isoformat())
+
+            for ticker, currency in ticker_currencies.items():
+                self.ensure_ticker_in_securities(ticker, currency)
+
+            # Replace every affected date; date_only is populated by trigger
+            sorted_dates = sorted(snapshot_dates)
+            for i in range(0, len(sorted_dates), self.BULK_DATE_CHUNK):
+                self.supabase.table("portfolio_positions").delete()\
+                    .eq("fund", self.fund)\
+                    .in_("date_only", sorted_dates[i:i + self.BULK_DATE_CHUNK])\
+                    .execute()
+
+            for i in range(0, len(all_rows), self.BULK_ROW_CHUNK):
+                self.supabase.table("portfolio_positions").upsert(
+                    all_rows[i:i + self.BULK_ROW_CHUNK],
+                    on_conflict="fund,ticker,date_only"
+                ).execute()
+
+            logger.info(f"Saved {len(snapshots)} snapshots ({len(all_rows)} positions) to Supabase")
+
+        except Exception as e:
+            logger.error(f"Failed to save portfolio snapshots: {e}")
+            raise RepositoryError(f"Failed to save portfolio snapshots: {e}") from e
     
     def get_trade_history(self, ticker: Optional[str] = None, date_range: Optional[Tuple[datetime, datetime]] = None) -> List[Trade]:
         """Get trade history from Supabase.
@@ -548,6 +697,7 @@ class SupabaseRepository(BaseRepository):
             trade_data = TradeMapper.model_to_db(trade, self.fund)
             
             result = self.supabase.table("trade_log").insert(trade_data).execute()
+            self._invalidate_trade_log_cache()
             
             logger.info(f"Saved trade for {trade.ticker} to Supabase")
             
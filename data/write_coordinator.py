@@ -6,15 +6,19 @@ across both storage systems.
 """
 
 import logging
-from dataclasses import dataclass
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
 from typing import Optional, List, Tuple
-from datetime import datetime
+from datetime import datetime, timezone
+from decimal import Decimal
 
 from data.models.trade import Trade
 from data.models.portfolio import PortfolioSnapshot, Position
 from data.repositories.base_repository import BaseRepository
 from data.repositories.csv_repository import CSVRepository
 from data.repositories.supabase_repository import SupabaseRepository
+from data.write_journal import SyncLag, WriteBehindQueue, WriteJournal
 
 logger = logging.getLogger(__name__)
 
@@ -26,11 +30,12 @@ class WriteResult:
     supabase_success: bool
     csv_error: Optional[str] = None
     supabase_error: Optional[str] = None
+    supabase_queued: bool = False  # Supabase write journaled for write-behind replay
     
     @property
     def all_successful(self) -> bool:
-        """Check if both writes were successful."""
-        return self.csv_success and self.supabase_success
+        """Check if both writes were successful (a queued write counts as accepted)."""
+        return self.csv_success and (self.supabase_success or self.supabase_queued)
     
     @property
     def any_successful(self) -> bool:
@@ -40,7 +45,7 @@ class WriteResult:
     @property
     def has_failures(self) -> bool:
         """Check if any writes failed."""
-        return not self.csv_success or not self.supabase_success
+        return not self.all_successful
     
     def get_failure_messages(self) -> List[str]:
         """Get list of failure messages."""
@@ -52,24 +57,85 @@ class WriteResult:
         return failures
 
 
+@dataclass
+class SyncReport:
+    """Divergence between the CSV and Supabase repositories."""
+    csv_trade_count: int = 0
+    supabase_trade_count: int = 0
+    missing_trades: List[Trade] = field(default_factory=list)  # In CSV but not in Supabase
+    extra_trade_count: int = 0  # In Supabase but not in CSV
+    snapshot_mismatch: Optional[str] = None
+    lag: Optional[SyncLag] = None
+    repaired_trades: int = 0
+    repaired_snapshot: bool = False
+
+    @property
+    def in_sync(self) -> bool:
+        return (self.csv_trade_count == self.supabase_trade_count and not self.missing_trades
+                and self.snapshot_mismatch is None and (self.lag is None or self.lag.in_sync))
+
+
 class WriteCoordinator:
     """Coordinates dual writes to both CSV and Supabase repositories.
     
     This class ensures that all write operations are performed on both
     CSV and Supabase repositories simultaneously, providing data redundancy
     and consistency across both storage systems.
+
+    With ``write_behind=True`` only the CSV write (primary) is synchronous;
+    the Supabase write is journaled and replayed in the background (see
+    data/write_journal.py), so callers don't wait for the Supabase round trip
+    and failed Supabase writes are retried instead of dropped.
     """
     
-    def __init__(self, csv_repo: CSVRepository, supabase_repo: SupabaseRepository):
+    def __init__(self, csv_repo: CSVRepository, supabase_repo: SupabaseRepository,
+                 write_behind: bool = False, journal_path: Optional[Path] = None):
         """Initialize the write coordinator.
         
         Args:
             csv_repo: CSV repository instance
             supabase_repo: Supabase repository instance
+            write_behind: Queue Supabase writes instead of waiting for them
+            journal_path: Write-behind journal (defaults to <data_dir>/.cache/supabase_write_journal.db)
         """
         self.csv_repo = csv_repo
         self.supabase_repo = supabase_repo
         self.logger = logging.getLogger(__name__)
+
+        self.write_queue: Optional[WriteBehindQueue] = None
+        if write_behind:
+            journal_path = journal_path or Path(csv_repo.data_dir) / ".cache" / "supabase_write_journal.db"
+            self.write_queue = WriteBehindQueue(supabase_repo, WriteJournal(journal_path))
+            self.write_queue.start()
+
+    def close(self) -> None:
+        """Stop the write-behind worker after a final drain."""
+        if self.write_queue:
+            self.write_queue.stop()
+            self.write_queue.journal.close()
+            self.write_queue = None
+
+    def sync_lag(self) -> Optional[SyncLag]:
+        """Pending Supabase writes in write-behind mode, None otherwise."""
+        return self.write_queue.sync_lag() if self.write_queue else None
+
+    def _write_supabase(self, operation: str, *args) -> Tuple[bool, bool, Optional[str]]:
+        """Write to Supabase, or journal the write in write-behind mode.
+
+        Returns:
+            Tuple of (success, queued, error)
+        """
+        try:
+            if self.write_queue:
+                self.write_queue.submit(operation, *args)
+                self.logger.debug(f"Supabase {operation} queued for write-behind")
+                return False, True, None
+            getattr(self.supabase_repo, operation)(*args)
+            self.logger.debug(f"Supabase {operation} successful")
+            return True, False, None
+        except Exception as e:
+            self.logger.error(f"Supabase {operation} failed: {e}")
+            return False, False, str(e)
     
     def save_trade(self, trade: Trade) -> WriteResult:
         """Save a trade to both CSV and Supabase repositories.
@@ -83,9 +149,7 @@ class WriteCoordinator:
         self.logger.info(f"Saving trade to both repositories: {trade.ticker} {trade.action}")
         
         csv_success = False
-        supabase_success = False
         csv_error = None
-        supabase_error = None
         
         # Try CSV write
         try:
@@ -96,17 +160,13 @@ class WriteCoordinator:
             csv_error = str(e)
             self.logger.error(f"CSV write failed for trade {trade.ticker}: {e}")
         
-        # Try Supabase write
-        try:
-            self.supabase_repo.save_trade(trade)
-            supabase_success = True
-            self.logger.debug(f"Supabase write successful for trade {trade.ticker}")
-        except Exception as e:
-            supabase_error = str(e)
-            self.logger.error(f"Supabase write failed for trade {trade.ticker}: {e}")
+        # Try Supabase write (queued in write-behind mode)
+        supabase_success, supabase_queued, supabase_error = self._write_supabase('save_trade', trade)
         
         # Log results
-        if csv_success and supabase_success:
+        if csv_success and supabase_queued:
+            self.logger.info(f"Trade {trade.ticker} saved to CSV, Supabase write queued")
+        elif csv_success and supabase_success:
             self.logger.info(f"Trade {trade.ticker} saved successfully to both repositories")
         elif csv_success or supabase_success:
             self.logger.warning(f"Trade {trade.ticker} saved to only one repository (partial success)")
@@ -117,7 +177,8 @@ class WriteCoordinator:
             csv_success=csv_success,
             supabase_success=supabase_success,
             csv_error=csv_error,
-            supabase_error=supabase_error
+            supabase_error=supabase_error,
+            supabase_queued=supabase_queued
         )
     
     def save_portfolio_snapshot(self, snapshot: PortfolioSnapshot) -> WriteResult:
@@ -132,9 +193,7 @@ class WriteCoordinator:
         self.logger.info(f"Saving portfolio snapshot to both repositories: {snapshot.timestamp}")
         
         csv_success = False
-        supabase_success = False
         csv_error = None
-        supabase_error = None
         
         # Try CSV write
         try:
@@ -145,17 +204,13 @@ class WriteCoordinator:
             csv_error = str(e)
             self.logger.error(f"CSV write failed for portfolio snapshot: {e}")
         
-        # Try Supabase write
-        try:
-            self.supabase_repo.save_portfolio_snapshot(snapshot)
-            supabase_success = True
-            self.logger.debug("Supabase write successful for portfolio snapshot")
-        except Exception as e:
-            supabase_error = str(e)
-            self.logger.error(f"Supabase write failed for portfolio snapshot: {e}")
+        # Try Supabase write (queued in write-behind mode)
+        supabase_success, supabase_queued, supabase_error = self._write_supabase('save_portfolio_snapshot', snapshot)
         
         # Log results
-        if csv_success and supabase_success:
+        if csv_success and supabase_queued:
+            self.logger.info("Portfolio snapshot saved to CSV, Supabase write queued")
+        elif csv_success and supabase_success:
             self.logger.info("Portfolio snapshot saved successfully to both repositories")
         elif csv_success or supabase_success:
             self.logger.warning("Portfolio snapshot saved to only one repository (partial success)")
@@ -166,7 +221,8 @@ class WriteCoordinator:
             csv_success=csv_success,
             supabase_success=supabase_success,
             csv_error=csv_error,
-            supabase_error=supabase_error
+            supabase_error=supabase_error,
+            supabase_queued=supabase_queued
         )
     
     def update_daily_portfolio_snapshot(self, snapshot: PortfolioSnapshot) -> WriteResult:
@@ -181,9 +237,7 @@ class WriteCoordinator:
         self.logger.info(f"Updating daily portfolio snapshot in both repositories: {snapshot.timestamp}")
         
         csv_success = False
-        supabase_success = False
         csv_error = None
-        supabase_error = None
         
         # Try CSV write
         try:
@@ -194,17 +248,13 @@ class WriteCoordinator:
             csv_error = str(e)
             self.logger.error(f"CSV update failed for daily portfolio snapshot: {e}")
         
-        # Try Supabase write
-        try:
-            self.supabase_repo.update_daily_portfolio_snapshot(snapshot)
-            supabase_success = True
-            self.logger.debug("Supabase update successful for daily portfolio snapshot")
-        except Exception as e:
-            supabase_error = str(e)
-            self.logger.error(f"Supabase update failed for daily portfolio snapshot: {e}")
+        # Try Supabase write (queued in write-behind mode)
+        supabase_success, supabase_queued, supabase_error = self._write_supabase('update_daily_portfolio_snapshot', snapshot)
         
         # Log results
-        if csv_success and supabase_success:
+        if csv_success and supabase_queued:
+            self.logger.info("Daily portfolio snapshot updated in CSV, Supabase update queued")
+        elif csv_success and supabase_success:
             self.logger.info("Daily portfolio snapshot updated successfully in both repositories")
         elif csv_success or supabase_success:
             self.logger.warning("Daily portfolio snapshot updated in only one repository (partial success)")
@@ -215,7 +265,8 @@ class WriteCoordinator:
             csv_success=csv_success,
             supabase_success=supabase_success,
             csv_error=csv_error,
-            supabase_error=supabase_error
+            supabase_error=supabase_error,
+            supabase_queued=supabase_queued
         )
     
     def get_latest_portfolio_snapshot(self) -> Optional[PortfolioSnapshot]:
@@ -253,43 +304,122 @@ class WriteCoordinator:
             self.logger.error(f"Failed to get trade history: {e}")
             return []
     
-    def validate_sync(self) -> bool:
+    def validate_sync(self, repair: bool = False) -> bool:
         """Validate that both repositories are in sync.
         
-        This is a basic validation that checks if both repositories
-        have the same number of trades and portfolio snapshots.
+        Compares trades and the latest portfolio snapshot (see check_sync).
+        
+        Args:
+            repair: Copy whatever is missing from CSV (primary) to Supabase
         
         Returns:
-            True if repositories appear to be in sync, False otherwise
+            True if repositories are in sync (after any repair), False otherwise
         """
         try:
-            # Check trade counts
-            csv_trades = self.csv_repo.get_trade_history()
-            supabase_trades = self.supabase_repo.get_trade_history()
-            
-            if len(csv_trades) != len(supabase_trades):
-                self.logger.warning(f"Trade count mismatch: CSV={len(csv_trades)}, Supabase={len(supabase_trades)}")
-                return False
-            
-            # Check portfolio snapshots
-            csv_snapshot = self.csv_repo.get_latest_portfolio_snapshot()
-            supabase_snapshot = self.supabase_repo.get_latest_portfolio_snapshot()
-            
-            if csv_snapshot is None and supabase_snapshot is None:
-                return True  # Both empty, considered in sync
-            
-            if csv_snapshot is None or supabase_snapshot is None:
-                self.logger.warning("Portfolio snapshot mismatch: one repository has data, other doesn't")
-                return False
-            
-            # Basic timestamp comparison
-            if abs((csv_snapshot.timestamp - supabase_snapshot.timestamp).total_seconds()) > 60:
-                self.logger.warning("Portfolio snapshot timestamps differ by more than 1 minute")
-                return False
-            
-            self.logger.info("Repositories appear to be in sync")
-            return True
-            
+            report = self.check_sync(repair=repair)
         except Exception as e:
             self.logger.error(f"Sync validation failed: {e}")
             return False
+        
+        if report.in_sync or (repair and self._repaired(report)):
+            self.logger.info("Repositories appear to be in sync")
+            return True
+        return False
+    
+    def check_sync(self, repair: bool = False) -> SyncReport:
+        """Report (and optionally repair) divergence between CSV and Supabase.
+        
+        CSV is the source of truth: trades missing from Supabase and a
+        differing latest snapshot are written to Supabase when ``repair`` is
+        set. In write-behind mode the journal is drained first, and trades
+        are not repaired while journaled writes are still pending, since
+        those would be applied twice.
+        
+        Args:
+            repair: Write missing data to Supabase
+        
+        Returns:
+            SyncReport describing the divergence found
+        """
+        report = SyncReport()
+        if self.write_queue:
+            if repair:
+                self.write_queue.drain()
+            report.lag = self.write_queue.sync_lag()
+            if not report.lag.in_sync:
+                self.logger.warning(f"{report.lag.pending} Supabase writes pending "
+                                    f"(oldest {report.lag.oldest_pending_seconds:.0f}s)")
+        
+        # Check trades
+        csv_trades = self.csv_repo.get_trade_history()
+        supabase_trades = self.supabase_repo.get_trade_history()
+        report.csv_trade_count = len(csv_trades)
+        report.supabase_trade_count = len(supabase_trades)
+        
+        supabase_keys = Counter(self._trade_key(trade) for trade in supabase_trades)
+        for trade in csv_trades:
+            key = self._trade_key(trade)
+            if supabase_keys[key] > 0:
+                supabase_keys[key] -= 1
+            else:
+                report.missing_trades.append(trade)
+        report.extra_trade_count = sum(supabase_keys.values())
+        
+        if report.csv_trade_count != report.supabase_trade_count or report.missing_trades:
+            self.logger.warning(f"Trade mismatch: CSV={report.csv_trade_count}, Supabase={report.supabase_trade_count}, "
+                                f"{len(report.missing_trades)} missing from Supabase")
+        
+        # Check portfolio snapshots
+        csv_snapshot = self.csv_repo.get_latest_portfolio_snapshot()
+        supabase_snapshot = self.supabase_repo.get_latest_portfolio_snapshot()
+        
+        if csv_snapshot is None and supabase_snapshot is None:
+            pass  # Both empty, considered in sync
+        elif csv_snapshot is None or supabase_snapshot is None:
+            report.snapshot_mismatch = "one repository has data, other doesn't"
+        elif abs((csv_snapshot.timestamp - supabase_snapshot.timestamp).total_seconds()) > 60:
+            report.snapshot_mismatch = "timestamps differ by more than 1 minute"
+        elif self._holdings(csv_snapshot) != self._holdings(supabase_snapshot):
+            report.snapshot_mismatch = "positions differ"
+        if report.snapshot_mismatch:
+            self.logger.warning(f"Portfolio snapshot mismatch: {report.snapshot_mismatch}")
+        
+        if repair:
+            if report.missing_trades and (report.lag is None or report.lag.in_sync):
+                for trade in report.missing_trades:
+                    self.supabase_repo.save_trade(trade)
+                    report.repaired_trades += 1
+                self.logger.info(f"Repaired {report.repaired_trades} trades missing from Supabase")
+            if report.snapshot_mismatch and csv_snapshot is not None:
+                self.supabase_repo.save_portfolio_snapshot(csv_snapshot)
+                report.repaired_snapshot = True
+                self.logger.info(f"Repaired latest portfolio snapshot in Supabase ({csv_snapshot.timestamp})")
+        
+        return report
+    
+    @staticmethod
+    def _repaired(report: SyncReport) -> bool:
+        """Whether a repair pass fixed every divergence in the report."""
+        return (report.repaired_trades == len(report.missing_trades) and report.extra_trade_count == 0
+                and (report.snapshot_mismatch is None or report.repaired_snapshot)
+                and (report.lag is None or report.lag.in_sync))
+    
+    @staticmethod
+    def _trade_key(trade: Trade) -> tuple:
+        """Identity of a trade across repositories (timestamp to the second, UTC)."""
+        timestamp = trade.timestamp
+        if timestamp.tzinfo is None:
+            # Naive times are read the way CSVRepository writes them (PST/PDT by date)
+            from utils.timezone_utils import format_timestamp_for_csv, parse_csv_timestamp
+            timestamp = parse_csv_timestamp(format_timestamp_for_csv(timestamp))
+        return (
+            trade.ticker,
+            str(trade.action).upper(),
+            timestamp.astimezone(timezone.utc).replace(microsecond=0),
+            round(Decimal(trade.shares), 4),
+            round(Decimal(trade.price), 4),
+        )
+    
+    @staticmethod
+    def _holdings(snapshot: PortfolioSnapshot) -> dict:
+        return {position.ticker: round(Decimal(position.shares), 4) for position in snapshot.positions}
@@ -0,0 +1,324 @@
+"""Durable write-behind queue for the secondary repository of a dual write.
+
+In write-behind mode a dual write goes to the primary repository
+synchronously, while the secondary write is appended to a local SQLite
+journal and replayed by a background worker. Callers therefore wait for one
+round trip instead of two, and a failed secondary write is retried from the
+journal instead of being lost.
+
+The journal survives restarts. Entries are replayed in order and deleted
+once applied, unless the write was queued again with a new payload while
+it was being applied; a failing entry is retried with exponential backoff and holds
+back the entries behind it, so the secondary never applies writes out of
+order. A replayed trade is first looked up on the secondary and skipped if
+it is already there. Snapshot writes are upserts, so they are naturally
+idempotent.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, fields
+from datetime import datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from data.models.portfolio import PortfolioSnapshot, Position
+from data.models.trade import Trade
+from data.repositories.base_repository import BaseRepository
+
+logger = logging.getLogger(__name__)
+
+# Repository methods that can be journaled
+JOURNALED_OPERATIONS = (
+    'save_trade',
+    'save_portfolio_snapshot',
+    'save_portfolio_snapshots',
+    'update_daily_portfolio_snapshot',
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS write_journal (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    operation TEXT NOT NULL,
+    idempotency_key TEXT NOT NULL UNIQUE,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL DEFAULT 0,
+    last_error TEXT
+);
+CREATE TABLE IF NOT EXISTS write_journal_state (
+    name TEXT PRIMARY KEY,
+    value REAL
+);
+"""
+
+
+def _encode(value: Any) -> Any:
+    """Encode models for the journal without losing Decimal precision."""
+    if isinstance(value, (Trade, Position, PortfolioSnapshot)):
+        tag = {Trade: '__trade__', Position: '__position__', PortfolioSnapshot: '__snapshot__'}[type(value)]
+        return {tag: {f.name: _encode(getattr(value, f.name)) for f in fields(value)}}
+    if isinstance(value, Decimal):
+        return {'__decimal__': str(value)}
+    if isinstance(value, datetime):
+        return {'__datetime__': value.isoformat()}
+    if isinstance(value, (list, tuple)):
+        return [_encode(item) for item in value]
+    return value
+
+
+def _decode_object(obj: Dict[str, Any]) -> Any:
+    """json object_hook reversing _encode (inner objects are decoded first)."""
+    if '__decimal__' in obj:
+        return Decimal(obj['__decimal__'])
+    if '__datetime__' in obj:
+        return datetime.fromisoformat(obj['__datetime__'])
+    if '__position__' in obj:
+        return Position(**obj['__position__'])
+    if '__trade__' in obj:
+        return Trade(**obj['__trade__'])
+    if '__snapshot__' in obj:
+        return PortfolioSnapshot(**obj['__snapshot__'])
+    return obj
+
+
+def idempotency_key(operation: str, args: tuple) -> str:
+    """Key identifying a write, so the same write is never queued twice."""
+    target = args[0]
+    if isinstance(target, Trade):
+        return (f"{operation}:{target.ticker}:{target.action}:{target.timestamp.isoformat()}:"
+                f"{target.shares.normalize()}:{target.price.normalize()}")
+    if isinstance(target, PortfolioSnapshot):
+        return f"{operation}:{target.timestamp.isoformat()}"
+    if isinstance(target, list):
+        return f"{operation}:" + ",".join(snapshot.timestamp.isoformat() for snapshot in target)
+    raise ValueError(f"Cannot journal {operation} of {type(target).__name__}")
+
+
+@dataclass
+class JournalEntry:
+    """A queued secondary write."""
+    id: int
+    operation: str
+    key: str
+    args: tuple
+    created_at: float
+    attempts: int
+    last_error: Optional[str] = None
+    payload: Optional[str] = None  # As read, to detect a re-queue while it is applied
+
+
+@dataclass
+class SyncLag:
+    """How far the secondary repository is behind the primary."""
+    pending: int
+    failing: int
+    oldest_pending_seconds: float
+    last_synced_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+
+    @property
+    def in_sync(self) -> bool:
+        return self.pending == 0
+
+
+class WriteJournal:
+    """SQLite-backed journal of pending secondary writes."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.executescript(_SCHEMA)
+
+    def append(self, operation: str, *args) -> int:
+        """Durably queue a write; queuing the same write again replaces its payload."""
+        if operation not in JOURNALED_OPERATIONS:
+            raise ValueError(f"Unsupported journaled operation: {operation}")
+        key = idempotency_key(operation, args)
+        payload = json.dumps(_encode(list(args)))
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO write_journal (operation, idempotency_key, payload, created_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(idempotency_key) DO UPDATE SET payload = excluded.payload",
+                (operation, key, payload, time.time())
+            )
+            return self._conn.execute("SELECT id FROM write_journal WHERE idempotency_key = ?", (key,)).fetchone()[0]
+
+    def due(self, now: Optional[float] = None) -> Optional[JournalEntry]:
+        """The oldest entry, or None if the journal is empty or it is still backing off."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, operation, idempotency_key, payload, created_at, attempts, last_error, next_attempt_at "
+                "FROM write_journal ORDER BY id LIMIT 1"
+            ).fetchone()
+        if row is None or row[7] > (now or time.time()):
+            return None
+        return JournalEntry(id=row[0], operation=row[1], key=row[2],
+                            args=tuple(json.loads(row[3], object_hook=_decode_object)),
+                            created_at=row[4], attempts=row[5], last_error=row[6], payload=row[3])
+
+    def begin_attempt(self, entry_id: int) -> None:
+        """Count an attempt before it is made, so a crash mid-write is seen as a replay."""
+        with self._lock:
+            self._conn.execute("UPDATE write_journal SET attempts = attempts + 1 WHERE id = ?", (entry_id,))
+
+    def complete(self, entry_id: int, payload: Optional[str] = None) -> bool:
+        """Remove an applied entry.
+
+        With payload, the entry is only removed if it still holds the payload
+        that was applied; a write queued again meanwhile stays for the next pass.
+
+        Returns:
+            True if the entry was removed
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            if payload is None:
+                removed = self._conn.execute("DELETE FROM write_journal WHERE id = ?", (entry_id,)).rowcount
+            else:
+                removed = self._conn.execute("DELETE FROM write_journal WHERE id = ? AND payload = ?",
+                                             (entry_id, payload)).rowcount
+            self._conn.execute("INSERT OR REPLACE INTO write_journal_state (name, value) VALUES ('last_synced_at', ?)",
+                               (time.time(),))
+            self._conn.execute("COMMIT")
+        return removed > 0
+
+    def fail(self, entry_id: int, error: str, retry_at: float) -> None:
+        with self._lock:
+            self._conn.execute("UPDATE write_journal SET last_error = ?, next_attempt_at = ? WHERE id = ?",
+                               (error, retry_at, entry_id))
+
+    def lag(self) -> SyncLag:
+        """Current sync lag."""
+        with self._lock:
+            pending, failing, oldest = self._conn.execute(
+                "SELECT COUNT(*), COUNT(last_error), MIN(created_at) FROM write_journal"
+            ).fetchone()
+            last_error = self._conn.execute(
+                "SELECT last_error FROM write_journal WHERE last_error IS NOT NULL ORDER BY id LIMIT 1"
+            ).fetchone()
+            synced = self._conn.execute(
+                "SELECT value FROM write_journal_state WHERE name = 'last_synced_at'"
+            ).fetchone()
+        return SyncLag(
+            pending=pending,
+            failing=failing,
+            oldest_pending_seconds=max(time.time() - oldest, 0.0) if oldest else 0.0,
+            last_synced_at=datetime.fromtimestamp(synced[0]) if synced else None,
+            last_error=last_error[0] if last_error else None,
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class WriteBehindQueue:
+    """Replays journaled writes against the secondary repository in the background."""
+
+    def __init__(self, secondary: BaseRepository, journal: WriteJournal,
+                 interval: float = 5.0, max_backoff: float = 300.0):
+        """Initialize the queue.
+
+        Args:
+            secondary: Repository the journaled writes are applied to
+            journal: Durable journal of pending writes
+            interval: Seconds between drain passes when idle
+            max_backoff: Upper bound of the retry delay for a failing write
+        """
+        self.secondary = secondary
+        self.journal = journal
+        self.interval = interval
+        self.max_backoff = max_backoff
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._drain_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, operation: str, *args) -> int:
+        """Journal a secondary write and wake the worker."""
+        entry_id = self.journal.append(operation, *args)
+        self._wake.set()
+        return entry_id
+
+    def drain(self, max_entries: Optional[int] = None) -> int:
+        """Apply due journal entries in order, stopping at the first failure.
+
+        Returns:
+            Number of entries applied
+        """
+        applied = 0
+        with self._drain_lock:
+            while max_entries is None or applied < max_entries:
+                entry = self.journal.due()
+                if entry is None:
+                    break
+                replay = entry.attempts > 0
+                self.journal.begin_attempt(entry.id)
+                try:
+                    if not (replay and self._already_applied(entry)):
+                        getattr(self.secondary, entry.operation)(*entry.args)
+                except Exception as e:
+                    delay = min(self.interval * 2 ** entry.attempts, self.max_backoff)
+                    self.journal.fail(entry.id, str(e), time.time() + delay)
+                    logger.warning(f"Write-behind {entry.operation} failed (attempt {entry.attempts + 1}), "
+                                   f"retrying in {delay:.0f}s: {e}")
+                    break
+                if not self.journal.complete(entry.id, entry.payload):
+                    logger.debug(f"Write-behind {entry.operation} was queued again while applied; reapplying")
+                applied += 1
+        return applied
+
+    def _already_applied(self, entry: JournalEntry) -> bool:
+        """Whether a replayed trade insert already reached the secondary."""
+        if entry.operation != 'save_trade':
+            return False
+        trade = entry.args[0]
+        window = (trade.timestamp - timedelta(seconds=1), trade.timestamp + timedelta(seconds=1))
+        return any(
+            existing.action == trade.action and existing.shares == trade.shares and existing.price == trade.price
+            for existing in self.secondary.get_trade_history(trade.ticker, window)
+        )
+
+    def sync_lag(self) -> SyncLag:
+        return self.journal.lag()
+
+    def start(self) -> None:
+        """Start the background worker."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 10.0) -> None:
+        """Stop the worker after a final drain pass."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.drain()
+            except Exception as e:
+                logger.error(f"Write-behind drain failed: {e}")
+            self._wake.wait(self.interval)
+            self._wake.clear()
+        try:
+            self.drain()
+        except Exception as e:
+            logger.error(f"Write-behind final drain failed: {e}")
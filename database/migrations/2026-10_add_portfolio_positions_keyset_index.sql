@@ -0,0 +1,7 @@
+-- Migration: Index for keyset pagination of portfolio_positions
+-- Readers page through a fund's positions with ORDER BY date, id and
+-- "date > d OR (date = d AND id > i)" instead of OFFSET, so each page is an
+-- index range scan whose cost does not grow with the page number.
+
+CREATE INDEX IF NOT EXISTS idx_portfolio_positions_fund_date_id
+ON portfolio_positions (fund, date, id);
@@ -0,0 +1,35 @@
+CREATE OR REPLACE FUNCTION public.get_portfolio_daily_totals(
+    fund_name character varying DEFAULT NULL::character varying,
+    start_at timestamp without time zone DEFAULT NULL::timestamp without time zone
+)
+ RETURNS TABLE(
+    date date,
+    total_value_base numeric,
+    cost_basis_base numeric,
+    pnl_base numeric,
+    total_value numeric,
+    cost_basis numeric,
+    pnl numeric,
+    position_count bigint,
+    preconverted_count bigint
+ )
+ LANGUAGE sql
+ STABLE
+ SET search_path TO 'public'
+AS $function$
+    SELECT
+        p.date::date AS date,
+        COALESCE(SUM(p.total_value_base), 0) AS total_value_base,
+        COALESCE(SUM(p.cost_basis_base), 0) AS cost_basis_base,
+        COALESCE(SUM(p.pnl_base), 0) AS pnl_base,
+        COALESCE(SUM(p.total_value), 0) AS total_value,
+        COALESCE(SUM(p.cost_basis), 0) AS cost_basis,
+        COALESCE(SUM(p.pnl), 0) AS pnl,
+        COUNT(*) AS position_count,
+        COUNT(p.total_value_base) AS preconverted_count
+    FROM portfolio_positions p
+    WHERE (fund_name IS NULL OR p.fund = fund_name)
+      AND (start_at IS NULL OR p.date >= start_at)
+    GROUP BY p.date::date
+    ORDER BY p.date::date;
+$function$;
\ No newline at end of file
@@ -0,0 +1,3 @@
+CREATE POLICY "Admins can view all fund NAV" ON "fund_nav_daily" FOR SELECT TO public USING ((EXISTS ( SELECT 1
+   FROM user_profiles
+  WHERE ((user_profiles.user_id = auth.uid()) AND ((user_profiles.role)::text = 'admin'::text)))));
\ No newline at end of file
@@ -0,0 +1 @@
+CREATE POLICY "Service role full access to fund_nav_daily" ON "fund_nav_daily" FOR ALL TO public USING ((auth.role() = 'service_role'::text));
\ No newline at end of file
@@ -0,0 +1,19 @@
+-- Table: fund_nav_daily
+DROP TABLE IF EXISTS fund_nav_daily CASCADE;
+
+CREATE TABLE fund_nav_daily (
+    fund VARCHAR(50) NOT NULL,
+    date DATE NOT NULL,
+    base_currency VARCHAR(3),
+    total_value NUMERIC(15, 2) NOT NULL DEFAULT 0,
+    cost_basis NUMERIC(15, 2) NOT NULL DEFAULT 0,
+    net_contributions NUMERIC(15, 2) NOT NULL DEFAULT 0,
+    units_outstanding NUMERIC(20, 6) NOT NULL DEFAULT 0,
+    nav_per_unit NUMERIC(15, 6),
+    updated_at TIMESTAMP DEFAULT now()
+,
+    PRIMARY KEY (fund, date)
+);
+
+-- Foreign Keys
+ALTER TABLE fund_nav_daily ADD CONSTRAINT fk_fund_nav_daily_fund FOREIGN KEY (fund) REFERENCES funds(name);
\ No newline at end of file
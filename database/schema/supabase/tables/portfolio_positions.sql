@@ -34,6 +34,7 @@ CREATE INDEX idx_portfolio_positions_date ON portfolio_positions (date);
 CREATE INDEX idx_portfolio_positions_date_fund ON portfolio_positions (date, fund);
 CREATE INDEX idx_portfolio_positions_fund ON portfolio_positions (fund);
 CREATE INDEX idx_portfolio_positions_fund_date ON portfolio_positions (fund, date);
+CREATE INDEX idx_portfolio_positions_fund_date_id ON portfolio_positions (fund, date, id);
 CREATE INDEX idx_portfolio_positions_fund_date_ticker ON portfolio_positions (fund, date, ticker);
 CREATE INDEX idx_portfolio_positions_fund_ticker ON portfolio_positions (fund, ticker);
 CREATE INDEX idx_portfolio_positions_fund_ticker_date ON portfolio_positions (fund, ticker, date);
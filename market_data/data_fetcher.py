@@ -8,18 +8,30 @@ fallback strategy for fetching OHLCV data:
 3. Stooq direct CSV
 4. Index proxies (e.g., ^GSPC->SPY, ^RUT->IWM) via Yahoo
 
+Strategies normally run one after another. In "hedged" mode the next strategy
+is started in parallel whenever the current ones have not answered within a
+configurable delay, and the first valid frame wins.
+
+How each raw ticker resolves (canonical listing such as CGL -> CGL.TO,
+currency and the strategy that last returned data) is kept in a persistent
+TickerResolutionIndex. Resolved tickers are fetched from their known listing
+with the last successful strategy first, without re-probing suffixes.
+
 The fetcher is designed to work with both current CSV storage and future database backends.
 """
 
 import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import Any, Dict, Optional, cast
+from typing import Any, Callable, Dict, List, Optional, Tuple, cast
 
 import pandas as pd
 from pathlib import Path
 
+from market_data.ticker_resolution import TickerResolutionIndex, get_resolution_index
+
 logger = logging.getLogger(__name__)
 
 # Optional pandas-datareader import for Stooq access
@@ -66,19 +78,28 @@ class MarketDataFetcher:
     through a consistent interface.
     """
     
-    def __init__(self, cache_instance: Optional[Any] = None, market_hours: Optional[Any] = None):
+    def __init__(
+        self,
+        cache_instance: Optional[Any] = None,
+        market_hours: Optional[Any] = None,
+        resolution_index: Optional[TickerResolutionIndex] = None
+    ):
         """
         Initialize the market data fetcher.
 
         Args:
             cache_instance: Optional cache instance for storing/retrieving data
             market_hours: Optional MarketHours instance for market status checking
+            resolution_index: Optional ticker resolution index (defaults to the shared one)
         """
         self.cache = cache_instance
         self.proxy_map = PROXY_MAP.copy()
         self._portfolio_currency_cache = {}
         self._load_currency_cache()
 
+        # Canonical listing and best strategy per ticker, persisted across runs
+        self.resolution_index = resolution_index if resolution_index is not None else get_resolution_index()
+
         # Initialize market hours
         if market_hours is None:
             from market_data.market_hours import MarketHours
@@ -104,6 +125,16 @@ class MarketDataFetcher:
             ttl_hours = 12
         self._fund_cache_ttl = timedelta(hours=ttl_hours)
 
+        # Hedged fetch mode: start the next strategy after hedge_delay seconds
+        self.fetch_mode = 'sequential'
+        self.hedge_delay = 1.5
+        try:
+            if self.settings:
+                self.fetch_mode = str(self.settings.get('market_data.fetch_mode', 'sequential'))
+                self.hedge_delay = float(self.settings.get('market_data.hedge_delay_seconds', 1.5))
+        except Exception:
+            self.fetch_mode = 'sequential'
+
         # Load fundamentals overrides (one-time load)
         self._fundamentals_overrides: Dict[str, Dict[str, Any]] = {}
         self._load_fundamentals_overrides()
@@ -400,7 +431,20 @@ class MarketDataFetcher:
                 if country == 'CANADA' or 'CANADIAN' in override_data.get('industry', '').upper():
                     is_likely_canadian = True
         
-        if is_likely_canadian:
+        # Tickers resolved on an earlier run go straight to their known listing,
+        # unless that listing conflicts with the currency this ticker is held in
+        # (the index is shared by all funds and keyed only by the raw ticker)
+        resolution = self.resolution_index.get(ticker)
+        if resolution and self._resolution_conflicts(ticker, resolution, is_likely_canadian):
+            logger.debug(f"Ignoring stored resolution {ticker} -> {resolution.symbol} "
+                         f"({resolution.currency or 'unknown currency'}) for this holding")
+            resolution = None
+        symbol = resolution.symbol if resolution else ticker
+        
+        if resolution:
+            # Only the resolved listing is tried - never re-probe suffixes
+            fetch_strategies = self._listing_strategies(symbol, start_date, end_date, period, **kwargs)
+        elif is_likely_canadian:
             # For likely Canadian tickers, try Canadian suffixes first
             # But don't add suffixes if ticker already has them
             if ticker.endswith(('.TO', '.V', '.CN')):
@@ -472,25 +516,26 @@ class MarketDataFetcher:
                         ("yahoo-proxy", lambda: self._fetch_proxy_data(ticker, start_date, end_date, **kwargs)),
                     ]
 
-        successful_strategy = None
-        failed_strategies = []
+        # Try the strategy that worked last time for this ticker first
+        if resolution and resolution.source:
+            fetch_strategies = self._prioritize_strategy(resolution.source, fetch_strategies)
         
-        for strategy_name, fetch_func in fetch_strategies:
-            try:
-                result = fetch_func()
-                if not result.df.empty:
-                    # Update source to indicate which strategy worked
-                    result = FetchResult(result.df, f"{result.source} ({strategy_name})")
-                    self._cache_result(ticker, result)
-                    successful_strategy = strategy_name
-                    
-                    # If we found data using a Canadian suffix, update CSVs to use canonical format
-                    self._normalize_ticker_in_csvs(ticker, strategy_name)
-                    
-                    break
-            except Exception as e:
-                failed_strategies.append(strategy_name)
-                continue
+        if self.fetch_mode == 'hedged' and len(fetch_strategies) > 1:
+            result, successful_strategy, failed_strategies = self._run_strategies_hedged(
+                ticker, fetch_strategies, self.hedge_delay
+            )
+        else:
+            result, successful_strategy, failed_strategies = self._run_strategies_sequential(
+                fetch_strategies
+            )
+        
+        if successful_strategy:
+            # Update source to indicate which strategy worked
+            result = FetchResult(result.df, f"{result.source} ({successful_strategy})")
+            self._cache_result(ticker, result)
+            
+            # Remember the listing and strategy that worked for the next fetch
+            self._record_resolution(ticker, symbol, successful_strategy)
 
             # Log a summary instead of individual errors
         if successful_strategy:
@@ -518,7 +563,7 @@ class MarketDataFetcher:
             if hasattr(self, '_portfolio_currency_cache'):
                 currency = self._portfolio_currency_cache.get(ticker)
                 # Don't convert if ticker already has Canadian suffix (.TO, .V, .CN) - these are already in CAD
-                if currency == 'CAD' and not successful_strategy.startswith('yahoo-ca') and not ticker.endswith(('.TO', '.V', '.CN')):
+                if currency == 'CAD' and not successful_strategy.startswith('yahoo-ca') and not symbol.endswith(('.TO', '.V', '.CN')):
                     # Only convert if we got data from US exchange, not Canadian, and ticker doesn't have Canadian suffix
                     result = self._convert_usd_to_cad(result)
 
@@ -527,6 +572,154 @@ class MarketDataFetcher:
             logger.error(f"{ticker}: All strategies failed ({', '.join(failed_strategies)})")
             return FetchResult(pd.DataFrame(), "failed")
     
+    def _prioritize_strategy(
+        self,
+        preferred: str,
+        strategies: List[Tuple[str, Callable[[], FetchResult]]]
+    ) -> List[Tuple[str, Callable[[], FetchResult]]]:
+        """Move the preferred strategy (e.g. the one that last succeeded) to the front.
+        
+        Only strategies already in the candidate list are reordered, so a known
+        USD ticker never starts trying Canadian variants.
+        """
+        if strategies[0][0] == preferred:
+            return strategies
+        first = [s for s in strategies if s[0] == preferred]
+        if not first:
+            return strategies
+        return first + [s for s in strategies if s[0] != preferred]
+    
+    def _listing_strategies(
+        self,
+        symbol: str,
+        start_date: datetime,
+        end_date: datetime,
+        period: str,
+        **kwargs: Any
+    ) -> List[Tuple[str, Callable[[], FetchResult]]]:
+        """Strategies that fetch a single listing, without trying other suffixes."""
+        return [
+            ("yahoo", lambda: self._fetch_yahoo_data(symbol, start_date, end_date, **kwargs)),
+            ("stooq-pdr", lambda: self._fetch_stooq_pdr(symbol, start_date, end_date)),
+            ("stooq-csv", lambda: self._fetch_stooq_csv(symbol, start_date, end_date)),
+            ("yahoo-retry-period", lambda: self._fetch_yahoo_data_retry_period(symbol, period)),
+            ("yahoo-retry-simple", lambda: self._fetch_yahoo_data_retry_simple(symbol)),
+            ("yahoo-proxy", lambda: self._fetch_proxy_data(symbol, start_date, end_date, **kwargs)),
+        ]
+    
+    @staticmethod
+    def _strategy_symbol(strategy_name: str) -> str:
+        """Which listing a strategy fetches: the ticker itself, a suffix variant, or a proxy.
+        
+        Strategies for the same listing are interchangeable; different listings
+        (e.g. DG vs DG.TO) are different securities.
+        """
+        if strategy_name == 'yahoo-ca-to':
+            return '.TO'
+        if strategy_name == 'yahoo-ca-v':
+            return '.V'
+        if strategy_name == 'yahoo-proxy':
+            return 'proxy'
+        return ''
+    
+    def _run_strategies_sequential(
+        self,
+        strategies: List[Tuple[str, Callable[[], FetchResult]]]
+    ) -> Tuple[Optional[FetchResult], Optional[str], List[str]]:
+        """Try strategies in order until one returns data.
+        
+        Returns:
+            Tuple of (result, successful strategy name, failed strategy names)
+        """
+        failed_strategies = []
+        for strategy_name, fetch_func in strategies:
+            try:
+                result = fetch_func()
+                if not result.df.empty:
+                    return result, strategy_name, failed_strategies
+            except Exception:
+                failed_strategies.append(strategy_name)
+        return None, None, failed_strategies
+    
+    def _run_strategies_hedged(
+        self,
+        ticker: str,
+        strategies: List[Tuple[str, Callable[[], FetchResult]]],
+        hedge_delay: float
+    ) -> Tuple[Optional[FetchResult], Optional[str], List[str]]:
+        """Race strategies, starting the next one whenever the running ones stall.
+        
+        The next strategy starts as soon as a running one fails or after
+        hedge_delay seconds without an answer. The first non-empty frame wins,
+        except that a result for a different listing (e.g. a .TO variant or
+        proxy) is only accepted once every higher-priority strategy for other
+        listings has finished without data, so hedging never picks a different
+        security than sequential mode would.
+        
+        Returns:
+            Tuple of (result, successful strategy name, failed strategy names)
+        """
+        order = {name: i for i, (name, _) in enumerate(strategies)}
+        symbols = [self._strategy_symbol(name) for name, _ in strategies]
+        finished_empty: set = set()
+        failed_strategies: List[str] = []
+        candidates: Dict[int, FetchResult] = {}
+        pending: Dict[Any, str] = {}
+        next_index = 0
+        
+        def accept(index: int) -> bool:
+            return all(
+                j in finished_empty
+                for j in range(index)
+                if symbols[j] != symbols[index]
+            )
+        
+        executor = ThreadPoolExecutor(max_workers=len(strategies), thread_name_prefix=f"fetch-{ticker}")
+        launch_next = True
+        try:
+            while True:
+                if launch_next and next_index < len(strategies):
+                    name, fetch_func = strategies[next_index]
+                    pending[executor.submit(fetch_func)] = name
+                    next_index += 1
+                
+                if not pending:
+                    break
+                
+                # Wait for an answer, or only hedge_delay if another strategy can still be started
+                can_hedge = next_index < len(strategies) and not candidates
+                done, _ = wait(list(pending), timeout=hedge_delay if can_hedge else None,
+                               return_when=FIRST_COMPLETED)
+                
+                for future in done:
+                    name = pending.pop(future)
+                    index = order[name]
+                    try:
+                        result = future.result()
+                        if result.df.empty:
+                            finished_empty.add(index)
+                        else:
+                            candidates[index] = result
+                    except Exception:
+                        finished_empty.add(index)
+                        failed_strategies.append(name)
+                
+                # Take the best-priority candidate that no running strategy can outrank
+                for index in sorted(candidates):
+                    if accept(index):
+                        winner = strategies[index][0]
+                        if pending:
+                            logger.debug(f"{ticker}: hedged fetch won by {winner}, abandoning {', '.join(pending.values())}")
+                        return candidates[index], winner, failed_strategies
+                
+                # Start another strategy when the running ones stalled or came back empty,
+                # but not while a candidate is only waiting on higher-priority strategies
+                launch_next = not candidates
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        return None, None, failed_strategies
+    
     def _weekend_safe_range(
         self,
         period: str,
@@ -859,92 +1052,53 @@ class MarketDataFetcher:
         if self.cache and not result.df.empty:
             self.cache.cache_price_data(ticker, result.df, result.source)
     
-    def _normalize_ticker_in_csvs(self, original_ticker: str, successful_strategy: str) -> None:
-        """Update CSVs to use canonical ticker format when we discover the correct suffix.
+    def _resolution_conflicts(self, ticker: str, resolution, is_likely_canadian: bool) -> bool:
+        """Whether a stored resolution points at the wrong listing for this holding.
+        
+        A CAD holding must not reuse a bare or US listing recorded for another
+        fund, and a known USD holding must not reuse a Canadian listing.
         
         Args:
-            original_ticker: The ticker as it appears in CSV (e.g., 'CGL')
-            successful_strategy: The strategy that worked (e.g., 'yahoo-ca-to')
+            ticker: The ticker as requested
+            resolution: Stored TickerResolution for the ticker
+            is_likely_canadian: Whether portfolio/fundamentals data mark it Canadian
         """
-        # Determine the canonical ticker format based on successful strategy
-        canonical_ticker = None
+        if is_likely_canadian:
+            return resolution.currency != 'CAD'
+        if self._portfolio_currency_cache.get(ticker.upper()) == 'USD':
+            return resolution.currency == 'CAD'
+        return False
+    
+    def _record_resolution(self, ticker: str, symbol: str, successful_strategy: str) -> None:
+        """Store the listing and strategy that returned data for a ticker.
         
-        if successful_strategy == 'yahoo-ca-to':
-            canonical_ticker = f"{original_ticker}.TO"
-        elif successful_strategy == 'yahoo-ca-v':
-            canonical_ticker = f"{original_ticker}.V"
-        else:
-            # No normalization needed for other strategies
-            return
+        A success through a suffix variant (e.g. 'yahoo-ca-to' for CGL) resolves
+        the ticker to that listing (CGL.TO), so later fetches use it directly.
+        The CSVs keep the raw ticker; the index maps it to the listing.
         
-        if canonical_ticker == original_ticker:
-            # Already in canonical format
-            return
+        Args:
+            ticker: The ticker as requested (e.g., 'CGL')
+            symbol: The listing that was fetched (resolved symbol or the ticker)
+            successful_strategy: The strategy that worked (e.g., 'yahoo-ca-to')
+        """
+        suffix = self._strategy_symbol(successful_strategy)
+        source = successful_strategy
+        if suffix in ('.TO', '.V'):
+            # On the resolved listing this is a plain Yahoo fetch
+            symbol = f"{ticker}{suffix}"
+            source = 'yahoo'
+            logger.info(f"Resolved ticker {ticker} -> {symbol}")
+        
+        # Suffixed listings imply CAD; a bare listing is only known to trade in USD
+        # if the portfolio says so (CAD holdings may be fetched from a US listing)
+        currency = None
+        if symbol == ticker and self._portfolio_currency_cache.get(ticker.upper()) == 'USD':
+            currency = 'USD'
         
         try:
-            import pandas as pd
-            import glob
-            from datetime import datetime
-            import shutil
-            
-            logger.info(f"Normalizing ticker {original_ticker} -> {canonical_ticker} in CSV files")
-            
-            # Update portfolio files
-            portfolio_files = glob.glob('trading_data/funds/*/llm_portfolio_update.csv')
-            for file_path in portfolio_files:
-                try:
-                    df = pd.read_csv(file_path)
-                    if 'Ticker' in df.columns:
-                        # Check if this ticker needs updating
-                        ticker_mask = df['Ticker'] == original_ticker
-                        if ticker_mask.any():
-                            # Create backup
-                            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                            backup_file = f"{file_path}.backup_normalize_{timestamp}"
-                            shutil.copy2(file_path, backup_file)
-                            
-                            # Update ticker format
-                            df.loc[ticker_mask, 'Ticker'] = canonical_ticker
-                            
-                            # Save updated file
-                            df.to_csv(file_path, index=False)
-                            logger.debug(f"Updated {ticker_mask.sum()} entries in {file_path}")
-                            
-                            # Update currency cache with canonical format
-                            currency = self._portfolio_currency_cache.get(original_ticker)
-                            if currency:
-                                self._portfolio_currency_cache[canonical_ticker] = currency
-                                logger.debug(f"Updated currency cache: {canonical_ticker} -> {currency}")
-                            
-                except Exception as e:
-                    logger.warning(f"Failed to normalize ticker in portfolio {file_path}: {e}")
-            
-            # Update trade log files
-            trade_log_files = glob.glob('trading_data/funds/*/llm_trade_log.csv')
-            for file_path in trade_log_files:
-                try:
-                    df = pd.read_csv(file_path)
-                    if 'Ticker' in df.columns:
-                        # Check if this ticker needs updating
-                        ticker_mask = df['Ticker'] == original_ticker
-                        if ticker_mask.any():
-                            # Create backup
-                            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                            backup_file = f"{file_path}.backup_normalize_{timestamp}"
-                            shutil.copy2(file_path, backup_file)
-                            
-                            # Update ticker format
-                            df.loc[ticker_mask, 'Ticker'] = canonical_ticker
-                            
-                            # Save updated file
-                            df.to_csv(file_path, index=False)
-                            logger.debug(f"Updated {ticker_mask.sum()} entries in trade log {file_path}")
-                            
-                except Exception as e:
-                    logger.warning(f"Failed to normalize ticker in trade log {file_path}: {e}")
-            
+            self.resolution_index.record(ticker, symbol=symbol, currency=currency, source=source)
         except Exception as e:
-            logger.error(f"Failed to normalize ticker {original_ticker} -> {canonical_ticker}: {e}")
+            logger.warning(f"Failed to record resolution for {ticker}: {e}")
     
     # -------------------- Fundamentals cache persistence --------------------
     def _get_fund_cache_path(self) -> Optional[Path]:
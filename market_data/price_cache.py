@@ -5,11 +5,18 @@ This module provides the PriceCache class for caching market data in memory
 with optional persistence to disk. Designed to support both current CSV-based
 storage and future database backends, with cache invalidation strategies
 suitable for real-time price updates in web dashboards.
+
+Price data is persisted per ticker in a columnar store (see price_store.py)
+and loaded lazily on first access; the legacy pickled blob is migrated on
+the next save.
 """
 
+import functools
 import json
 import logging
 import pickle
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, Optional, Tuple, Union
@@ -17,23 +24,39 @@ from typing import Any, Dict, Optional, Tuple, Union
 import pandas as pd
 
 from config.settings import Settings
+from market_data.price_store import ColumnarPriceStore
+from market_data.ticker_resolution import TickerResolutionIndex, get_resolution_index
 
 logger = logging.getLogger(__name__)
 
 
+def _synchronized(method):
+    """Run a PriceCache method while holding the instance lock."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
 class PriceCache:
     """
     In-memory price cache with persistence and invalidation strategies.
     
     Provides fast access to recently fetched price data while supporting
     both current CSV storage and future database/real-time scenarios.
+    
+    Entries are kept in an OrderedDict in least- to most-recently-used order,
+    so hits, inserts and evictions are O(1). All public methods hold a
+    re-entrant lock, making one instance safe to share between threads.
     """
     
     def __init__(
         self, 
         settings: Optional[Settings] = None,
         max_cache_size: int = 1000,
-        default_ttl_minutes: int = 15
+        default_ttl_minutes: int = 15,
+        resolution_index: Optional[TickerResolutionIndex] = None
     ):
         """
         Initialize the price cache.
@@ -42,24 +65,40 @@ class PriceCache:
             settings: Optional settings instance for configuration
             max_cache_size: Maximum number of ticker entries to cache
             default_ttl_minutes: Default time-to-live for cache entries in minutes
+            resolution_index: Optional ticker resolution index (defaults to the shared one)
         """
         self.settings = settings or Settings()
         self.max_cache_size = max_cache_size
         self.default_ttl = timedelta(minutes=default_ttl_minutes)
         
-        # Cache structure: {ticker: CacheEntry}
-        self._cache: Dict[str, 'CacheEntry'] = {}
-        self._access_order: list = []  # For LRU eviction
+        # Guards all cache state; re-entrant because public methods call each other
+        self._lock = threading.RLock()
+        
+        # Cache structure: {ticker: CacheEntry}, ordered least to most recently used
+        self._cache: 'OrderedDict[str, CacheEntry]' = OrderedDict()
+        
+        # Counters reported by get_cache_stats()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
         
         # Company name cache (from original script)
         self._company_name_cache: Dict[str, str] = {}
         
-        # Ticker correction cache (from original script)
-        self._ticker_correction_cache: Dict[str, str] = {}
+        # Ticker corrections live in the shared resolution index
+        self._resolution_index = resolution_index if resolution_index is not None else get_resolution_index()
+        
+        # Columnar on-disk store; tickers are loaded from it on first access
+        self._store: Optional[ColumnarPriceStore] = None
+        # Tickers cached since the last save_persistent_cache()
+        self._dirty: set = set()
+        # Legacy pickle to delete once its entries are saved to the store
+        self._legacy_cache_file: Optional[Path] = None
         
         # Load persistent cache if available
         self._load_persistent_cache()
     
+    @_synchronized
     def get_cached_price(
         self, 
         ticker: str, 
@@ -79,40 +118,50 @@ class PriceCache:
         """
         ticker = ticker.upper().strip()
         
-        if ticker not in self._cache:
-            return None
-        
-        entry = self._cache[ticker]
+        entry = self._cache.get(ticker)
+        if entry is None:
+            entry = self._load_from_store(ticker)
+            if entry is None:
+                self._misses += 1
+                return None
         
         # Check if cache entry is still valid
         if self._is_expired(entry):
             self._remove_from_cache(ticker)
+            if self._store is not None:
+                self._store.remove(ticker)
+            self._misses += 1
             return None
         
         # Update access order for LRU
         self._update_access_order(ticker)
         
-        # Filter data by date range if specified
-        df = entry.data.copy()
+        # Slice the sorted index by date range, copying only the selected rows
+        data = entry.data
+        start_pos, end_pos = 0, len(data)
         if start_date:
             start_ts = pd.Timestamp(start_date)
             # Make timezone-aware if the index is timezone-aware
-            if df.index.tz is not None and start_ts.tz is None:
-                start_ts = start_ts.tz_localize(df.index.tz)
-            df = df[df.index >= start_ts]
+            if data.index.tz is not None and start_ts.tz is None:
+                start_ts = start_ts.tz_localize(data.index.tz)
+            start_pos = data.index.searchsorted(start_ts, side='left')
         if end_date:
             end_ts = pd.Timestamp(end_date)
             # Make timezone-aware if the index is timezone-aware
-            if df.index.tz is not None and end_ts.tz is None:
-                end_ts = end_ts.tz_localize(df.index.tz)
-            df = df[df.index <= end_ts]
+            if data.index.tz is not None and end_ts.tz is None:
+                end_ts = end_ts.tz_localize(data.index.tz)
+            end_pos = data.index.searchsorted(end_ts, side='right')
         
-        if df.empty:
+        if start_pos >= end_pos:
+            self._misses += 1
             return None
+        df = data.iloc[start_pos:end_pos].copy()
+        self._hits += 1
         
         logger.debug(f"Cache hit for {ticker} ({len(df)} rows)")
         return df
     
+    @_synchronized
     def cache_price_data(
         self, 
         ticker: str, 
@@ -135,10 +184,13 @@ class PriceCache:
         ticker = ticker.upper().strip()
         ttl = timedelta(minutes=ttl_minutes) if ttl_minutes else self.default_ttl
         
+        # Keep data sorted so range lookups can binary-search the index
+        data = data.copy() if data.index.is_monotonic_increasing else data.sort_index()
+        
         # Create cache entry
         entry = CacheEntry(
             ticker=ticker,
-            data=data.copy(),
+            data=data,
             source=source,
             timestamp=datetime.now(),
             ttl=ttl
@@ -146,6 +198,7 @@ class PriceCache:
         
         # Add to cache
         self._cache[ticker] = entry
+        self._dirty.add(ticker)
         self._update_access_order(ticker)
         
         # Enforce cache size limit
@@ -153,6 +206,7 @@ class PriceCache:
         
         logger.debug(f"Cached {len(data)} rows for {ticker} from {source}")
     
+    @_synchronized
     def invalidate_ticker(self, ticker: str) -> None:
         """
         Invalidate cache entry for a specific ticker.
@@ -161,16 +215,22 @@ class PriceCache:
             ticker: Stock ticker symbol to invalidate
         """
         ticker = ticker.upper().strip()
+        if self._store is not None:
+            self._store.remove(ticker)
         if ticker in self._cache:
             self._remove_from_cache(ticker)
             logger.debug(f"Invalidated cache for {ticker}")
     
+    @_synchronized
     def invalidate_all(self) -> None:
         """Invalidate all cache entries."""
         self._cache.clear()
-        self._access_order.clear()
+        self._dirty.clear()
+        if self._store is not None:
+            self._store.clear()
         logger.debug("Invalidated entire price cache")
     
+    @_synchronized
     def invalidate_expired(self) -> int:
         """
         Remove expired cache entries.
@@ -180,18 +240,23 @@ class PriceCache:
         """
         expired_tickers = []
         
-        for ticker, entry in self._cache.items():
+        for ticker, entry in list(self._cache.items()):
             if self._is_expired(entry):
                 expired_tickers.append(ticker)
         
         for ticker in expired_tickers:
             self._remove_from_cache(ticker)
         
-        if expired_tickers:
-            logger.debug(f"Removed {len(expired_tickers)} expired cache entries")
+        removed = len(expired_tickers)
+        if self._store is not None:
+            removed += self._store.remove_expired()
+        
+        if removed:
+            logger.debug(f"Removed {removed} expired cache entries")
         
-        return len(expired_tickers)
+        return removed
     
+    @_synchronized
     def get_cache_stats(self) -> Dict[str, Any]:
         """
         Get cache statistics.
@@ -199,6 +264,7 @@ class PriceCache:
         Returns:
             Dictionary with cache statistics
         """
+        lookups = self._hits + self._misses
         total_entries = len(self._cache)
         total_rows = sum(len(entry.data) for entry in self._cache.values())
         
@@ -219,13 +285,19 @@ class PriceCache:
             "total_entries": total_entries,
             "total_rows": total_rows,
             "max_cache_size": self.max_cache_size,
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "hit_rate": self._hits / lookups if lookups else 0.0,
+            "persisted_entries": len(self._store.index) if self._store is not None else 0,
             "sources": sources,
             "oldest_entry": oldest,
             "newest_entry": newest,
             "company_names_cached": len(self._company_name_cache),
-            "ticker_corrections_cached": len(self._ticker_correction_cache)
+            "ticker_corrections_cached": len(self._resolution_index)
         }
     
+    @_synchronized
     def get_company_name(self, ticker: str) -> Optional[str]:
         """
         Get cached company name for a ticker.
@@ -239,6 +311,7 @@ class PriceCache:
         ticker = ticker.upper().strip()
         return self._company_name_cache.get(ticker)
     
+    @_synchronized
     def cache_company_name(self, ticker: str, name: str) -> None:
         """
         Cache company name for a ticker.
@@ -250,6 +323,7 @@ class PriceCache:
         ticker = ticker.upper().strip()
         self._company_name_cache[ticker] = name
     
+    @_synchronized
     def clear_company_name_cache(self, ticker: str) -> None:
         """
         Clear cached company name for a ticker.
@@ -261,51 +335,66 @@ class PriceCache:
         if ticker in self._company_name_cache:
             del self._company_name_cache[ticker]
     
+    @_synchronized
     def get_ticker_correction(self, ticker: str) -> Optional[str]:
         """
-        Get cached ticker correction.
+        Get cached ticker correction from the resolution index.
         
         Args:
             ticker: Original ticker symbol
             
         Returns:
-            Corrected ticker if cached, None otherwise
+            Canonical ticker if resolved, None otherwise
         """
-        ticker = ticker.upper().strip()
-        return self._ticker_correction_cache.get(ticker)
+        resolution = self._resolution_index.get(ticker)
+        return resolution.symbol if resolution else None
     
+    @_synchronized
     def cache_ticker_correction(self, original: str, corrected: str) -> None:
         """
-        Cache ticker correction.
+        Cache ticker correction in the resolution index.
         
         Args:
             original: Original ticker symbol
             corrected: Corrected ticker symbol
         """
-        original = original.upper().strip()
-        corrected = corrected.upper().strip()
-        self._ticker_correction_cache[original] = corrected
+        self._resolution_index.record(original, symbol=corrected)
     
+    @_synchronized
     def save_persistent_cache(self) -> None:
-        """Save cache to disk for persistence across sessions."""
+        """Save cache to disk for persistence across sessions.
+        
+        Only tickers cached since the last save are written, each to its own
+        columnar files; unchanged tickers are not touched.
+        """
         try:
             cache_dir = Path(self.settings.get_data_directory()) / ".cache"
             cache_dir.mkdir(exist_ok=True)
             
-            # Save price cache (using pickle for DataFrame support)
-            price_cache_file = cache_dir / "price_cache.pkl"
-            with open(price_cache_file, 'wb') as f:
-                pickle.dump({
-                    'cache': self._cache,
-                    'access_order': self._access_order
-                }, f)
+            # Save price data for tickers changed since the last save
+            if self._store is None:
+                self._store = ColumnarPriceStore(cache_dir / "prices")
+            dirty = [ticker for ticker in self._dirty if ticker in self._cache]
+            for ticker in dirty:
+                entry = self._cache[ticker]
+                try:
+                    self._store.write(ticker, entry.data, entry.source, entry.timestamp, entry.ttl)
+                except Exception as e:
+                    logger.warning(f"Failed to persist price data for {ticker}: {e}")
+            if dirty or self._legacy_cache_file is not None:
+                self._store.save_index()
+            self._dirty.clear()
+            
+            if self._legacy_cache_file is not None:
+                self._legacy_cache_file.unlink(missing_ok=True)
+                self._legacy_cache_file = None
+                logger.info("Migrated legacy price_cache.pkl to columnar price store")
             
             # Save name caches (using JSON for readability)
             name_cache_file = cache_dir / "name_cache.json"
             with open(name_cache_file, 'w') as f:
                 json.dump({
-                    'company_names': self._company_name_cache,
-                    'ticker_corrections': self._ticker_correction_cache
+                    'company_names': self._company_name_cache
                 }, f, indent=2)
             
             logger.debug("Saved persistent cache to disk")
@@ -314,17 +403,30 @@ class PriceCache:
             logger.warning(f"Failed to save persistent cache: {e}")
     
     def _load_persistent_cache(self) -> None:
-        """Load cache from disk if available."""
+        """Open the persistent cache.
+        
+        Only the small price store index and the name caches are read here;
+        price data is loaded per ticker on first access.
+        """
         try:
             cache_dir = Path(self.settings.get_data_directory()) / ".cache"
+            self._store = ColumnarPriceStore(cache_dir / "prices")
             
-            # Load price cache
+            # Migrate the legacy pickled blob; entries are written to the store on next save
             price_cache_file = cache_dir / "price_cache.pkl"
             if price_cache_file.exists():
                 with open(price_cache_file, 'rb') as f:
                     data = pickle.load(f)
-                    self._cache = data.get('cache', {})
-                    self._access_order = data.get('access_order', [])
+                    entries = data.get('cache', {})
+                    # Restore LRU order from the legacy access list
+                    order = [t for t in data.get('access_order', []) if t in entries]
+                    order += [t for t in entries if t not in order]
+                    self._cache = OrderedDict((t, entries[t]) for t in order)
+                for entry in self._cache.values():
+                    if not entry.data.index.is_monotonic_increasing:
+                        entry.data = entry.data.sort_index()
+                self._dirty.update(self._cache.keys())
+                self._legacy_cache_file = price_cache_file
                 
                 # Remove expired entries
                 self.invalidate_expired()
@@ -335,7 +437,7 @@ class PriceCache:
                 with open(name_cache_file, 'r') as f:
                     data = json.load(f)
                     self._company_name_cache = data.get('company_names', {})
-                    self._ticker_correction_cache = data.get('ticker_corrections', {})
+                    self._migrate_ticker_corrections(data.get('ticker_corrections', {}))
             
             if self._cache:
                 logger.debug(f"Loaded persistent cache with {len(self._cache)} entries")
@@ -344,36 +446,75 @@ class PriceCache:
             logger.warning(f"Failed to load persistent cache: {e}")
             # Reset caches on load failure
             self._cache.clear()
-            self._access_order.clear()
+            self._dirty.clear()
             self._company_name_cache.clear()
-            self._ticker_correction_cache.clear()
+    
+    def _migrate_ticker_corrections(self, corrections: Dict[str, str]) -> None:
+        """Move corrections from the legacy name cache into the resolution index.
+        
+        Existing resolutions win; the corrections are dropped from
+        name_cache.json on the next save.
+        """
+        migrated = 0
+        for original, corrected in corrections.items():
+            if self._resolution_index.get(original) is None:
+                self._resolution_index.record(original, symbol=corrected, save=False)
+                migrated += 1
+        if migrated:
+            self._resolution_index.save()
+            logger.info(f"Migrated {migrated} ticker corrections to the resolution index")
+    
+    def _load_from_store(self, ticker: str) -> Optional['CacheEntry']:
+        """Load a ticker from the columnar store into memory.
+        
+        Args:
+            ticker: Normalized ticker symbol
+            
+        Returns:
+            CacheEntry if the ticker is persisted and readable, None otherwise
+        """
+        if self._store is None:
+            return None
+        
+        metadata = self._store.get_metadata(ticker)
+        if metadata is None:
+            return None
+        
+        source, cached_at, ttl = metadata
+        if datetime.now() - cached_at > ttl:
+            self._store.remove(ticker)
+            return None
+        
+        data = self._store.read(ticker)
+        if data is None or data.empty:
+            return None
+        
+        entry = CacheEntry(ticker=ticker, data=data, source=source, timestamp=cached_at, ttl=ttl)
+        self._cache[ticker] = entry
+        self._update_access_order(ticker)
+        self._enforce_cache_limit()
+        logger.debug(f"Loaded {len(data)} rows for {ticker} from persistent cache")
+        return entry
     
     def _is_expired(self, entry: 'CacheEntry') -> bool:
         """Check if a cache entry is expired."""
         return datetime.now() - entry.timestamp > entry.ttl
     
     def _update_access_order(self, ticker: str) -> None:
-        """Update LRU access order for a ticker."""
-        if ticker in self._access_order:
-            self._access_order.remove(ticker)
-        self._access_order.append(ticker)
+        """Mark a ticker as most recently used."""
+        if ticker in self._cache:
+            self._cache.move_to_end(ticker)
     
     def _remove_from_cache(self, ticker: str) -> None:
-        """Remove a ticker from cache and access order."""
-        if ticker in self._cache:
-            del self._cache[ticker]
-        if ticker in self._access_order:
-            self._access_order.remove(ticker)
+        """Remove a ticker from the in-memory cache."""
+        self._cache.pop(ticker, None)
     
     def _enforce_cache_limit(self) -> None:
         """Enforce maximum cache size using LRU eviction."""
         while len(self._cache) > self.max_cache_size:
-            if not self._access_order:
-                break
-            
             # Remove least recently used entry
-            lru_ticker = self._access_order[0]
-            self._remove_from_cache(lru_ticker)
+            lru_ticker, _ = self._cache.popitem(last=False)
+            self._evictions += 1
             logger.debug(f"Evicted {lru_ticker} from cache (LRU)")
 
 
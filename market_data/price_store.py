@@ -0,0 +1,323 @@
+"""
+Columnar on-disk storage for cached price data.
+
+This module provides the ColumnarPriceStore class used by PriceCache for
+persistence. Each ticker's bars are stored as Parquet segment files in their
+own directory, described by a small JSON index. Tickers are read lazily and
+independently, new bars are appended as new segments instead of rewriting
+the whole cache, and date-range reads are pushed down to the Parquet reader.
+A corrupt segment only loses the ticker it belongs to.
+"""
+
+import json
+import logging
+import os
+import shutil
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+from urllib.parse import quote
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "index.json"
+INDEX_VERSION = 1
+DATE_COLUMN = "__date__"
+
+
+def _atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Write a file via a temporary sibling and an atomic rename."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class ColumnarPriceStore:
+    """
+    Per-ticker Parquet segment store with a JSON index.
+
+    Layout::
+
+        <directory>/index.json           {ticker: metadata}
+        <directory>/<TICKER>/part-00001.parquet
+        <directory>/<TICKER>/part-00002.parquet   (appended bars)
+
+    Segments are read in order and later segments win for duplicate
+    timestamps, so re-fetched bars (e.g. today's intraday close) are appended
+    rather than rewritten. Once a ticker has more than ``max_segments``
+    segments it is compacted into a single file.
+    """
+
+    def __init__(self, directory: Union[str, Path], max_segments: int = 8):
+        """
+        Initialize the store.
+
+        Args:
+            directory: Directory holding the index and per-ticker segments
+            max_segments: Segment count that triggers compaction of a ticker
+        """
+        self.directory = Path(directory)
+        self.max_segments = max_segments
+        self._index: Optional[Dict[str, Dict[str, Any]]] = None
+
+    @property
+    def index(self) -> Dict[str, Dict[str, Any]]:
+        """Ticker metadata, loaded from disk on first use."""
+        if self._index is None:
+            self._index = self._load_index()
+        return self._index
+
+    def tickers(self) -> List[str]:
+        """Get all tickers with persisted data."""
+        return list(self.index.keys())
+
+    def get_metadata(self, ticker: str) -> Optional[Tuple[str, datetime, timedelta]]:
+        """
+        Get cache metadata for a ticker without reading its bars.
+
+        Args:
+            ticker: Stock ticker symbol
+
+        Returns:
+            Tuple of (source, cached_at, ttl), or None if not stored
+        """
+        meta = self.index.get(ticker)
+        if not meta:
+            return None
+        return (
+            meta.get('source', 'unknown'),
+            datetime.fromisoformat(meta['cached_at']),
+            timedelta(seconds=meta['ttl_seconds'])
+        )
+
+    def read(
+        self,
+        ticker: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> Optional[pd.DataFrame]:
+        """
+        Read a ticker's bars, optionally restricted to [start, end].
+
+        Only rows inside the range are materialized. Unreadable segments drop
+        the ticker from the store.
+
+        Args:
+            ticker: Stock ticker symbol
+            start: Optional start of range (inclusive)
+            end: Optional end of range (inclusive)
+
+        Returns:
+            DataFrame indexed by date, or None if not stored or unreadable
+        """
+        meta = self.index.get(ticker)
+        if not meta:
+            return None
+
+        filters = []
+        tz = meta.get('tz')
+        if start is not None:
+            filters.append((DATE_COLUMN, '>=', self._align_timestamp(start, tz)))
+        if end is not None:
+            filters.append((DATE_COLUMN, '<=', self._align_timestamp(end, tz)))
+
+        try:
+            frames = []
+            ticker_dir = self._ticker_dir(ticker)
+            for segment in meta['segments']:
+                table = pq.read_table(ticker_dir / segment, filters=filters or None)
+                frames.append(table.to_pandas())
+        except Exception as e:
+            logger.warning(f"Dropping unreadable price data for {ticker}: {e}")
+            self.remove(ticker)
+            return None
+
+        df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+        df = df.set_index(DATE_COLUMN)
+        df.index.name = meta.get('index_name')
+        if len(frames) > 1:
+            df = df[~df.index.duplicated(keep='last')].sort_index()
+        return df
+
+    def write(
+        self,
+        ticker: str,
+        data: pd.DataFrame,
+        source: str,
+        cached_at: datetime,
+        ttl: timedelta
+    ) -> None:
+        """
+        Persist bars for a ticker, appending where possible.
+
+        Bars before the stored range or at/after its last timestamp are
+        appended as a new segment; bars strictly inside the stored range are
+        assumed unchanged. Incompatible data (different timezone or columns)
+        replaces the ticker's segments. Call save_index() after a batch of
+        writes.
+
+        Args:
+            ticker: Stock ticker symbol
+            data: Price DataFrame indexed by date
+            source: Data source identifier
+            cached_at: When the data was fetched
+            ttl: Time-to-live of the data
+        """
+        if data.empty:
+            return
+
+        if not data.index.is_monotonic_increasing:
+            data = data.sort_index()
+
+        meta = self.index.get(ticker)
+        tz = str(data.index.tz) if getattr(data.index, 'tz', None) is not None else None
+        columns = [str(c) for c in data.columns]
+
+        rows = data
+        replace = meta is None or meta.get('tz') != tz or meta.get('columns') != columns
+        if not replace:
+            try:
+                first = pd.Timestamp(meta['first'])
+                last = pd.Timestamp(meta['last'])
+                rows = data[(data.index < first) | (data.index >= last)]
+            except (TypeError, ValueError):
+                replace = True
+                rows = data
+
+        ticker_dir = self._ticker_dir(ticker)
+        ticker_dir.mkdir(parents=True, exist_ok=True)
+
+        segments = [] if replace else list(meta['segments'])
+        replaced_segments = list(meta['segments']) if replace and meta else []
+
+        next_segment = (meta or {}).get('next_segment', 1)
+        if not rows.empty:
+            segments.append(self._write_segment(ticker_dir, next_segment, rows))
+            next_segment += 1
+
+        first_ts = data.index[0] if replace else min(pd.Timestamp(meta['first']), data.index[0])
+        last_ts = data.index[-1] if replace else max(pd.Timestamp(meta['last']), data.index[-1])
+
+        self.index[ticker] = {
+            'source': source,
+            'cached_at': cached_at.isoformat(),
+            'ttl_seconds': ttl.total_seconds(),
+            'tz': tz,
+            'columns': columns,
+            'index_name': data.index.name,
+            'first': pd.Timestamp(first_ts).isoformat(),
+            'last': pd.Timestamp(last_ts).isoformat(),
+            'segments': segments,
+            'next_segment': next_segment
+        }
+
+        for segment in replaced_segments:
+            (ticker_dir / segment).unlink(missing_ok=True)
+
+        if len(segments) > self.max_segments:
+            self.compact(ticker)
+
+    def compact(self, ticker: str) -> None:
+        """Merge a ticker's segments into a single file."""
+        meta = self.index.get(ticker)
+        if not meta or len(meta['segments']) <= 1:
+            return
+
+        df = self.read(ticker)
+        if df is None:
+            return
+
+        ticker_dir = self._ticker_dir(ticker)
+        old_segments = meta['segments']
+        meta['segments'] = [self._write_segment(ticker_dir, meta['next_segment'], df)]
+        meta['next_segment'] += 1
+        for segment in old_segments:
+            (ticker_dir / segment).unlink(missing_ok=True)
+        logger.debug(f"Compacted {len(old_segments)} price segments for {ticker}")
+
+    def remove(self, ticker: str) -> None:
+        """Remove a ticker's bars and metadata."""
+        if self.index.pop(ticker, None) is not None:
+            shutil.rmtree(self._ticker_dir(ticker), ignore_errors=True)
+            self.save_index()
+
+    def remove_expired(self, now: Optional[datetime] = None) -> int:
+        """
+        Remove tickers whose TTL has elapsed.
+
+        Returns:
+            Number of tickers removed
+        """
+        now = now or datetime.now()
+        expired = []
+        for ticker in self.index:
+            _, cached_at, ttl = self.get_metadata(ticker)
+            if now - cached_at > ttl:
+                expired.append(ticker)
+
+        for ticker in expired:
+            self.index.pop(ticker, None)
+            shutil.rmtree(self._ticker_dir(ticker), ignore_errors=True)
+        if expired:
+            self.save_index()
+        return len(expired)
+
+    def clear(self) -> None:
+        """Remove all persisted price data."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self._index = {}
+
+    def save_index(self) -> None:
+        """Atomically write the index file."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        payload = json.dumps({'version': INDEX_VERSION, 'tickers': self.index}, indent=2)
+        _atomic_write_bytes(self.directory / INDEX_FILE, payload.encode('utf-8'))
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        """Load the index file, returning an empty index if missing or invalid."""
+        index_file = self.directory / INDEX_FILE
+        if not index_file.exists():
+            return {}
+        try:
+            with open(index_file, 'r') as f:
+                data = json.load(f)
+            if data.get('version') != INDEX_VERSION:
+                logger.warning(f"Ignoring price store index with version {data.get('version')}")
+                return {}
+            return data.get('tickers', {})
+        except Exception as e:
+            logger.warning(f"Failed to load price store index: {e}")
+            return {}
+
+    def _ticker_dir(self, ticker: str) -> Path:
+        """Directory for a ticker (symbols like ^GSPC are percent-encoded)."""
+        return self.directory / quote(ticker, safe='')
+
+    @staticmethod
+    def _write_segment(ticker_dir: Path, number: int, data: pd.DataFrame) -> str:
+        """Write bars to a new Parquet segment and return its file name."""
+        frame = data.copy()
+        frame.columns = [str(c) for c in frame.columns]
+        frame.index.name = DATE_COLUMN
+        table = pa.Table.from_pandas(frame.reset_index(), preserve_index=False)
+
+        segment = f"part-{number:05d}.parquet"
+        tmp_path = ticker_dir / (segment + ".tmp")
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, ticker_dir / segment)
+        return segment
+
+    @staticmethod
+    def _align_timestamp(value: datetime, tz: Optional[str]) -> pd.Timestamp:
+        """Match a range bound to the stored index timezone."""
+        ts = pd.Timestamp(value)
+        if tz is not None and ts.tz is None:
+            return ts.tz_localize(tz)
+        if tz is None and ts.tz is not None:
+            return ts.tz_localize(None)
+        return ts
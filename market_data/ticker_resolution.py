@@ -0,0 +1,230 @@
+"""
+Persistent per-ticker resolution index.
+
+This module provides the TickerResolutionIndex class, which remembers how a
+raw ticker from trades or user input resolves to a tradable listing: the
+canonical symbol (e.g. CGL -> CGL.TO), its exchange, its currency and the
+data source strategy that last returned prices for it. Once a ticker is
+resolved, fetchers and lookups use the stored listing directly instead of
+re-probing .TO/.V variants on every cold start.
+
+The index is a small JSON file shared by MarketDataFetcher, PriceCache and
+the ticker utilities. Writes are atomic and only happen when an entry
+actually changes.
+"""
+
+import json
+import logging
+import os
+import threading
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+RESOLUTION_FILE = "ticker_resolution.json"
+INDEX_VERSION = 1
+
+# Suffix -> (exchange, currency) for listings we can resolve without a lookup
+SUFFIX_LISTINGS = {
+    '.TO': ('TSX', 'CAD'),
+    '.V': ('TSXV', 'CAD'),
+    '.CN': ('CSE', 'CAD'),
+    '.NE': ('NEO', 'CAD'),
+}
+
+
+@dataclass
+class TickerResolution:
+    """How a raw ticker resolves to a listing."""
+    ticker: str                      # Raw ticker as it appears in trades/CSVs
+    symbol: str                      # Canonical listing symbol (e.g. "CGL.TO")
+    exchange: Optional[str] = None   # "TSX", "NASDAQ", ...
+    currency: Optional[str] = None   # "CAD" | "USD" | ...
+    source: Optional[str] = None     # Fetch strategy that last returned data
+    updated_at: Optional[str] = None # ISO timestamp of the last change
+
+
+def listing_for_symbol(symbol: str) -> Optional[tuple]:
+    """Get (exchange, currency) implied by a symbol's exchange suffix, if any."""
+    for suffix, listing in SUFFIX_LISTINGS.items():
+        if symbol.endswith(suffix):
+            return listing
+    return None
+
+
+class TickerResolutionIndex:
+    """
+    Thread-safe, JSON-backed map of raw ticker -> TickerResolution.
+
+    Entries are keyed by the upper-cased raw ticker. A path of None keeps the
+    index in memory only (useful for tests and one-off scripts).
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = None):
+        """
+        Initialize the index.
+
+        Args:
+            path: JSON file holding the index, or None for an in-memory index
+        """
+        self.path = Path(path) if path is not None else None
+        self._lock = threading.RLock()
+        self._entries: Optional[Dict[str, TickerResolution]] = None
+
+    def get(self, ticker: str) -> Optional[TickerResolution]:
+        """
+        Get the stored resolution for a ticker.
+
+        Args:
+            ticker: Raw ticker symbol
+
+        Returns:
+            TickerResolution, or None if the ticker has not been resolved
+        """
+        with self._lock:
+            return self._load().get(ticker.upper().strip())
+
+    def resolve(self, ticker: str) -> str:
+        """Get the canonical symbol for a ticker, or the ticker itself if unresolved."""
+        resolution = self.get(ticker)
+        return resolution.symbol if resolution else ticker.upper().strip()
+
+    def record(
+        self,
+        ticker: str,
+        symbol: Optional[str] = None,
+        exchange: Optional[str] = None,
+        currency: Optional[str] = None,
+        source: Optional[str] = None,
+        save: bool = True
+    ) -> TickerResolution:
+        """
+        Create or update a ticker's resolution.
+
+        Fields passed as None keep their stored value. Exchange and currency
+        default to those implied by the symbol's suffix. The file is only
+        rewritten when something changed.
+
+        Args:
+            ticker: Raw ticker symbol
+            symbol: Canonical listing symbol (defaults to the stored one or the ticker)
+            exchange: Exchange of the listing
+            currency: Trading currency of the listing
+            source: Fetch strategy that returned data for the listing
+            save: Whether to persist the index immediately
+
+        Returns:
+            The updated TickerResolution
+        """
+        key = ticker.upper().strip()
+        with self._lock:
+            entries = self._load()
+            current = entries.get(key)
+            symbol = (symbol or (current.symbol if current else key)).upper().strip()
+
+            if current and current.symbol != symbol:
+                # A different listing invalidates what we knew about the old one
+                current = None
+            implied = listing_for_symbol(symbol) or (None, None)
+            updated = TickerResolution(
+                ticker=key,
+                symbol=symbol,
+                exchange=exchange or (current.exchange if current else None) or implied[0],
+                currency=(currency.upper() if currency else None)
+                or (current.currency if current else None) or implied[1],
+                source=source or (current.source if current else None),
+                updated_at=current.updated_at if current else None
+            )
+
+            if updated != current:
+                updated.updated_at = datetime.now().isoformat()
+                entries[key] = updated
+                if save:
+                    self.save()
+            return updated
+
+    def remove(self, ticker: str) -> None:
+        """Forget a ticker's resolution."""
+        with self._lock:
+            if self._load().pop(ticker.upper().strip(), None) is not None:
+                self.save()
+
+    def save(self) -> None:
+        """Atomically write the index file."""
+        if self.path is None:
+            return
+        with self._lock:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                payload = json.dumps({
+                    'version': INDEX_VERSION,
+                    'tickers': {key: asdict(entry) for key, entry in self._load().items()}
+                }, indent=2, sort_keys=True)
+                tmp_path = self.path.with_name(self.path.name + ".tmp")
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    f.write(payload)
+                os.replace(tmp_path, self.path)
+            except Exception as e:
+                logger.warning(f"Failed to save ticker resolution index: {e}")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._load())
+
+    def __contains__(self, ticker: str) -> bool:
+        return self.get(ticker) is not None
+
+    def _load(self) -> Dict[str, TickerResolution]:
+        """Load entries from disk on first use (caller holds the lock)."""
+        if self._entries is not None:
+            return self._entries
+
+        self._entries = {}
+        if self.path is None or not self.path.exists():
+            return self._entries
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != INDEX_VERSION:
+                logger.warning(f"Ignoring ticker resolution index with version {data.get('version')}")
+                return self._entries
+            for key, entry in data.get('tickers', {}).items():
+                self._entries[key] = TickerResolution(**entry)
+            logger.debug(f"Loaded {len(self._entries)} ticker resolutions from {self.path}")
+        except Exception as e:
+            logger.warning(f"Failed to load ticker resolution index: {e}")
+            self._entries = {}
+        return self._entries
+
+
+_indexes: Dict[Path, TickerResolutionIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def default_index_path() -> Path:
+    """Path of the shared index under the shared (cross-fund) data directory."""
+    from config.constants import SHARED_DATA_DIR
+    project_root = Path(__file__).resolve().parent.parent
+    return project_root / SHARED_DATA_DIR / ".cache" / RESOLUTION_FILE
+
+
+def get_resolution_index(path: Optional[Union[str, Path]] = None) -> TickerResolutionIndex:
+    """
+    Get the process-wide index for a path (the shared default if omitted).
+
+    Args:
+        path: Optional index file path
+
+    Returns:
+        TickerResolutionIndex shared by all callers using the same path
+    """
+    resolved = Path(path) if path is not None else default_index_path()
+    with _indexes_lock:
+        index = _indexes.get(resolved)
+        if index is None:
+            index = TickerResolutionIndex(resolved)
+            _indexes[resolved] = index
+        return index
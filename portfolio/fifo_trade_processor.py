@@ -294,70 +294,20 @@ class FIFOTradeProcessor:
     def _rebuild_snapshots_from_date(self, start_date) -> None:
         """Rebuild portfolio snapshots from a specific date onwards.
         
-        This method processes all trades from the start_date onwards and rebuilds
-        the portfolio snapshots to ensure they include the backdated trade.
+        Delegates to SnapshotRebuilder, which sweeps the trade history once and
+        bulk-saves one snapshot per trading day so the backdated trade is
+        reflected in every later snapshot. Prices already recorded in the
+        repository are preserved.
         
         Args:
             start_date: Date to start rebuilding from (inclusive)
         """
         try:
-            from datetime import datetime, timedelta
-            from portfolio.portfolio_manager import PortfolioManager
-            from portfolio.fund_manager import Fund
+            from portfolio.snapshot_rebuilder import SnapshotRebuilder
             
             logger.info(f"Rebuilding snapshots from {start_date} onwards...")
-            
-            # Get all trades from start_date onwards
-            end_date = datetime.now().date()
-            all_trades = self.repository.get_trade_history()
-            
-            # Filter trades from start_date onwards
-            relevant_trades = [
-                trade for trade in all_trades 
-                if trade.timestamp.date() >= start_date
-            ]
-            
-            if not relevant_trades:
-                logger.info("No trades found for rebuild period")
-                return
-            
-            logger.info(f"Found {len(relevant_trades)} trades to process")
-            
-            # Group trades by date
-            trades_by_date = {}
-            for trade in relevant_trades:
-                trade_date = trade.timestamp.date()
-                if trade_date not in trades_by_date:
-                    trades_by_date[trade_date] = []
-                trades_by_date[trade_date].append(trade)
-            
-            # Process each date and rebuild snapshots
-            for trade_date in sorted(trades_by_date.keys()):
-                logger.info(f"Rebuilding snapshot for {trade_date}")
-                
-                # Get all trades up to and including this date
-                trades_up_to_date = [
-                    trade for trade in all_trades 
-                    if trade.timestamp.date() <= trade_date
-                ]
-                
-                # Calculate positions for this date
-                positions = self._calculate_positions_from_trades(trades_up_to_date)
-                
-                # Create snapshot for this date
-                from data.models.portfolio import PortfolioSnapshot
-                snapshot_timestamp = datetime.combine(trade_date, datetime.min.time().replace(hour=16, minute=0))
-                
-                snapshot = PortfolioSnapshot(
-                    positions=positions,
-                    timestamp=snapshot_timestamp
-                )
-                
-                # Save the snapshot (this will replace any existing snapshot for this date)
-                self.repository.save_portfolio_snapshot(snapshot)
-                logger.info(f"Rebuilt snapshot for {trade_date} with {len(positions)} positions")
-            
-            logger.info("Historical snapshot rebuild completed successfully")
+            rebuilt = SnapshotRebuilder(self.repository).rebuild(start_date)
+            logger.info(f"Historical snapshot rebuild completed successfully ({rebuilt} snapshots)")
             
         except Exception as e:
             logger.error(f"Failed to rebuild snapshots from {start_date}: {e}")
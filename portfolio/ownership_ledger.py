@@ -0,0 +1,390 @@
+"""Contributor unit ledger.
+
+Vectorized NAV/unit accounting over a fund's contribution ledger, shared by
+PositionCalculator.calculate_ownership_percentages (CLI) and the dashboard's
+get_investor_allocations / get_user_investment_metrics.
+
+Contributions are parsed in bulk, joined to the historical fund value series
+by as-of date (``pd.merge_asof`` with a 7-day lookback), and every NAV input
+that doesn't depend on units outstanding (uninvested cash, time-weighted
+estimates, average cost) is computed column-wise. Units outstanding is a
+running quantity, so the units themselves are issued one trading day at a
+time: all contributions of a day share the start-of-day NAV and are issued
+in one array operation, and only the day's withdrawals (capped at what each
+contributor holds) are visited individually. Days without units outstanding
+at the start (inception) are walked row by row.
+
+The callers historically priced units slightly differently (whether the
+contribution date itself is looked up, how uninvested cash is counted, what
+happens without a fund value). Those differences are captured by NavRules
+presets so each caller keeps its results.
+
+This module only depends on pandas/numpy so the dashboard can import it
+without loading the rest of the trading system.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# NAV used when no fund value is found within the lookback
+AVERAGE_COST = 'average_cost'      # net contributions so far / units outstanding
+TIME_WEIGHTED = 'time_weighted'    # linear growth from 1.0 to today's NAV
+INCEPTION = 'inception'            # 1.0
+
+LOOKBACK_DAYS = 7
+
+
+@dataclass(frozen=True)
+class NavRules:
+    """How units are priced when contributions and withdrawals are booked.
+
+    Attributes:
+        same_day_value: Look up the fund value of the contribution date itself
+            before earlier days (otherwise only the previous days' closes)
+        cash_on_lookback: Add uninvested cash to values found on earlier days,
+            not only to values of the contribution date
+        clamp_cash: Uninvested cash (contributions before the day minus cost
+            basis) can't be negative
+        positive_values_only: Skip dates with a zero fund value
+        fallback: NAV source when no value is found within the lookback
+        fallback_without_history: NAV source when no historical values were
+            passed at all
+        withdrawals_at_transaction_nav: Redeem at the same NAV contributions
+            get; otherwise at the value of the withdrawal date over the units
+            outstanding at that moment
+        reset_nav_when_empty: Issue at 1.0 once every unit has been redeemed
+            (otherwise the rest of that day is priced on start-of-day units)
+        lookback_days: How many days back to look for a fund value
+    """
+    same_day_value: bool = True
+    cash_on_lookback: bool = False
+    clamp_cash: bool = True
+    positive_values_only: bool = False
+    fallback: str = AVERAGE_COST
+    fallback_without_history: str = TIME_WEIGHTED
+    withdrawals_at_transaction_nav: bool = False
+    reset_nav_when_empty: bool = True
+    lookback_days: int = LOOKBACK_DAYS
+
+
+# PositionCalculator.calculate_ownership_percentages
+POSITION_CALCULATOR_RULES = NavRules()
+
+# streamlit_utils.get_investor_allocations
+INVESTOR_ALLOCATION_RULES = NavRules(clamp_cash=False, fallback=INCEPTION, fallback_without_history=INCEPTION)
+
+# streamlit_utils.get_user_investment_metrics: previous close plus net cash
+USER_METRICS_RULES = NavRules(
+    same_day_value=False,
+    cash_on_lookback=True,
+    clamp_cash=False,
+    positive_values_only=True,
+    fallback=TIME_WEIGHTED,
+    withdrawals_at_transaction_nav=True,
+    reset_nav_when_empty=False,
+)
+
+
+@dataclass
+class UnitLedger:
+    """Result of unit_ledger().
+
+    Attributes:
+        holdings: One row per contributor (index, in order of first
+            contribution) with columns email, contributions, withdrawals,
+            net_contribution, units, ownership_pct and - when a current fund
+            value was given - current_value, gain_loss, gain_loss_pct
+        total_units: Units outstanding
+        unit_price: Current NAV per unit (None without a current fund value
+            or units outstanding)
+        net_contributions: Net contributions of all contributors
+        fallback_count: Transactions priced without a fund value in the lookback
+    """
+    holdings: pd.DataFrame
+    total_units: float
+    unit_price: Optional[float]
+    net_contributions: float
+    fallback_count: int
+
+
+def _column(raw: pd.DataFrame, names: List[str], default: Any) -> pd.Series:
+    """First non-null value among the given column names (earlier names win)."""
+    values = pd.Series(default, index=raw.index, dtype=object)
+    for name in reversed(names):
+        if name in raw.columns:
+            values = raw[name].where(raw[name].notna(), values)
+    return values
+
+
+def parse_contributions(records: Iterable[Dict[str, Any]]) -> pd.DataFrame:
+    """Parse contribution records in bulk and sort them chronologically.
+
+    Accepts both the CSV/repository field names (Contributor, Amount, Type,
+    Timestamp) and the fund_contributions columns (contributor, amount,
+    contribution_type, timestamp). Timestamps may be ISO strings or datetimes.
+
+    Returns:
+        DataFrame with columns contributor, email, amount, withdrawal,
+        timestamp (UTC, NaT if missing/unparseable) and day ('YYYY-MM-DD' in
+        the timestamp's own offset, like ``timestamp.strftime``). Rows without
+        a timestamp come first.
+    """
+    raw = pd.DataFrame.from_records(list(records))
+    if raw.empty:
+        return pd.DataFrame(columns=['contributor', 'email', 'amount', 'withdrawal', 'timestamp', 'day'])
+
+    stamps = _column(raw, ['Timestamp', 'timestamp'], None)
+    text = stamps.astype(str)
+    timestamp = pd.to_datetime(text, utc=True, errors='coerce', format='ISO8601')
+
+    parsed = pd.DataFrame({
+        'contributor': _column(raw, ['Contributor', 'contributor'], 'Unknown'),
+        'email': _column(raw, ['Email', 'email'], ''),
+        'amount': pd.to_numeric(_column(raw, ['Amount', 'amount'], 0), errors='coerce').fillna(0.0).astype(float),
+        'withdrawal': _column(raw, ['Type', 'type', 'contribution_type'], 'contribution').astype(str).str.lower() == 'withdrawal',
+        'timestamp': timestamp,
+        'day': text.str[:10].where(timestamp.notna()),
+    })
+    unparsed = stamps.notna() & (text != '') & timestamp.isna()
+    if unparsed.any():
+        logger.warning(f"Could not parse {int(unparsed.sum())} contribution timestamp(s), e.g. '{text[unparsed].iloc[0]}'")
+
+    return parsed.sort_values('timestamp', kind='mergesort', na_position='first').reset_index(drop=True)
+
+
+def _value_series(values: Optional[Dict[str, Any]]) -> pd.Series:
+    if not values:
+        return pd.Series(dtype=float)
+    return pd.to_numeric(pd.Series(values, dtype=object), errors='coerce').astype(float)
+
+
+def _asof_fund_values(days: pd.Series, historical_values: Optional[Dict[str, Any]],
+                      historical_cost_basis: Optional[Dict[str, Any]], rules: NavRules) -> pd.DataFrame:
+    """Join each contribution day to the closest fund value on or before it.
+
+    Returns:
+        DataFrame aligned with ``days``: value and cost (NaN when nothing is
+        within the lookback) and exact (value is from the day itself)
+    """
+    values = _value_series(historical_values)
+    table = pd.DataFrame({
+        'value_date': pd.to_datetime(pd.Index(values.index), errors='coerce').astype('datetime64[ns]'),
+        'value': values.to_numpy(),
+        'cost': _value_series(historical_cost_basis).reindex(values.index).fillna(0.0).to_numpy(),
+    }).dropna(subset=['value_date', 'value'])
+    if rules.positive_values_only:
+        table = table[table['value'] > 0]
+
+    rows = pd.DataFrame({'row': np.arange(len(days)),
+                         'day_date': pd.to_datetime(days, errors='coerce').astype('datetime64[ns]').to_numpy()})
+    dated = rows.dropna(subset=['day_date']).sort_values('day_date', kind='mergesort')
+
+    joined = pd.merge_asof(
+        dated, table.sort_values('value_date'),
+        left_on='day_date', right_on='value_date', direction='backward',
+        tolerance=pd.Timedelta(days=rules.lookback_days),
+        allow_exact_matches=rules.same_day_value,
+    ).set_index('row').reindex(rows['row'])
+
+    return pd.DataFrame({
+        'value': joined['value'].to_numpy(dtype=float),
+        'cost': joined['cost'].to_numpy(dtype=float),
+        'exact': (joined['value_date'] == joined['day_date']).to_numpy(),
+    })
+
+
+def unit_ledger(
+    contributions: Union[pd.DataFrame, Iterable[Dict[str, Any]]],
+    current_fund_value: Optional[float] = None,
+    historical_values: Optional[Dict[str, Any]] = None,
+    historical_cost_basis: Optional[Dict[str, Any]] = None,
+    rules: NavRules = POSITION_CALCULATOR_RULES,
+    now: Optional[datetime] = None,
+) -> Optional[UnitLedger]:
+    """Issue and redeem fund units for a contribution ledger.
+
+    Args:
+        contributions: Contribution records, or parse_contributions() output
+        current_fund_value: Current total fund value (for current NAV, values
+            and returns, and the time-weighted estimate)
+        historical_values: Fund value by date ('YYYY-MM-DD')
+        historical_cost_basis: Cost basis by date, for uninvested cash
+        rules: Pricing rules of the caller (see NavRules)
+        now: End of the time-weighted estimation period (default: now)
+
+    Returns:
+        UnitLedger, or None if there are no contributions
+    """
+    if not isinstance(contributions, pd.DataFrame):
+        contributions = parse_contributions(contributions)
+    if contributions.empty:
+        return None
+
+    n = len(contributions)
+    amount = contributions['amount'].to_numpy(dtype=float)
+    withdrawal = contributions['withdrawal'].to_numpy(dtype=bool)
+    timestamp = contributions['timestamp']
+    has_timestamp = timestamp.notna().to_numpy()
+    codes, contributors = pd.factorize(contributions['contributor'])
+
+    # Net contributions before each row, and before each day's first row
+    signed = np.where(withdrawal, -amount, amount)
+    running = np.concatenate(([0.0], np.cumsum(signed)[:-1]))
+    day_key = contributions['day'].fillna('')
+    day_start = (day_key != day_key.shift()).to_numpy(copy=True)
+    day_start[0] = True
+    day_id = np.cumsum(day_start) - 1
+    running_at_day_start = running[day_start][day_id]
+    net_contributions = float(signed.sum())
+
+    # Fund value (plus uninvested cash) from the as-of join
+    fund = _asof_fund_values(contributions['day'], historical_values, historical_cost_basis, rules)
+    found = ~np.isnan(fund['value'].to_numpy())
+    exact = fund['exact'].to_numpy() & found
+    cash = running_at_day_start - fund['cost'].to_numpy()
+    if rules.clamp_cash:
+        cash = np.maximum(cash, 0.0)
+    with_cash = exact | rules.cash_on_lookback
+    fund_value = fund['value'].to_numpy() + np.where(with_cash, cash, 0.0)
+
+    # Time-weighted NAV estimate: linear growth from 1.0 to current / net contributions
+    time_nav = np.full(n, np.nan)
+    if has_timestamp.any():
+        growth_rate = (current_fund_value / net_contributions
+                       if current_fund_value is not None and net_contributions > 0 else 1.0)
+        first = timestamp.min()
+        end = pd.Timestamp(now if now is not None else datetime.now(timezone.utc))
+        end = end.tz_localize('UTC') if end.tzinfo is None else end.tz_convert('UTC')
+        total_days = max((end - first).days, 1)
+        elapsed = (timestamp - first).dt.days.to_numpy(dtype=float)
+        time_nav = 1.0 + (growth_rate - 1.0) * elapsed / total_days
+
+    fallback = rules.fallback if historical_values else rules.fallback_without_history
+    use_time_nav = (fallback == TIME_WEIGHTED) & has_timestamp
+    use_average_cost = (fallback == AVERAGE_COST) | ((fallback == TIME_WEIGHTED) & ~has_timestamp)
+
+    # Contributions: NAV = relative / units (units-dependent) or a fixed NAV
+    relative = np.where(found, fund_value, np.where(use_average_cost, running, np.nan))
+    fixed = np.where(found, np.nan, np.where(use_time_nav, time_nav, np.where(use_average_cost, np.nan, 1.0)))
+
+    # Withdrawals: fund value of the day itself over the units outstanding at that moment
+    if rules.withdrawals_at_transaction_nav:
+        redeem_relative, redeem_fixed = relative, fixed
+    else:
+        redeem_relative = np.where(exact, fund['value'].to_numpy(), np.where(use_average_cost, running, np.nan))
+        redeem_fixed = np.where(exact, np.nan, np.where(use_time_nav, time_nav, np.where(use_average_cost, np.nan, 1.0)))
+
+    units = np.zeros(n)
+    holder_units = np.zeros(len(contributors))
+    total_units = 0.0
+    fallback_count = 0
+    bounds = np.append(np.flatnonzero(day_start), n)
+    redeem_priced = found if rules.withdrawals_at_transaction_nav else exact
+
+    def redeem_within_day(start: int, stop: int, issued: np.ndarray, units_at_start: float):
+        """Redemptions of a day whose contributions are already issued.
+
+        Returns the units redeemed per row, or None if a withdrawal empties the
+        fund before later contributions of the day (those restart at 1.0).
+        """
+        redeemed = np.zeros(stop - start)
+        day_codes = codes[start:stop]
+        issued_before = np.concatenate(([0.0], np.cumsum(issued)[:-1]))
+        skipped = []
+        for j in np.flatnonzero(withdrawal[start:stop]):
+            i = start + j
+            holder = day_codes[j]
+            total_now = units_at_start + issued_before[j] - redeemed[:j].sum()
+            earlier = day_codes[:j] == holder
+            held = holder_units[holder] + issued[:j][earlier].sum() - redeemed[:j][earlier].sum()
+            if total_now > 0 and held > 0:
+                base = units_at_start if rules.withdrawals_at_transaction_nav else total_now
+                nav = redeem_fixed[i] if np.isnan(redeem_relative[i]) else redeem_relative[i] / base
+                redeemed[j] = min(amount[i] / nav if nav > 0 else amount[i], held)
+                if (total_now - redeemed[j] <= 0 and rules.reset_nav_when_empty
+                        and not withdrawal[i + 1:stop].all()):
+                    return None, []
+            elif amount[i] > 0:
+                skipped.append(i)
+        return redeemed, skipped
+
+    for start, stop in zip(bounds[:-1], bounds[1:], strict=True):
+        units_at_start = total_units
+        day = slice(start, stop)
+        if units_at_start > 0:
+            # Every contribution of the day is priced at the start-of-day NAV
+            nav = np.where(np.isnan(fixed[day]), relative[day] / units_at_start, fixed[day])
+            issued = np.where(withdrawal[day], 0.0, amount[day] / np.where(nav > 0, nav, 1.0))
+            redeemed, skipped = (redeem_within_day(start, stop, issued, units_at_start)
+                                 if withdrawal[day].any() else (0.0, []))
+            if redeemed is not None:
+                units[day] = issued - redeemed
+                np.add.at(holder_units, codes[day], units[day])
+                total_units += float(units[day].sum())
+                fallback_count += int(np.count_nonzero(~np.where(withdrawal[day], redeem_priced[day], found[day])
+                                                       & (units[day] != 0)))
+                for i in skipped:
+                    logger.warning(f"⚠️  Withdrawal of ${amount[i]} from {contributors[codes[i]]} skipped - no units to redeem")
+                continue
+
+        # Inception, or a withdrawal empties the fund: walk the day row by row
+        for i in range(start, stop):
+            units_for_nav = units_at_start if units_at_start > 0 else total_units
+            holder = codes[i]
+            if withdrawal[i]:
+                if total_units > 0 and holder_units[holder] > 0:
+                    base = units_for_nav if rules.withdrawals_at_transaction_nav else total_units
+                    nav = redeem_fixed[i] if np.isnan(redeem_relative[i]) else redeem_relative[i] / base
+                    fallback_count += not redeem_priced[i]
+                    redeemed = min(amount[i] / nav if nav > 0 else amount[i], holder_units[holder])
+                    holder_units[holder] -= redeemed
+                    total_units -= redeemed
+                    units[i] = -redeemed
+                elif amount[i] > 0:
+                    logger.warning(f"⚠️  Withdrawal of ${amount[i]} from {contributors[holder]} skipped - no units to redeem")
+            else:
+                if units_for_nav <= 0 or (total_units <= 0 and rules.reset_nav_when_empty):
+                    nav = 1.0
+                else:
+                    nav = fixed[i] if np.isnan(relative[i]) else relative[i] / units_for_nav
+                    fallback_count += not found[i]
+                if not nav > 0:
+                    nav = 1.0
+                units[i] = amount[i] / nav
+                holder_units[holder] += units[i]
+                total_units += units[i]
+
+    # Per-contributor totals
+    counts = len(contributors)
+    contributed = np.bincount(codes, weights=np.where(withdrawal, 0.0, amount), minlength=counts)
+    withdrawn = np.bincount(codes, weights=np.where(withdrawal, amount, 0.0), minlength=counts)
+    first_row = np.unique(codes, return_index=True)[1]
+    holdings = pd.DataFrame({
+        'email': contributions['email'].to_numpy()[first_row],
+        'contributions': contributed,
+        'withdrawals': withdrawn,
+        'net_contribution': contributed - withdrawn,
+        'units': holder_units,
+    }, index=pd.Index(contributors, name='contributor'))
+    holdings['ownership_pct'] = holdings['units'] / total_units * 100 if total_units > 0 else 0.0
+
+    unit_price = None
+    if current_fund_value is not None and total_units > 0:
+        unit_price = current_fund_value / total_units
+        net = holdings['net_contribution']
+        holdings['current_value'] = holdings['units'] * unit_price
+        holdings['gain_loss'] = holdings['current_value'] - net
+        holdings['gain_loss_pct'] = np.where(net > 0, holdings['gain_loss'] / net.where(net > 0, 1.0) * 100, 0.0)
+
+    logger.debug(f"Unit ledger: {n} transactions, {counts} contributors, {total_units:.4f} units"
+                 + (f", NAV {unit_price:.4f}" if unit_price is not None else ""))
+    return UnitLedger(holdings, total_units, unit_price, net_contributions, fallback_count)
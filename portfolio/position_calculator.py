@@ -18,6 +18,7 @@ from data.repositories.base_repository import BaseRepository, RepositoryError
 from data.models.portfolio import Position, PortfolioSnapshot
 from data.models.trade import Trade
 from financial.calculations import money_to_decimal, calculate_cost_basis, calculate_position_value
+from portfolio.ownership_ledger import unit_ledger, POSITION_CALCULATOR_RULES
 from utils.currency_converter import load_exchange_rates, convert_usd_to_cad
 
 logger = logging.getLogger(__name__)
@@ -384,6 +385,50 @@ class PositionCalculator:
             logger.error(f"Failed to calculate portfolio metrics: {e}")
             raise PositionCalculatorError(f"Failed to calculate portfolio metrics: {e}") from e
     
+    def get_historical_fund_values(self, dates: List[datetime]) -> Tuple[Dict[str, Decimal], Dict[str, Decimal]]:
+        """Get fund value and cost basis on specific dates for NAV-based ownership.
+        
+        Reads the repository's daily NAV store when it has one, which costs one
+        row per date. Otherwise sums every portfolio snapshot from the earliest
+        date onwards.
+        
+        Args:
+            dates: Dates to look up (e.g. contribution timestamps)
+            
+        Returns:
+            Tuple of (historical_fund_values, historical_cost_basis) dicts keyed
+            by 'YYYY-MM-DD', as expected by calculate_ownership_percentages()
+        """
+        dates = [d for d in dates if d]
+        if not dates:
+            return {}, {}
+        
+        nav_history = self.repository.get_fund_nav_history(dates)
+        if nav_history is not None:
+            logger.debug(f"Retrieved {len(nav_history[0])} historical fund values from NAV store")
+            return nav_history
+        
+        historical_fund_values = {}
+        historical_cost_basis = {}
+        snapshots = self.repository.get_portfolio_data(date_range=(min(dates), datetime.now()))
+        for snapshot in snapshots or []:
+            date_str = snapshot.timestamp.strftime('%Y-%m-%d')
+            total_value = sum(
+                pos.shares * pos.current_price
+                for pos in snapshot.positions
+                if pos.current_price is not None
+            )
+            total_cost_basis = sum(
+                pos.cost_basis if pos.cost_basis else Decimal('0')
+                for pos in snapshot.positions
+            )
+            if total_value > 0:
+                historical_fund_values[date_str] = Decimal(str(total_value))
+                historical_cost_basis[date_str] = Decimal(str(total_cost_basis))
+        
+        logger.debug(f"Retrieved {len(historical_fund_values)} historical fund values from snapshots")
+        return historical_fund_values, historical_cost_basis
+    
     def calculate_ownership_percentages(self, fund_contributions_data: List[Dict[str, Any]],
                                        current_fund_value: Decimal,
                                        historical_fund_values: Optional[Dict[str, Decimal]] = None,
@@ -400,6 +445,8 @@ class PositionCalculator:
         The NAV calculation now includes uninvested cash:
         Fund Value = Stock Value + max(0, contributions_at_start_of_day - cost_basis)
         
+        Units are issued by the vectorized ledger in portfolio/ownership_ledger.py.
+        
         Example:
             - Day 1: Fund starts with $1,000 from Investor A. NAV = $1.00, A owns 1,000 units.
             - Day 30: Fund grows 20% to $1,200. Investor B joins with $2,000.
@@ -428,249 +475,52 @@ class PositionCalculator:
             if not fund_contributions_data or current_fund_value <= 0:
                 return {}
             
-            # Parse and sort contributions chronologically
-            from datetime import datetime
-            
-            parsed_contributions = []
-            for contribution in fund_contributions_data:
-                contributor = contribution.get('Contributor', contribution.get('contributor', 'Unknown'))
-                amount = Decimal(str(contribution.get('Amount', contribution.get('amount', 0))))
-                contribution_type = contribution.get('Type', contribution.get('type', 'contribution'))
-                timestamp_raw = contribution.get('Timestamp', contribution.get('timestamp', ''))
-                
-                # Parse timestamp - use proper ISO format parser for database timestamps
-                timestamp = None
-                if timestamp_raw:
-                    try:
-                        if isinstance(timestamp_raw, datetime):
-                            timestamp = timestamp_raw
-                        elif isinstance(timestamp_raw, str):
-                            # Use the same ISO parser that the repository uses for database timestamps
-                            from data.repositories.field_mapper import TypeTransformers
-                            timestamp = TypeTransformers.iso_to_datetime(timestamp_raw)
-                        else:
-                            logger.debug(f"Unexpected timestamp type '{type(timestamp_raw)}' for contributor {contributor}")
-                    except Exception as e:
-                        logger.warning(f"Could not parse timestamp '{timestamp_raw}' for contributor {contributor}: {e}")
-                
-                parsed_contributions.append({
-                    'contributor': contributor,
-                    'amount': amount,
-                    'type': contribution_type.lower(),
-                    'timestamp': timestamp
-                })
-            
-            # Sort by timestamp (None/unknown dates go first as they're likely the earliest)
-            parsed_contributions.sort(key=lambda x: x['timestamp'] or datetime.min)
-            
             # Check if we have historical data for perfect accuracy
             use_historical = historical_fund_values and len(historical_fund_values) > 0
             
-            # Fallback: calculate growth rate for time-weighted estimation
+            ledger = unit_ledger(fund_contributions_data, float(current_fund_value),
+                                 historical_fund_values, historical_cost_basis,
+                                 rules=POSITION_CALCULATOR_RULES)
+            if ledger is None:
+                return {}
+            
             if not use_historical:
-                total_net_contributions = Decimal('0')
-                for contrib in parsed_contributions:
-                    if contrib['type'] == 'withdrawal':
-                        total_net_contributions -= contrib['amount']
-                    else:
-                        total_net_contributions += contrib['amount']
-                
-                if total_net_contributions <= 0:
+                # Fallback: time-weighted estimation needs positive net contributions
+                if ledger.net_contributions <= 0:
                     return {}
-                
-                growth_rate = current_fund_value / total_net_contributions
-                
-                timestamps = [c['timestamp'] for c in parsed_contributions if c['timestamp']]
-                if timestamps:
-                    first_timestamp = min(timestamps)
-                    now = datetime.now()
-                    total_days = max((now - first_timestamp).days, 1)
-                else:
-                    first_timestamp = None
-                    total_days = 1
-                    
+                growth_rate = float(current_fund_value) / ledger.net_contributions
                 logger.warning(f"⚠️  NAV FALLBACK: No historical fund values provided - using time-weighted estimation (growth_rate={growth_rate:.4f})")
             else:
                 logger.info(f"✓ Using {len(historical_fund_values)} historical fund values for accurate NAV calculation")
-            
-            # Calculate units per contributor
-            contributor_units = {}
-            contributor_data = {}
-            total_units = Decimal('0')
-            running_contributions = Decimal('0')
-            
-            # Track state at start of each day for same-day contribution NAV calculation
-            # CRITICAL FIX: Multiple contributions on the same day should all use the SAME NAV
-            # (the NAV before any contributions that day), otherwise later contributions get
-            # exponentially more units, causing massive ownership inflation
-            units_at_start_of_day = Decimal('0')
-            contributions_at_start_of_day = Decimal('0')  # For uninvested cash calculation
-            last_contribution_date = None
-            
-            for contrib in parsed_contributions:
-                contributor = contrib['contributor']
-                amount = contrib['amount']
-                contrib_type = contrib['type']
-                timestamp = contrib['timestamp']
-                
-                # Same-day NAV fix - capture state at START of each new day
-                date_str = timestamp.strftime('%Y-%m-%d') if timestamp else None
-                if date_str != last_contribution_date:
-                    units_at_start_of_day = total_units
-                    contributions_at_start_of_day = running_contributions
-                    last_contribution_date = date_str
-                
-                # Initialize contributor tracking if needed
-                if contributor not in contributor_units:
-                    contributor_units[contributor] = Decimal('0')
-                if contributor not in contributor_data:
-                    contributor_data[contributor] = {
-                        'contributions': Decimal('0'),
-                        'withdrawals': Decimal('0'),
-                        'net_contribution': Decimal('0')
-                    }
-                
-                if contrib_type == 'withdrawal':
-                    contributor_data[contributor]['withdrawals'] += amount
-                    contributor_data[contributor]['net_contribution'] -= amount
-                    
-                    # Redeem units at NAV on withdrawal date
-                    # IMPORTANT: Only redeem if contributor actually has units to prevent total_units corruption
-                    if total_units > 0 and contributor_units[contributor] > 0:
-                        # date_str already calculated above
-                        
-                        if use_historical and date_str and date_str in historical_fund_values:
-                            fund_value_at_date = Decimal(str(historical_fund_values[date_str]))
-                            nav_at_withdrawal = fund_value_at_date / total_units
-                        elif not use_historical and first_timestamp and timestamp:
-                            elapsed_days = (timestamp - first_timestamp).days
-                            time_fraction = Decimal(str(elapsed_days / total_days))
-                            nav_at_withdrawal = Decimal('1') + (growth_rate - Decimal('1')) * time_fraction
-                        else:
-                            nav_at_withdrawal = running_contributions / total_units if total_units > 0 else Decimal('1')
-                        
-                        units_to_redeem = amount / nav_at_withdrawal if nav_at_withdrawal > 0 else amount
-                        # Cap redemption at contributor's actual units to prevent going negative
-                        actual_units_redeemed = min(units_to_redeem, contributor_units[contributor])
-                        contributor_units[contributor] -= actual_units_redeemed
-                        total_units -= actual_units_redeemed
-                    elif contributor_units[contributor] <= 0 and amount > 0:
-                        logger.warning(f"⚠️  Withdrawal of ${amount} from {contributor} skipped - no units to redeem")
-                    
-                    running_contributions -= amount
-                else:
-                    contributor_data[contributor]['contributions'] += amount
-                    contributor_data[contributor]['net_contribution'] += amount
-                    
-                    # Calculate NAV at time of contribution
-                    # date_str already calculated above
-                    
-                    if total_units == 0:
-                        # First contribution - NAV = 1.0
-                        nav_at_contribution = Decimal('1.0')
-                    elif use_historical and date_str and date_str in historical_fund_values:
-                        # PROPER NAV FIX: Fund Value = Stock Value + Uninvested Cash
-                        stock_value_at_date = Decimal(str(historical_fund_values[date_str]))
-                        
-                        # Get cost basis for this date (if available)
-                        cost_basis_at_date = Decimal('0')
-                        if historical_cost_basis and date_str in historical_cost_basis:
-                            cost_basis_at_date = Decimal(str(historical_cost_basis[date_str]))
-                        
-                        # Uninvested Cash = contributions before today that aren't yet in stocks
-                        uninvested_cash = max(Decimal('0'), contributions_at_start_of_day - cost_basis_at_date)
-                        fund_value_at_date = stock_value_at_date + uninvested_cash
-                        
-                        # Use units_at_start_of_day for same-day contributions
-                        units_for_nav = units_at_start_of_day if units_at_start_of_day > 0 else total_units
-                        nav_at_contribution = fund_value_at_date / units_for_nav if units_for_nav > 0 else Decimal('1')
-                    elif use_historical and date_str:
-                        # Historical data provided but missing for this date - 7-day lookback
-                        nav_at_contribution = Decimal('1')
-                        units_for_nav = units_at_start_of_day if units_at_start_of_day > 0 else total_units
-                        
-                        found_fallback = False
-                        if units_for_nav > 0:
-                            try:
-                                from datetime import datetime as dt, timedelta
-                                contribution_date = dt.strptime(date_str, '%Y-%m-%d')
-                                for days_back in range(1, 8):
-                                    prior_date = contribution_date - timedelta(days=days_back)
-                                    prior_date_str = prior_date.strftime('%Y-%m-%d')
-                                    if prior_date_str in historical_fund_values:
-                                        fund_value_at_prior = Decimal(str(historical_fund_values[prior_date_str]))
-                                        nav_at_contribution = fund_value_at_prior / units_for_nav
-                                        found_fallback = True
-                                        logger.info(f"ℹ️  NAV FALLBACK: {date_str} -> using {prior_date_str} (NAV=${nav_at_contribution:.4f})")
-                                        break
-                            except Exception:
-                                pass
-                        
-                        if not found_fallback:
-                            logger.warning(f"⚠️  NAV FALLBACK: Missing historical data for {date_str} (contributor: {contributor}). Using estimation.")
-                            nav_at_contribution = running_contributions / units_for_nav if units_for_nav > 0 else Decimal('1')
-                    elif not use_historical and first_timestamp and timestamp:
-                        # Fallback: time-weighted growth estimation (already warned at start)
-                        elapsed_days = (timestamp - first_timestamp).days
-                        time_fraction = Decimal(str(elapsed_days / total_days))
-                        nav_at_contribution = Decimal('1') + (growth_rate - Decimal('1')) * time_fraction
-                    else:
-                        logger.warning(f"⚠️  NAV FALLBACK: No timestamp for contribution from {contributor}. Using simple estimation.")
-                        nav_at_contribution = running_contributions / total_units if total_units > 0 else Decimal('1')
-                    
-                    # Ensure NAV is positive
-                    if nav_at_contribution <= 0:
-                        nav_at_contribution = Decimal('1')
-                    
-                    # Units purchased = contribution / NAV
-                    units_purchased = amount / nav_at_contribution
-                    contributor_units[contributor] += units_purchased
-                    total_units += units_purchased
-                    running_contributions += amount
-                    
-                    logger.debug(f"  {contributor}: +${amount} at NAV ${nav_at_contribution:.4f} = {units_purchased:.4f} units")
+                if ledger.fallback_count:
+                    logger.warning(f"⚠️  NAV FALLBACK: {ledger.fallback_count} transaction(s) without historical data within 7 days. Using estimation.")
             
             # Calculate final values based on current NAV
-            if total_units <= 0:
+            if ledger.total_units <= 0:
                 return {}
             
-            current_nav = current_fund_value / total_units
-            logger.debug(f"Current NAV: ${current_nav:.4f} (fund value ${current_fund_value:.2f} / {total_units:.4f} units)")
+            current_nav = Decimal(str(ledger.unit_price))
+            logger.debug(f"Current NAV: ${current_nav:.4f} (fund value ${current_fund_value:.2f} / {ledger.total_units:.4f} units)")
             
             # Build ownership details with accurate per-contributor returns
             ownership_details = {}
-            for contributor, units in contributor_units.items():
-                if units > 0:
-                    data = contributor_data[contributor]
-                    net_contribution = data['net_contribution']
-                    
-                    if net_contribution <= 0:
-                        continue
-                    
-                    # Current value based on units owned
-                    current_value = units * current_nav
-                    
-                    # Ownership percentage based on units
-                    ownership_pct = (units / total_units * Decimal('100'))
-                    
-                    # Individual gain/loss - this is now ACCURATE per contributor
-                    gain_loss = current_value - net_contribution
-                    gain_loss_pct = (gain_loss / net_contribution * Decimal('100')) if net_contribution > 0 else Decimal('0')
-                    
-                    ownership_details[contributor] = {
-                        'contributions': data['contributions'],
-                        'withdrawals': data['withdrawals'],
-                        'net_contribution': net_contribution,
-                        'ownership_percentage': ownership_pct.quantize(Decimal('0.1')),
-                        'current_value': current_value.quantize(Decimal('0.01')),
-                        'gain_loss': gain_loss.quantize(Decimal('0.01')),
-                        'gain_loss_percentage': gain_loss_pct.quantize(Decimal('0.1')),
-                        # New fields for transparency
-                        'units': units.quantize(Decimal('0.0001')),
-                        'unit_price': current_nav.quantize(Decimal('0.0001'))
-                    }
-                    
-                    logger.debug(f"  {contributor}: {units:.4f} units = ${current_value:.2f} ({gain_loss_pct:.1f}% return)")
+            holdings = ledger.holdings
+            owners = holdings[(holdings['units'] > 0) & (holdings['net_contribution'] > 0)]
+            for contributor, data in owners.to_dict('index').items():
+                ownership_details[contributor] = {
+                    'contributions': money_to_decimal(data['contributions']),
+                    'withdrawals': money_to_decimal(data['withdrawals']),
+                    'net_contribution': money_to_decimal(data['net_contribution']),
+                    'ownership_percentage': Decimal(str(data['ownership_pct'])).quantize(Decimal('0.1')),
+                    'current_value': Decimal(str(data['current_value'])).quantize(Decimal('0.01')),
+                    'gain_loss': Decimal(str(data['gain_loss'])).quantize(Decimal('0.01')),
+                    'gain_loss_percentage': Decimal(str(data['gain_loss_pct'])).quantize(Decimal('0.1')),
+                    # New fields for transparency
+                    'units': Decimal(str(data['units'])).quantize(Decimal('0.0001')),
+                    'unit_price': current_nav.quantize(Decimal('0.0001'))
+                }
+                
+                logger.debug(f"  {contributor}: {data['units']:.4f} units = ${data['current_value']:.2f} ({data['gain_loss_pct']:.1f}% return)")
             
             logger.debug(f"NAV-based ownership calculated for {len(ownership_details)} contributors")
             return ownership_details
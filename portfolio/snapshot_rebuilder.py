@@ -0,0 +1,276 @@
+"""Incremental snapshot rebuild engine.
+
+This module provides the SnapshotRebuilder class, a single-pass engine for
+rebuilding daily portfolio snapshots after backdated trades. Trades are sorted
+once and swept in order while running positions are carried forward day by
+day, so a rebuild costs O(trades + days × positions) instead of re-processing
+the full trade history for every affected date.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from data.models.portfolio import Position, PortfolioSnapshot
+from data.models.trade import Trade
+from data.repositories.base_repository import BaseRepository
+
+logger = logging.getLogger(__name__)
+
+# (ticker, day) -> close price, or None when no price is known for that day
+PriceLookup = Callable[[str, date], Optional[Decimal]]
+
+
+@dataclass
+class RunningPosition:
+    """Average-cost position state carried forward between trading days."""
+    shares: Decimal = Decimal('0')
+    cost: Decimal = Decimal('0')
+    currency: str = 'USD'
+
+    @property
+    def avg_price(self) -> Decimal:
+        return self.cost / self.shares if self.shares > 0 else Decimal('0')
+
+
+class SnapshotRebuilder:
+    """Rebuilds per-trading-day portfolio snapshots in one sweep of the trade log.
+
+    Positions use the same average-cost rules as the trade processors: buys add
+    shares and cost, sells reduce cost proportionally and never go negative.
+    Snapshots are emitted for every trading day in the requested window (not
+    only days with trades or positions) and written through the repository in
+    bulk, so every stored day in the window is replaced.
+    """
+
+    def __init__(self, repository: Optional[BaseRepository] = None,
+                 market: str = "any", snapshot_hour: int = 16,
+                 localize: bool = True):
+        """Initialize snapshot rebuilder.
+
+        Args:
+            repository: Repository used to read trades and bulk-save snapshots
+            market: Market calendar for trading days ("us", "canadian", "both", "any")
+            snapshot_hour: Hour (trading timezone) used for snapshot timestamps
+            localize: Attach the trading timezone to snapshot timestamps
+        """
+        self.repository = repository
+        self.market = market
+        self.snapshot_hour = snapshot_hour
+        self.localize = localize
+
+    @staticmethod
+    def apply_trade(positions: Dict[str, RunningPosition], trade: Trade) -> None:
+        """Apply a single trade to running positions in place."""
+        position = positions.get(trade.ticker)
+        if position is None:
+            position = positions[trade.ticker] = RunningPosition()
+
+        if str(trade.action).upper() == 'SELL':
+            # Reduce shares and cost proportionally
+            if position.shares > 0:
+                cost_per_share = position.cost / position.shares
+                position.shares -= trade.shares
+                position.cost -= trade.shares * cost_per_share
+                # Ensure we don't go negative
+                if position.shares < 0:
+                    position.shares = Decimal('0')
+                if position.cost < 0:
+                    position.cost = Decimal('0')
+        else:
+            # Default to BUY for all other trades
+            cost = trade.cost_basis if trade.cost_basis is not None else trade.shares * trade.price
+            position.shares += trade.shares
+            position.cost += cost
+            position.currency = trade.currency or position.currency
+
+    def get_trading_days(self, start_date: date, end_date: date) -> List[date]:
+        """Get trading days in [start_date, end_date] for the configured market."""
+        from utils.market_holidays import MarketHolidays
+        return MarketHolidays().get_trading_days_in_range(start_date, end_date, market=self.market)
+
+    def rebuild_days(self, trades: Iterable[Trade], start_date: date, end_date: date) -> List[date]:
+        """Days to rebuild: trading days in the window plus any day with a trade.
+
+        Trades entered on a non-trading day (e.g. a weekend) leave a snapshot
+        dated that day, which has to be replaced as well.
+        """
+        days = set(self.get_trading_days(start_date, end_date))
+        days.update(
+            trade.timestamp.date() for trade in trades
+            if start_date <= trade.timestamp.date() <= end_date
+        )
+        return sorted(days)
+
+    def iter_daily_positions(self, trades: Iterable[Trade], start_date: date,
+                             end_date: Optional[date] = None,
+                             trading_days: Optional[List[date]] = None
+                             ) -> Iterator[Tuple[date, Dict[str, RunningPosition]]]:
+        """Sweep trades once and yield held positions for each trading day.
+
+        Trades dated before ``start_date`` only seed the opening state. Trades on
+        non-trading days are picked up by the next trading day. The yielded dict
+        is a fresh mapping per day, but its RunningPosition values must be
+        treated as read-only.
+
+        Args:
+            trades: Trades in any order
+            start_date: First day to emit (inclusive)
+            end_date: Last day to emit (inclusive, defaults to today)
+            trading_days: Optional precomputed, sorted trading days to emit
+
+        Yields:
+            Tuples of (day, {ticker: RunningPosition}) for positions with shares
+        """
+        end_date = end_date or datetime.now().date()
+        if trading_days is None:
+            trading_days = self.get_trading_days(start_date, end_date)
+
+        ordered = sorted(trades, key=lambda t: t.timestamp)
+        positions: Dict[str, RunningPosition] = {}
+        index = 0
+        total = len(ordered)
+
+        for day in trading_days:
+            while index < total and ordered[index].timestamp.date() <= day:
+                self.apply_trade(positions, ordered[index])
+                index += 1
+            yield day, {
+                ticker: RunningPosition(pos.shares, pos.cost, pos.currency)
+                for ticker, pos in positions.items() if pos.shares > 0
+            }
+
+    def snapshot_timestamp(self, day: date) -> datetime:
+        """Market-close timestamp for a trading day."""
+        timestamp = datetime.combine(day, datetime.min.time().replace(hour=self.snapshot_hour))
+        if not self.localize:
+            return timestamp
+        from utils.timezone_utils import get_trading_timezone
+        trading_tz = get_trading_timezone()
+        # Handle timezone localization compatible with both pytz and zoneinfo
+        if hasattr(trading_tz, 'localize'):
+            return trading_tz.localize(timestamp)
+        return timestamp.replace(tzinfo=trading_tz)
+
+    def build_snapshots(self, trades: Iterable[Trade], start_date: date,
+                        end_date: Optional[date] = None,
+                        price_lookup: Optional[PriceLookup] = None,
+                        forward_fill: bool = True,
+                        fallback_to_cost: bool = True,
+                        company_names: Optional[Dict[str, str]] = None,
+                        trading_days: Optional[List[date]] = None) -> List[PortfolioSnapshot]:
+        """Build one snapshot per trading day in the window.
+
+        Args:
+            trades: Full trade history (any order)
+            start_date: First day to rebuild (inclusive)
+            end_date: Last day to rebuild (inclusive, defaults to today)
+            price_lookup: Optional (ticker, day) -> price lookup
+            forward_fill: Reuse a ticker's last known price on days without one
+            fallback_to_cost: Price positions at average cost when no price is known;
+                when False, unpriced positions are left out of the snapshot
+            company_names: Optional {ticker: company} used for Position.company
+            trading_days: Optional precomputed, sorted trading days
+
+        Returns:
+            List of PortfolioSnapshot objects, one per trading day. Days that end
+            flat get an empty snapshot so saving it replaces the stored one.
+        """
+        snapshots: List[PortfolioSnapshot] = []
+        last_prices: Dict[str, Decimal] = {}
+        company_names = company_names or {}
+        skipped = 0
+
+        for day, held in self.iter_daily_positions(trades, start_date, end_date, trading_days):
+            positions: List[Position] = []
+            total_value = Decimal('0')
+            for ticker, pos in held.items():
+                price = price_lookup(ticker, day) if price_lookup else None
+                if price is not None and price > 0:
+                    last_prices[ticker] = price
+                elif forward_fill and ticker in last_prices:
+                    price = last_prices[ticker]
+                elif fallback_to_cost:
+                    price = pos.avg_price
+                else:
+                    skipped += 1
+                    continue
+
+                market_value = pos.shares * price
+                positions.append(Position(
+                    ticker=ticker,
+                    shares=pos.shares,
+                    avg_price=pos.avg_price,
+                    cost_basis=pos.cost,
+                    currency=pos.currency,
+                    company=company_names.get(ticker),
+                    current_price=price,
+                    market_value=market_value,
+                    unrealized_pnl=market_value - pos.cost
+                ))
+                total_value += market_value
+
+            snapshots.append(PortfolioSnapshot(
+                positions=positions,
+                timestamp=self.snapshot_timestamp(day),
+                total_value=total_value
+            ))
+
+        if skipped:
+            logger.warning(f"Skipped {skipped} position-days with no price data")
+        return snapshots
+
+    def existing_price_lookup(self, start_date: date, end_date: date) -> PriceLookup:
+        """Build a price lookup from snapshots already stored in the repository.
+
+        Reads the window once so rebuilt snapshots keep their recorded prices.
+        """
+        prices: Dict[Tuple[str, date], Decimal] = {}
+        try:
+            snapshots = self.repository.get_portfolio_data(date_range=(
+                datetime.combine(start_date, datetime.min.time()),
+                datetime.combine(end_date, datetime.max.time())
+            ))
+            for snapshot in snapshots:
+                day = snapshot.timestamp.date()
+                for position in snapshot.positions:
+                    if position.current_price is not None and position.current_price > 0:
+                        prices[(position.ticker, day)] = position.current_price
+        except Exception as e:
+            logger.warning(f"Could not load existing prices for rebuild: {e}")
+        return lambda ticker, day: prices.get((ticker, day))
+
+    def rebuild(self, start_date: date, end_date: Optional[date] = None,
+                trades: Optional[List[Trade]] = None,
+                price_lookup: Optional[PriceLookup] = None, **kwargs) -> int:
+        """Rebuild and bulk-save snapshots from start_date onwards.
+
+        Args:
+            start_date: First day to rebuild (inclusive)
+            end_date: Last day to rebuild (inclusive, defaults to today)
+            trades: Trade history (loaded from the repository when omitted)
+            price_lookup: Price lookup (defaults to prices already in the repository)
+            **kwargs: Passed through to build_snapshots
+
+        Returns:
+            Number of snapshots written
+        """
+        if self.repository is None:
+            raise ValueError("SnapshotRebuilder.rebuild requires a repository")
+
+        end_date = end_date or datetime.now().date()
+        if trades is None:
+            trades = self.repository.get_trade_history()
+        if price_lookup is None:
+            price_lookup = self.existing_price_lookup(start_date, end_date)
+
+        kwargs.setdefault('trading_days', self.rebuild_days(trades, start_date, end_date))
+        snapshots = self.build_snapshots(trades, start_date, end_date, price_lookup, **kwargs)
+        if snapshots:
+            self.repository.save_portfolio_snapshots(snapshots)
+        logger.info(f"Rebuilt {len(snapshots)} snapshots from {start_date} to {end_date}")
+        return len(snapshots)
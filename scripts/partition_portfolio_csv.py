@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Partition Portfolio CSV
+
+Converts a fund's llm_portfolio_update.csv into the partitioned layout
+(portfolio/manifest.json plus one CSV per month or year, see
+data/repositories/csv_partitions.py), or merges it back into a single file.
+
+Rows are copied as text, so values and timestamps are unchanged. After a
+migration the single file is renamed to llm_portfolio_update.csv.pre-partition:
+CSVRepository reads the partitions, but scripts that open
+llm_portfolio_update.csv directly must not see a stale copy.
+"""
+
+import argparse
+import shutil
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Add the project root to the Python path
+# Since this script is in scripts/, we need to go up one level to get to project root.
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from data.repositories.csv_partitions import GRANULARITIES, PortfolioPartitions, atomic_write_text
+from utils.timezone_utils import split_csv_timestamps
+
+PORTFOLIO_FILE = "llm_portfolio_update.csv"
+PRE_PARTITION_SUFFIX = ".pre-partition"
+
+
+def partition_portfolio(data_dir: Path, granularity: str = 'month', keep_original: bool = False,
+                        dry_run: bool = False) -> dict:
+    """Split the fund's portfolio file into partitions.
+
+    Returns:
+        Row counts by partition key
+    """
+    portfolio_file = data_dir / PORTFOLIO_FILE
+    partitions = PortfolioPartitions(data_dir / "portfolio")
+    if partitions.exists():
+        raise SystemExit(f"❌ {data_dir.name} already uses the partitioned layout")
+    if not portfolio_file.exists():
+        raise SystemExit(f"❌ Portfolio file not found: {portfolio_file}")
+
+    df = pd.read_csv(portfolio_file, dtype=str, keep_default_na=False)
+    local, offsets = split_csv_timestamps(df['Date'])
+    # Unrecognized dates still start with YYYY-MM-DD in practice
+    days = local.dt.strftime(GRANULARITIES[granularity]).fillna(
+        pd.to_datetime(df['Date'].str[:10], errors='coerce').dt.strftime(GRANULARITIES[granularity])
+    )
+    if days.isna().any():
+        bad = df.loc[days.isna(), 'Date'].head(5).tolist()
+        raise SystemExit(f"❌ Cannot determine the date of {int(days.isna().sum())} rows, e.g. {bad}")
+
+    counts = days.value_counts().sort_index().to_dict()
+    if dry_run:
+        return counts
+
+    utc_offset = None
+    if not offsets.empty and pd.notna(offsets.iloc[0]):
+        minutes = int(offsets.iloc[0].total_seconds() // 60)
+        utc_offset = f"{'-' if minutes < 0 else '+'}{abs(minutes) // 60:02d}:{abs(minutes) % 60:02d}"
+
+    partitions.create(granularity, utc_offset)
+    partitions.write({key: df[days == key] for key in counts})
+
+    written = partitions.read()
+    if len(written) != len(df):
+        raise SystemExit(f"❌ Partitions hold {len(written)} rows, expected {len(df)}; original file left in place")
+
+    if not keep_original:
+        portfolio_file.rename(portfolio_file.with_name(PORTFOLIO_FILE + PRE_PARTITION_SUFFIX))
+    return counts
+
+
+def merge_partitions(data_dir: Path, dry_run: bool = False) -> int:
+    """Merge the partitions back into llm_portfolio_update.csv.
+
+    Returns:
+        Number of rows written
+    """
+    portfolio_file = data_dir / PORTFOLIO_FILE
+    partitions = PortfolioPartitions(data_dir / "portfolio")
+    if not partitions.exists():
+        raise SystemExit(f"❌ {data_dir.name} does not use the partitioned layout")
+
+    frames = [pd.read_csv(partitions.partition_path(key), dtype=str, keep_default_na=False)
+              for key in partitions.keys()]
+    df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    if dry_run:
+        return len(df)
+
+    atomic_write_text(portfolio_file, df.to_csv(index=False))
+    # Keep the partitions around until the merged file has been checked
+    shutil.move(str(partitions.directory), str(data_dir / "portfolio.merged"))
+    return len(df)
+
+
+def main():
+    """Main entry point for the partitioning script."""
+    parser = argparse.ArgumentParser(
+        description="Convert a fund's portfolio CSV to or from the partitioned layout",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Preview the monthly partitions
+  python scripts/partition_portfolio_csv.py --data-dir "trading_data/funds/Project Chimera" --dry-run
+
+  # Partition by year
+  python scripts/partition_portfolio_csv.py --data-dir "trading_data/funds/Project Chimera" --granularity year
+
+  # Go back to a single llm_portfolio_update.csv
+  python scripts/partition_portfolio_csv.py --data-dir "trading_data/funds/Project Chimera" --revert
+        """
+    )
+    parser.add_argument("--data-dir", type=str, required=True, help="Fund data directory")
+    parser.add_argument("--granularity", choices=sorted(GRANULARITIES), default='month',
+                        help="Partition size (default: month)")
+    parser.add_argument("--keep-original", action="store_true",
+                        help=f"Leave {PORTFOLIO_FILE} in place instead of renaming it")
+    parser.add_argument("--revert", action="store_true", help="Merge the partitions back into a single file")
+    parser.add_argument("--dry-run", action="store_true", help="Show what would be written without writing")
+    args = parser.parse_args()
+
+    data_dir = Path(args.data_dir)
+    if not data_dir.exists():
+        print(f"❌ Data directory not found: {data_dir}")
+        sys.exit(1)
+
+    if args.revert:
+        rows = merge_partitions(data_dir, dry_run=args.dry_run)
+        print(f"{'🔍 Would write' if args.dry_run else '✅ Wrote'} {rows} rows to {data_dir / PORTFOLIO_FILE}")
+        return
+
+    counts = partition_portfolio(data_dir, args.granularity, args.keep_original, args.dry_run)
+    for key, rows in counts.items():
+        print(f"  {key}.csv: {rows} rows")
+    print(f"{'🔍 Would write' if args.dry_run else '✅ Wrote'} {len(counts)} partitions "
+          f"({sum(counts.values())} rows) to {data_dir / 'portfolio'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""Tests for concurrent context assembly and time-to-first-token in ChatHandler.
+
+The data and formatting layers (flask_data_utils, ai_context_builder) are
+replaced with small fake modules so sections can be made slow or failing,
+and cache_version/flask_cache_utils point at temp files and a fresh cache.
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+import types
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add web_dashboard to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'web_dashboard')))
+
+from flask import Flask
+
+import ai_chat_handler
+import cache_version
+import flask_cache_utils
+from ai_chat_handler import ChatHandler, SectionBudget, get_ttft_stats
+from cache_version import cache_tag, invalidate
+from flask_cache_utils import SimpleCache
+
+
+class FakeData:
+    """Stand-ins for flask_data_utils and ai_context_builder with per-call delays."""
+
+    def __init__(self):
+        self.delays = {}
+        self.failing = set()
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def _fetch(self, name, fund):
+        with self.lock:
+            self.calls.append((name, fund))
+        time.sleep(self.delays.get(name, 0))
+        if name in self.failing:
+            raise RuntimeError(f"{name} unavailable")
+        return f"{name}:{fund}"
+
+    def modules(self):
+        data = types.ModuleType('flask_data_utils')
+        data.get_current_positions_flask = lambda fund: self._fetch('positions', fund)
+        data.get_trade_log_flask = lambda limit=1000, fund=None: self._fetch('trades', fund)
+        data.get_fund_thesis_data_flask = lambda fund: self._fetch('thesis', fund)
+        data.get_cash_balances_flask = lambda fund: self._fetch('cash', fund)
+        data.calculate_portfolio_value_over_time_flask = lambda fund, days=None: self._fetch('portfolio', fund)
+        data.calculate_performance_metrics_flask = lambda fund: self._fetch('metrics', fund)
+
+        builder = types.ModuleType('ai_context_builder')
+        builder.format_holdings = lambda positions, fund, trades_df=None, **_: f"HOLDINGS[{positions}]"
+        builder.format_thesis = lambda thesis: f"THESIS[{thesis}]"
+        builder.format_trades = lambda trades, limit: f"TRADES[{trades}]"
+        builder.format_performance_metrics = lambda metrics, portfolio: f"METRICS[{metrics}]"
+        builder.format_cash_balances = lambda cash: f"CASH[{cash}]"
+        return {'flask_data_utils': data, 'ai_context_builder': builder}
+
+
+class ContextTestCase(unittest.TestCase):
+    """Fresh cache, temp cache_version files and fake data modules."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        tmp = Path(self.tmpdir.name)
+        self.fake = FakeData()
+        patches = [
+            patch.object(cache_version, 'VERSION_FILE', tmp / '.cache_version'),
+            patch.object(cache_version, 'TAGS_FILE', tmp / '.cache_tags.json'),
+            patch.object(cache_version, 'VERSION_CHECK_INTERVAL', 0),
+            patch.object(cache_version, '_base_version', None),
+            patch.object(cache_version, '_seq', 0),
+            patch.object(cache_version, '_tag_seqs', {}),
+            patch.object(cache_version, '_file_stamps', (None, None)),
+            patch.object(cache_version, '_related_memo', {}),
+            patch.object(flask_cache_utils, '_get_cache', return_value=SimpleCache()),
+            patch.dict(sys.modules, self.fake.modules()),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        self.addCleanup(self.tmpdir.cleanup)
+        self.handler = ChatHandler(user_id='user-1', model='llama3.2:3b', fund='A')
+
+    def build(self, *item_types, fund=None):
+        items = [{'item_type': item_type, 'fund': fund} for item_type in item_types]
+        return self.handler.build_context(items, {}).split("\n\n---\n\n")
+
+
+class TestBuildContext(ContextTestCase):
+    """Test concurrent section assembly."""
+
+    def test_sections_are_fetched_concurrently_in_selection_order(self):
+        self.fake.delays = {'positions': 0.3, 'thesis': 0.3, 'cash': 0.3, 'metrics': 0.3}
+
+        started = time.perf_counter()
+        parts = self.build('cash_balances', 'holdings', 'thesis', 'metrics', 'performance_chart')
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(parts, ['CASH[cash:A]', 'HOLDINGS[positions:A]', 'THESIS[thesis:A]', 'METRICS[metrics:A]'])
+        self.assertLess(elapsed, 1.0)
+
+    def test_optional_section_over_budget_is_left_out_and_cached_later(self):
+        self.fake.delays = {'metrics': 0.6}
+        with patch.dict(ai_chat_handler.CONTEXT_SECTION_BUDGETS, {'metrics': SectionBudget(0.1)}):
+            started = time.perf_counter()
+            self.assertEqual(self.build('holdings', 'metrics'), ['HOLDINGS[positions:A]'])
+            self.assertLess(time.perf_counter() - started, 0.5)
+
+            # The section finishes in the background and is used by the next message
+            time.sleep(0.8)
+            self.fake.calls.clear()
+            self.assertEqual(self.build('holdings', 'metrics'), ['HOLDINGS[positions:A]', 'METRICS[metrics:A]'])
+            self.assertEqual(self.fake.calls, [])
+
+    def test_optional_section_ready_while_waiting_on_mandatory_is_included(self):
+        self.fake.delays = {'positions': 0.4, 'metrics': 0.2}
+        with patch.dict(ai_chat_handler.CONTEXT_SECTION_BUDGETS, {'metrics': SectionBudget(0.1)}):
+            self.assertEqual(self.build('metrics', 'holdings'), ['METRICS[metrics:A]', 'HOLDINGS[positions:A]'])
+
+    def test_failing_section_is_skipped(self):
+        self.fake.failing = {'cash'}
+
+        self.assertEqual(self.build('holdings', 'cash_balances'), ['HOLDINGS[positions:A]'])
+
+    def test_sections_are_cached_per_fund_until_its_data_changes(self):
+        self.build('holdings', fund='A')
+        self.build('holdings', fund='B')
+        self.fake.calls.clear()
+
+        self.build('holdings', fund='A')
+        self.assertEqual(self.fake.calls, [])
+
+        invalidate(cache_tag("portfolio_positions", "A"))
+        self.build('holdings', fund='A')
+        self.build('holdings', fund='B')
+        self.assertEqual(self.fake.calls, [('positions', 'A'), ('trades', 'A')])
+
+    def test_runs_in_a_copy_of_the_request_context(self):
+        from flask import request
+
+        seen = []
+        sys.modules['flask_data_utils'].get_cash_balances_flask = lambda fund: seen.append(request.cookies.get('auth_token')) or {}
+
+        app = Flask(__name__)
+        with app.test_request_context(headers={'Cookie': 'auth_token=abc'}):
+            self.build('cash_balances')
+
+        self.assertEqual(seen, ['abc'])
+
+
+class TestTimeToFirstToken(unittest.TestCase):
+    """Test time-to-first-token instrumentation."""
+
+    def setUp(self):
+        patcher = patch.object(ai_chat_handler, '_ttft_samples', {})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_ollama_stream_records_first_chunk(self):
+        client = types.SimpleNamespace(query_ollama=lambda **_: iter(['', 'Hello', ' world']))
+        ollama_client = types.ModuleType('ollama_client')
+        ollama_client.get_ollama_client = lambda: client
+
+        app = Flask(__name__)
+        with patch.dict(sys.modules, {'ollama_client': ollama_client}), app.test_request_context():
+            handler = ChatHandler(user_id='user-1', model='llama3.2:3b')
+            handler._started -= 0.25  # Pretend context assembly took 250ms
+            body = ''.join(handler._handle_ollama_stream('prompt', 'system').response)
+
+        self.assertIn('Hello', body)
+        stats = get_ttft_stats()
+        self.assertEqual(list(stats), ['ollama'])
+        self.assertEqual(stats['ollama']['count'], 1)
+        self.assertGreaterEqual(stats['ollama']['p50_ms'], 250)
+
+    def test_stats_percentiles(self):
+        for seconds in (0.1, 0.2, 0.3, 0.4, 1.0):
+            ai_chat_handler._record_ttft('glm', 'glm-4-plus', seconds)
+
+        self.assertEqual(get_ttft_stats()['glm'], {'count': 5, 'p50_ms': 300.0, 'p95_ms': 1000.0, 'max_ms': 1000.0})
+
+
+if __name__ == '__main__':
+    unittest.main()
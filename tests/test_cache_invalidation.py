@@ -0,0 +1,266 @@
+"""Tests for tagged cache invalidation (cache_version + flask_cache_utils/streamlit_utils).
+
+Version files are redirected to a temp directory and the Flask cache is a
+fresh SimpleCache, so tests don't touch the real dashboard cache.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from collections import OrderedDict
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+# Add web_dashboard to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'web_dashboard')))
+
+import cache_version
+import flask_cache_utils
+from cache_version import cache_tag, invalidate, tags_related
+from flask_cache_utils import SimpleCache, cache_data
+from streamlit_utils import tagged_cache_data
+import chart_utils  # After streamlit_utils, which loads the project-root utils package chart_utils needs
+
+
+class CacheVersionTestCase(unittest.TestCase):
+    """Points cache_version at temp files and resets its in-memory state."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        tmp = Path(self.tmpdir.name)
+        patches = [
+            patch.object(cache_version, 'VERSION_FILE', tmp / '.cache_version'),
+            patch.object(cache_version, 'TAGS_FILE', tmp / '.cache_tags.json'),
+            patch.object(cache_version, 'VERSION_CHECK_INTERVAL', 0),
+            patch.object(cache_version, '_base_version', None),
+            patch.object(cache_version, '_seq', 0),
+            patch.object(cache_version, '_tag_seqs', {}),
+            patch.object(cache_version, '_file_stamps', (None, None)),
+            patch.object(cache_version, '_related_memo', {}),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+        self.addCleanup(self.tmpdir.cleanup)
+
+
+class TestCacheTags(CacheVersionTestCase):
+    """Test suite for tag relations and dependency versions."""
+
+    def test_cache_tag_drops_none(self):
+        self.assertEqual(cache_tag("trade_log", "Project Chimera"), "trade_log:Project Chimera")
+        self.assertEqual(cache_tag("trade_log", None), "trade_log")
+
+    def test_tags_related(self):
+        self.assertTrue(tags_related("portfolio_positions", "portfolio_positions:A"))
+        self.assertTrue(tags_related("portfolio_positions:A", "portfolio_positions"))
+        self.assertFalse(tags_related("portfolio_positions:A", "portfolio_positions:B"))
+        self.assertFalse(tags_related("trade", "trade_log"))
+
+    def test_dependency_version_changes_only_for_related_tags(self):
+        """Invalidating one fund leaves other funds' versions alone."""
+        fund_a = [cache_tag("portfolio_positions", "A")]
+        fund_b = [cache_tag("portfolio_positions", "B")]
+        all_funds = [cache_tag("portfolio_positions")]
+        before = {name: cache_version.get_dependency_version(tags)
+                  for name, tags in (('a', fund_a), ('b', fund_b), ('all', all_funds))}
+
+        invalidate(cache_tag("portfolio_positions", "A"))
+
+        self.assertNotEqual(cache_version.get_dependency_version(fund_a), before['a'])
+        self.assertEqual(cache_version.get_dependency_version(fund_b), before['b'])
+        self.assertNotEqual(cache_version.get_dependency_version(all_funds), before['all'])
+
+    def test_events_persist_across_processes(self):
+        """Another process reading the tags file sees the same events."""
+        invalidate("trade_log:A", "dividend_log:A")
+        invalidate("benchmark_data")
+
+        cache_version._tag_seqs = {}
+        cache_version._file_stamps = (None, None)
+
+        self.assertEqual(cache_version.get_invalidation_seq(), 2)
+        self.assertEqual(sorted(cache_version.tags_invalidated_since(1)), ["benchmark_data"])
+        self.assertEqual(cache_version.get_tag_seq("trade_log"), 1)
+
+    def test_coarse_version_changes_on_any_event(self):
+        version = cache_version.get_cache_version()
+
+        invalidate("benchmark_data")
+
+        self.assertNotEqual(cache_version.get_cache_version(), version)
+
+
+class TestTaggedCacheData(CacheVersionTestCase):
+    """Test suite for cache_data(depends_on=...)."""
+
+    def setUp(self):
+        super().setUp()
+        cache = SimpleCache()
+        for p in (patch.object(flask_cache_utils, '_get_cache', return_value=cache),
+                  patch.object(flask_cache_utils, '_tag_index', {}),
+                  patch.object(flask_cache_utils, '_indexed_keys', OrderedDict()),
+                  patch.object(flask_cache_utils, '_last_index_prune', 0.0),
+                  patch.object(flask_cache_utils, '_seen_invalidation', None)):
+            p.start()
+            self.addCleanup(p.stop)
+        self.cache = cache
+        self.calls = []
+
+        @cache_data(ttl=300, depends_on=lambda fund, **_: [cache_tag("portfolio_positions", fund)])
+        def positions(fund=None):
+            self.calls.append(('positions', fund))
+            return len(self.calls)
+
+        @cache_data(ttl=300)
+        def undeclared():
+            self.calls.append(('undeclared', None))
+            return len(self.calls)
+
+        self.positions = positions
+        self.undeclared = undeclared
+
+    def test_only_related_entries_recomputed(self):
+        """Invalidating fund A recomputes A (and all-funds) but not B."""
+        self.positions("A")
+        self.positions("B")
+        self.positions()
+        self.calls.clear()
+
+        invalidate(cache_tag("portfolio_positions", "A"))
+        self.positions("A")
+        self.positions("B")
+        self.positions()
+
+        self.assertEqual(self.calls, [('positions', 'A'), ('positions', None)])
+
+    def test_stale_keys_evicted(self):
+        """Entries of invalidated tags are deleted, not just left to expire."""
+        self.positions("A")
+        self.positions("B")
+
+        invalidate(cache_tag("portfolio_positions", "A"))
+        evicted = flask_cache_utils._evict_invalidated(self.cache)
+
+        self.assertEqual(evicted, 1)
+        self.assertEqual(len(self.cache._cache), 1)
+
+    def test_undeclared_entries_invalidated_by_any_event(self):
+        self.undeclared()
+        self.positions("B")
+        self.calls.clear()
+
+        invalidate("benchmark_data")
+        self.undeclared()
+        self.positions("B")
+
+        self.assertEqual(self.calls, [('undeclared', None)])
+
+    def test_expired_keys_pruned_from_tag_index(self):
+        """Keys that expire by TTL don't stay in the index forever."""
+        with patch.object(flask_cache_utils.time, 'time', return_value=1000.0):
+            self.positions("A")
+        self.assertEqual(len(flask_cache_utils._indexed_keys), 1)
+
+        # Registering another key after the TTL and the prune interval sweeps the old one
+        with patch.object(flask_cache_utils.time, 'time', return_value=1000.0 + 301):
+            self.positions("B")
+
+        self.assertEqual(len(flask_cache_utils._indexed_keys), 1)
+        self.assertEqual(set(flask_cache_utils._tag_index), {cache_tag("portfolio_positions", "B")})
+
+    def test_tag_index_is_capped(self):
+        with patch.object(flask_cache_utils, 'TAG_INDEX_MAX_KEYS', 2):
+            for fund in ("A", "B", "C"):
+                self.positions(fund)
+
+        self.assertEqual(len(flask_cache_utils._indexed_keys), 2)
+        self.assertNotIn(cache_tag("portfolio_positions", "A"), flask_cache_utils._tag_index)
+        # Untracked entries are still invalidated through their versioned keys
+        invalidate(cache_tag("portfolio_positions", "A"))
+        self.calls.clear()
+        self.positions("A")
+        self.assertEqual(self.calls, [('positions', 'A')])
+
+    def test_clear_all_caches_resets_tag_index(self):
+        self.positions("A")
+
+        flask_cache_utils.clear_all_caches()
+
+        self.assertEqual(flask_cache_utils._tag_index, {})
+        self.assertEqual(len(flask_cache_utils._indexed_keys), 0)
+
+    def test_global_bump_invalidates_everything(self):
+        self.positions("A")
+        self.calls.clear()
+
+        cache_version.bump_cache_version()
+        self.positions("A")
+
+        self.assertEqual(self.calls, [('positions', 'A')])
+
+    def test_benchmark_rows_cached_until_benchmark_data_invalidated(self):
+        client = MagicMock()
+        client.get_benchmark_data.return_value = [{'date': '2026-01-02', 'close': 100.0}]
+        with patch('streamlit_utils.get_supabase_client', return_value=client):
+            chart_utils._get_benchmark_rows('^GSPC', '2026-01-01', '2026-01-31')
+            chart_utils._get_benchmark_rows('^GSPC', '2026-01-01', '2026-01-31')
+            self.assertEqual(client.get_benchmark_data.call_count, 1)
+
+            invalidate(cache_tag("benchmark_data"))
+            chart_utils._get_benchmark_rows('^GSPC', '2026-01-01', '2026-01-31')
+
+        self.assertEqual(client.get_benchmark_data.call_count, 2)
+
+
+class TestStreamlitTaggedCacheData(CacheVersionTestCase):
+    """Test suite for streamlit_utils.tagged_cache_data."""
+
+    def setUp(self):
+        super().setUp()
+        self.calls = []
+
+        @tagged_cache_data(ttl=None, depends_on=lambda fund, **_: [cache_tag("trade_log", fund)])
+        def trades(fund, _cache_version="v1"):
+            self.calls.append(('trades', fund))
+            return len(self.calls)
+
+        @tagged_cache_data(ttl=None, depends_on=[cache_tag("exchange_rates")])
+        def rates(fund):
+            self.calls.append(('rates', fund))
+            return len(self.calls)
+
+        self.addCleanup(trades.clear)
+        self.addCleanup(rates.clear)
+        self.trades = trades
+        self.rates = rates
+
+    def test_only_related_entries_recomputed(self):
+        self.trades("A")
+        self.trades("B")
+        self.rates("A")
+        self.assertEqual(len(self.calls), 3)  # Functions don't share entries
+        self.calls.clear()
+
+        invalidate(cache_tag("trade_log", "A"))
+        self.trades("A")
+        self.trades("B", _cache_version="v2")
+        self.rates("A")
+
+        self.assertEqual(self.calls, [('trades', 'A')])
+
+    def test_global_bump_invalidates_everything(self):
+        self.trades("A")
+        self.rates("A")
+        self.calls.clear()
+
+        cache_version.bump_cache_version()
+        self.trades("A")
+        self.rates("A")
+
+        self.assertEqual(self.calls, [('trades', 'A'), ('rates', 'A')])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+"""Tests for the partitioned portfolio CSV layout.
+
+Covers the migration script, CSVRepository reads and writes on the
+partitioned layout (data/repositories/csv_partitions.py) and reverting to a
+single file.
+"""
+
+import importlib.util
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+
+import pandas as pd
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from data.models.portfolio import Position, PortfolioSnapshot
+from data.repositories.csv_repository import CSVRepository
+
+_script_path = Path(__file__).parent.parent / "scripts" / "partition_portfolio_csv.py"
+_spec = importlib.util.spec_from_file_location("partition_portfolio_csv", _script_path)
+partition_portfolio_csv = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(partition_portfolio_csv)
+
+
+def _row(date, ticker, price):
+    return {'Date': date, 'Ticker': ticker, 'Shares': 10, 'Average Price': 10.0, 'Cost Basis': 100.0,
+            'Stop Loss': '', 'Current Price': price, 'Total Value': 10 * price, 'PnL': 10 * price - 100,
+            'Action': 'HOLD', 'Company': f'{ticker} Corp', 'Currency': 'USD'}
+
+
+def _position(ticker, price):
+    return Position(ticker=ticker, shares=Decimal('10'), avg_price=Decimal('10'), cost_basis=Decimal('100'),
+                    currency='USD', current_price=Decimal(price), market_value=Decimal(price) * 10)
+
+
+def _summary(snapshots):
+    return [(s.timestamp.date(), sorted((p.ticker, p.current_price) for p in s.positions)) for s in snapshots]
+
+
+class TestPartitionedPortfolio(unittest.TestCase):
+    """Test suite for the partitioned portfolio layout."""
+
+    def setUp(self):
+        self.data_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.data_dir, ignore_errors=True)
+
+        pd.DataFrame([
+            _row('2025-01-30 13:00:00 PST', 'AAA', 11.0),
+            _row('2025-01-31 13:00:00 PST', 'AAA', 12.0),
+            _row('2025-02-03 13:00:00 PST', 'AAA', 13.0),
+            _row('2025-02-03 13:00:00 PST', 'BBB', 5.0),
+            _row('2025-03-03 13:00:00 PST', 'AAA', 14.0),
+        ]).to_csv(self.data_dir / "llm_portfolio_update.csv", index=False)
+        self.before = _summary(CSVRepository("TEST", str(self.data_dir)).get_portfolio_data())
+
+        partition_portfolio_csv.partition_portfolio(self.data_dir)
+        self.repository = CSVRepository("TEST", str(self.data_dir))
+        self.partition_dir = self.data_dir / "portfolio"
+
+    def test_migration_preserves_snapshots(self):
+        self.assertEqual(sorted(p.name for p in self.partition_dir.iterdir()),
+                         ['2025-01.csv', '2025-02.csv', '2025-03.csv', 'manifest.json'])
+        self.assertFalse((self.data_dir / "llm_portfolio_update.csv").exists())
+        self.assertEqual(_summary(self.repository.get_portfolio_data()), self.before)
+        self.assertEqual(_summary(self.repository.iter_portfolio_snapshots(chunksize=2)), self.before)
+
+    def test_date_range_reads_only_needed_partitions(self):
+        (self.partition_dir / "2025-03.csv").write_text("not,a\nportfolio")
+
+        snapshots = self.repository.get_portfolio_data((datetime(2025, 1, 1), datetime(2025, 1, 31, 23)))
+
+        self.assertEqual(_summary(snapshots), self.before[:2])
+
+    def test_replacing_a_day_rewrites_only_its_partition(self):
+        january = (self.partition_dir / "2025-01.csv").read_bytes()
+
+        self.repository.save_portfolio_snapshot(
+            PortfolioSnapshot(positions=[_position('CCC', '7')], timestamp=datetime(2025, 2, 3, 13)))
+        self.repository.update_daily_portfolio_snapshot(
+            PortfolioSnapshot(positions=[_position('CCC', '8'), _position('DDD', '9')],
+                              timestamp=datetime(2025, 2, 3, 14)))
+
+        self.assertEqual((self.partition_dir / "2025-01.csv").read_bytes(), january)
+        self.assertEqual([p.name for p in self.partition_dir.iterdir() if p.name.endswith('.tmp')], [])
+        reloaded = _summary(CSVRepository("TEST", str(self.data_dir)).get_portfolio_data())
+        self.assertEqual(reloaded[2], (datetime(2025, 2, 3).date(), [('CCC', Decimal('8.0')), ('DDD', Decimal('9'))]))
+        self.assertEqual(reloaded[:2] + reloaded[3:], self.before[:2] + self.before[3:])
+
+    def test_new_month_adds_partition(self):
+        self.repository.save_portfolio_snapshot(
+            PortfolioSnapshot(positions=[_position('AAA', '15')], timestamp=datetime(2025, 4, 1, 13)))
+
+        manifest = self.repository.portfolio_partitions.manifest()
+        self.assertEqual(sorted(manifest['partitions']), ['2025-01', '2025-02', '2025-03', '2025-04'])
+        self.assertEqual(manifest['utc_offset'], '-08:00')
+        self.assertEqual(len(self.repository.get_portfolio_data()), len(self.before) + 1)
+
+    def test_revert_to_single_file(self):
+        partition_portfolio_csv.merge_partitions(self.data_dir)
+
+        self.assertFalse(self.repository.portfolio_partitions.exists())
+        self.assertEqual(_summary(CSVRepository("TEST", str(self.data_dir)).get_portfolio_data()), self.before)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+"""Tests for vectorized portfolio CSV loading in CSVRepository.
+
+Covers split_csv_timestamps against the row-by-row parse_csv_timestamp, the
+grouped snapshot building of get_portfolio_data and the chunked
+iter_portfolio_snapshots stream.
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pandas as pd
+
+# Add parent directory to path to import modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from data.repositories.csv_repository import CSVRepository
+from utils.timezone_utils import parse_csv_timestamp, split_csv_timestamps
+
+
+def _row(date, ticker, shares, price):
+    return {'Date': date, 'Ticker': ticker, 'Shares': shares, 'Average Price': 10.0,
+            'Cost Basis': 10.0 * shares, 'Stop Loss': '', 'Current Price': price,
+            'Total Value': '', 'PnL': '', 'Action': 'HOLD', 'Company': f'{ticker} Corp', 'Currency': 'USD'}
+
+
+class TestSplitCsvTimestamps(unittest.TestCase):
+    """Test suite for the vectorized timestamp parser."""
+
+    def test_matches_row_parser(self):
+        values = ['2025-09-10 06:30:00 EST', '2025-07-01 09:30:00 PDT', '2025-01-06 13:00:00 MST',
+                  '2025-03-10 08:00:00 CDT', '2025-08-25 04:00:00+05:30', '2025-02-01 10:00:00 UTC']
+        local, offsets = split_csv_timestamps(pd.Series(values))
+
+        for value, wall_clock, offset in zip(values, local, offsets, strict=True):
+            expected = parse_csv_timestamp(value)
+            self.assertEqual(wall_clock, expected.replace(tzinfo=None))
+            self.assertEqual(offset, expected.utcoffset())
+
+    def test_negative_iso_offset(self):
+        local, offsets = split_csv_timestamps(pd.Series(['2025-08-25 04:00:00-04:00']))
+
+        self.assertEqual(local.iloc[0], pd.Timestamp('2025-08-25 04:00:00'))
+        self.assertEqual(offsets.iloc[0], timedelta(hours=-4))
+
+    def test_missing_and_unrecognized(self):
+        local, offsets = split_csv_timestamps(pd.Series(['2025-01-02', None, 'yesterday']))
+
+        self.assertEqual(local.iloc[0], pd.Timestamp('2025-01-02'))
+        self.assertTrue(pd.notna(offsets.iloc[0]))
+        self.assertTrue(local.iloc[1:].isna().all())
+        self.assertTrue(offsets.iloc[1:].isna().all())
+
+
+class TestPortfolioLoading(unittest.TestCase):
+    """Test suite for building snapshots from the portfolio file."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir, ignore_errors=True)
+        self.repository = CSVRepository(fund_name="TEST", data_directory=self.temp_dir)
+
+        pd.DataFrame([
+            _row('2025-01-06 09:30:00 PST', 'AAA', 10, 11.0),
+            _row('2025-01-06 13:00:00 PST', 'BBB', 5, ''),
+            _row('2025-01-07 13:00:00 PST', 'AAA', 10, 12.0),
+            _row('2025-01-07 13:00:00 PST', 'BBB', 5, 9.5),
+            _row('2025-01-08 13:00:00 PST', 'AAA', 4, 13.0),
+        ]).to_csv(os.path.join(self.temp_dir, 'llm_portfolio_update.csv'), index=False)
+
+    def test_snapshots_grouped_by_day(self):
+        snapshots = self.repository.get_portfolio_data()
+
+        self.assertEqual([len(s.positions) for s in snapshots], [2, 2, 1])
+        self.assertEqual([s.total_value for s in snapshots], [Decimal('110.0'), Decimal('167.5'), Decimal('52.0')])
+        pst = timezone(timedelta(hours=-8))
+        self.assertEqual(snapshots[0].timestamp, datetime(2025, 1, 6, 13, tzinfo=pst))
+        self.assertIsNone(snapshots[0].positions[1].market_value)
+        self.assertEqual(snapshots[1].positions[1].company, 'BBB Corp')
+
+    def test_date_range_filter(self):
+        snapshots = self.repository.get_portfolio_data((datetime(2025, 1, 7), datetime(2025, 1, 8, 23)))
+
+        self.assertEqual([s.timestamp.day for s in snapshots], [7, 8])
+
+    def test_stream_matches_full_load(self):
+        expected = self.repository.get_portfolio_data()
+
+        for chunksize in (1, 2, 3, 100):
+            streamed = list(self.repository.iter_portfolio_snapshots(chunksize=chunksize))
+            self.assertEqual([(s.timestamp, s.total_value, [p.ticker for p in s.positions]) for s in streamed],
+                             [(s.timestamp, s.total_value, [p.ticker for p in s.positions]) for s in expected])
+
+    def test_stream_date_range_and_missing_file(self):
+        streamed = list(self.repository.iter_portfolio_snapshots((datetime(2025, 1, 7), datetime(2025, 1, 7, 23)),
+                                                                 chunksize=2))
+        self.assertEqual([s.timestamp.day for s in streamed], [7])
+
+        empty = CSVRepository(fund_name="EMPTY", data_directory=os.path.join(self.temp_dir, 'empty'))
+        self.assertEqual(list(empty.iter_portfolio_snapshots()), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,203 @@
+"""Unit tests for MarketDataFetcher strategy ordering and hedged fetch mode.
+
+All network strategies are replaced with stubs, so these tests never touch
+Yahoo Finance or Stooq.
+"""
+
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+import pandas as pd
+
+from market_data.data_fetcher import MarketDataFetcher, FetchResult
+from market_data.ticker_resolution import TickerResolutionIndex
+
+
+def _frame(close: float) -> pd.DataFrame:
+    """Build a one-row OHLCV frame."""
+    index = pd.DatetimeIndex([pd.Timestamp('2024-01-02')], name='Date')
+    return pd.DataFrame({'Open': [close], 'High': [close], 'Low': [close],
+                         'Close': [close], 'Volume': [100]}, index=index)
+
+
+def _stub(close=None, delay: float = 0.0, error: bool = False, source: str = "yahoo"):
+    """Build a strategy stub returning data, an empty frame, or raising."""
+    def fetch(*args, **kwargs):
+        time.sleep(delay)
+        if error:
+            raise RuntimeError("network error")
+        if close is None:
+            return FetchResult(pd.DataFrame(), "empty")
+        return FetchResult(_frame(close), source)
+    return Mock(side_effect=fetch)
+
+
+class TestFetchStrategies(unittest.TestCase):
+    """Test suite for sequential and hedged strategy execution."""
+
+    def setUp(self):
+        """Create a fetcher with no cache and stubbed side effects."""
+        with patch.object(MarketDataFetcher, '_load_currency_cache'):
+            self.fetcher = MarketDataFetcher(market_hours=Mock(), resolution_index=TickerResolutionIndex())
+        self.fetcher._fetch_yahoo_data_retry_period = _stub()
+        self.fetcher._fetch_yahoo_data_retry_simple = _stub()
+        self.fetcher._fetch_proxy_data = _stub()
+
+    def test_hedged_takes_first_valid_frame(self):
+        """A slow primary source is overtaken by the next strategy."""
+        self.fetcher._portfolio_currency_cache = {'AAPL': 'USD'}
+        self.fetcher._fetch_yahoo_data = _stub(close=1.0, delay=0.5)
+        self.fetcher._fetch_stooq_pdr = _stub(close=2.0, source="stooq-pdr")
+        self.fetcher._fetch_stooq_csv = _stub()
+        self.fetcher.fetch_mode = 'hedged'
+        self.fetcher.hedge_delay = 0.05
+
+        start = time.monotonic()
+        result = self.fetcher.fetch_price_data('AAPL', pd.Timestamp('2024-01-01'), pd.Timestamp('2024-01-03'))
+        elapsed = time.monotonic() - start
+
+        self.assertEqual(result.df['Close'].iloc[0], 2.0)
+        self.assertIn('stooq-pdr', result.source)
+        self.assertLess(elapsed, 0.4)
+
+    def test_hedged_does_not_prefer_other_listing(self):
+        """A fast .TO variant never beats a slower answer for the ticker itself."""
+        self.fetcher._portfolio_currency_cache = {}
+
+        def yahoo(symbol, *args, **kwargs):
+            if symbol.endswith('.TO'):
+                return FetchResult(_frame(99.0), "yahoo")
+            time.sleep(0.3)
+            return FetchResult(_frame(1.0), "yahoo")
+
+        self.fetcher._fetch_yahoo_data = Mock(side_effect=yahoo)
+        self.fetcher._fetch_stooq_pdr = _stub()
+        self.fetcher._fetch_stooq_csv = _stub()
+        self.fetcher.fetch_mode = 'hedged'
+        self.fetcher.hedge_delay = 0.01
+
+        result = self.fetcher.fetch_price_data('DG', pd.Timestamp('2024-01-01'), pd.Timestamp('2024-01-03'))
+
+        self.assertEqual(result.df['Close'].iloc[0], 1.0)
+        self.assertTrue(result.source.endswith('(yahoo)'))
+
+    def test_hedged_falls_back_when_all_else_empty(self):
+        """The other listing is accepted once higher-priority strategies are empty."""
+        self.fetcher._portfolio_currency_cache = {}
+
+        def yahoo(symbol, *args, **kwargs):
+            if symbol.endswith('.TO'):
+                return FetchResult(_frame(99.0), "yahoo")
+            time.sleep(0.1)
+            return FetchResult(pd.DataFrame(), "empty")
+
+        self.fetcher._fetch_yahoo_data = Mock(side_effect=yahoo)
+        self.fetcher._fetch_stooq_pdr = _stub(error=True)
+        self.fetcher._fetch_stooq_csv = _stub()
+        self.fetcher.fetch_mode = 'hedged'
+        self.fetcher.hedge_delay = 0.01
+
+        result = self.fetcher.fetch_price_data('CGL', pd.Timestamp('2024-01-01'), pd.Timestamp('2024-01-03'))
+
+        self.assertEqual(result.df['Close'].iloc[0], 99.0)
+        self.assertIn('yahoo-ca-to', result.source)
+        self.assertEqual(self.fetcher.resolution_index.resolve('CGL'), 'CGL.TO')
+
+    def test_last_successful_strategy_tried_first(self):
+        """The strategy that succeeded last time is tried first on the next call."""
+        self.fetcher._portfolio_currency_cache = {'XYZ': 'USD'}
+        self.fetcher._fetch_yahoo_data = _stub(error=True)
+        self.fetcher._fetch_stooq_pdr = _stub(close=5.0, source="stooq-pdr")
+        self.fetcher._fetch_stooq_csv = _stub()
+
+        self.fetcher.fetch_price_data('XYZ', pd.Timestamp('2024-01-01'), pd.Timestamp('2024-01-03'))
+        self.assertEqual(self.fetcher._fetch_yahoo_data.call_count, 1)
+
+        result = self.fetcher.fetch_price_data('XYZ', pd.Timestamp('2024-01-01'), pd.Timestamp('2024-01-03'))
+
+        self.assertEqual(result.df['Close'].iloc[0], 5.0)
+        self.assertEqual(self.fetcher._fetch_yahoo_data.call_count, 1)
+
+    def test_resolved_ticker_skips_suffix_probing(self):
+        """Once CGL resolves to CGL.TO, later fetches only try that listing."""
+        self.fetcher._portfolio_currency_cache = {}
+        symbols = []
+
+        def yahoo(symbol, *args, **kwargs):
+            symbols.append(symbol)
+            if symbol == 'CGL.TO':
+                return FetchResult(_frame(99.0), "yahoo")
+            return FetchResult(pd.DataFrame(), "empty")
+
+        self.fetcher._fetch_yahoo_data = Mock(side_effect=yahoo)
+        self.fetcher._fetch_stooq_pdr = _stub()
+        self.fetcher._fetch_stooq_csv = _stub()
+
+        self.fetcher.fetch_price_data('CGL', pd.Timestamp('2024-01-01'), pd.Timestamp('2024-01-03'))
+        symbols.clear()
+        self.fetcher._fetch_stooq_pdr.reset_mock()
+
+        result = self.fetcher.fetch_price_data('CGL', pd.Timestamp('2024-01-01'), pd.Timestamp('2024-01-03'))
+
+        self.assertEqual(result.df['Close'].iloc[0], 99.0)
+        self.assertEqual(symbols, ['CGL.TO'])
+        self.assertEqual(self.fetcher._fetch_stooq_pdr.call_count, 0)
+        resolution = self.fetcher.resolution_index.get('CGL')
+        self.assertEqual((resolution.exchange, resolution.currency, resolution.source), ('TSX', 'CAD', 'yahoo'))
+
+    def test_bare_resolution_ignored_for_cad_holding(self):
+        """A listing resolved for a USD holding is not reused for a CAD holding."""
+        self.fetcher.resolution_index.record('DG', symbol='DG', currency='USD', source='yahoo')
+        self.fetcher._portfolio_currency_cache = {'DG': 'CAD'}
+        symbols = []
+
+        def yahoo(symbol, *args, **kwargs):
+            symbols.append(symbol)
+            return FetchResult(_frame(99.0 if symbol == 'DG.TO' else 1.0), "yahoo")
+
+        self.fetcher._fetch_yahoo_data = Mock(side_effect=yahoo)
+        self.fetcher._fetch_stooq_pdr = _stub()
+        self.fetcher._fetch_stooq_csv = _stub()
+
+        result = self.fetcher.fetch_price_data('DG', pd.Timestamp('2024-01-01'), pd.Timestamp('2024-01-03'))
+
+        self.assertEqual(result.df['Close'].iloc[0], 99.0)
+        self.assertEqual(symbols, ['DG.TO'])
+
+    def test_cad_resolution_ignored_for_usd_holding(self):
+        """A Canadian listing resolved for another fund is not reused for a USD holding."""
+        self.fetcher.resolution_index.record('DG', symbol='DG.TO', source='yahoo')
+        self.fetcher._portfolio_currency_cache = {'DG': 'USD'}
+        symbols = []
+
+        def yahoo(symbol, *args, **kwargs):
+            symbols.append(symbol)
+            return FetchResult(_frame(99.0 if symbol == 'DG.TO' else 1.0), "yahoo")
+
+        self.fetcher._fetch_yahoo_data = Mock(side_effect=yahoo)
+        self.fetcher._fetch_stooq_pdr = _stub()
+        self.fetcher._fetch_stooq_csv = _stub()
+
+        result = self.fetcher.fetch_price_data('DG', pd.Timestamp('2024-01-01'), pd.Timestamp('2024-01-03'))
+
+        self.assertEqual(result.df['Close'].iloc[0], 1.0)
+        self.assertEqual(symbols, ['DG'])
+
+    def test_all_strategies_fail(self):
+        """Hedged mode reports failure when no strategy returns data."""
+        self.fetcher._portfolio_currency_cache = {'NOPE': 'USD'}
+        self.fetcher._fetch_yahoo_data = _stub(error=True)
+        self.fetcher._fetch_stooq_pdr = _stub()
+        self.fetcher._fetch_stooq_csv = _stub()
+        self.fetcher.fetch_mode = 'hedged'
+        self.fetcher.hedge_delay = 0.01
+
+        result = self.fetcher.fetch_price_data('NOPE', pd.Timestamp('2024-01-01'), pd.Timestamp('2024-01-03'))
+
+        self.assertTrue(result.df.empty)
+        self.assertEqual(result.source, "failed")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,215 @@
+"""Tests and benchmarks for the vectorized ETF holdings diff engine.
+
+The vectorized engine must produce exactly what the row-by-row engine it
+replaced did; ``_row_by_row_diff`` below is that engine, kept as the
+reference. Benchmarks need pytest-benchmark and are skipped without it.
+"""
+
+import math
+import os
+import sys
+from collections import Counter
+from decimal import Decimal
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# Add web_dashboard to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'web_dashboard')))
+
+from etf_diff_engine import (
+    MIN_PERCENT_CHANGE,
+    MIN_SHARE_CHANGE,
+    calculate_diff,
+    calculate_diffs,
+    is_stock_ticker,
+    percent_bins,
+    stock_ticker_mask,
+)
+
+
+def _row_by_row_diff(today, yesterday, etf_ticker):
+    """The original calculate_diff (iterrows / apply), used as the reference."""
+    if 'shares' in yesterday.columns:
+        yesterday = yesterday.copy()
+        yesterday['shares'] = pd.to_numeric(yesterday['shares'], errors='coerce').astype(float)
+    merged = today.merge(yesterday, on='ticker', how='outer', suffixes=('_now', '_prev'))
+    merged['shares_now'] = merged['shares_now'].fillna(0)
+    merged['shares_prev'] = merged['shares_prev'].fillna(0)
+    merged['shares_now'] = pd.to_numeric(merged['shares_now'], errors='coerce').astype(float).fillna(0)
+    merged['shares_prev'] = pd.to_numeric(merged['shares_prev'], errors='coerce').astype(float).fillna(0)
+    merged['share_diff'] = merged['shares_now'] - merged['shares_prev']
+    merged['percent_change'] = ((merged['share_diff'] / merged['shares_prev']) * 100).replace([float('inf'), -float('inf')], 100)
+    significant = merged[
+        (merged['share_diff'].abs() >= MIN_SHARE_CHANGE) |
+        (merged['percent_change'].abs() >= MIN_PERCENT_CHANGE)
+    ].copy()
+    significant = significant[significant['ticker'].apply(is_stock_ticker)].copy()
+    if len(significant) == 0:
+        return []
+    if len(significant) > 5:
+        rounded_pcts = [round(abs(row['percent_change']), 1) for _, row in significant.iterrows()]
+        most_common_pct, most_common_count = Counter(rounded_pcts).most_common(1)[0]
+        if most_common_count >= len(significant) * 0.8 and most_common_pct <= 2.0:
+            if (all(row['share_diff'] > 0 for _, row in significant.iterrows()) or
+                    all(row['share_diff'] < 0 for _, row in significant.iterrows())):
+                return []
+    significant['etf'] = etf_ticker
+    significant['action'] = significant['share_diff'].apply(lambda x: 'BUY' if x > 0 else 'SELL')
+    return significant.to_dict('records')
+
+
+def _normalized(records):
+    """Records with NaN as None and numbers as float, so they compare by value."""
+    def value(v):
+        if isinstance(v, (int, float, Decimal, np.integer, np.floating)) and not isinstance(v, bool):
+            return None if math.isnan(float(v)) else float(v)
+        return v
+    return [{key: value(v) for key, v in record.items()} for record in records]
+
+
+def _holdings(count, seed, adjustment=None):
+    """An IWM-sized day: today's holdings and the previous snapshot as the DB returns it.
+
+    Includes duplicate, removed and new tickers plus cash/futures rows. With
+    ``adjustment`` every holding changes by that fraction instead of trading.
+    """
+    rng = np.random.default_rng(seed)
+    tickers = [f"T{i:04d}" for i in range(count)] + ['USD', 'ESH6', 'XX_USD', '12345', 'VERYLONGTICKER1']
+    shares_prev = rng.integers(10_000, 2_000_000, len(tickers)).astype(float)
+    if adjustment is None:
+        shares_now = shares_prev * rng.choice([1, 1, 1, 1.01, 0.97, 1.2, 0.995, 0.0001], len(tickers))
+    else:
+        shares_now = np.round(shares_prev * (1 + adjustment))
+    today = pd.DataFrame({
+        'ticker': tickers,
+        'name': [f"{ticker} Inc" for ticker in tickers],
+        'shares': shares_now,
+        'weight_percent': rng.random(len(tickers)),
+        'sector': 'Technology',
+    })
+    previous = pd.DataFrame({
+        'ticker': tickers,
+        'shares': [Decimal(str(shares)) for shares in shares_prev],
+        'weight_percent': [Decimal('0.0333')] * len(tickers),
+    })
+    if adjustment is None:
+        new = pd.DataFrame({'ticker': ['NEW1', 'NEW2'], 'name': ['New 1', 'New 2'], 'shares': [5000.0, 10.0],
+                            'weight_percent': [0.1, 0.1], 'sector': 'Health Care'})
+        today = pd.concat([today.iloc[5:], today.iloc[:3], new], ignore_index=True)
+    return today, previous
+
+
+class TestStockTickerMask:
+    """Test the vectorized stock-ticker filter."""
+
+    def test_matches_is_stock_ticker(self):
+        tickers = pd.Series(['AAPL', 'brk.b', 'USD', 'esh6', 'ABC_USD', 'SWAPX', 'SPYFWD', '12345', '',
+                             '  ', ' msft ', 'VERYLONGTICKER', None, float('nan'), 123, 'cashcollateral'],
+                            dtype=object)
+
+        expected = [is_stock_ticker(ticker) for ticker in tickers]
+
+        assert stock_ticker_mask(tickers).tolist() == expected
+
+    def test_non_string_column(self):
+        assert stock_ticker_mask(pd.Series([1.0, float('nan')])).tolist() == [False, False]
+
+
+class TestPercentBins:
+    """Test 0.1% binning against round()."""
+
+    def test_matches_round(self):
+        rng = np.random.default_rng(7)
+        values = np.concatenate([
+            [0.05, 0.15, 0.25, 0.35, 0.45, 1.45, 2.05, 2.15, -0.15, -1.25, 0.0, 100.0],
+            np.round(rng.uniform(-5, 5, 5000), 2),
+            rng.uniform(-300, 300, 5000),
+        ])
+
+        # iterrows() on the mixed-type merge yields Python floats, so round() is Python's
+        expected = [int(round(round(abs(float(value)), 1) * 10)) for value in values]
+
+        assert percent_bins(values).tolist() == expected
+
+
+class TestCalculateDiff:
+    """Test the vectorized engine against the row-by-row engine."""
+
+    @pytest.mark.parametrize('seed', range(4))
+    def test_trading_day_matches(self, seed):
+        today, previous = _holdings(3000, seed)
+
+        expected = _row_by_row_diff(today, previous, 'IWM')
+        result = calculate_diff(today, previous, 'IWM')
+
+        assert expected
+        assert _normalized(result) == _normalized(expected)
+
+    @pytest.mark.parametrize('adjustment', [-0.005, 0.003, -0.015])
+    def test_systematic_adjustment_filtered(self, adjustment):
+        today, previous = _holdings(3000, 11, adjustment)
+
+        assert _row_by_row_diff(today, previous, 'IWM') == []
+        assert calculate_diff(today, previous, 'IWM') == []
+
+    def test_large_uniform_change_is_trading(self):
+        today, previous = _holdings(500, 12, -0.05)
+
+        expected = _row_by_row_diff(today, previous, 'ARKK')
+
+        assert expected
+        assert _normalized(calculate_diff(today, previous, 'ARKK')) == _normalized(expected)
+
+    def test_combined_day_matches_per_etf(self):
+        days, previous = {}, {}
+        for i, etf_ticker in enumerate(['IWM', 'ARKK', 'XBI', 'IVV', 'BOTZ']):
+            days[etf_ticker], previous[etf_ticker] = _holdings(300 + 400 * i, 20 + i, -0.005 if i == 2 else None)
+        # Providers don't all report the same columns
+        days['ARKK'] = days['ARKK'].drop(columns=['weight_percent'])
+        days['IVV'] = days['IVV'].assign(market_value=1.0)
+
+        result = calculate_diffs(days, previous)
+
+        assert list(result) == list(days)
+        assert result['XBI'] == []
+        for etf_ticker in days:
+            expected = _row_by_row_diff(days[etf_ticker], previous[etf_ticker], etf_ticker)
+            assert _normalized(result[etf_ticker]) == _normalized(expected)
+
+    def test_first_snapshot(self):
+        today, _ = _holdings(10, 30)
+        empty = pd.DataFrame(columns=['ticker', 'shares', 'weight_percent'])
+
+        assert _normalized(calculate_diff(today, empty, 'LIT')) == _normalized(_row_by_row_diff(today, empty, 'LIT'))
+
+
+def _benchmark(request):
+    try:
+        return request.getfixturevalue('benchmark')
+    except pytest.FixtureLookupError:
+        pytest.skip("pytest-benchmark plugin not installed")
+
+
+def test_benchmark_row_by_row_iwm(request):
+    """Benchmark the reference engine on a 3,000-holding ETF (baseline)."""
+    benchmark = _benchmark(request)
+    today, previous = _holdings(3000, 1)
+    benchmark(_row_by_row_diff, today, previous, 'IWM')
+
+
+def test_benchmark_vectorized_iwm(request):
+    """Benchmark the vectorized engine on a 3,000-holding ETF."""
+    benchmark = _benchmark(request)
+    today, previous = _holdings(3000, 1)
+    benchmark(calculate_diff, today, previous, 'IWM')
+
+
+def test_benchmark_vectorized_day(request):
+    """Benchmark a day of 30 ETFs with 3,000 holdings each as one frame."""
+    benchmark = _benchmark(request)
+    days, previous = {}, {}
+    for i in range(30):
+        days[f"ETF{i}"], previous[f"ETF{i}"] = _holdings(3000, 100 + i, -0.005 if i % 3 == 0 else None)
+    benchmark(calculate_diffs, days, previous)
@@ -0,0 +1,157 @@
+"""Unit tests for the ETF Watchtower fetch and load paths.
+
+Provider downloads and the Research DB are fakes, so no network or database
+is needed.
+"""
+
+import csv
+import io
+import os
+import sys
+import threading
+import time
+import unittest
+from collections import defaultdict
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+
+# Add web_dashboard to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'web_dashboard')))
+
+from rss_pipeline import DomainLimiter, domain_of
+from scheduler import jobs_etf_watchtower as watchtower
+
+TODAY = datetime(2025, 3, 4, 5, tzinfo=timezone.utc)
+
+
+class TestFetchAllHoldings(unittest.TestCase):
+    """Test suite for concurrent holdings downloads."""
+
+    def setUp(self):
+        self.active = defaultdict(int)
+        self.peak = defaultdict(int)
+        self.lock = threading.Lock()
+
+    def _fetcher(self, delay=0.1, fail=()):
+        def fetch(etf_ticker, url, date):
+            host = domain_of(url)
+            with self.lock:
+                self.active[host] += 1
+                self.peak[host] = max(self.peak[host], self.active[host])
+            time.sleep(delay)
+            with self.lock:
+                self.active[host] -= 1
+            if etf_ticker in fail:
+                raise ConnectionError("offline")
+            return pd.DataFrame({'ticker': [f"{etf_ticker}1"], 'shares': [100.0]})
+        return fetch
+
+    def test_hosts_download_concurrently(self):
+        """ETFs on different hosts don't wait on each other."""
+        configs = {f"ETF{i}": {'provider': 'Fake', 'url': f"https://host{i}.example.com/etf{i}.csv"}
+                   for i in range(6)}
+
+        with patch.dict(watchtower.PROVIDER_FETCHERS, {'Fake': self._fetcher(0.2)}):
+            start = time.monotonic()
+            results = watchtower.fetch_all_holdings(configs, TODAY, max_workers=6,
+                                                    limiter=DomainLimiter(max_concurrent=2, min_interval=0))
+            elapsed = time.monotonic() - start
+
+        self.assertEqual(sorted(results), sorted(configs))
+        self.assertLess(elapsed, 0.6)
+
+    def test_per_host_limit(self):
+        """At most max_concurrent downloads run against one host."""
+        configs = {f"ETF{i}": {'provider': 'Fake', 'url': f"https://provider.example.com/etf{i}.csv"}
+                   for i in range(6)}
+
+        with patch.dict(watchtower.PROVIDER_FETCHERS, {'Fake': self._fetcher(0.05)}):
+            watchtower.fetch_all_holdings(configs, TODAY, max_workers=6,
+                                          limiter=DomainLimiter(max_concurrent=2, min_interval=0))
+
+        self.assertEqual(self.peak['provider.example.com'], 2)
+
+    def test_failures_and_unknown_providers(self):
+        """A failed download maps to None; unsupported providers are left out."""
+        configs = {
+            'GOOD': {'provider': 'Fake', 'url': "https://a.example.com/good.csv"},
+            'BAD': {'provider': 'Fake', 'url': "https://b.example.com/bad.csv"},
+            'NEW': {'provider': 'Unknown', 'url': "https://c.example.com/new.csv"},
+        }
+
+        with patch.dict(watchtower.PROVIDER_FETCHERS, {'Fake': self._fetcher(0, fail={'BAD'})}):
+            results = watchtower.fetch_all_holdings(configs, TODAY, limiter=DomainLimiter(min_interval=0))
+
+        self.assertEqual(set(results), {'GOOD', 'BAD'})
+        self.assertIsNone(results['BAD'])
+        self.assertEqual(results['GOOD']['ticker'].tolist(), ['GOOD1'])
+
+
+class TestPreviousHoldings(unittest.TestCase):
+    """Test suite for loading previous snapshots."""
+
+    def test_one_query_for_all_etfs(self):
+        pc = MagicMock()
+        pc.execute_query.return_value = [
+            {'etf_ticker': 'ARKK', 'date': '2025-03-03', 'holding_ticker': 'TSLA', 'shares_held': 10, 'weight_percent': 5},
+            {'etf_ticker': 'ARKK', 'date': '2025-03-03', 'holding_ticker': 'ROKU', 'shares_held': 20, 'weight_percent': 3},
+            {'etf_ticker': 'IVV', 'date': '2025-02-28', 'holding_ticker': 'AAPL', 'shares_held': 30, 'weight_percent': 7},
+        ]
+
+        previous = watchtower.get_previous_holdings_bulk(pc, ['ARKK', 'IVV', 'XBI'], TODAY)
+
+        pc.execute_query.assert_called_once()
+        self.assertEqual(pc.execute_query.call_args.args[1], (['ARKK', 'IVV', 'XBI'], '2025-03-04'))
+        self.assertEqual(previous['ARKK']['ticker'].tolist(), ['TSLA', 'ROKU'])
+        self.assertEqual(list(previous['IVV'].columns), ['ticker', 'shares', 'weight_percent'])
+        self.assertTrue(previous['XBI'].empty)
+
+    def test_query_error_returns_empty_holdings(self):
+        pc = MagicMock()
+        pc.execute_query.side_effect = RuntimeError("connection reset")
+
+        previous = watchtower.get_previous_holdings(pc, 'ARKK', TODAY)
+
+        self.assertTrue(previous.empty)
+
+
+class TestSaveHoldingsSnapshot(unittest.TestCase):
+    """Test suite for the COPY-based snapshot write."""
+
+    def setUp(self):
+        self.cursor = MagicMock()
+        self.copied = None
+
+        def copy_expert(sql, buffer):
+            self.copied = list(csv.reader(io.StringIO(buffer.read())))
+        self.cursor.copy_expert.side_effect = copy_expert
+
+        conn = MagicMock()
+        conn.cursor.return_value = self.cursor
+        self.pc = MagicMock()
+        self.pc.get_connection.return_value.__enter__.return_value = conn
+
+    def test_copies_aggregated_rows_then_merges(self):
+        holdings = pd.DataFrame({
+            'ticker': ['AAA', 'BBB', 'AAA', None],
+            'name': ['Alpha', None, 'Alpha B', 'Nothing'],
+            'shares': [100, 0, 50, 10],
+            'weight_percent': [1.5, 0.0, 0.5, 1.0],
+        })
+
+        watchtower.save_holdings_snapshot(self.pc, 'TEST', holdings, TODAY)
+
+        self.assertEqual(self.copied, [
+            ['2025-03-04', 'TEST', 'AAA', 'Alpha', '150.0', '2.0'],
+            ['2025-03-04', 'TEST', 'BBB', '', '', ''],
+        ])
+        statements = [call.args[0] for call in self.cursor.execute.call_args_list]
+        self.assertIn("CREATE TEMP TABLE etf_holdings_staging", statements[0])
+        self.assertIn("ON CONFLICT (date, etf_ticker, holding_ticker)", statements[1])
+        self.cursor.executemany.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -146,3 +146,72 @@ def test_logs_debug_allows_admin_access(client):
         assert 'user_id' in data
         assert 'is_admin' in data
         assert data['is_admin'] is True
+
+
+def test_ticker_price_history_shared_across_users(client, app):
+    """Users with access get the same shared cache entry (fetched once)."""
+    import pandas as pd
+    from flask_cache_utils import SimpleCache
+
+    view_globals = app.view_functions['api_ticker_price_history'].__wrapped__.__globals__
+    price_df = pd.DataFrame({'date': pd.to_datetime(['2025-01-02', '2025-01-03']),
+                             'price': [10.0, 11.0], 'normalized': [100.0, 110.0]})
+
+    with patch('auth.auth_manager.verify_session') as mock_verify, \
+         patch('auth.is_admin', return_value=False), \
+         patch('ticker_utils.get_ticker_price_history', return_value=price_df) as mock_history, \
+         patch('flask_cache_utils._get_cache', return_value=SimpleCache()), \
+         patch.dict(view_globals, {
+             '_get_user_funds_cached': lambda user_id: ['Fund A'],
+             '_get_shared_supabase_client': lambda: MagicMock(),
+         }):
+        client.set_cookie('auth_token', 'test.token.value')
+        responses = []
+        for user_id in ('user-1', 'user-2'):
+            mock_verify.return_value = {'user_id': user_id, 'email': f'{user_id}@example.com'}
+            responses.append(client.get('/api/v2/ticker/price-history?ticker=SHRD&days=30&fund=Fund A'))
+
+    assert [r.status_code for r in responses] == [200, 200]
+    assert responses[0].get_json() == responses[1].get_json()
+    assert mock_history.call_count == 1
+
+
+def test_ticker_price_history_denies_other_fund(client, app):
+    """The authorization tier rejects funds the user isn't assigned to."""
+    view_globals = app.view_functions['api_ticker_price_history'].__wrapped__.__globals__
+
+    with patch('auth.auth_manager.verify_session') as mock_verify, \
+         patch('auth.is_admin', return_value=False), \
+         patch('ticker_utils.get_ticker_price_history') as mock_history, \
+         patch.dict(view_globals, {'_get_user_funds_cached': lambda user_id: ['Fund A']}):
+        mock_verify.return_value = {'user_id': 'user-1', 'email': 'user-1@example.com'}
+        client.set_cookie('auth_token', 'test.token.value')
+
+        response = client.get('/api/v2/ticker/price-history?ticker=SHRD&fund=Fund B')
+
+    assert response.status_code == 403
+    mock_history.assert_not_called()
+
+
+def test_ticker_price_history_scoped_to_user_funds(client, app):
+    """Without a fund filter, a non-admin only reads positions of their own funds."""
+    import pandas as pd
+    from flask_cache_utils import SimpleCache
+
+    view_globals = app.view_functions['api_ticker_price_history'].__wrapped__.__globals__
+
+    with patch('auth.auth_manager.verify_session') as mock_verify, \
+         patch('auth.is_admin', return_value=False), \
+         patch('ticker_utils.get_ticker_price_history', return_value=pd.DataFrame()) as mock_history, \
+         patch('flask_cache_utils._get_cache', return_value=SimpleCache()), \
+         patch.dict(view_globals, {
+             '_get_user_funds_cached': lambda user_id: ['Fund A'],
+             '_get_shared_supabase_client': lambda: MagicMock(),
+         }):
+        mock_verify.return_value = {'user_id': 'user-1', 'email': 'user-1@example.com'}
+        client.set_cookie('auth_token', 'test.token.value')
+
+        response = client.get('/api/v2/ticker/price-history?ticker=SCOPE&days=30')
+
+    assert response.status_code == 200
+    assert mock_history.call_args.kwargs['funds'] == ('Fund A',)
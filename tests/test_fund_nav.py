@@ -0,0 +1,324 @@
+"""Tests for the fund_nav_daily store (web_dashboard/fund_nav.py).
+
+Supabase is replaced by a small in-memory table store that evaluates the
+filters the module uses, so no database is needed.
+"""
+
+import os
+import sys
+import unittest
+from collections import defaultdict
+from datetime import datetime
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+
+# Add web_dashboard to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'web_dashboard')))
+
+import portfolio_daily_totals
+from fund_nav import build_nav_rows, get_nav_history, next_nav_row, rebuild_fund_nav, update_fund_nav
+
+
+class FakeQuery:
+    def __init__(self, store, table):
+        self.store = store
+        self.table = table
+        self.predicates = []
+        self.order_by = []
+        self.row_limit = None
+        self.action = 'select'
+        self.payload = None
+
+    def select(self, columns):
+        return self
+
+    def eq(self, column, value):
+        self.predicates.append(lambda row: row[column] == value)
+        return self
+
+    def lt(self, column, value):
+        self.predicates.append(lambda row: row[column] < value)
+        return self
+
+    def gt(self, column, value):
+        self.predicates.append(lambda row: row[column] > value)
+        return self
+
+    def gte(self, column, value):
+        self.predicates.append(lambda row: row[column] >= value)
+        return self
+
+    def in_(self, column, values):
+        self.predicates.append(lambda row: row[column] in values)
+        return self
+
+    def order(self, column, desc=False):
+        self.order_by.append((column, desc))
+        return self
+
+    def limit(self, count):
+        self.row_limit = count
+        return self
+
+    def range(self, start, end):
+        return self
+
+    def upsert(self, rows, on_conflict=None):
+        self.action, self.payload = 'upsert', rows
+        return self
+
+    def delete(self):
+        self.action = 'delete'
+        return self
+
+    def execute(self):
+        self.store.requests.append((self.table, self.action))
+        rows = self.store.tables[self.table]
+        if self.action == 'upsert':
+            for new in self.payload:
+                rows[:] = [r for r in rows if (r['fund'], r['date']) != (new['fund'], new['date'])]
+                rows.append(dict(new))
+            return type('Result', (), {'data': self.payload})()
+        matched = [r for r in rows if all(p(r) for p in self.predicates)]
+        if self.action == 'delete':
+            rows[:] = [r for r in rows if r not in matched]
+            return type('Result', (), {'data': matched})()
+        for column, desc in reversed(self.order_by):
+            matched.sort(key=lambda r: r.get(column) or 0, reverse=desc)
+        return type('Result', (), {'data': [dict(r) for r in matched[:self.row_limit]]})()
+
+
+class FakeRpc:
+    """get_portfolio_daily_totals over the fake portfolio_positions table."""
+
+    def __init__(self, store, params):
+        self.store = store
+        self.params = params
+
+    def limit(self, count):
+        return self
+
+    def execute(self):
+        days = defaultdict(lambda: defaultdict(float))
+        for row in self.store.tables['portfolio_positions']:
+            if row['fund'] != self.params['fund_name']:
+                continue
+            if self.params['start_at'] and row['date'] < self.params['start_at']:
+                continue
+            totals = days[row['date'][:10]]
+            # SUM() skips NULLs, COUNT(total_value_base) counts pre-converted rows
+            for column in ('total_value_base', 'cost_basis_base', 'total_value', 'cost_basis'):
+                totals[column] += row.get(column) or 0
+            totals['position_count'] += 1
+            totals['preconverted_count'] += row['total_value_base'] is not None
+        data = [dict(date=day, pnl=0, pnl_base=0, **totals)
+                for day, totals in sorted(days.items())]
+        return type('Result', (), {'data': data})()
+
+
+class FakeSupabase:
+    def __init__(self):
+        self.tables = defaultdict(list)
+        self.requests = []
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+    def rpc(self, name, params):
+        return FakeRpc(self, params)
+
+
+def _contribution(timestamp, amount, kind='CONTRIBUTION'):
+    return {'timestamp': timestamp, 'amount': amount, 'contribution_type': kind, 'fund': 'F'}
+
+
+def _position(day, value, cost, currency='CAD', preconverted=True):
+    """A position row; without pre-converted values only the raw columns are set."""
+    return {'fund': 'F', 'date': f"{day}T20:00:00", 'currency': currency,
+            'total_value': value, 'cost_basis': cost,
+            'total_value_base': value if preconverted else None,
+            'cost_basis_base': cost if preconverted else None}
+
+
+class TestNavRows(unittest.TestCase):
+    """Test suite for the unit accounting."""
+
+    def test_units_issued_at_previous_nav(self):
+        contributions = [
+            _contribution('2024-01-01T10:00:00', 1000),
+            _contribution('2024-01-03T10:00:00', 1100),
+        ]
+        rows = build_nav_rows('F', [('2024-01-01', 1000, 1000), ('2024-01-02', 1100, 1000),
+                                    ('2024-01-03', 2310, 2100)], contributions)
+
+        self.assertEqual([r['units_outstanding'] for r in rows], [1000.0, 1000.0, 2000.0])
+        self.assertEqual([r['nav_per_unit'] for r in rows], [1.0, 1.1, 1.155])
+        self.assertEqual(rows[-1]['net_contributions'], 2100.0)
+
+    def test_uninvested_cash_counts_towards_nav(self):
+        row = next_nav_row('F', '2024-01-01', 500, 500, None, [_contribution('2024-01-01', 1000)])
+
+        self.assertEqual(row['nav_per_unit'], 1.0)
+
+    def test_withdrawal_redeems_units_capped(self):
+        previous = {'date': '2024-01-01', 'units_outstanding': 100, 'net_contributions': 100, 'nav_per_unit': 2.0}
+        row = next_nav_row('F', '2024-01-02', 0, 0, previous, [_contribution('2024-01-02', 500, 'WITHDRAWAL')])
+
+        self.assertEqual(row['units_outstanding'], 0.0)
+        self.assertIsNone(row['nav_per_unit'])
+
+    def test_weekend_contributions_applied_on_next_row(self):
+        contributions = [_contribution('2024-01-05', 1000), _contribution('2024-01-06', 500)]
+        rows = build_nav_rows('F', [('2024-01-05', 1000, 1000), ('2024-01-08', 1500, 1500)], contributions)
+
+        self.assertEqual([r['units_outstanding'] for r in rows], [1000.0, 1500.0])
+
+
+class TestNavStore(unittest.TestCase):
+    """Test suite for maintaining and reading fund_nav_daily."""
+
+    def setUp(self):
+        patcher = patch.object(portfolio_daily_totals, '_rpc_missing', False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.supabase = FakeSupabase()
+        self.supabase.tables['fund_contributions'] = [
+            _contribution('2024-01-02T10:00:00', 1000),
+            _contribution('2024-01-06T10:00:00', 1200),
+            _contribution('2024-01-10T10:00:00', 300, 'WITHDRAWAL'),
+        ]
+        self.days = [('2024-01-02', 1000, 1000), ('2024-01-03', 1100, 1000), ('2024-01-05', 1200, 1000),
+                     ('2024-01-08', 2500, 2200), ('2024-01-09', 2600, 2200), ('2024-01-10', 2300, 1900)]
+        self.supabase.tables['portfolio_positions'] = [_position(*day) for day in self.days]
+
+    def test_daily_updates_match_rebuild(self):
+        """Appending day by day gives the same rows as a full rebuild."""
+        for day, value, cost in self.days:
+            update_fund_nav(self.supabase, 'F', day, value, cost, 'CAD')
+        incremental = sorted(self.supabase.tables['fund_nav_daily'], key=lambda r: r['date'])
+
+        self.supabase.tables['fund_nav_daily'] = []
+        rebuilt = rebuild_fund_nav(self.supabase, 'F', base_currency='CAD')
+
+        self.assertEqual(incremental, rebuilt)
+        self.assertEqual(len(rebuilt), len(self.days))
+
+    def test_rebuild_converts_days_without_preconverted_values(self):
+        """Older rows with NULL *_base columns are converted at that day's rate."""
+        self.supabase.tables['portfolio_positions'] = [
+            _position('2024-01-02', 400, 400),
+            _position('2024-01-02', 500, 450, 'USD', preconverted=False),
+            _position('2024-01-03', 600, 500, 'USD', preconverted=False),
+            _position('2024-01-05', 1000, 1000),
+        ]
+        self.supabase.tables['exchange_rates'] = [
+            {'timestamp': '2024-01-01T00:00:00', 'from_currency': 'USD', 'to_currency': 'CAD', 'rate': 1.3},
+            {'timestamp': '2024-01-03T00:00:00', 'from_currency': 'CAD', 'to_currency': 'USD', 'rate': 0.8},
+        ]
+
+        rows = {r['date']: r for r in rebuild_fund_nav(self.supabase, 'F', base_currency='CAD')}
+
+        # 2024-01-02 uses the earlier USD->CAD rate, 2024-01-03 the inverted CAD->USD rate
+        self.assertAlmostEqual(rows['2024-01-02']['total_value'], 400 + 500 * 1.3)
+        self.assertAlmostEqual(rows['2024-01-02']['cost_basis'], 400 + 450 * 1.3)
+        self.assertAlmostEqual(rows['2024-01-03']['total_value'], 600 / 0.8)
+        self.assertEqual(rows['2024-01-05']['total_value'], 1000)
+
+    def test_day_without_exchange_rate_is_not_stored(self):
+        self.supabase.tables['portfolio_positions'] = [
+            _position('2024-01-02', 1000, 1000),
+            _position('2024-01-03', 500, 450, 'USD', preconverted=False),
+            _position('2024-01-05', 1200, 1000),
+        ]
+
+        rows = rebuild_fund_nav(self.supabase, 'F', base_currency='CAD')
+
+        self.assertEqual([r['date'] for r in rows], ['2024-01-02', '2024-01-05'])
+
+    def test_rebuild_without_rpc_converts_per_row(self):
+        self.supabase.tables['portfolio_positions'] = [
+            _position('2024-01-02', 400, 400),
+            _position('2024-01-02', 500, 450, 'USD', preconverted=False),
+        ]
+        self.supabase.tables['exchange_rates'] = [
+            {'timestamp': '2024-01-02T00:00:00', 'from_currency': 'USD', 'to_currency': 'CAD', 'rate': 1.3},
+        ]
+
+        with patch.object(portfolio_daily_totals, '_rpc_missing', True):
+            rows = rebuild_fund_nav(self.supabase, 'F', base_currency='CAD')
+
+        self.assertAlmostEqual(rows[0]['total_value'], 400 + 500 * 1.3)
+
+    def test_update_of_past_day_rebuilds_later_rows(self):
+        rebuild_fund_nav(self.supabase, 'F')
+        self.supabase.tables['portfolio_positions'] = [
+            _position('2024-01-03', 1500, 1000) if p['date'].startswith('2024-01-03') else p
+            for p in self.supabase.tables['portfolio_positions']
+        ]
+
+        update_fund_nav(self.supabase, 'F', '2024-01-03', 1500, 1000)
+
+        rows = {r['date']: r for r in self.supabase.tables['fund_nav_daily']}
+        self.assertEqual(rows['2024-01-03']['nav_per_unit'], 1.5)
+        # The Jan 6 contribution is now issued at the higher NAV of Jan 5
+        self.assertEqual(rows['2024-01-08']['units_outstanding'], round(1000 + 1200 / 1.2, 6))
+
+    def test_rebuild_from_start_keeps_earlier_rows(self):
+        rebuild_fund_nav(self.supabase, 'F')
+        before = {r['date']: r for r in self.supabase.tables['fund_nav_daily']}
+        self.supabase.requests.clear()
+
+        rows = rebuild_fund_nav(self.supabase, 'F', '2024-01-08')
+
+        self.assertEqual([r['date'] for r in rows], ['2024-01-08', '2024-01-09', '2024-01-10'])
+        self.assertEqual(rows, [before[r['date']] for r in rows])
+
+    def test_nav_history_reads_requested_dates_only(self):
+        rebuild_fund_nav(self.supabase, 'F')
+        self.supabase.requests.clear()
+
+        values, cost_basis = get_nav_history(self.supabase, 'F', [
+            datetime(2024, 1, 3, 15), datetime(2024, 1, 7), '2024-01-20'
+        ])
+
+        self.assertEqual(values, {'2024-01-03': 1100.0, '2024-01-07': 1200.0, '2024-01-20': 2300.0})
+        self.assertEqual(cost_basis['2024-01-07'], 1000.0)
+        # One windowed read, plus a closest-row lookup for the date 10 days after the last row
+        self.assertEqual(len(self.supabase.requests), 2)
+
+    def test_nav_history_none_without_store(self):
+        self.assertIsNone(get_nav_history(self.supabase, 'F', ['2024-01-03']))
+
+
+class TestPositionCalculatorHistory(unittest.TestCase):
+    """PositionCalculator reads historical values from the repository's NAV store."""
+
+    def test_uses_nav_store_when_available(self):
+        from portfolio.position_calculator import PositionCalculator
+
+        repository = MagicMock()
+        repository.get_fund_nav_history.return_value = ({'2024-01-03': Decimal('1100')}, {'2024-01-03': Decimal('1000')})
+
+        values, cost_basis = PositionCalculator(repository).get_historical_fund_values([datetime(2024, 1, 3)])
+
+        self.assertEqual(values, {'2024-01-03': Decimal('1100')})
+        repository.get_portfolio_data.assert_not_called()
+
+    def test_falls_back_to_snapshots(self):
+        from portfolio.position_calculator import PositionCalculator
+
+        position = MagicMock(shares=Decimal('10'), current_price=Decimal('12'), cost_basis=Decimal('100'))
+        snapshot = MagicMock(timestamp=datetime(2024, 1, 3), positions=[position])
+        repository = MagicMock()
+        repository.get_fund_nav_history.return_value = None
+        repository.get_portfolio_data.return_value = [snapshot]
+
+        values, cost_basis = PositionCalculator(repository).get_historical_fund_values([datetime(2024, 1, 3)])
+
+        self.assertEqual(values, {'2024-01-03': Decimal('120')})
+        self.assertEqual(cost_basis, {'2024-01-03': Decimal('100')})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -19,11 +19,18 @@ def mock_cache_data(*args, **kwargs):
     return decorator
 
 # Patch flask_cache_utils BEFORE importing flask_data_utils
+_real_flask_cache_utils = sys.modules.get('flask_cache_utils')
 sys.modules['flask_cache_utils'] = MagicMock()
 sys.modules['flask_cache_utils'].cache_data = mock_cache_data
 
 from flask_data_utils import get_individual_holdings_performance_flask
 
+# Restore it so modules imported later (e.g. the Flask app) get real caching
+if _real_flask_cache_utils is None:
+    del sys.modules['flask_cache_utils']
+else:
+    sys.modules['flask_cache_utils'] = _real_flask_cache_utils
+
 class TestHoldingsOptimization(unittest.TestCase):
 
     @patch('flask_data_utils.get_supabase_client_flask')
@@ -52,43 +59,16 @@ class TestHoldingsOptimization(unittest.TestCase):
         def table_side_effect(table_name):
             query_mock = MagicMock()
             if table_name == "portfolio_positions":
-                # Mock chain for portfolio_positions
-                # table().select().eq().gte().order().range().execute()
-                # Simplified chain logic
-                select_mock = MagicMock()
-                eq_mock = MagicMock()
-                gte_mock = MagicMock()
-                order_mock = MagicMock()
-                range_mock = MagicMock()
-                execute_mock = MagicMock()
-
-                query_mock.select.return_value = select_mock
-                select_mock.eq.return_value = eq_mock
-
-                # Handle optional gte (cutoff)
-                eq_mock.gte.return_value = gte_mock
-                eq_mock.order.return_value = order_mock # If gte skipped
-                gte_mock.order.return_value = order_mock
-
-                order_mock.range.return_value = range_mock
-                range_mock.execute.return_value = execute_mock
-
-                # Mock execute response
-                # Return data on first call, empty on second (to break loop)
-                execute_mock.data = positions_data
-
-                # If called multiple times (pagination), we need side_effect on range().execute()
-                # But here we just mock the chain end
-                # We need to make sure subsequent calls return empty to stop pagination loop
-                # range_mock is called in loop.
-                # Let's use side_effect on range() to return different execute mocks
+                # Mock chain for portfolio_positions (keyset pagination)
+                # table().select().eq().gte().order().order().limit().execute()
+                # Every builder method returns the same query mock
+                for method in ("select", "eq", "gte", "or_", "order", "limit"):
+                    getattr(query_mock, method).return_value = query_mock
 
+                # Fewer rows than the page size ends pagination after one request
                 exec_1 = MagicMock()
                 exec_1.data = positions_data
-                exec_2 = MagicMock()
-                exec_2.data = [] # End of data
-
-                range_mock.execute.side_effect = [exec_1, exec_2]
+                query_mock.execute.return_value = exec_1
 
                 return query_mock
 
@@ -51,23 +51,15 @@ def test_get_individual_holdings_performance_flask_vectorized_logic():
         query_mock = MagicMock()
         
         if table_name == "portfolio_positions":
-            # Mock chain: table().select().eq().order().range().execute()
-            select_mock = MagicMock()
-            eq_mock = MagicMock()
-            order_mock = MagicMock()
-            range_mock = MagicMock()
-            
-            query_mock.select.return_value = select_mock
-            select_mock.eq.return_value = eq_mock
-            eq_mock.order.return_value = order_mock
-            order_mock.range.return_value = range_mock
+            # Keyset-paginated chain: table().select().eq().gte().order().order().limit().execute()
+            # Every builder method returns the same query mock
+            for method in ("select", "eq", "gte", "or_", "order", "limit"):
+                getattr(query_mock, method).return_value = query_mock
             
-            # For pagination: return data on first call, empty on second
+            # Fewer rows than the page size ends pagination after one request
             result_1 = MagicMock()
             result_1.data = positions_data
-            result_2 = MagicMock()
-            result_2.data = []
-            range_mock.execute.side_effect = [result_1, result_2]
+            query_mock.execute.return_value = result_1
             
             return query_mock
             
@@ -0,0 +1,158 @@
+"""Unit tests for the keyset-paginated Supabase reader.
+
+A small in-memory stand-in for the postgrest query builder evaluates the
+filters, ordering and limits, so no database is needed.
+"""
+
+import os
+import re
+import sys
+import unittest
+
+import pandas as pd
+
+# Add web_dashboard to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'web_dashboard')))
+
+from keyset_pagination import _after_filter, iter_pages, read_frame
+
+
+class FakeQuery:
+    """Just enough of the postgrest select builder to run keyset queries."""
+
+    AFTER = re.compile(r'^date\.gt\."([^"]*)",and\(date\.eq\."([^"]*)",id\.gt\."([^"]*)"\)$')
+
+    def __init__(self, table, columns):
+        self.table = table
+        self.columns = [c.strip() for c in columns.split(",")]
+        self.predicates = []
+        self.order_by = []
+        self.row_limit = None
+
+    def eq(self, column, value):
+        self.predicates.append(lambda row: row[column] == value)
+        return self
+
+    def gte(self, column, value):
+        self.predicates.append(lambda row: row[column] >= value)
+        return self
+
+    def or_(self, expression):
+        date, same_date, row_id = self.AFTER.match(expression).groups()
+        self.predicates.append(
+            lambda row: row['date'] > date or (row['date'] == same_date and row['id'] > int(row_id))
+        )
+        return self
+
+    def order(self, column):
+        self.order_by.append(column)
+        return self
+
+    def limit(self, count):
+        self.row_limit = count
+        return self
+
+    def execute(self):
+        self.table.requests.append(self)
+        rows = [r for r in self.table.rows if all(p(r) for p in self.predicates)]
+        rows.sort(key=lambda r: tuple(r[c] for c in self.order_by))
+        rows = rows[:self.row_limit]
+        if self.columns != ['*']:
+            rows = [{c: r[c] for c in self.columns} for r in rows]
+        return type('Result', (), {'data': rows})()
+
+
+class FakeTable:
+    def __init__(self, rows):
+        self.rows = rows
+        self.requests = []
+
+    def select(self, columns):
+        return FakeQuery(self, columns)
+
+
+class FakeSupabase:
+    def __init__(self, rows):
+        self.positions = FakeTable(rows)
+
+    def table(self, name):
+        assert name == "portfolio_positions"
+        return self.positions
+
+
+def _positions(days, tickers_per_day, fund="TEST"):
+    """Build rows where many positions share each date, in shuffled id order."""
+    rows = []
+    row_id = 0
+    for day in range(days):
+        for t in range(tickers_per_day):
+            row_id += 1
+            rows.append({
+                'id': (row_id * 7919) % 100003,
+                'fund': fund,
+                'date': (pd.Timestamp('2024-01-01', tz='UTC') + pd.Timedelta(days=day)).isoformat(),
+                'ticker': f"T{t}",
+                'total_value': float(t),
+            })
+    return rows
+
+
+class TestKeysetPagination(unittest.TestCase):
+    """Test suite for iter_pages and read_frame."""
+
+    def test_reads_every_row_once_across_tied_dates(self):
+        """Pages split inside a date are continued by id, without gaps or repeats."""
+        rows = _positions(days=30, tickers_per_day=37)
+        client = FakeSupabase(rows)
+
+        pages = list(iter_pages(client, "portfolio_positions", ["ticker", "date"],
+                                [("eq", "fund", "TEST")], page_size=100))
+
+        seen = [(r['date'], r['id']) for page in pages for r in page]
+        self.assertEqual(len(seen), len(rows))
+        self.assertEqual(len(set(seen)), len(rows))
+        self.assertEqual(seen, sorted(seen))
+        self.assertEqual(len(client.positions.requests), len(pages))
+
+    def test_no_row_cap(self):
+        """Reading continues until the data runs out, not to a fixed row limit."""
+        rows = _positions(days=50, tickers_per_day=120)
+        client = FakeSupabase(rows)
+
+        df = read_frame(client, "portfolio_positions", "ticker, total_value", page_size=500)
+
+        self.assertEqual(len(df), 6000)
+
+    def test_projection_and_key_columns(self):
+        """Only requested columns are selected; key columns are added then dropped."""
+        client = FakeSupabase(_positions(days=3, tickers_per_day=5))
+
+        df = read_frame(client, "portfolio_positions", ["ticker", "total_value"],
+                        [("gte", "date", "2024-01-02T00:00:00+00:00")], page_size=4)
+
+        self.assertEqual(list(df.columns), ["ticker", "total_value"])
+        self.assertEqual(len(df), 10)
+        self.assertEqual(client.positions.requests[0].columns, ["ticker", "total_value", "date", "id"])
+
+    def test_empty_result(self):
+        """No matching rows gives an empty frame after a single request."""
+        client = FakeSupabase(_positions(days=2, tickers_per_day=2))
+
+        df = read_frame(client, "portfolio_positions", "*", [("eq", "fund", "OTHER")])
+
+        self.assertTrue(df.empty)
+        self.assertEqual(len(client.positions.requests), 1)
+
+    def test_after_filter_quotes_timestamps(self):
+        """Timestamps with ':' and '+' are quoted inside the or filter."""
+        expression = _after_filter(("date", "id"), ("2024-01-02T00:00:00+00:00", "abc"))
+
+        self.assertEqual(
+            expression,
+            'date.gt."2024-01-02T00:00:00+00:00",'
+            'and(date.eq."2024-01-02T00:00:00+00:00",id.gt."abc")'
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,203 @@
+"""Tests for the indexed log store behind the admin log viewer."""
+
+import os
+import shutil
+import sys
+import tempfile
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+# Add web_dashboard to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'web_dashboard')))
+
+import log_handler
+from log_store import LogStore, parse_log_line
+
+
+def _line(second, level='INFO', module='app', message='hello'):
+    return f"2025-03-04 10:00:{second:02d} | {level:<8} | {module:<30} | {message}\n"
+
+
+class TestLogStore:
+    """Test incremental ingestion and cursor queries."""
+
+    def setup_method(self):
+        self.log_dir = tempfile.mkdtemp(prefix="test_log_store_")
+        self.log_file = os.path.join(self.log_dir, 'app.log')
+        self.store = LogStore(self.log_dir)
+
+    def teardown_method(self):
+        self.store.close()
+        shutil.rmtree(self.log_dir, ignore_errors=True)
+
+    def _append(self, *lines, path=None):
+        with open(path or self.log_file, 'a', encoding='utf-8') as f:
+            f.write(''.join(lines))
+
+    def _rotate(self):
+        """Rotate like RotatingFileHandler: app.log.N -> app.log.N+1, app.log -> app.log.1."""
+        for index in range(4, 0, -1):
+            source = f"{self.log_file}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.log_file}.{index + 1}")
+        os.replace(self.log_file, f"{self.log_file}.1")
+        open(self.log_file, 'w').close()
+
+    def _messages(self, **kwargs):
+        return [log['message'] for log in self.store.query(limit=None, **kwargs).logs]
+
+    def test_parse_log_line(self):
+        record = parse_log_line(_line(5, 'ERROR', 'scheduler.jobs', 'failed | retrying').rstrip('\n'))
+
+        assert record['timestamp'] == '2025-03-04 10:00:05'
+        assert (record['level'], record['module'], record['message']) == ('ERROR', 'scheduler.jobs', 'failed | retrying')
+        assert parse_log_line('Traceback (most recent call last):') is None
+        assert parse_log_line('not a date | INFO | app | message') is None
+
+    def test_backfills_rotated_files_in_order(self):
+        self._append(_line(1, message='oldest'), path=f"{self.log_file}.2")
+        self._append(_line(2, message='older'), '  File "x.py", line 1\n', path=f"{self.log_file}.1")
+        self._append(_line(3, message='current'))
+
+        assert self.store.sync() == 3
+        assert self._messages() == ['current', 'older', 'oldest']
+
+    def test_sync_reads_only_appended_lines(self):
+        self._append(_line(1, message='first'))
+        self.store.sync()
+
+        # A partial line is left until it is complete
+        self._append(_line(2, message='second'), "2025-03-04 10:00:03 | INFO     | app")
+        assert self.store.sync() == 1
+        self._append(" | third\n")
+        assert self.store.sync() == 1
+        assert self.store.sync() == 0
+
+        assert self._messages() == ['third', 'second', 'first']
+
+    def test_rotation_finishes_the_old_file(self):
+        self._append(_line(1, message='before'))
+        self.store.sync()
+        self._append(_line(2, message='unread before rotation'))
+        self._rotate()
+        self._append(_line(3, message='after'))
+
+        assert self.store.sync() == 2
+        assert self._messages() == ['after', 'unread before rotation', 'before']
+
+    def test_several_rotations_between_syncs(self):
+        self._append(_line(1, message='a'))
+        self.store.sync()
+        self._append(_line(2, message='b'))
+        self._rotate()
+        self._append(_line(3, message='c'))
+        self._rotate()
+        self._append(_line(4, message='d'))
+
+        self.store.sync()
+
+        assert self._messages() == ['d', 'c', 'b', 'a']
+
+    def test_truncation_drops_the_current_file(self):
+        self._append(_line(1, message='rotated'), path=f"{self.log_file}.1")
+        self._append(_line(2, message='cleared 1'), _line(3, message='cleared 2'))
+        self.store.sync()
+
+        with open(self.log_file, 'w', encoding='utf-8') as f:
+            f.write(_line(4, message='new'))
+        self.store.sync()
+
+        assert self._messages() == ['new', 'rotated']
+
+    def test_prunes_oldest_records_on_rotation(self):
+        self.store.max_rows = 2
+        self._append(_line(1, message='a'), _line(2, message='b'))
+        self.store.sync()
+        self._rotate()
+        self._append(_line(3, message='c'))
+
+        self.store.sync()
+
+        assert self._messages() == ['c', 'b']
+
+    def test_cursor_pagination_and_tailing(self):
+        self._append(*[_line(i, message=f"m{i}") for i in range(7)])
+        self.store.sync()
+
+        first = self.store.query(limit=3)
+        second = self.store.query(limit=3, before=first.next_cursor)
+        last = self.store.query(limit=3, before=second.next_cursor)
+
+        assert [log['message'] for log in first.logs] == ['m6', 'm5', 'm4']
+        assert [log['message'] for log in second.logs] == ['m3', 'm2', 'm1']
+        assert [log['message'] for log in last.logs] == ['m0']
+        assert last.next_cursor is None
+
+        self._append(_line(8, message='m8'), _line(9, message='m9'))
+        self.store.sync()
+        tail = self.store.query(limit=10, after=first.latest_cursor)
+
+        assert [log['message'] for log in tail.logs] == ['m9', 'm8']
+        assert self.store.query(limit=10, after=tail.latest_cursor).logs == []
+        assert self.store.query(limit=10, after=tail.latest_cursor).latest_cursor == tail.latest_cursor
+
+    def test_filters(self):
+        self._append(
+            _line(1, 'INFO', 'app', 'started'),
+            _line(2, 'DEBUG', 'app', 'details'),
+            _line(3, 'INFO', 'scheduler.scheduler_core.heartbeat', 'beat'),
+            _line(4, 'ERROR', 'market_data', 'Price fetch failed for 50%_ETF'),
+        )
+        self.store.sync()
+
+        assert self._messages(level=['INFO', 'ERROR']) == ['Price fetch failed for 50%_ETF', 'beat', 'started']
+        assert self._messages(level='DEBUG') == ['details']
+        assert self._messages(exclude_modules=['scheduler.scheduler_core.heartbeat']) == [
+            'Price fetch failed for 50%_ETF', 'details', 'started']
+        assert self._messages(search='PRICE FETCH') == ['Price fetch failed for 50%_ETF']
+        assert self._messages(search='MARKET_DATA') == ['Price fetch failed for 50%_ETF']
+        assert self._messages(search='50%_') == ['Price fetch failed for 50%_ETF']
+        assert self._messages(search='5%') == []
+        assert self._messages(since=datetime(2025, 3, 4, 10, 0, 3)) == ['Price fetch failed for 50%_ETF', 'beat']
+        assert self.store.count(level='INFO') == 2
+
+
+class TestReadLogsFromFile:
+    """Test read_logs_from_file on top of the store."""
+
+    def setup_method(self):
+        self.log_dir = tempfile.mkdtemp(prefix="test_read_logs_")
+        self.store = LogStore(self.log_dir)
+        with open(os.path.join(self.log_dir, 'app.log'), 'w', encoding='utf-8') as f:
+            f.write(_line(1, message='one') + _line(2, 'ERROR', message='two') + _line(3, message='three'))
+        self.patcher = patch('log_store.get_log_store', return_value=self.store)
+        self.patcher.start()
+
+    def teardown_method(self):
+        self.patcher.stop()
+        self.store.close()
+        shutil.rmtree(self.log_dir, ignore_errors=True)
+
+    def test_newest_first_with_datetimes(self):
+        logs = log_handler.read_logs_from_file(n=2)
+
+        assert [log['message'] for log in logs] == ['three', 'two']
+        assert logs[0]['timestamp'] == datetime(2025, 3, 4, 10, 0, 3)
+
+    def test_return_all_and_level(self):
+        assert len(log_handler.read_logs_from_file(n=1, return_all=True)) == 3
+        assert [log['message'] for log in log_handler.read_logs_from_file(level=['ERROR'])] == ['two']
+
+    def test_since_deployment_uses_pacific_time(self):
+        # 18:00:02 UTC is 10:00:02 PST
+        deployed = datetime(2025, 3, 4, 18, 0, 2, tzinfo=timezone.utc)
+        with patch('log_handler.get_deployment_timestamp', return_value=deployed):
+            logs = log_handler.read_logs_from_file(since_deployment=True)
+
+        assert [log['message'] for log in logs] == ['three', 'two']
+
+    def test_read_log_page(self):
+        page = log_handler.read_log_page(limit=2)
+
+        assert [log['message'] for log in page.logs] == ['three', 'two']
+        assert [log['message'] for log in log_handler.read_log_page(limit=2, before=page.next_cursor).logs] == ['one']
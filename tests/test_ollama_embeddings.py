@@ -0,0 +1,139 @@
+"""Tests for batched embedding generation in OllamaClient.
+
+Runs against a local stub HTTP server that mimics Ollama's /api/embed and
+/api/embeddings endpoints, so no Ollama instance is needed.
+"""
+
+import json
+import os
+import sys
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+# Add web_dashboard to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'web_dashboard')))
+
+from ollama_client import EmbeddingBatcher, OllamaClient
+
+
+def _vector(text):
+    """Deterministic fake embedding derived from the text."""
+    return [float(len(text)), float(sum(map(ord, text)) % 997), 0.5]
+
+
+class StubOllamaHandler(BaseHTTPRequestHandler):
+    """Serves fake embeddings and records every request."""
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        self.server.requests.append((self.path, body))
+
+        if self.path == '/api/embed' and self.server.batch_supported:
+            payload = {'model': body['model'], 'embeddings': [_vector(t) for t in body['input']]}
+        elif self.path == '/api/embeddings':
+            payload = {'embedding': _vector(body['prompt'])}
+        else:
+            self.send_response(404)
+            self.end_headers()
+            self.wfile.write(b'404 page not found')
+            return
+
+        data = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestBatchEmbeddings(unittest.TestCase):
+    """Test suite for generate_embeddings and EmbeddingBatcher."""
+
+    def setUp(self):
+        """Start the stub server and point a client at it."""
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StubOllamaHandler)
+        self.server.requests = []
+        self.server.batch_supported = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+        host, port = self.server.server_address
+        self.client = OllamaClient(base_url=f"http://{host}:{port}", timeout=5)
+        self.client.enabled = True
+
+    def tearDown(self):
+        """Stop the stub server."""
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_batches_in_chunks(self):
+        """Texts are sent batch_size at a time, results keep input order."""
+        texts = [f"article {i}" for i in range(5)]
+
+        embeddings = self.client.generate_embeddings(texts, batch_size=2)
+
+        self.assertEqual(embeddings, [_vector(t) for t in texts])
+        self.assertEqual([len(body['input']) for _, body in self.server.requests], [2, 2, 1])
+
+    def test_cached_and_duplicate_texts_not_reembedded(self):
+        """Re-ingested content is served from the content-hash cache."""
+        self.client.generate_embeddings(["first", "second"])
+
+        embeddings = self.client.generate_embeddings(["second", "third", "third"])
+
+        self.assertEqual(embeddings, [_vector("second"), _vector("third"), _vector("third")])
+        self.assertEqual(self.server.requests[-1][1]['input'], ["third"])
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_single_embedding_uses_cache(self):
+        """generate_embedding shares the cache with the batch API."""
+        self.client.generate_embeddings(["hello"])
+
+        self.assertEqual(self.client.generate_embedding("hello"), _vector("hello"))
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_falls_back_to_legacy_endpoint(self):
+        """Servers without /api/embed get one /api/embeddings call per text."""
+        self.server.batch_supported = False
+
+        embeddings = self.client.generate_embeddings(["a", "bb"])
+        self.client.generate_embeddings(["ccc"])
+
+        self.assertEqual(embeddings, [_vector("a"), _vector("bb")])
+        paths = [path for path, _ in self.server.requests]
+        self.assertEqual(paths, ['/api/embed', '/api/embeddings', '/api/embeddings', '/api/embeddings'])
+
+    def test_unreachable_server_returns_empty_vectors(self):
+        """Connection failures give an empty embedding per text."""
+        self.server.shutdown()
+        self.server.server_close()
+        self.client.session.mount('http://', requests.adapters.HTTPAdapter(max_retries=0))
+
+        self.assertEqual(self.client.generate_embeddings(["x", "y"]), [[], []])
+
+    def test_batcher_flushes_full_batches_and_remainder(self):
+        """Queued texts are embedded per batch and handed to the callback."""
+        saved = []
+        batcher = EmbeddingBatcher(self.client, saved.append, batch_size=2)
+
+        for i in range(3):
+            batcher.add(f"id-{i}", f"content {i}")
+        self.assertEqual(len(saved), 1)
+        batcher.flush()
+
+        self.assertEqual(saved, [
+            {'id-0': _vector("content 0"), 'id-1': _vector("content 1")},
+            {'id-2': _vector("content 2")},
+        ])
+        self.assertEqual((batcher.embedded, batcher.failed), (3, 0))
+        self.assertEqual(batcher.flush(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
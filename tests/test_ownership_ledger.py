@@ -0,0 +1,165 @@
+"""Tests for the vectorized contributor unit ledger (portfolio/ownership_ledger.py).
+
+The expected figures of the shared ledger fixture were produced by the
+row-by-row NAV loops the ledger replaced (PositionCalculator and the two
+dashboard functions in streamlit_utils), so these tests pin the results to
+the cent.
+"""
+
+import unittest
+from datetime import datetime, timezone
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+from portfolio.ownership_ledger import (
+    INVESTOR_ALLOCATION_RULES, USER_METRICS_RULES, parse_contributions, unit_ledger
+)
+from portfolio.position_calculator import PositionCalculator
+
+LEDGER = [
+    ('Alice', 'alice@example.com', 5000, 'CONTRIBUTION', '2024-01-02T10:00:00+00:00'),
+    ('Bob', 'bob@example.com', 2000, 'CONTRIBUTION', '2024-01-02T15:30:00+00:00'),
+    ('Carol', 'carol@example.com', 3000, 'CONTRIBUTION', '2024-01-06T12:00:00+00:00'),
+    ('Bob', 'bob@example.com', 1000, 'CONTRIBUTION', '2024-01-09T09:00:00+00:00'),
+    ('Alice', 'alice@example.com', 1500, 'WITHDRAWAL', '2024-01-09T16:00:00+00:00'),
+    ('Dave', 'dave@example.com', 2500, 'CONTRIBUTION', '2024-01-09T18:00:00+00:00'),
+    ('Carol', 'carol@example.com', 5000, 'WITHDRAWAL', '2024-01-15T11:00:00+00:00'),
+    ('Alice', 'alice@example.com', 1000, 'CONTRIBUTION', '2024-01-22T10:00:00+00:00'),
+]
+
+VALUES = {'2024-01-02': 6900, '2024-01-03': 7200, '2024-01-05': 7600, '2024-01-08': 10400,
+          '2024-01-09': 11900, '2024-01-12': 13100, '2024-01-15': 12800, '2024-01-19': 9800}
+COST = {'2024-01-02': 6500, '2024-01-03': 6800, '2024-01-05': 6800, '2024-01-08': 9500,
+        '2024-01-09': 11000, '2024-01-12': 11000, '2024-01-15': 11000, '2024-01-19': 8000}
+
+CURRENT_VALUE = 14250
+
+
+def _records(ledger=LEDGER):
+    """fund_contributions rows, shuffled like an unordered query result."""
+    rows = [{'contributor': c, 'email': e, 'amount': a, 'contribution_type': t, 'timestamp': ts}
+            for c, e, a, t, ts in ledger]
+    return rows[::2] + rows[1::2]
+
+
+class TestParseContributions(unittest.TestCase):
+    """Test suite for bulk parsing."""
+
+    def test_field_names_and_order(self):
+        parsed = parse_contributions([
+            {'Contributor': 'A', 'Amount': '10.5', 'Type': 'Withdrawal', 'Timestamp': '2024-01-03T10:00:00Z'},
+            {'contributor': 'B', 'amount': 20, 'contribution_type': 'CONTRIBUTION',
+             'timestamp': datetime(2024, 1, 2, 9, tzinfo=timezone.utc)},
+            {'contributor': 'C', 'amount': 5, 'timestamp': None},
+        ])
+
+        self.assertEqual(list(parsed['contributor']), ['C', 'B', 'A'])
+        self.assertEqual(list(parsed['amount']), [5.0, 20.0, 10.5])
+        self.assertEqual(list(parsed['withdrawal']), [False, False, True])
+        self.assertTrue(parsed['day'].isna().iloc[0])
+
+    def test_day_in_timestamp_offset(self):
+        """The day is the local date of the timestamp, as strftime gave it."""
+        parsed = parse_contributions([{'contributor': 'A', 'amount': 1, 'timestamp': '2024-01-02T22:00:00-05:00'}])
+
+        self.assertEqual(parsed['day'].iloc[0], '2024-01-02')
+        self.assertEqual(parsed['timestamp'].iloc[0], datetime(2024, 1, 3, 3, tzinfo=timezone.utc))
+
+
+class TestUnitLedger(unittest.TestCase):
+    """Test suite for unit issuance and redemption."""
+
+    def test_docstring_example(self):
+        records = [
+            {'contributor': 'A', 'amount': 1000, 'timestamp': '2024-01-01T10:00:00'},
+            {'contributor': 'B', 'amount': 2000, 'timestamp': '2024-01-30T10:00:00'},
+        ]
+        ledger = unit_ledger(records, 3520, {'2024-01-01': 1000, '2024-01-30': 1200},
+                             {'2024-01-01': 1000, '2024-01-30': 1000})
+
+        self.assertAlmostEqual(ledger.total_units, 1000 + 2000 / 1.2)
+        self.assertAlmostEqual(ledger.unit_price, 1.32)
+        self.assertAlmostEqual(ledger.holdings.loc['A', 'current_value'], 1320)
+        self.assertAlmostEqual(ledger.holdings.loc['B', 'current_value'], 2200)
+
+    def test_same_day_contributions_share_nav(self):
+        records = [
+            {'contributor': 'A', 'amount': 1000, 'timestamp': '2024-01-01T10:00:00'},
+            {'contributor': 'B', 'amount': 1000, 'timestamp': '2024-01-02T10:00:00'},
+            {'contributor': 'C', 'amount': 1000, 'timestamp': '2024-01-02T11:00:00'},
+        ]
+        ledger = unit_ledger(records, 4000, {'2024-01-01': 1000, '2024-01-02': 2000},
+                             {'2024-01-01': 1000, '2024-01-02': 1000})
+
+        self.assertAlmostEqual(ledger.holdings.loc['B', 'units'], 500)
+        self.assertAlmostEqual(ledger.holdings.loc['C', 'units'], 500)
+
+    def test_withdrawal_without_units_is_skipped(self):
+        records = [
+            {'contributor': 'A', 'amount': 1000, 'timestamp': '2024-01-01T10:00:00'},
+            {'contributor': 'B', 'amount': 500, 'contribution_type': 'WITHDRAWAL', 'timestamp': '2024-01-02T10:00:00'},
+        ]
+        with self.assertLogs('portfolio.ownership_ledger', level='WARNING'):
+            ledger = unit_ledger(records, 1000, {'2024-01-01': 1000, '2024-01-02': 1000})
+
+        self.assertEqual(ledger.total_units, 1000)
+        self.assertEqual(ledger.holdings.loc['B', 'net_contribution'], -500)
+
+    def test_matches_investor_allocations(self):
+        ledger = unit_ledger(_records(), None, VALUES, COST, rules=INVESTOR_ALLOCATION_RULES)
+
+        self.assertAlmostEqual(ledger.total_units, 42357.532100, places=5)
+        self.assertEqual(ledger.holdings['ownership_pct'].round(4).to_dict(),
+                         {'Alice': 9.2593, 'Bob': 68.0841, 'Carol': 0.0, 'Dave': 22.6567})
+        self.assertIsNone(ledger.unit_price)
+
+    def test_matches_user_investment_metrics(self):
+        ledger = unit_ledger(_records(), CURRENT_VALUE, VALUES, COST, rules=USER_METRICS_RULES)
+
+        self.assertAlmostEqual(ledger.total_units, 9775.951113, places=5)
+        self.assertEqual(ledger.holdings['current_value'].round(2).to_dict(),
+                         {'Alice': 6798.14, 'Bob': 4211.47, 'Carol': 0.0, 'Dave': 3240.38})
+        self.assertEqual(ledger.holdings.loc['Dave', 'email'], 'dave@example.com')
+
+
+class TestCalculateOwnershipPercentages(unittest.TestCase):
+    """PositionCalculator.calculate_ownership_percentages on the ledger engine."""
+
+    def setUp(self):
+        self.calculator = PositionCalculator(MagicMock())
+        self.records = [{'Contributor': c, 'Amount': a, 'Type': t, 'Timestamp': ts} for c, _, a, t, ts in LEDGER]
+
+    def test_matches_previous_results(self):
+        ownership = self.calculator.calculate_ownership_percentages(
+            self.records, Decimal(CURRENT_VALUE),
+            {k: Decimal(v) for k, v in VALUES.items()}, {k: Decimal(v) for k, v in COST.items()}
+        )
+
+        # Carol withdrew more than she put in and holds no units
+        self.assertEqual(set(ownership), {'Alice', 'Bob', 'Dave'})
+        self.assertEqual(ownership['Alice']['current_value'], Decimal('7518.42'))
+        self.assertEqual(ownership['Bob']['current_value'], Decimal('3625.07'))
+        self.assertEqual(ownership['Dave']['current_value'], Decimal('3106.51'))
+        self.assertEqual(ownership['Alice']['units'], Decimal('4573.5208'))
+        self.assertEqual(ownership['Alice']['gain_loss_percentage'], Decimal('67.1'))
+        self.assertEqual(ownership['Bob']['ownership_percentage'], Decimal('25.4'))
+        self.assertEqual(ownership['Alice']['net_contribution'], Decimal('4500'))
+
+    def test_time_weighted_without_history(self):
+        records = [
+            {'Contributor': 'A', 'Amount': 1000, 'Timestamp': '2024-01-01T10:00:00'},
+            {'Contributor': 'B', 'Amount': 1000, 'Timestamp': '2024-01-02T10:00:00'},
+        ]
+        ownership = self.calculator.calculate_ownership_percentages(records, Decimal('2000'))
+
+        # No growth: every contribution buys units at 1.0
+        self.assertEqual(ownership['A']['units'], Decimal('1000.0000'))
+        self.assertEqual(ownership['B']['current_value'], Decimal('1000.00'))
+
+    def test_empty_and_non_positive_value(self):
+        self.assertEqual(self.calculator.calculate_ownership_percentages([], Decimal('100')), {})
+        self.assertEqual(self.calculator.calculate_ownership_percentages(self.records, Decimal('0')), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,175 @@
+"""Tests for the database-side daily portfolio totals.
+
+An in-memory SQLite database stands in for Postgres: the fake RPC runs the
+aggregation query of get_portfolio_daily_totals against a portfolio_positions
+table, so the results can be compared with the client-side pandas groupby.
+"""
+
+import os
+import re
+import sqlite3
+import sys
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+
+import pandas as pd
+
+# Add web_dashboard to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'web_dashboard')))
+
+import portfolio_daily_totals
+from portfolio_daily_totals import daily_value_series, fetch_daily_totals
+
+MIGRATION_SQL = os.path.join(os.path.dirname(__file__), '..', 'web_dashboard', 'migrations',
+                             'add_portfolio_daily_totals_rpc.sql')
+
+
+def _daily_totals_sql():
+    """Body of get_portfolio_daily_totals from the shipped migration, in SQLite syntax."""
+    with open(MIGRATION_SQL, encoding='utf-8') as f:
+        migration = f.read()
+    body = re.search(r"AS \$function\$(.*?)\$function\$;", migration, re.S).group(1)
+    body = body.strip().rstrip(';')
+    body = re.sub(r"(\w+(?:\.\w+)?)::date", r"date(\1)", body)
+    return re.sub(r"\b(fund_name|start_at)\b", r":\1", body)
+
+
+DAILY_TOTALS_SQL = _daily_totals_sql()
+
+
+class FakeRpc:
+    def __init__(self, db, params):
+        self.db = db
+        self.params = params
+        self.row_limit = None
+
+    def limit(self, count):
+        self.row_limit = count
+        return self
+
+    def execute(self):
+        self.db.requests.append(dict(self.params))
+        if self.db.error:
+            raise self.db.error
+        sql = DAILY_TOTALS_SQL + (f" LIMIT {self.row_limit}" if self.row_limit else "")
+        cursor = self.db.conn.execute(sql, self.params)
+        columns = [c[0] for c in cursor.description]
+        return type('Result', (), {'data': [dict(zip(columns, row, strict=True)) for row in cursor.fetchall()]})()
+
+
+class PostgresStandIn:
+    """SQLite-backed portfolio_positions with a postgrest-style rpc()."""
+
+    def __init__(self, rows):
+        self.conn = sqlite3.connect(":memory:")
+        self.conn.execute(
+            "CREATE TABLE portfolio_positions (fund TEXT, ticker TEXT, date TEXT, "
+            "total_value REAL, cost_basis REAL, pnl REAL, "
+            "total_value_base REAL, cost_basis_base REAL, pnl_base REAL)"
+        )
+        self.conn.executemany(
+            "INSERT INTO portfolio_positions VALUES (:fund, :ticker, :date, :total_value, :cost_basis, :pnl, "
+            ":total_value_base, :cost_basis_base, :pnl_base)",
+            rows
+        )
+        self.requests = []
+        self.error = None
+
+    def rpc(self, name, params):
+        assert name == "get_portfolio_daily_totals"
+        return FakeRpc(self, params)
+
+
+def _position(fund, ticker, date, value, cost, base=True):
+    rate = 1.25 if base else None
+    return {
+        'fund': fund, 'ticker': ticker, 'date': date,
+        'total_value': value, 'cost_basis': cost, 'pnl': value - cost,
+        'total_value_base': value * rate if base else None,
+        'cost_basis_base': cost * rate if base else None,
+        'pnl_base': (value - cost) * rate if base else None,
+    }
+
+
+def _client_side_totals(rows, value_col, cost_col, pnl_col):
+    """The groupby the charts used to run on every downloaded row."""
+    df = pd.DataFrame(rows)
+    df['date'] = pd.to_datetime(df['date']).dt.normalize()
+    daily = df.groupby(df['date'].dt.date).agg({value_col: 'sum', cost_col: 'sum', pnl_col: 'sum'}).reset_index()
+    daily.columns = ['date', 'value', 'cost_basis', 'pnl']
+    daily['date'] = pd.to_datetime(daily['date'])
+    return daily
+
+
+class TestDailyTotals(unittest.TestCase):
+    """Test suite for fetch_daily_totals and daily_value_series."""
+
+    def setUp(self):
+        patcher = patch.object(portfolio_daily_totals, '_rpc_missing', False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.rows = [
+            _position(fund, ticker, f"2024-01-{day:02d}T{hour:02d}:00:00", 100.0 * day + i, 90.0 * day)
+            for fund in ("A", "B")
+            for day in range(1, 11)
+            for i, (ticker, hour) in enumerate((("AAPL", 16), ("MSFT", 21)))
+        ]
+        self.db = PostgresStandIn(self.rows)
+
+    def test_matches_client_side_aggregation(self):
+        totals = fetch_daily_totals(self.db)
+        daily, preconverted = daily_value_series(totals)
+
+        expected = _client_side_totals(self.rows, 'total_value_base', 'cost_basis_base', 'pnl_base')
+        self.assertTrue(preconverted)
+        pd.testing.assert_frame_equal(daily, expected, check_dtype=False)
+
+    def test_fund_and_start_filters(self):
+        totals = fetch_daily_totals(self.db, fund="A", since=datetime(2024, 1, 5, 18, 0))
+
+        # Only the 21:00 position of the 5th is after the cutoff
+        self.assertEqual(list(totals['date'].dt.day), [5, 6, 7, 8, 9, 10])
+        self.assertEqual(list(totals['position_count']), [1.0] + [2.0] * 5)
+        self.assertEqual(self.db.requests[0], {'fund_name': 'A', 'start_at': '2024-01-05T18:00:00'})
+
+    def test_pages_restart_after_last_day(self):
+        """Past the row limit the RPC is re-run from the next day, without gaps or repeats."""
+        totals = fetch_daily_totals(self.db, page_size=4)
+
+        self.assertEqual(list(totals['date'].dt.day), list(range(1, 11)))
+        self.assertEqual([r['start_at'] for r in self.db.requests],
+                         [None, '2024-01-05T00:00:00', '2024-01-09T00:00:00'])
+
+    def test_raw_columns_used_when_mostly_not_preconverted(self):
+        rows = [_position("A", "AAPL", f"2024-01-0{day}T16:00:00", 100.0, 80.0, base=day == 1)
+                for day in range(1, 6)]
+        daily, preconverted = daily_value_series(fetch_daily_totals(PostgresStandIn(rows)))
+
+        self.assertFalse(preconverted)
+        pd.testing.assert_frame_equal(daily, _client_side_totals(rows, 'total_value', 'cost_basis', 'pnl'), check_dtype=False)
+
+    def test_no_positions(self):
+        totals = fetch_daily_totals(PostgresStandIn([]))
+
+        self.assertTrue(totals.empty)
+        self.assertFalse(daily_value_series(totals)[1])
+
+    def test_missing_rpc_falls_back_and_is_not_retried(self):
+        self.db.error = Exception("{'code': 'PGRST202', 'message': 'Could not find the function'}")
+
+        self.assertIsNone(fetch_daily_totals(self.db))
+        self.assertIsNone(fetch_daily_totals(self.db))
+        self.assertEqual(len(self.db.requests), 1)
+
+    def test_other_errors_fall_back_and_retry(self):
+        self.db.error = Exception("connection reset")
+        self.assertIsNone(fetch_daily_totals(self.db))
+
+        self.db.error = None
+        self.assertEqual(len(fetch_daily_totals(self.db)), 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
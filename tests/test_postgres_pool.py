@@ -0,0 +1,162 @@
+"""Unit tests for the blocking Postgres connection pool.
+
+Connections come from an in-memory factory, so no database is needed.
+"""
+
+import os
+import sys
+import threading
+import time
+import unittest
+
+# Add web_dashboard to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'web_dashboard')))
+
+from postgres_client import BlockingConnectionPool, PoolTimeoutError
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, query, params=None):
+        if self.conn.dead:
+            raise RuntimeError("server closed the connection unexpectedly")
+        self.conn.queries.append(query)
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    """Connection stand-in; ``dead`` simulates a server-side disconnect."""
+
+    def __init__(self):
+        self.closed = 0
+        self.dead = False
+        self.queries = []
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = 1
+
+
+class FakeConnect:
+    def __init__(self):
+        self.connections = []
+        self.lock = threading.Lock()
+
+    def __call__(self):
+        conn = FakeConnection()
+        with self.lock:
+            self.connections.append(conn)
+        return conn
+
+
+class TestBlockingConnectionPool(unittest.TestCase):
+    """Test suite for BlockingConnectionPool."""
+
+    def setUp(self):
+        self.connect = FakeConnect()
+
+    def _pool(self, maxconn=2, **kwargs):
+        kwargs.setdefault('timeout', 2.0)
+        return BlockingConnectionPool(1, maxconn, connect=self.connect, **kwargs)
+
+    def test_waits_instead_of_exhausting(self):
+        """More threads than connections all get served, never sharing one."""
+        connection_pool = self._pool(maxconn=3)
+        active = set()
+        lock = threading.Lock()
+        errors = []
+
+        def worker():
+            try:
+                for _ in range(5):
+                    conn = connection_pool.getconn()
+                    with lock:
+                        if id(conn) in active:
+                            errors.append("connection shared between threads")
+                        active.add(id(conn))
+                    time.sleep(0.002)
+                    with lock:
+                        active.discard(id(conn))
+                    connection_pool.putconn(conn)
+            except Exception as e:  # pragma: no cover - reported below
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker) for _ in range(12)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = connection_pool.stats()
+        self.assertEqual(errors, [])
+        self.assertLessEqual(len(self.connect.connections), 3)
+        self.assertEqual(stats['acquisitions'], 60)
+        self.assertEqual(stats['peak_in_use'], 3)
+        self.assertEqual(stats['in_use'], 0)
+        self.assertGreater(stats['max_wait_ms'], 0)
+
+    def test_timeout(self):
+        """A checkout fails with PoolTimeoutError once the timeout passes."""
+        connection_pool = self._pool(maxconn=1)
+        connection_pool.getconn()
+
+        with self.assertRaises(PoolTimeoutError):
+            connection_pool.getconn(timeout=0.05)
+        self.assertEqual(connection_pool.stats()['timeouts'], 1)
+
+    def test_returned_connection_wakes_waiter(self):
+        """A blocked checkout gets the connection another thread returns."""
+        connection_pool = self._pool(maxconn=1)
+        conn = connection_pool.getconn()
+        timer = threading.Timer(0.05, connection_pool.putconn, args=(conn,))
+        timer.start()
+
+        self.assertIs(connection_pool.getconn(), conn)
+        timer.join()
+
+    def test_dead_connection_replaced_on_checkout(self):
+        """Stale idle connections are validated and replaced if dead."""
+        connection_pool = self._pool(maxconn=1, health_check_interval=0)
+        conn = connection_pool.getconn()
+        connection_pool.putconn(conn)
+        conn.dead = True
+
+        replacement = connection_pool.getconn()
+
+        self.assertIsNot(replacement, conn)
+        self.assertTrue(conn.closed)
+        self.assertEqual(connection_pool.stats()['discarded_connections'], 1)
+
+    def test_recently_used_connection_not_pinged(self):
+        """Connections used within the health check interval skip SELECT 1."""
+        connection_pool = self._pool(maxconn=1, health_check_interval=60)
+        conn = connection_pool.getconn()
+        connection_pool.putconn(conn)
+
+        self.assertIs(connection_pool.getconn(), conn)
+        self.assertEqual(conn.queries, [])
+
+    def test_broken_connection_not_reused(self):
+        """Connections returned with close=True free their slot."""
+        connection_pool = self._pool(maxconn=1)
+        conn = connection_pool.getconn()
+        connection_pool.prepared_statements(conn).add("article_exists")
+        connection_pool.putconn(conn, close=True)
+
+        replacement = connection_pool.getconn()
+
+        self.assertIsNot(replacement, conn)
+        self.assertEqual(connection_pool.prepared_statements(replacement), set())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+"""Unit tests for PriceCache LRU bookkeeping, counters and thread safety.
+
+Includes a microbenchmark showing cache hit latency stays flat as the
+cache grows to 10k tickers.
+"""
+
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import Mock
+
+import pandas as pd
+
+from market_data.price_cache import PriceCache
+
+
+def _bars(periods: int = 5) -> pd.DataFrame:
+    """Build a small daily price frame."""
+    index = pd.date_range('2024-01-01', periods=periods, freq='D', name='Date')
+    return pd.DataFrame({'Close': [float(i) for i in range(periods)]}, index=index)
+
+
+class TestPriceCacheLRU(unittest.TestCase):
+    """Test suite for PriceCache LRU behaviour and statistics."""
+
+    def setUp(self):
+        """Point PriceCache at a temporary data directory."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.settings = Mock()
+        self.settings.get_data_directory.return_value = self.temp_dir
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_evicts_least_recently_used(self):
+        """A hit refreshes recency so the untouched entry is evicted."""
+        cache = PriceCache(settings=self.settings, max_cache_size=2)
+        cache.cache_price_data('AAPL', _bars())
+        cache.cache_price_data('MSFT', _bars())
+        cache.get_cached_price('AAPL')
+
+        cache.cache_price_data('GOOGL', _bars())
+
+        self.assertIsNotNone(cache.get_cached_price('AAPL'))
+        self.assertIsNone(cache.get_cached_price('MSFT'))
+        self.assertEqual(cache.get_cache_stats()['evictions'], 1)
+
+    def test_recaching_refreshes_recency(self):
+        """Re-caching an existing ticker moves it to most recently used."""
+        cache = PriceCache(settings=self.settings, max_cache_size=2)
+        cache.cache_price_data('AAPL', _bars())
+        cache.cache_price_data('MSFT', _bars())
+        cache.cache_price_data('AAPL', _bars(6))
+
+        cache.cache_price_data('GOOGL', _bars())
+
+        self.assertIsNotNone(cache.get_cached_price('AAPL'))
+        self.assertIsNone(cache.get_cached_price('MSFT'))
+
+    def test_hit_miss_counters(self):
+        """get_cache_stats reports hits, misses and hit rate."""
+        cache = PriceCache(settings=self.settings)
+        cache.cache_price_data('AAPL', _bars())
+
+        cache.get_cached_price('AAPL')
+        cache.get_cached_price('AAPL')
+        cache.get_cached_price('MSFT')
+
+        stats = cache.get_cache_stats()
+        self.assertEqual(stats['hits'], 2)
+        self.assertEqual(stats['misses'], 1)
+        self.assertAlmostEqual(stats['hit_rate'], 2 / 3)
+
+    def test_concurrent_access(self):
+        """Concurrent reads, writes and invalidations keep the cache consistent."""
+        cache = PriceCache(settings=self.settings, max_cache_size=50)
+        errors = []
+
+        def worker(worker_id: int):
+            try:
+                for i in range(300):
+                    ticker = f"T{(worker_id * 7 + i) % 120}"
+                    cache.cache_price_data(ticker, _bars())
+                    cache.get_cached_price(ticker)
+                    if i % 25 == 0:
+                        cache.invalidate_ticker(ticker)
+                        cache.invalidate_expired()
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        stats = cache.get_cache_stats()
+        self.assertLessEqual(stats['total_entries'], 50)
+        self.assertEqual(stats['hits'] + stats['misses'], 8 * 300)
+
+
+class TestPriceCacheHitLatency(unittest.TestCase):
+    """Microbenchmark: hit latency should not grow with cache size."""
+
+    def setUp(self):
+        """Point PriceCache at a temporary data directory."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.settings = Mock()
+        self.settings.get_data_directory.return_value = self.temp_dir
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _median_hit_seconds(self, size: int, lookups: int = 2000) -> float:
+        """Fill a cache with size tickers and time hits on the newest ones."""
+        cache = PriceCache(settings=self.settings, max_cache_size=size)
+        frame = _bars()
+        for i in range(size):
+            cache.cache_price_data(f"T{i}", frame)
+
+        # Recently used tickers sit at the end of an access list, the worst
+        # case for the old `ticker in list` + `list.remove` bookkeeping
+        tickers = [f"T{size - 1 - (i % size)}" for i in range(lookups)]
+        timings = []
+        for ticker in tickers:
+            start = time.perf_counter()
+            cache.get_cached_price(ticker)
+            timings.append(time.perf_counter() - start)
+        return statistics.median(timings)
+
+    def test_hit_latency_flat_up_to_10k_tickers(self):
+        """Median hit latency at 10k tickers stays close to 100 tickers."""
+        small = self._median_hit_seconds(100)
+        large = self._median_hit_seconds(10_000)
+
+        # Generous headroom for timer noise; the old list scan added ~0.5ms per hit at 10k
+        self.assertLess(large, small * 4,
+                        f"hit latency: 100 tickers {small * 1e6:.1f}us, 10k tickers {large * 1e6:.1f}us")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,9 +9,11 @@ import unittest
 from datetime import datetime, timedelta
 from decimal import Decimal
 from unittest.mock import Mock, MagicMock, patch
+import threading
+import time
 import pandas as pd
 
-from utils.price_service import PriceService
+from utils.price_service import PriceService, SourceRateLimiter
 from data.models.portfolio import Position
 
 
@@ -401,6 +403,111 @@ class TestPriceService(unittest.TestCase):
         stats = self.service.format_cache_stats(0, 5)
         self.assertEqual(stats, "5 API calls")
 
+    def test_get_historical_prices_concurrent_preserves_order(self):
+        """Concurrent fetches return results keyed and ordered like the input."""
+        self.mock_cache.get_cached_price.return_value = None
+        tickers = ['AAPL', 'MSFT', 'GOOGL', 'SHOP.TO', 'RY.TO']
+        
+        def fetch_side_effect(ticker, start, end):
+            # Finish in reverse order to shuffle completion
+            time.sleep(0.01 * (len(tickers) - tickers.index(ticker)))
+            result = Mock()
+            result.df = pd.DataFrame({'Close': [float(tickers.index(ticker))]})
+            result.source = 'yahoo'
+            return result
+        
+        self.mock_fetcher.fetch_price_data.side_effect = fetch_side_effect
+        
+        market_data, hits, calls = self.service.get_historical_prices(
+            tickers, self.week_ago, self.today, verbose=False, max_workers=5
+        )
+        
+        self.assertEqual(list(market_data.keys()), tickers)
+        for i, ticker in enumerate(tickers):
+            self.assertEqual(market_data[ticker]['Close'].iloc[0], float(i))
+        self.assertEqual(hits, 0)
+        self.assertEqual(calls, 5)
+        self.assertEqual(self.mock_cache.cache_price_data.call_count, 5)
+    
+    def test_get_current_prices_concurrent_failure_isolated(self):
+        """One failing ticker does not affect the others in concurrent mode."""
+        def price_side_effect(ticker):
+            if ticker == 'BAD':
+                raise Exception("API Error")
+            return Decimal('10.00')
+        
+        self.mock_fetcher.get_current_price.side_effect = price_side_effect
+        
+        prices = self.service.get_current_prices(['AAPL', 'BAD', 'MSFT'], verbose=False, max_workers=3)
+        
+        self.assertEqual(list(prices.keys()), ['AAPL', 'BAD', 'MSFT'])
+        self.assertIsNone(prices['BAD'])
+        self.assertEqual(prices['AAPL'], Decimal('10.00'))
+    
+    def test_inflight_requests_deduplicated_across_services(self):
+        """Two services (funds) requesting the same ticker share one API call."""
+        self.mock_cache.get_cached_price.return_value = None
+        started = threading.Event()
+        release = threading.Event()
+        
+        def slow_fetch(ticker, start, end):
+            started.set()
+            release.wait(2)
+            result = Mock()
+            result.df = pd.DataFrame({'Close': [100.0]})
+            result.source = 'yahoo'
+            return result
+        
+        self.mock_fetcher.fetch_price_data.side_effect = slow_fetch
+        other_service = PriceService(
+            market_data_fetcher=self.mock_fetcher,
+            price_cache=Mock(**{'get_cached_price.return_value': None}),
+            market_hours=self.mock_market_hours
+        )
+        
+        first = {}
+        thread = threading.Thread(target=lambda: first.update(result=self.service.get_historical_prices(
+            ['AAPL'], self.week_ago, self.today, verbose=False
+        )))
+        thread.start()
+        started.wait(2)
+        
+        second = {}
+        joiner = threading.Thread(target=lambda: second.update(result=other_service.get_historical_prices(
+            ['AAPL'], self.week_ago, self.today, verbose=False
+        )))
+        joiner.start()
+        time.sleep(0.05)
+        release.set()
+        thread.join(2)
+        joiner.join(2)
+        
+        self.assertEqual(self.mock_fetcher.fetch_price_data.call_count, 1)
+        _, first_hits, first_calls = first['result']
+        _, second_hits, second_calls = second['result']
+        self.assertEqual((first_hits, first_calls), (0, 1))
+        self.assertEqual((second_hits, second_calls), (1, 0))
+        self.assertFalse(second['result'][0]['AAPL'].empty)
+    
+    def test_source_rate_limiter_spaces_requests(self):
+        """Rate limiter spaces requests for a limited source only."""
+        limiter = SourceRateLimiter({'stooq': 50.0})
+        
+        start = time.monotonic()
+        for _ in range(4):
+            limiter.acquire('stooq')
+        elapsed = time.monotonic() - start
+        
+        self.assertGreaterEqual(elapsed, 0.05)
+        self.assertEqual(limiter.acquire('yahoo'), 0.0)
+    
+    def test_source_key_normalization(self):
+        """FetchResult source labels map to rate limit buckets."""
+        self.assertEqual(PriceService._source_key('yahoo (.TO suffix)'), 'yahoo')
+        self.assertEqual(PriceService._source_key('stooq-csv'), 'stooq')
+        self.assertEqual(PriceService._source_key('yahoo:http-proxy'), 'yahoo')
+        self.assertIsNone(PriceService._source_key('failed'))
+
 
 if __name__ == '__main__':
     unittest.main()
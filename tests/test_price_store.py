@@ -0,0 +1,208 @@
+"""Unit tests for the columnar price store and PriceCache persistence.
+
+These tests use a temporary data directory and never touch the network.
+"""
+
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import Mock
+
+import numpy as np
+import pandas as pd
+
+from market_data.price_cache import PriceCache, CacheEntry
+from market_data.price_store import ColumnarPriceStore
+
+
+def _bars(start: str, periods: int, close_offset: float = 0.0) -> pd.DataFrame:
+    """Build daily OHLCV bars with a tz-aware Date index."""
+    index = pd.date_range(start, periods=periods, freq='D', tz='America/New_York', name='Date')
+    values = np.arange(periods, dtype=float)
+    return pd.DataFrame({
+        'Open': values,
+        'High': values + 2,
+        'Low': values - 1,
+        'Close': values + 1 + close_offset,
+        'Volume': np.arange(periods) * 100
+    }, index=index)
+
+
+class TestColumnarPriceStore(unittest.TestCase):
+    """Test suite for ColumnarPriceStore."""
+
+    def setUp(self):
+        """Create a temporary store directory."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = ColumnarPriceStore(Path(self.temp_dir) / "prices", max_segments=3)
+        self.now = datetime.now()
+        self.ttl = timedelta(minutes=15)
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_round_trip(self):
+        """Bars, index name and timezone survive a write and read."""
+        df = _bars('2024-01-01', 10)
+        self.store.write('AAPL', df, 'yahoo', self.now, self.ttl)
+        self.store.save_index()
+
+        reopened = ColumnarPriceStore(self.store.directory)
+        result = reopened.read('AAPL')
+
+        pd.testing.assert_frame_equal(result, df, check_freq=False)
+        self.assertEqual(reopened.get_metadata('AAPL')[0], 'yahoo')
+
+    def test_append_only_writes_new_bars(self):
+        """New bars go to a new segment and re-fetched last bars win."""
+        self.store.write('AAPL', _bars('2024-01-01', 10), 'yahoo', self.now, self.ttl)
+        # Overlaps the stored range; last stored bar (Jan 10) has a new close
+        update = _bars('2024-01-05', 8, close_offset=100)
+        self.store.write('AAPL', update, 'yahoo', self.now, self.ttl)
+
+        meta = self.store.index['AAPL']
+        self.assertEqual(len(meta['segments']), 2)
+        appended = pd.read_parquet(self.store.directory / 'AAPL' / meta['segments'][1])
+        self.assertEqual(len(appended), 3)  # Jan 10, 11, 12
+
+        result = self.store.read('AAPL')
+        self.assertEqual(len(result), 12)
+        self.assertTrue(result.index.is_monotonic_increasing)
+        self.assertEqual(result.loc['2024-01-10', 'Close'], update.loc['2024-01-10', 'Close'])
+        self.assertEqual(result.loc['2024-01-09', 'Close'], 9.0)
+
+    def test_range_read(self):
+        """Range reads return only rows inside the requested window."""
+        self.store.write('AAPL', _bars('2024-01-01', 30), 'yahoo', self.now, self.ttl)
+
+        result = self.store.read('AAPL', datetime(2024, 1, 10), datetime(2024, 1, 12))
+
+        self.assertEqual(len(result), 3)
+        self.assertEqual(result.index[0].day, 10)
+
+    def test_compaction(self):
+        """Segments are merged once max_segments is exceeded."""
+        for i in range(4):
+            self.store.write('AAPL', _bars(f'2024-01-{1 + i * 5:02d}', 5), 'yahoo', self.now, self.ttl)
+
+        self.assertEqual(len(self.store.index['AAPL']['segments']), 1)
+        self.assertEqual(len(self.store.read('AAPL')), 20)
+        self.assertEqual(len(os.listdir(self.store.directory / 'AAPL')), 1)
+
+    def test_corrupt_segment_only_loses_its_ticker(self):
+        """A corrupt segment drops that ticker and leaves others readable."""
+        self.store.write('AAPL', _bars('2024-01-01', 5), 'yahoo', self.now, self.ttl)
+        self.store.write('MSFT', _bars('2024-01-01', 5), 'yahoo', self.now, self.ttl)
+        self.store.save_index()
+        segment = self.store.directory / 'AAPL' / self.store.index['AAPL']['segments'][0]
+        segment.write_bytes(b'not parquet')
+
+        self.assertIsNone(self.store.read('AAPL'))
+        self.assertNotIn('AAPL', self.store.tickers())
+        self.assertEqual(len(self.store.read('MSFT')), 5)
+
+    def test_special_characters_in_ticker(self):
+        """Index symbols like ^GSPC get a safe directory name."""
+        self.store.write('^GSPC', _bars('2024-01-01', 5), 'yahoo', self.now, self.ttl)
+
+        self.assertTrue((self.store.directory / '%5EGSPC').is_dir())
+        self.assertEqual(len(self.store.read('^GSPC')), 5)
+
+    def test_remove_expired(self):
+        """Expired tickers are removed from index and disk."""
+        self.store.write('OLD', _bars('2024-01-01', 5), 'yahoo', self.now - timedelta(hours=1), self.ttl)
+        self.store.write('NEW', _bars('2024-01-01', 5), 'yahoo', self.now, self.ttl)
+
+        self.assertEqual(self.store.remove_expired(), 1)
+        self.assertEqual(self.store.tickers(), ['NEW'])
+        self.assertFalse((self.store.directory / 'OLD').exists())
+
+
+class TestPriceCachePersistence(unittest.TestCase):
+    """Test PriceCache lazy loading and migration on top of the store."""
+
+    def setUp(self):
+        """Point PriceCache at a temporary data directory."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.settings = Mock()
+        self.settings.get_data_directory.return_value = self.temp_dir
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_lazy_load_on_first_access(self):
+        """Persisted tickers are not loaded until first requested."""
+        cache = PriceCache(settings=self.settings)
+        cache.cache_price_data('AAPL', _bars('2024-01-01', 10), 'yahoo')
+        cache.cache_price_data('MSFT', _bars('2024-01-01', 10), 'yahoo')
+        cache.save_persistent_cache()
+
+        reopened = PriceCache(settings=self.settings)
+        self.assertEqual(reopened.get_cache_stats()['total_entries'], 0)
+        self.assertEqual(reopened.get_cache_stats()['persisted_entries'], 2)
+
+        result = reopened.get_cached_price('aapl', datetime(2024, 1, 3), datetime(2024, 1, 5))
+
+        self.assertEqual(len(result), 3)
+        self.assertEqual(reopened.get_cache_stats()['total_entries'], 1)
+
+    def test_range_slice_does_not_alias_cache(self):
+        """Returned slices can be modified without touching cached data."""
+        cache = PriceCache(settings=self.settings)
+        cache.cache_price_data('AAPL', _bars('2024-01-01', 10), 'yahoo')
+
+        result = cache.get_cached_price('AAPL', datetime(2024, 1, 2), datetime(2024, 1, 3))
+        result['Close'] = 0.0
+
+        again = cache.get_cached_price('AAPL', datetime(2024, 1, 2), datetime(2024, 1, 3))
+        self.assertEqual(list(again['Close']), [2.0, 3.0])
+        self.assertIsNone(cache.get_cached_price('AAPL', datetime(2025, 1, 1)))
+
+    def test_save_only_writes_changed_tickers(self):
+        """Unchanged tickers are not rewritten on save."""
+        cache = PriceCache(settings=self.settings)
+        cache.cache_price_data('AAPL', _bars('2024-01-01', 10), 'yahoo')
+        cache.cache_price_data('MSFT', _bars('2024-01-01', 10), 'yahoo')
+        cache.save_persistent_cache()
+        aapl_dir = Path(self.temp_dir) / '.cache' / 'prices' / 'AAPL'
+        before = sorted(os.listdir(aapl_dir))
+
+        cache.cache_price_data('MSFT', _bars('2024-01-05', 10), 'yahoo')
+        cache.save_persistent_cache()
+
+        self.assertEqual(sorted(os.listdir(aapl_dir)), before)
+
+    def test_invalidate_ticker_removes_persisted_data(self):
+        """Invalidated tickers are not resurrected from disk."""
+        cache = PriceCache(settings=self.settings)
+        cache.cache_price_data('AAPL', _bars('2024-01-01', 10), 'yahoo')
+        cache.save_persistent_cache()
+
+        cache.invalidate_ticker('AAPL')
+
+        self.assertIsNone(PriceCache(settings=self.settings).get_cached_price('AAPL'))
+
+    def test_legacy_pickle_migration(self):
+        """The legacy pickled cache is migrated to the store on next save."""
+        cache_dir = Path(self.temp_dir) / '.cache'
+        cache_dir.mkdir()
+        entry = CacheEntry('AAPL', _bars('2024-01-01', 10), 'yahoo', datetime.now(), timedelta(minutes=15))
+        with open(cache_dir / 'price_cache.pkl', 'wb') as f:
+            pickle.dump({'cache': {'AAPL': entry}, 'access_order': ['AAPL']}, f)
+
+        cache = PriceCache(settings=self.settings)
+        self.assertEqual(len(cache.get_cached_price('AAPL')), 10)
+        cache.save_persistent_cache()
+
+        self.assertFalse((cache_dir / 'price_cache.pkl').exists())
+        self.assertEqual(len(PriceCache(settings=self.settings).get_cached_price('AAPL')), 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
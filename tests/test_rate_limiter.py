@@ -1,21 +1,23 @@
 import pytest
 from unittest.mock import patch, MagicMock
+import threading
 import time
-from web_dashboard.flask_cache_utils import SimpleCache
+from concurrent.futures import ThreadPoolExecutor
+from rate_limiter import MemoryBackend, RateLimitPolicy, RedisBackend, check_rate_limit
 
 def test_rate_limiter_login(client):
     """Test that login endpoint is rate limited."""
 
-    # Create a fresh cache for this test
-    test_cache = SimpleCache()
+    # Create a fresh backend for this test
+    test_backend = MemoryBackend()
 
-    # We need to patch _get_cache in rate_limiter module specifically
+    # We need to patch _get_backend in rate_limiter module specifically
     # And patch requests.post in app module to avoid external calls
 
-    # We try patching 'rate_limiter._get_cache' because app.py imports it as 'from rate_limiter import ...'
+    # We try patching 'rate_limiter._get_backend' because app.py imports it as 'from rate_limiter import ...'
     # and app.py is loaded with web_dashboard in sys.path.
 
-    with patch('rate_limiter._get_cache', return_value=test_cache) as mock_cache_getter, \
+    with patch('rate_limiter._get_backend', return_value=test_backend) as mock_cache_getter, \
          patch('web_dashboard.app.requests.post') as mock_post:
 
         # Mock 401 response from Supabase
@@ -52,9 +54,9 @@ def test_rate_limiter_login(client):
 def test_rate_limiter_window_expiry(client):
     """Test that rate limit resets after window expires."""
 
-    test_cache = SimpleCache()
+    test_backend = MemoryBackend()
 
-    with patch('rate_limiter._get_cache', return_value=test_cache), \
+    with patch('rate_limiter._get_backend', return_value=test_backend), \
          patch('web_dashboard.app.requests.post') as mock_post, \
          patch('rate_limiter.time.time') as mock_time:
 
@@ -82,10 +84,10 @@ def test_rate_limiter_window_expiry(client):
         assert response.status_code == 429
 
         # Advance time by 61 seconds (window is 60s)
-        # Note: Fixed window logic uses int(time / period).
-        # start_time = 1000000.0. window = 1000000 // 60 = 16666
-        # next_time = 1000061.0. window = 1000061 // 60 = 16667
-        # So the key changes.
+        # Note: Sliding window logic weights the previous window by the part still covered.
+        # start_time = 1000000.0 is 40s into window 16666 (5 requests)
+        # next_time = 1000061.0 is 41s into window 16667: 5 * (1 - 41/60) + 1 = 2.6 <= 5
+        # So the request is allowed.
         mock_time.return_value = start_time + 61.0
 
         # Should be allowed again
@@ -93,3 +95,157 @@ def test_rate_limiter_window_expiry(client):
                              json={'email': 'test@test.com', 'password': 'pass'},
                              headers=headers)
         assert response.status_code == 401
+
+
+class FakeRedis:
+    """Local stand-in for a Redis server: each command runs atomically."""
+
+    def __init__(self):
+        self.data = {}
+        self.hashes = {}
+        self.lock = threading.Lock()
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, server):
+        self.server = server
+        self.commands = []
+
+    def __getattr__(self, name):
+        def queue(*args):
+            self.commands.append((name, args))
+            return self
+        return queue
+
+    def execute(self):
+        results = []
+        for name, args in self.commands:
+            with self.server.lock:
+                results.append(getattr(self, f"_{name}")(*args))
+        self.commands = []
+        return results
+
+    def _incr(self, key):
+        self.server.data[key] = int(self.server.data.get(key, 0)) + 1
+        return self.server.data[key]
+
+    def _decr(self, key):
+        self.server.data[key] = int(self.server.data.get(key, 0)) - 1
+        return self.server.data[key]
+
+    def _expire(self, key, ttl):
+        return key in self.server.data
+
+    def _get(self, key):
+        value = self.server.data.get(key)
+        return None if value is None else str(value).encode()
+
+    def _hincrby(self, key, field, amount):
+        counters = self.server.hashes.setdefault(key, {})
+        counters[field] = counters.get(field, 0) + amount
+        return counters[field]
+
+    def _hgetall(self, key):
+        return {field.encode(): str(value).encode() for field, value in self.server.hashes.get(key, {}).items()}
+
+
+@pytest.fixture(params=['memory', 'redis'])
+def backend(request):
+    if request.param == 'memory':
+        return MemoryBackend()
+    return RedisBackend(FakeRedis())
+
+
+def test_concurrent_requests_are_counted_atomically(backend):
+    """Exactly `limit` of many simultaneous requests get through."""
+    policy = RateLimitPolicy(scope='test_concurrent', limit=10, period=60)
+    barrier = threading.Barrier(20)
+
+    def attempt(_):
+        barrier.wait()
+        return sum(check_rate_limit(policy, 'ip:10.0.1.1', backend) for _ in range(5))
+
+    with ThreadPoolExecutor(max_workers=20) as pool:
+        allowed = sum(pool.map(attempt, range(20)))
+
+    assert allowed == 10
+    stats = backend.stats(['rate_limit:stats:test_concurrent'])['rate_limit:stats:test_concurrent']
+    assert stats == {'hits': 100, 'denied': 90}
+
+
+def test_window_boundary_burst_is_limited(backend):
+    """A burst at the end of a window still counts early in the next one."""
+    policy = RateLimitPolicy(scope='test_boundary', limit=5, period=60)
+
+    with patch('rate_limiter.time.time') as mock_time:
+        # Last second of window 16666, then first seconds of window 16667
+        mock_time.return_value = 16667 * 60 - 1.0
+        assert all(check_rate_limit(policy, 'ip:10.0.1.2', backend) for _ in range(5))
+
+        mock_time.return_value = 16667 * 60 + 1.0
+        assert not check_rate_limit(policy, 'ip:10.0.1.2', backend)
+
+        # Once the previous window has mostly slid out, requests are allowed again
+        mock_time.return_value = 16667 * 60 + 50.0
+        assert check_rate_limit(policy, 'ip:10.0.1.2', backend)
+
+
+def test_denied_requests_are_refunded(backend):
+    """Retrying while limited doesn't push the window further out."""
+    policy = RateLimitPolicy(scope='test_refund', limit=2, period=60)
+
+    with patch('rate_limiter.time.time', return_value=16667 * 60 + 1.0):
+        results = [check_rate_limit(policy, 'ip:10.0.1.3', backend) for _ in range(10)]
+
+    with patch('rate_limiter.time.time', return_value=16668 * 60 + 40.0):
+        # 2 * (1 - 40/60) + 1 <= 2, which would fail if the denials had counted
+        assert check_rate_limit(policy, 'ip:10.0.1.3', backend)
+
+    assert results == [True, True] + [False] * 8
+
+
+def test_per_user_limits_and_stats():
+    """per='user' limits each signed-in user separately, and hits/denials are reported."""
+    from flask import Flask, request as flask_request
+    from rate_limiter import get_rate_limit_stats, rate_limit
+
+    app = Flask(__name__)
+
+    @app.route('/expensive')
+    @rate_limit(limit=2, period=60, per='user', scope='test_per_user')
+    def expensive():
+        return 'ok'
+
+    @app.before_request
+    def authenticate():
+        flask_request.user_id = flask_request.headers.get('X-User')
+
+    test_backend = MemoryBackend()
+    with patch('rate_limiter._get_backend', return_value=test_backend):
+        test_client = app.test_client()
+        alice = [test_client.get('/expensive', headers={'X-User': 'alice'}).status_code for _ in range(3)]
+        bob = test_client.get('/expensive', headers={'X-User': 'bob'}).status_code
+        denied = test_client.get('/expensive', headers={'X-User': 'alice'})
+
+        stats = {row['endpoint']: row for row in get_rate_limit_stats()}
+
+    assert alice == [200, 200, 429]
+    assert bob == 200
+    assert denied.headers['Retry-After'] == '60'
+    assert stats['test_per_user']['hits'] == 5
+    assert stats['test_per_user']['denied'] == 2
+    assert (stats['test_per_user']['limit'], stats['test_per_user']['per']) == (2, 'user')
+
+
+def test_benchmark_check_rate_limit(request):
+    """Benchmark the per-request cost of the in-process limiter."""
+    try:
+        benchmark = request.getfixturevalue('benchmark')
+    except pytest.FixtureLookupError:
+        pytest.skip("pytest-benchmark plugin not installed")
+    backend = MemoryBackend()
+    policy = RateLimitPolicy(scope='test_benchmark', limit=10 ** 9, period=60)
+    benchmark(check_rate_limit, policy, 'user:benchmark', backend)
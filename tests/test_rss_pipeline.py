@@ -0,0 +1,186 @@
+"""Unit tests for the staged RSS ingestion pipeline.
+
+Feeds, the existence check, processing and saving are all fakes, so no
+network or database is needed.
+"""
+
+import os
+import sys
+import threading
+import time
+import unittest
+
+# Add web_dashboard to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'web_dashboard')))
+
+from rss_pipeline import DomainLimiter, PipelineMetrics, domain_of, run_pipeline
+
+
+def _feeds(count, items_per_feed):
+    """Build feed rows on distinct domains, each with its own item list."""
+    feeds = []
+    for f in range(count):
+        feeds.append({
+            'id': f,
+            'name': f"feed {f}",
+            'url': f"https://feed{f}.example.com/rss",
+            'items': [{'url': f"https://news{f}.example.com/{i}", 'title': f"Item {f}-{i}"}
+                      for i in range(items_per_feed)],
+        })
+    return feeds
+
+
+class TestDomainLimiter(unittest.TestCase):
+    """Test suite for DomainLimiter."""
+
+    def test_same_domain_requests_spaced(self):
+        """Consecutive requests to one domain start min_interval apart."""
+        limiter = DomainLimiter(max_concurrent=2, min_interval=0.05)
+        starts = []
+
+        for path in ("a", "b", "c"):
+            with limiter.slot(f"https://example.com/{path}"):
+                starts.append(time.monotonic())
+
+        self.assertGreaterEqual(starts[1] - starts[0], 0.045)
+        self.assertGreaterEqual(starts[2] - starts[1], 0.045)
+
+    def test_other_domains_do_not_wait(self):
+        """A busy domain doesn't delay requests to a different one."""
+        limiter = DomainLimiter(max_concurrent=1, min_interval=1.0)
+        with limiter.slot("https://slow.example.com/x"):
+            start = time.monotonic()
+            with limiter.slot("https://fast.example.org/y"):
+                pass
+
+        self.assertLess(time.monotonic() - start, 0.5)
+
+    def test_concurrency_cap(self):
+        """No more than max_concurrent requests run against one domain."""
+        limiter = DomainLimiter(max_concurrent=2, min_interval=0)
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def request():
+            with limiter.slot("https://example.com/page"):
+                with lock:
+                    active.append(1)
+                    peak.append(len(active))
+                time.sleep(0.02)
+                with lock:
+                    active.pop()
+
+        threads = [threading.Thread(target=request) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(max(peak), 2)
+
+    def test_domain_of(self):
+        self.assertEqual(domain_of("https://WWW.Example.com:8080/a?b=c"), "www.example.com")
+        self.assertEqual(domain_of("not a url"), "unknown")
+
+
+class TestRunPipeline(unittest.TestCase):
+    """Test suite for run_pipeline."""
+
+    def setUp(self):
+        self.limiter = DomainLimiter(max_concurrent=2, min_interval=0)
+        self.saved_batches = []
+        self.filter_calls = []
+
+    def _run(self, feeds, existing=(), fetch=None, process=None, **kwargs):
+        def filter_new(feed, items):
+            self.filter_calls.append(feed['id'])
+            return [item for item in items if item['url'] not in existing]
+
+        def save_batch(records):
+            self.saved_batches.append(records)
+            return len(records)
+
+        return run_pipeline(
+            feeds,
+            fetch or (lambda feed: feed['items']),
+            filter_new,
+            process or (lambda feed, item: {'url': item['url']}),
+            save_batch,
+            limiter=self.limiter,
+            **kwargs
+        )
+
+    def test_every_new_item_saved_in_batches(self):
+        """New items flow through to save in batches of batch_size."""
+        feeds = _feeds(3, 5)
+        existing = {"https://news0.example.com/0", "https://news2.example.com/4"}
+
+        metrics = self._run(feeds, existing=existing, batch_size=4)
+
+        saved = sorted(record['url'] for batch in self.saved_batches for record in batch)
+        expected = sorted(item['url'] for feed in feeds for item in feed['items'] if item['url'] not in existing)
+        self.assertEqual(saved, expected)
+        self.assertTrue(all(len(batch) <= 4 for batch in self.saved_batches))
+        self.assertEqual(sorted(self.filter_calls), [0, 1, 2])
+        self.assertEqual(metrics.stage('fetch').items, 3)
+        self.assertEqual(metrics.stage('dedupe').items, 15)
+        self.assertEqual(metrics.stage('process').items, 13)
+        self.assertEqual(metrics.stage('save').items, 13)
+
+    def test_feeds_and_items_run_concurrently(self):
+        """Slow fetches and slow items overlap instead of running back to back."""
+        feeds = _feeds(4, 3)
+
+        def slow_fetch(feed):
+            time.sleep(0.1)
+            return feed['items']
+
+        def slow_process(feed, item):
+            time.sleep(0.05)
+            return {'url': item['url']}
+
+        start = time.monotonic()
+        self._run(feeds, fetch=slow_fetch, process=slow_process, feed_workers=4, item_workers=4)
+        elapsed = time.monotonic() - start
+
+        # Sequential would take 4 * 0.1 + 12 * 0.05 = 1.0s
+        self.assertLess(elapsed, 0.6)
+        self.assertEqual(sum(len(batch) for batch in self.saved_batches), 12)
+
+    def test_failures_are_isolated(self):
+        """A failing feed or item is counted and the rest still get saved."""
+        feeds = _feeds(2, 3)
+
+        def fetch(feed):
+            if feed['id'] == 0:
+                raise RuntimeError("feed down")
+            return feed['items']
+
+        def process(feed, item):
+            if item['url'].endswith('/1'):
+                raise ValueError("bad item")
+            if item['url'].endswith('/2'):
+                return None
+            return {'url': item['url']}
+
+        metrics = self._run(feeds, fetch=fetch, process=process)
+
+        saved = [record['url'] for batch in self.saved_batches for record in batch]
+        self.assertEqual(saved, ["https://news1.example.com/0"])
+        self.assertEqual(metrics.stage('fetch').errors, 1)
+        self.assertEqual(metrics.stage('process').errors, 1)
+
+    def test_metrics_as_dict(self):
+        """Stage metrics are exported as plain values."""
+        metrics = self._run(_feeds(1, 2), metrics=PipelineMetrics())
+
+        exported = metrics.as_dict()
+
+        self.assertEqual(set(exported), {'fetch', 'dedupe', 'process', 'save'})
+        self.assertEqual(exported['save']['items'], 2)
+        self.assertGreaterEqual(exported['process']['throughput_per_s'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
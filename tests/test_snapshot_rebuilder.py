@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Tests for the single-pass snapshot rebuild engine.
+
+Covers:
+1. Positions carried forward across days without trades
+2. Backdated trades reflected in every later snapshot
+3. Price lookup, forward-fill and cost fallback behaviour
+4. Bulk save through CSVRepository replacing existing dates
+"""
+
+import unittest
+import sys
+import shutil
+import tempfile
+from pathlib import Path
+from decimal import Decimal
+from datetime import date, datetime
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from data.models.trade import Trade
+from data.models.portfolio import Position, PortfolioSnapshot
+from data.repositories.csv_repository import CSVRepository
+from portfolio.snapshot_rebuilder import SnapshotRebuilder
+
+
+# Mon 2024-03-04 .. Fri 2024-03-08 (no market holidays)
+TRADING_DAYS = [date(2024, 3, 4), date(2024, 3, 5), date(2024, 3, 6), date(2024, 3, 7), date(2024, 3, 8)]
+
+
+def _trade(ticker, action, shares, price, day, hour=10):
+    return Trade(
+        ticker=ticker,
+        action=action,
+        shares=Decimal(str(shares)),
+        price=Decimal(str(price)),
+        timestamp=datetime.combine(day, datetime.min.time().replace(hour=hour)),
+        cost_basis=Decimal(str(shares)) * Decimal(str(price)),
+        reason=f"{action} order",
+        currency="USD"
+    )
+
+
+class TestSnapshotRebuilder(unittest.TestCase):
+    """Test SnapshotRebuilder position sweep and snapshot construction."""
+
+    def setUp(self):
+        self.rebuilder = SnapshotRebuilder(localize=False)
+
+    def test_positions_carry_forward_between_trades(self):
+        """Every trading day gets positions, not only days with trades."""
+        trades = [
+            _trade("AAPL", "BUY", 10, 100, TRADING_DAYS[0]),
+            _trade("AAPL", "SELL", 4, 110, TRADING_DAYS[3]),
+        ]
+
+        days = list(self.rebuilder.iter_daily_positions(
+            trades, TRADING_DAYS[0], TRADING_DAYS[-1], trading_days=TRADING_DAYS
+        ))
+
+        self.assertEqual([d for d, _ in days], TRADING_DAYS)
+        for _, held in days[:3]:
+            self.assertEqual(held["AAPL"].shares, Decimal("10"))
+        for _, held in days[3:]:
+            self.assertEqual(held["AAPL"].shares, Decimal("6"))
+            self.assertEqual(held["AAPL"].cost, Decimal("600"))
+
+    def test_trades_before_window_seed_opening_state(self):
+        """Trades before start_date and unsorted input are handled in one sweep."""
+        trades = [
+            _trade("MSFT", "BUY", 5, 200, TRADING_DAYS[2]),
+            _trade("AAPL", "BUY", 10, 100, date(2024, 2, 1)),
+        ]
+
+        days = dict(self.rebuilder.iter_daily_positions(
+            trades, TRADING_DAYS[1], TRADING_DAYS[-1], trading_days=TRADING_DAYS[1:]
+        ))
+
+        self.assertEqual(set(days[TRADING_DAYS[1]]), {"AAPL"})
+        self.assertEqual(set(days[TRADING_DAYS[2]]), {"AAPL", "MSFT"})
+
+    def test_closed_positions_are_dropped(self):
+        """Positions sold to zero do not appear in later snapshots, which are empty."""
+        trades = [
+            _trade("AAPL", "BUY", 10, 100, TRADING_DAYS[0]),
+            _trade("AAPL", "SELL", 10, 120, TRADING_DAYS[1]),
+        ]
+
+        snapshots = self.rebuilder.build_snapshots(
+            trades, TRADING_DAYS[0], TRADING_DAYS[-1], trading_days=TRADING_DAYS
+        )
+
+        self.assertEqual([s.timestamp.date() for s in snapshots], TRADING_DAYS)
+        self.assertEqual(len(snapshots[0].positions), 1)
+        for snapshot in snapshots[1:]:
+            self.assertEqual(snapshot.positions, [])
+            self.assertEqual(snapshot.total_value, Decimal("0"))
+
+    def test_price_lookup_and_forward_fill(self):
+        """Known prices are used and forward-filled; cost is the last resort."""
+        trades = [_trade("AAPL", "BUY", 10, 100, TRADING_DAYS[0])]
+        prices = {("AAPL", TRADING_DAYS[1]): Decimal("105")}
+
+        snapshots = self.rebuilder.build_snapshots(
+            trades, TRADING_DAYS[0], TRADING_DAYS[-1],
+            price_lookup=lambda ticker, day: prices.get((ticker, day)),
+            trading_days=TRADING_DAYS
+        )
+
+        current_prices = [s.positions[0].current_price for s in snapshots]
+        self.assertEqual(current_prices, [Decimal("100"), Decimal("105"), Decimal("105"),
+                                          Decimal("105"), Decimal("105")])
+        self.assertEqual(snapshots[1].positions[0].unrealized_pnl, Decimal("50"))
+        self.assertEqual(snapshots[1].total_value, Decimal("1050"))
+
+    def test_exact_prices_only(self):
+        """Without forward-fill or cost fallback, unpriced positions are left out."""
+        trades = [_trade("AAPL", "BUY", 10, 100, TRADING_DAYS[0])]
+        prices = {("AAPL", TRADING_DAYS[2]): Decimal("101")}
+
+        snapshots = self.rebuilder.build_snapshots(
+            trades, TRADING_DAYS[0], TRADING_DAYS[-1],
+            price_lookup=lambda ticker, day: prices.get((ticker, day)),
+            forward_fill=False,
+            fallback_to_cost=False,
+            trading_days=TRADING_DAYS
+        )
+
+        priced = [s.timestamp.date() for s in snapshots if s.positions]
+        self.assertEqual(priced, [TRADING_DAYS[2]])
+
+
+class TestSnapshotRebuilderCSV(unittest.TestCase):
+    """Test rebuild and bulk save through CSVRepository."""
+
+    def setUp(self):
+        self.test_data_dir = Path(tempfile.mkdtemp())
+        self.repository = CSVRepository(fund_name="TEST", data_directory=str(self.test_data_dir))
+
+    def tearDown(self):
+        if self.test_data_dir.exists():
+            shutil.rmtree(self.test_data_dir)
+
+    def test_backdated_trade_rebuild(self):
+        """A backdated trade shows up in every later snapshot, existing prices kept."""
+        self.repository.save_trade(_trade("AAPL", "BUY", 10, 100, TRADING_DAYS[0]))
+
+        rebuilder = SnapshotRebuilder(self.repository)
+        written = rebuilder.rebuild(TRADING_DAYS[0], TRADING_DAYS[-1])
+        self.assertEqual(written, len(TRADING_DAYS))
+
+        # Record a market price on day 3, then backdate a second buy to day 2
+        stored = self.repository.get_portfolio_data()
+        day3 = [s for s in stored if s.timestamp.date() == TRADING_DAYS[2]][0]
+        self.repository.save_portfolio_snapshots([PortfolioSnapshot(
+            positions=[Position(ticker="AAPL", shares=Decimal("10"), avg_price=Decimal("100"),
+                                cost_basis=Decimal("1000"), currency="USD",
+                                current_price=Decimal("120"), market_value=Decimal("1200"),
+                                unrealized_pnl=Decimal("200"))],
+            timestamp=day3.timestamp
+        )])
+        self.repository.save_trade(_trade("MSFT", "BUY", 2, 50, TRADING_DAYS[1]))
+
+        rebuilder.rebuild(TRADING_DAYS[1], TRADING_DAYS[-1])
+
+        by_day = {s.timestamp.date(): s for s in self.repository.get_portfolio_data()}
+        self.assertEqual(set(by_day), set(TRADING_DAYS))
+        self.assertEqual({p.ticker for p in by_day[TRADING_DAYS[0]].positions}, {"AAPL"})
+        for day in TRADING_DAYS[1:]:
+            self.assertEqual({p.ticker for p in by_day[day].positions}, {"AAPL", "MSFT"})
+
+        aapl_day3 = [p for p in by_day[TRADING_DAYS[2]].positions if p.ticker == "AAPL"][0]
+        self.assertEqual(aapl_day3.current_price, Decimal("120"))
+
+    def test_rebuild_replaces_non_trading_day_with_trades(self):
+        """A snapshot left by a weekend trade is rebuilt along with the trading days."""
+        saturday = date(2024, 3, 9)
+        self.repository.save_trade(_trade("AAPL", "BUY", 10, 100, TRADING_DAYS[-1]))
+        self.repository.save_trade(_trade("AAPL", "SELL", 4, 110, saturday))
+        self.repository.save_portfolio_snapshots([PortfolioSnapshot(
+            positions=[Position(ticker="AAPL", shares=Decimal("6"), avg_price=Decimal("100"),
+                                cost_basis=Decimal("600"), currency="USD")],
+            timestamp=datetime.combine(saturday, datetime.min.time().replace(hour=11))
+        )])
+
+        # Backdate another buy before the weekend
+        self.repository.save_trade(_trade("AAPL", "BUY", 5, 100, TRADING_DAYS[-1], hour=11))
+        SnapshotRebuilder(self.repository).rebuild(TRADING_DAYS[-1], saturday)
+
+        by_day = {s.timestamp.date(): s for s in self.repository.get_portfolio_data()}
+        self.assertEqual(by_day[TRADING_DAYS[-1]].positions[0].shares, Decimal("15"))
+        self.assertEqual(by_day[saturday].positions[0].shares, Decimal("11"))
+
+    def test_backdated_sell_clears_flat_days(self):
+        """Days that end flat after a backdated sell lose their stale snapshot."""
+        self.repository.save_trade(_trade("AAPL", "BUY", 10, 100, TRADING_DAYS[0]))
+        rebuilder = SnapshotRebuilder(self.repository)
+        rebuilder.rebuild(TRADING_DAYS[0], TRADING_DAYS[-1])
+
+        self.repository.save_trade(_trade("AAPL", "SELL", 10, 110, TRADING_DAYS[2]))
+        rebuilder.rebuild(TRADING_DAYS[2], TRADING_DAYS[-1])
+
+        stored_days = {s.timestamp.date() for s in self.repository.get_portfolio_data() if s.positions}
+        self.assertEqual(stored_days, set(TRADING_DAYS[:2]))
+
+
+if __name__ == '__main__':
+    unittest.main()
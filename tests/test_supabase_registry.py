@@ -0,0 +1,128 @@
+"""Tests for the Supabase client registry.
+
+Clients are plain fakes built by counting factories, so supabase itself
+isn't needed.
+"""
+
+import base64
+import json
+import os
+import sys
+import threading
+import time
+import unittest
+
+# Add web_dashboard to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'web_dashboard')))
+
+from supabase_registry import SupabaseClientRegistry, token_expiry
+
+
+def _jwt(exp, sub="user-1"):
+    """Unsigned JWT with the given expiry."""
+    def encode(data):
+        return base64.urlsafe_b64encode(json.dumps(data).encode()).rstrip(b'=').decode()
+    return f"{encode({'alg': 'HS256'})}.{encode({'sub': sub, 'exp': exp})}.signature"
+
+
+class FakeClient:
+    def __init__(self, token=None):
+        self.token = token
+
+
+class TestSupabaseClientRegistry(unittest.TestCase):
+    """Test suite for SupabaseClientRegistry."""
+
+    def setUp(self):
+        self.registry = SupabaseClientRegistry(max_user_clients=2, refresh_margin=60, http_pool_size=0)
+        self.created = []
+        self.refresh_calls = []
+
+    def _create(self, token, refresh_token=None):
+        self.created.append(token)
+        return FakeClient(token)
+
+    def _refresh(self, client, refresh_token):
+        self.refresh_calls.append(refresh_token)
+        return _jwt(time.time() + 3600, sub="refreshed"), "refresh-2"
+
+    def _user(self, token, refresh_token=None):
+        return self.registry.user_client(token, refresh_token, self._create, self._refresh)
+
+    def test_shared_client_created_once(self):
+        clients = [self.registry.shared_client("url", "service-key", FakeClient) for _ in range(3)]
+
+        self.assertTrue(all(client is clients[0] for client in clients))
+        self.assertIsNot(self.registry.shared_client("url", "anon-key", FakeClient), clients[0])
+        self.assertEqual(self.registry.stats()['shared_clients'], 2)
+
+    def test_shared_client_concurrent_first_use(self):
+        """Threads racing on first use all get the same client."""
+        results = []
+
+        def get():
+            results.append(self.registry.shared_client("url", "key", lambda: (time.sleep(0.01), FakeClient())[1]))
+
+        threads = [threading.Thread(target=get) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len({id(client) for client in results}), 1)
+
+    def test_user_clients_reused_per_token(self):
+        token_a = _jwt(time.time() + 3600, "a")
+        token_b = _jwt(time.time() + 3600, "b")
+
+        client_a, _ = self._user(token_a)
+        again, access_token = self._user(token_a)
+        client_b, _ = self._user(token_b)
+
+        self.assertIs(again, client_a)
+        self.assertEqual(access_token, token_a)
+        self.assertIsNot(client_b, client_a)
+        self.assertEqual(self.created, [token_a, token_b])
+
+    def test_least_recently_used_user_client_dropped(self):
+        tokens = [_jwt(time.time() + 3600, sub) for sub in ("a", "b", "c")]
+        self._user(tokens[0])
+        self._user(tokens[1])
+        self._user(tokens[0])
+        self._user(tokens[2])
+
+        self._user(tokens[0])
+        self._user(tokens[1])
+
+        self.assertEqual(self.created, [tokens[0], tokens[1], tokens[2], tokens[1]])
+
+    def test_expiring_session_refreshed(self):
+        """A client whose token is about to expire is refreshed and rebuilt."""
+        expiring = _jwt(time.time() + 30)
+        self._user(expiring, "refresh-1")
+
+        client, access_token = self._user(expiring)
+
+        self.assertEqual(self.refresh_calls, ["refresh-1"])
+        self.assertNotEqual(access_token, expiring)
+        self.assertEqual(client.token, access_token)
+        # The refreshed client is found by both tokens without another refresh
+        self.assertIs(self._user(expiring)[0], client)
+        self.assertIs(self._user(access_token)[0], client)
+        self.assertEqual(len(self.refresh_calls), 1)
+
+    def test_expiring_session_without_refresh_token_kept(self):
+        expiring = _jwt(time.time() + 30)
+        client, _ = self._user(expiring)
+
+        self.assertIs(self._user(expiring)[0], client)
+        self.assertEqual(self.refresh_calls, [])
+
+    def test_token_expiry(self):
+        self.assertEqual(token_expiry(_jwt(1700000000)), 1700000000.0)
+        self.assertIsNone(token_expiry("not-a-jwt"))
+        self.assertIsNone(token_expiry(None))
+
+
+if __name__ == '__main__':
+    unittest.main()
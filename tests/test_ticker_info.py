@@ -0,0 +1,216 @@
+"""Tests for concurrent section fetching and caching in get_ticker_info.
+
+Supabase and Postgres are replaced by small fakes that return canned rows
+(optionally after a delay), so no database is needed.
+"""
+
+import os
+import sys
+import threading
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+# Add web_dashboard to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'web_dashboard')))
+
+import ticker_utils
+from ticker_utils import TickerProfileCache, get_ticker_info
+
+
+class FakeResult:
+    def __init__(self, data):
+        self.data = data
+
+
+class FakeQuery:
+    """Chainable query builder returning the table's canned rows."""
+
+    def __init__(self, client, table):
+        self.client = client
+        self.table = table
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self
+
+    def execute(self):
+        with self.client.lock:
+            self.client.calls.append(self.table)
+            if self.client.failures.get(self.table, 0) > 0:
+                self.client.failures[self.table] -= 1
+                raise ConnectionError(f"{self.table} unavailable")
+        time.sleep(self.client.delays.get(self.table, 0))
+        return FakeResult([dict(row) for row in self.client.rows.get(self.table, [])])
+
+
+class FakeSupabaseClient:
+    def __init__(self, rows, delays=None):
+        self.rows = rows
+        self.delays = delays or {}
+        self.failures = {}
+        self.calls = []
+        self.lock = threading.Lock()
+        self.supabase = self
+
+    def table(self, name):
+        return FakeQuery(self, name)
+
+
+class FakePostgresClient:
+    def __init__(self, delay=0):
+        self.delay = delay
+        self.queries = 0
+
+    def execute_query(self, query, params=None):
+        self.queries += 1
+        time.sleep(self.delay)
+        if 'research_articles' in query:
+            return [{'id': 1, 'title': 'Article'}]
+        return []
+
+
+SECURITY = {'ticker': 'AAPL', 'company_name': 'Apple Inc.', 'sector': 'Technology',
+            'industry': 'Consumer Electronics', 'trailing_pe': 30.0, 'description': 'Phones'}
+
+
+class TestGetTickerInfo(unittest.TestCase):
+    """Test suite for get_ticker_info."""
+
+    def setUp(self):
+        patches = [
+            patch.object(ticker_utils, '_profile_cache', TickerProfileCache()),
+            patch.object(ticker_utils, '_resolution_index', return_value=None),
+            patch.object(ticker_utils, '_get_logo_url', return_value=None),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def _supabase(self, delays=None):
+        return FakeSupabaseClient({
+            'securities': [SECURITY],
+            'portfolio_positions': [{'ticker': 'AAPL', 'shares': 10}],
+            'trade_log': [],
+            'congress_trades_enriched': [{'ticker': 'AAPL', 'politician': 'X'}],
+            'insider_trades': [],
+            'watched_tickers': [],
+        }, delays)
+
+    def test_sections_assembled(self):
+        info = get_ticker_info("aapl", self._supabase(), FakePostgresClient())
+
+        self.assertTrue(info['found'])
+        self.assertEqual(info['ticker'], 'AAPL')
+        self.assertEqual(info['basic_info']['company_name'], 'Apple Inc.')
+        self.assertTrue(info['portfolio_data']['has_positions'])
+        self.assertFalse(info['portfolio_data']['has_trades'])
+        self.assertEqual(info['research_articles'], [{'id': 1, 'title': 'Article'}])
+        self.assertIsNone(info['social_sentiment'])
+        self.assertEqual(len(info['congress_trades']), 1)
+        self.assertIsNone(info['watchlist_status'])
+
+    def test_sections_fetched_concurrently(self):
+        """Total latency is about the slowest section, not the sum."""
+        delays = {table: 0.1 for table in ('securities', 'portfolio_positions', 'congress_trades_enriched',
+                                           'insider_trades', 'watched_tickers')}
+
+        start = time.monotonic()
+        get_ticker_info("AAPL", self._supabase(delays), FakePostgresClient(delay=0.1))
+        elapsed = time.monotonic() - start
+
+        # Sequential would take 0.1 * 5 tables + 0.1 * 3 queries = 0.8s
+        self.assertLess(elapsed, 0.5)
+
+    def test_slow_section_times_out_and_is_cached_later(self):
+        """A slow section doesn't hold up the response and is served once it finishes."""
+        supabase = self._supabase({'congress_trades_enriched': 0.3})
+
+        with patch.object(ticker_utils, 'TICKER_SECTION_TIMEOUT', 0.05):
+            start = time.monotonic()
+            info = get_ticker_info("AAPL", supabase, FakePostgresClient())
+            elapsed = time.monotonic() - start
+
+        self.assertLess(elapsed, 0.25)
+        self.assertEqual(info['congress_trades'], [])
+        self.assertIsNotNone(info['basic_info'])
+
+        time.sleep(0.35)
+        info = get_ticker_info("AAPL", supabase, FakePostgresClient())
+        self.assertEqual(len(info['congress_trades']), 1)
+        self.assertEqual(supabase.calls.count('congress_trades_enriched'), 1)
+
+    def test_shared_sections_cached_across_callers(self):
+        """A second lookup only refetches the per-user portfolio section."""
+        get_ticker_info("AAPL", self._supabase(), FakePostgresClient())
+        supabase = self._supabase()
+        postgres = FakePostgresClient()
+
+        info = get_ticker_info("AAPL", supabase, postgres)
+
+        self.assertEqual(sorted(set(supabase.calls)), ['portfolio_positions', 'trade_log'])
+        self.assertEqual(postgres.queries, 0)
+        self.assertEqual(info['research_articles'], [{'id': 1, 'title': 'Article'}])
+
+    def test_portfolio_cached_per_scope(self):
+        """Portfolio data is reused only for the same scope and fund."""
+        get_ticker_info("AAPL", self._supabase(), FakePostgresClient(), cache_scope="user-1")
+
+        same_user = self._supabase()
+        get_ticker_info("AAPL", same_user, FakePostgresClient(), cache_scope="user-1")
+        other_user = self._supabase()
+        get_ticker_info("AAPL", other_user, FakePostgresClient(), cache_scope="user-2")
+        other_fund = self._supabase()
+        get_ticker_info("AAPL", other_fund, FakePostgresClient(), fund="Project Chimera", cache_scope="user-1")
+
+        self.assertEqual(same_user.calls, [])
+        self.assertIn('portfolio_positions', other_user.calls)
+        self.assertIn('portfolio_positions', other_fund.calls)
+
+    def test_cached_values_are_copies(self):
+        """Mutating a returned profile doesn't corrupt the cache."""
+        info = get_ticker_info("AAPL", self._supabase(), FakePostgresClient())
+        info['basic_info']['company_name'] = 'Changed'
+
+        info = get_ticker_info("AAPL", self._supabase(), FakePostgresClient())
+
+        self.assertEqual(info['basic_info']['company_name'], 'Apple Inc.')
+
+    def test_failed_basic_info_not_cached(self):
+        """A transient lookup failure doesn't blank the company header for later callers."""
+        supabase = self._supabase()
+        supabase.failures['securities'] = 1
+        yfinance = MagicMock()
+        yfinance.Ticker.side_effect = ConnectionError("yahoo unavailable")
+
+        with patch.dict(sys.modules, {'yfinance': yfinance}):
+            info = get_ticker_info("AAPL", supabase, FakePostgresClient())
+        self.assertIsNone(info['basic_info'])
+
+        info = get_ticker_info("AAPL", supabase, FakePostgresClient())
+        self.assertEqual(info['basic_info']['company_name'], 'Apple Inc.')
+
+
+class TestTickerProfileCache(unittest.TestCase):
+    """Test suite for TickerProfileCache."""
+
+    def test_section_ttl_expiry(self):
+        cache = TickerProfileCache()
+        cache.set("AAPL", "watchlist_status", {'ticker': 'AAPL'}, ttl=0.05)
+
+        self.assertEqual(cache.get("AAPL", "watchlist_status"), (True, {'ticker': 'AAPL'}))
+        time.sleep(0.06)
+        self.assertEqual(cache.get("AAPL", "watchlist_status"), (False, None))
+
+    def test_least_recently_used_ticker_dropped(self):
+        cache = TickerProfileCache(max_tickers=2)
+        cache.set("AAPL", "basic_info", 1, ttl=60)
+        cache.set("MSFT", "basic_info", 2, ttl=60)
+        cache.get("AAPL", "basic_info")
+        cache.set("NVDA", "basic_info", 3, ttl=60)
+
+        self.assertTrue(cache.get("AAPL", "basic_info")[0])
+        self.assertFalse(cache.get("MSFT", "basic_info")[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
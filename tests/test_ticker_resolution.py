@@ -0,0 +1,124 @@
+"""Unit tests for the persistent ticker resolution index.
+
+Covers persistence, field merging, the PriceCache correction API and the
+migration of legacy corrections from name_cache.json.
+"""
+
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import Mock
+
+from market_data.price_cache import PriceCache
+from market_data.ticker_resolution import TickerResolutionIndex
+
+
+class TestTickerResolutionIndex(unittest.TestCase):
+    """Test suite for TickerResolutionIndex."""
+
+    def setUp(self):
+        """Create a temporary index file location."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = Path(self.temp_dir) / ".cache" / "ticker_resolution.json"
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_round_trip(self):
+        """Resolutions survive a reload from disk."""
+        index = TickerResolutionIndex(self.path)
+        index.record('cgl', symbol='cgl.to', source='yahoo')
+
+        reopened = TickerResolutionIndex(self.path)
+        resolution = reopened.get('CGL')
+
+        self.assertEqual(resolution.symbol, 'CGL.TO')
+        self.assertEqual((resolution.exchange, resolution.currency), ('TSX', 'CAD'))
+        self.assertEqual(resolution.source, 'yahoo')
+        self.assertEqual(reopened.resolve('AAPL'), 'AAPL')
+
+    def test_partial_update_keeps_known_fields(self):
+        """Fields left as None keep their stored values."""
+        index = TickerResolutionIndex(self.path)
+        index.record('AAPL', exchange='NMS', currency='usd')
+
+        resolution = index.record('AAPL', source='stooq-pdr')
+
+        self.assertEqual((resolution.symbol, resolution.exchange, resolution.currency),
+                         ('AAPL', 'NMS', 'USD'))
+        self.assertEqual(resolution.source, 'stooq-pdr')
+
+    def test_new_listing_resets_listing_fields(self):
+        """Switching to another listing drops the old exchange and source."""
+        index = TickerResolutionIndex(self.path)
+        index.record('WEB', exchange='NYQ', currency='USD', source='stooq-csv')
+
+        resolution = index.record('WEB', symbol='WEB.V')
+
+        self.assertEqual((resolution.exchange, resolution.currency, resolution.source),
+                         ('TSXV', 'CAD', None))
+
+    def test_unchanged_record_does_not_rewrite(self):
+        """Recording what is already stored leaves the file alone."""
+        index = TickerResolutionIndex(self.path)
+        index.record('CGL', symbol='CGL.TO')
+        self.path.write_text(json.dumps({'version': 1, 'tickers': {}}))
+
+        index.record('CGL', symbol='CGL.TO')
+
+        self.assertEqual(json.loads(self.path.read_text())['tickers'], {})
+
+    def test_corrupt_file_starts_empty(self):
+        """An unreadable index is ignored rather than raising."""
+        self.path.parent.mkdir(parents=True)
+        self.path.write_text('{not json')
+
+        self.assertEqual(len(TickerResolutionIndex(self.path)), 0)
+
+
+class TestPriceCacheTickerCorrections(unittest.TestCase):
+    """Test PriceCache ticker corrections backed by the resolution index."""
+
+    def setUp(self):
+        """Point PriceCache at a temporary data directory and index."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.settings = Mock()
+        self.settings.get_data_directory.return_value = self.temp_dir
+        self.index = TickerResolutionIndex(Path(self.temp_dir) / "ticker_resolution.json")
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_corrections_are_shared(self):
+        """Corrections are visible through the index and other caches."""
+        cache = PriceCache(settings=self.settings, resolution_index=self.index)
+        cache.cache_ticker_correction('vee', 'vee.to')
+
+        other = PriceCache(settings=self.settings, resolution_index=self.index)
+
+        self.assertEqual(other.get_ticker_correction('VEE'), 'VEE.TO')
+        self.assertEqual(self.index.resolve('VEE'), 'VEE.TO')
+        self.assertIsNone(other.get_ticker_correction('XYZ'))
+
+    def test_legacy_corrections_migrated(self):
+        """Corrections in name_cache.json move to the index and leave the file."""
+        cache_dir = Path(self.temp_dir) / '.cache'
+        cache_dir.mkdir()
+        with open(cache_dir / 'name_cache.json', 'w') as f:
+            json.dump({'company_names': {'VEE': 'Vanguard'}, 'ticker_corrections': {'VEE': 'VEE.TO'}}, f)
+
+        cache = PriceCache(settings=self.settings, resolution_index=self.index)
+        cache.save_persistent_cache()
+
+        self.assertEqual(self.index.resolve('VEE'), 'VEE.TO')
+        with open(cache_dir / 'name_cache.json') as f:
+            self.assertNotIn('ticker_corrections', json.load(f))
+        self.assertEqual(cache.get_company_name('VEE'), 'Vanguard')
+
+
+if __name__ == '__main__':
+    unittest.main()
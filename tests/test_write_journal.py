@@ -0,0 +1,180 @@
+"""Tests for the write-behind journal and WriteCoordinator write-behind mode."""
+
+import shutil
+import tempfile
+import time
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from unittest.mock import Mock
+
+from data.models.portfolio import PortfolioSnapshot, Position
+from data.models.trade import Trade
+from data.repositories.csv_repository import CSVRepository
+from data.write_coordinator import WriteCoordinator
+from data.write_journal import WriteBehindQueue, WriteJournal
+
+
+def _trade(ticker="AAPL", shares="10.123456", price="150.0001", minute=0):
+    return Trade(ticker=ticker, action="BUY", shares=Decimal(shares), price=Decimal(price),
+                 timestamp=datetime(2025, 3, 3, 10, minute), cost_basis=Decimal(shares) * Decimal(price),
+                 reason="test", currency="USD")
+
+
+def _snapshot(price="101.25"):
+    position = Position(ticker="AAPL", shares=Decimal("10"), avg_price=Decimal("100"), cost_basis=Decimal("1000"),
+                        currency="USD", current_price=Decimal(price), market_value=Decimal(price) * 10)
+    return PortfolioSnapshot(positions=[position], timestamp=datetime(2025, 3, 3, 16))
+
+
+class TestWriteBehindQueue:
+    """Test journaling and replay of secondary writes."""
+
+    def setup_method(self):
+        self.test_dir = Path(tempfile.mkdtemp(prefix="test_write_journal_"))
+        self.journal_path = self.test_dir / "journal.db"
+        self.journal = WriteJournal(self.journal_path)
+        self.secondary = Mock()
+        self.secondary.get_trade_history.return_value = []
+        self.queue = WriteBehindQueue(self.secondary, self.journal, interval=0.01)
+
+    def teardown_method(self):
+        self.queue.stop()
+        self.journal.close()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_replay_is_lossless(self):
+        trade = _trade()
+        snapshot = _snapshot()
+        self.queue.submit('save_trade', trade)
+        self.queue.submit('save_portfolio_snapshot', snapshot, True)
+
+        assert self.queue.drain() == 2
+
+        assert self.secondary.save_trade.call_args.args == (trade,)
+        assert self.secondary.save_portfolio_snapshot.call_args.args == (snapshot, True)
+        assert self.queue.sync_lag().in_sync
+        assert self.queue.sync_lag().last_synced_at is not None
+
+    def test_same_write_is_queued_once(self):
+        self.queue.submit('save_trade', _trade())
+        self.queue.submit('save_trade', _trade())
+
+        assert self.queue.sync_lag().pending == 1
+
+    def test_requeue_while_applying_is_not_lost(self):
+        """A snapshot saved again while the old payload is applied is applied too."""
+        def save_again(snapshot, *args):
+            if snapshot.positions[0].current_price == Decimal("101.25"):
+                self.queue.submit('save_portfolio_snapshot', _snapshot("105.00"), True)
+
+        self.secondary.save_portfolio_snapshot.side_effect = save_again
+        self.queue.submit('save_portfolio_snapshot', _snapshot(), True)
+
+        assert self.queue.drain() == 2
+        applied = [call.args[0].positions[0].current_price for call in self.secondary.save_portfolio_snapshot.call_args_list]
+        assert applied == [Decimal("101.25"), Decimal("105.00")]
+        assert self.queue.sync_lag().in_sync
+
+    def test_complete_keeps_entry_requeued_after_due(self):
+        self.journal.append('save_portfolio_snapshot', _snapshot(), True)
+        entry = self.journal.due()
+        self.journal.append('save_portfolio_snapshot', _snapshot("105.00"), True)
+
+        assert not self.journal.complete(entry.id, entry.payload)
+        assert self.journal.due().args[0].positions[0].current_price == Decimal("105.00")
+        assert self.journal.complete(entry.id, self.journal.due().payload)
+        assert self.journal.due() is None
+
+    def test_failure_holds_back_later_writes(self):
+        self.secondary.save_trade.side_effect = [ConnectionError("offline"), None, None]
+        self.queue.submit('save_trade', _trade(minute=1))
+        self.queue.submit('save_trade', _trade(minute=2))
+
+        assert self.queue.drain() == 0
+        lag = self.queue.sync_lag()
+        assert (lag.pending, lag.failing, lag.last_error) == (2, 1, "offline")
+        # Still backing off
+        assert self.queue.drain() == 0
+
+        time.sleep(0.05)
+        assert self.queue.drain() == 2
+        replayed = [call.args[0].timestamp.minute for call in self.secondary.save_trade.call_args_list]
+        assert replayed == [1, 1, 2]
+
+    def test_replayed_trade_already_applied_is_skipped(self):
+        trade = _trade()
+        self.secondary.save_trade.side_effect = TimeoutError("response lost")
+        self.queue.submit('save_trade', trade)
+        self.queue.drain()
+
+        # The insert reached the secondary even though the call failed
+        self.secondary.get_trade_history.return_value = [_trade()]
+        time.sleep(0.05)
+
+        assert self.queue.drain() == 1
+        assert self.secondary.save_trade.call_count == 1
+
+    def test_journal_survives_restart(self):
+        self.queue.submit('save_trade', _trade())
+        self.journal.close()
+
+        self.journal = WriteJournal(self.journal_path)
+        self.queue = WriteBehindQueue(self.secondary, self.journal)
+
+        assert self.queue.sync_lag().pending == 1
+        assert self.queue.drain() == 1
+        assert self.secondary.save_trade.call_args.args[0].shares == Decimal("10.123456")
+
+    def test_worker_applies_writes_in_background(self):
+        self.queue.start()
+        self.queue.submit('save_trade', _trade())
+
+        deadline = time.time() + 5
+        while not self.queue.sync_lag().in_sync and time.time() < deadline:
+            time.sleep(0.01)
+
+        self.secondary.save_trade.assert_called_once()
+
+
+class TestWriteCoordinatorWriteBehind:
+    """Test WriteCoordinator with a queued Supabase write."""
+
+    def setup_method(self):
+        self.test_dir = Path(tempfile.mkdtemp(prefix="test_write_behind_"))
+        self.csv_repo = CSVRepository(fund_name="TEST", data_directory=str(self.test_dir))
+        self.supabase_repo = Mock()
+        self.supabase_repo.get_trade_history.return_value = []
+        self.supabase_repo.get_latest_portfolio_snapshot.return_value = None
+        self.coordinator = WriteCoordinator(self.csv_repo, self.supabase_repo, write_behind=True)
+        # Drive the queue by hand
+        self.coordinator.write_queue.stop()
+
+    def teardown_method(self):
+        self.coordinator.close()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_save_trade_is_queued(self):
+        result = self.coordinator.save_trade(_trade())
+
+        assert result.csv_success and result.supabase_queued and not result.supabase_success
+        assert result.all_successful and not result.has_failures
+        self.supabase_repo.save_trade.assert_not_called()
+        assert self.coordinator.sync_lag().pending == 1
+        assert (self.test_dir / ".cache" / "supabase_write_journal.db").exists()
+
+        self.coordinator.write_queue.drain()
+        self.supabase_repo.save_trade.assert_called_once()
+        assert self.coordinator.sync_lag().in_sync
+
+    def test_check_sync_repairs_missing_trades(self):
+        self.csv_repo.save_trade(_trade(minute=1))
+        self.csv_repo.save_trade(_trade(minute=2))
+        self.supabase_repo.get_trade_history.return_value = [_trade(minute=1)]
+
+        report = self.coordinator.check_sync(repair=True)
+
+        assert (report.csv_trade_count, report.supabase_trade_count) == (2, 1)
+        assert [trade.timestamp.minute for trade in report.missing_trades] == [2]
+        assert report.repaired_trades == 1
+        assert self.supabase_repo.save_trade.call_args.args[0].timestamp.minute == 2
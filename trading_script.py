@@ -1097,41 +1097,24 @@ def run_portfolio_workflow(args: argparse.Namespace, settings: Settings, reposit
                 if currency:
                     market_data_fetcher._portfolio_currency_cache[pos.ticker.upper()] = currency.upper()
             
-            end_date = datetime.now()
+            # Day bounds keep the request keys identical across fund refreshes,
+            # so concurrent refreshes share in-flight fetches
+            end_date = datetime.now().replace(hour=23, minute=59, second=59, microsecond=999999)
             # Go back about 15 calendar days to ensure we get at least 10 trading days
-            start_date = end_date - timedelta(days=15)
+            start_date = (end_date - timedelta(days=15)).replace(hour=0, minute=0, second=0, microsecond=0)
 
-            # Cache-first approach: Check cache first, only fetch missing data
-            market_data = {}
-            cache_hits = 0
-            api_calls = 0
-
-            for ticker in tickers:
-                try:
-                    # First, try to get cached data
-                    cached_data = price_cache.get_cached_price(ticker, start_date, end_date)
-
-                    if cached_data is not None and not cached_data.empty:
-                        # Use cached data
-                        market_data[ticker] = cached_data
-                        cache_hits += 1
-                        logger.debug(f"Cache hit for {ticker}: {len(cached_data)} rows")
-                    else:
-                        # Cache miss - fetch fresh data
-                        result = market_data_fetcher.fetch_price_data(ticker, start_date, end_date)
-                        if not result.df.empty:
-                            market_data[ticker] = result.df
-                            # Update price cache with fresh data
-                            price_cache.cache_price_data(ticker, result.df, result.source)
-                            api_calls += 1
-                            logger.debug(f"API fetch for {ticker}: {len(result.df)} rows from {result.source}")
-                        else:
-                            market_data[ticker] = pd.DataFrame()
-                            logger.warning(f"No data returned for {ticker}")
-
-                except Exception as e:
-                    logger.warning(f"Failed to fetch data for {ticker}: {e}")
-                    market_data[ticker] = pd.DataFrame()
+            # Cache-first approach: the service only fetches missing data
+            from utils.price_service import PriceService
+            price_service = PriceService(
+                market_data_fetcher=market_data_fetcher,
+                price_cache=price_cache,
+                market_hours=market_hours,
+                max_workers=settings.get('market_data.fetch_max_workers', 1),
+                rate_limits=settings.get('market_data.source_rate_limits')
+            )
+            market_data, cache_hits, api_calls = price_service.get_historical_prices(
+                tickers, start_date, end_date, verbose=False
+            )
 
             # Report optimization results
             market_data_time = time.time() - market_data_start
@@ -2053,35 +2036,15 @@ def run_portfolio_workflow(args: argparse.Namespace, settings: Settings, reposit
                                     pass
                         
                         if contribution_dates:
-                            min_date = min(contribution_dates)
-                            max_date = max(contribution_dates)
+                            # Read from the fund NAV store when available, else from snapshots
+                            historical_fund_values, historical_cost_basis = \
+                                position_calculator.get_historical_fund_values(contribution_dates)
                             
-                            # Get portfolio snapshots for the contribution period
-                            snapshots = repository.get_portfolio_data(date_range=(min_date, datetime.now()))
-                            if snapshots:
-                                for snapshot in snapshots:
-                                    date_str = snapshot.timestamp.strftime('%Y-%m-%d')
-                                    # Calculate total value AND cost basis for this snapshot
-                                    total_value = sum(
-                                        pos.shares * pos.current_price 
-                                        for pos in snapshot.positions 
-                                        if pos.current_price is not None
-                                    )
-                                    total_cost_basis = sum(
-                                        pos.cost_basis if pos.cost_basis else Decimal('0')
-                                        for pos in snapshot.positions
-                                    )
-                                    if total_value > 0:
-                                        historical_fund_values[date_str] = Decimal(str(total_value))
-                                        historical_cost_basis[date_str] = Decimal(str(total_cost_basis))
-                                
-                                logger.debug(f"Retrieved {len(historical_fund_values)} historical fund values for NAV calculation")
-                                
-                                # Check for missing dates and warn
-                                contribution_date_strs = set(d.strftime('%Y-%m-%d') for d in contribution_dates)
-                                if len(historical_fund_values) < len(contribution_date_strs):
-                                    missing_dates = contribution_date_strs - set(historical_fund_values.keys())
-                                    print_warning(f"⚠️  NAV: Missing historical data for {len(missing_dates)} date(s): {', '.join(sorted(missing_dates)[:3])}{'...' if len(missing_dates) > 3 else ''}")
+                            # Check for missing dates and warn
+                            contribution_date_strs = set(d.strftime('%Y-%m-%d') for d in contribution_dates)
+                            if len(historical_fund_values) < len(contribution_date_strs):
+                                missing_dates = contribution_date_strs - set(historical_fund_values.keys())
+                                print_warning(f"⚠️  NAV: Missing historical data for {len(missing_dates)} date(s): {', '.join(sorted(missing_dates)[:3])}{'...' if len(missing_dates) > 3 else ''}")
                     except Exception as hist_err:
                         logger.warning(f"Could not retrieve historical fund values: {hist_err}")
                         print_warning(f"⚠️  NAV: Could not retrieve historical fund values - using time-weighted estimation")
@@ -425,10 +425,14 @@ def refresh_portfolio_prices_if_needed(
         
         # Initialize PriceService
         from utils.price_service import PriceService
+        from config.settings import get_settings
+        settings = get_settings()
         price_service = PriceService(
             market_data_fetcher=market_data_fetcher,
             price_cache=price_cache,
-            market_hours=market_hours
+            market_hours=market_hours,
+            max_workers=settings.get('market_data.fetch_max_workers', 1),
+            rate_limits=settings.get('market_data.source_rate_limits')
         )
         
         # Update prices for all positions
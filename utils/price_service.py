@@ -17,10 +17,13 @@ of concerns.
 from __future__ import annotations
 
 import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
 from decimal import Decimal
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Callable, Dict, List, Optional, Tuple, Any
 
 import pandas as pd
 
@@ -33,6 +36,51 @@ from portfolio.portfolio_manager import PortfolioManager
 logger = logging.getLogger(__name__)
 
 
+class SourceRateLimiter:
+    """Thread-safe per-source request spacing.
+    
+    Each data source gets a maximum request rate (requests per second).
+    Callers reserve the next free slot for a source under a lock and sleep
+    outside it, so concurrent workers are spaced out instead of bursting.
+    Sources without a configured rate fall back to the 'default' entry, or
+    are not limited at all.
+    """
+    
+    def __init__(self, rates: Optional[Dict[str, float]] = None):
+        """Initialize the rate limiter.
+        
+        Args:
+            rates: Mapping of source name to max requests per second
+        """
+        self.rates = dict(rates or {})
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+    
+    def acquire(self, source: str) -> float:
+        """Wait until a request to the given source is allowed.
+        
+        Args:
+            source: Data source name (e.g. 'yahoo', 'stooq')
+            
+        Returns:
+            Seconds spent waiting
+        """
+        rate = self.rates.get(source, self.rates.get('default'))
+        if not rate or rate <= 0:
+            return 0.0
+        
+        interval = 1.0 / rate
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(source, now))
+            self._next_slot[source] = slot + interval
+        
+        wait = slot - now
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
 class PriceService:
     """Centralized service for price fetching and portfolio updates.
     
@@ -48,6 +96,8 @@ class PriceService:
     - Currency conversion support
     - Fallback to existing prices when API fails
     - Reports cache efficiency metrics
+    - Optional concurrent fetching with per-source rate limiting
+    - In-flight deduplication of identical requests across instances (funds)
     
     Separation of Concerns:
     - This service handles ONLY business logic (fetch, calculate, validate)
@@ -55,11 +105,21 @@ class PriceService:
     - No knowledge of CSV, Supabase, or any storage implementation
     """
     
+    # Source assumed for tickers that have not been fetched yet
+    DEFAULT_SOURCE = 'yahoo'
+    
+    # Requests currently being fetched, shared by every PriceService in the
+    # process so two funds refreshing the same ticker make one API call
+    _inflight: Dict[Tuple[Any, ...], Future] = {}
+    _inflight_lock = threading.Lock()
+    
     def __init__(
         self,
         market_data_fetcher: MarketDataFetcher,
         price_cache: PriceCache,
-        market_hours: MarketHours
+        market_hours: MarketHours,
+        max_workers: int = 1,
+        rate_limits: Optional[Dict[str, float]] = None
     ):
         """Initialize the price service.
         
@@ -67,17 +127,115 @@ class PriceService:
             market_data_fetcher: Service for fetching market data from APIs
             price_cache: Cache for storing and retrieving price data
             market_hours: Service for market hours and trading day logic
+            max_workers: Default number of concurrent ticker fetches (1 = serial)
+            rate_limits: Optional max requests per second per data source
+                (e.g. {'yahoo': 5.0, 'stooq': 2.0, 'default': 5.0})
         """
         self.fetcher = market_data_fetcher
         self.cache = price_cache
         self.market_hours = market_hours
+        self.max_workers = max(1, int(max_workers or 1))
+        self.rate_limiter = SourceRateLimiter(rate_limits)
+        # Source that last served each ticker, used to pick its rate limit bucket
+        self._ticker_sources: Dict[str, str] = {}
+    
+    @staticmethod
+    def _source_key(source: Optional[str]) -> Optional[str]:
+        """Reduce a FetchResult source label to its rate limit bucket.
+        
+        'yahoo (.TO suffix)', 'yahoo:http-proxy' and 'yahoo-retry' all map to
+        'yahoo'; 'stooq-pdr' and 'stooq-csv' map to 'stooq'.
+        """
+        if not source or source in ('cache', 'empty', 'failed'):
+            return None
+        return source.split(' ')[0].split(':')[0].split('-')[0]
+    
+    def _rate_limited(self, ticker: str, fetch: Callable[[], Any]) -> Any:
+        """Run a fetch for ticker after waiting on its source's rate limit."""
+        self.rate_limiter.acquire(self._ticker_sources.get(ticker, self.DEFAULT_SOURCE))
+        result = fetch()
+        source = self._source_key(getattr(result, 'source', None))
+        if source:
+            self._ticker_sources[ticker] = source
+        return result
+    
+    @classmethod
+    def _fetch_shared(cls, key: Tuple[Any, ...], fetch: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Run fetch once per key, letting concurrent callers join the in-flight call.
+        
+        Args:
+            key: Request identity, e.g. ('history', ticker, start, end)
+            fetch: Callable that performs the request
+            
+        Returns:
+            Tuple of (result, joined) where joined is True if another caller
+            made the request
+            
+        Raises:
+            Whatever fetch raised, for the owner and every joined caller
+        """
+        with cls._inflight_lock:
+            future = cls._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                cls._inflight[key] = future
+        
+        if not owner:
+            return future.result(), True
+        
+        try:
+            result = fetch()
+            future.set_result(result)
+            return result, False
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with cls._inflight_lock:
+                cls._inflight.pop(key, None)
+    
+    def _run_batch(
+        self,
+        tickers: List[str],
+        fetch: Callable[[str], Any],
+        max_workers: Optional[int]
+    ) -> Dict[str, Tuple[Any, Optional[Exception]]]:
+        """Run fetch for each ticker, concurrently when max_workers > 1.
+        
+        Results are keyed by ticker, so callers see the same output regardless
+        of completion order.
+        
+        Returns:
+            Dict mapping ticker to (result, error); exactly one is not None
+        """
+        workers = self.max_workers if max_workers is None else max(1, int(max_workers))
+        outcomes: Dict[str, Tuple[Any, Optional[Exception]]] = {}
+        
+        if workers <= 1 or len(tickers) <= 1:
+            for ticker in tickers:
+                try:
+                    outcomes[ticker] = (fetch(ticker), None)
+                except Exception as e:
+                    outcomes[ticker] = (None, e)
+            return outcomes
+        
+        with ThreadPoolExecutor(max_workers=min(workers, len(tickers))) as executor:
+            futures = {ticker: executor.submit(fetch, ticker) for ticker in tickers}
+            for ticker, future in futures.items():
+                try:
+                    outcomes[ticker] = (future.result(), None)
+                except Exception as e:
+                    outcomes[ticker] = (None, e)
+        return outcomes
     
     def get_historical_prices(
         self,
         tickers: List[str],
         start_date: datetime,
         end_date: datetime,
-        verbose: bool = True
+        verbose: bool = True,
+        max_workers: Optional[int] = None
     ) -> Tuple[Dict[str, pd.DataFrame], int, int]:
         """Fetch historical price data for multiple tickers.
         
@@ -91,15 +249,23 @@ class PriceService:
         - Caches results for future use
         - Reports cache efficiency (hits vs API calls)
         
+        Cache misses are fetched with up to max_workers concurrent requests.
+        Cache reads and writes stay on the calling thread. A miss that joins an
+        identical request already in flight (e.g. from another fund) is
+        counted as a cache hit since it makes no API call of its own.
+        
         Args:
             tickers: List of ticker symbols to fetch
             start_date: Start date for historical data
             end_date: End date for historical data
             verbose: If True, log progress and cache metrics
+            max_workers: Concurrent fetches for cache misses (defaults to
+                the service's max_workers)
             
         Returns:
             Tuple of:
-            - Dict mapping ticker to DataFrame (empty DataFrame if fetch fails)
+            - Dict mapping ticker to DataFrame (empty DataFrame if fetch fails),
+              in the same order as tickers
             - Number of cache hits
             - Number of API calls made
             
@@ -119,7 +285,10 @@ class PriceService:
         if verbose:
             logger.info(f"Fetching historical prices for {len(tickers)} tickers")
         
+        misses = []
         for ticker in tickers:
+            if ticker in market_data or ticker in misses:
+                continue
             try:
                 # Cache-first approach: Check cache first
                 cached_data = self.cache.get_cached_price(ticker, start_date, end_date)
@@ -130,18 +299,42 @@ class PriceService:
                     cache_hits += 1
                     logger.debug(f"Cache hit for {ticker}: {len(cached_data)} rows")
                 else:
-                    # Cache miss - fetch fresh data from API
-                    result = self.fetcher.fetch_price_data(ticker, start_date, end_date)
-                    if not result.df.empty:
-                        market_data[ticker] = result.df
-                        # Update cache with fresh data
-                        self.cache.cache_price_data(ticker, result.df, result.source)
-                        api_calls += 1
-                        logger.debug(f"API fetch for {ticker}: {len(result.df)} rows from {result.source}")
-                    else:
-                        market_data[ticker] = pd.DataFrame()
-                        logger.warning(f"No data returned for {ticker}")
+                    misses.append(ticker)
+            except Exception as e:
+                logger.warning(f"Failed to fetch data for {ticker}: {e}")
+                market_data[ticker] = pd.DataFrame()
+        
+        # Cache misses - fetch fresh data from API
+        def fetch(ticker: str) -> Tuple[Any, bool]:
+            return self._fetch_shared(
+                ('history', ticker, start_date, end_date),
+                lambda: self._rate_limited(
+                    ticker, lambda: self.fetcher.fetch_price_data(ticker, start_date, end_date)
+                )
+            )
+        
+        outcomes = self._run_batch(misses, fetch, max_workers)
+        for ticker in misses:
+            outcome, error = outcomes[ticker]
+            if error is not None:
+                logger.warning(f"Failed to fetch data for {ticker}: {error}")
+                market_data[ticker] = pd.DataFrame()
+                continue
             
+            result, joined = outcome
+            try:
+                if not result.df.empty:
+                    market_data[ticker] = result.df
+                    # Update cache with fresh data
+                    self.cache.cache_price_data(ticker, result.df, result.source)
+                    if joined:
+                        cache_hits += 1
+                    else:
+                        api_calls += 1
+                    logger.debug(f"API fetch for {ticker}: {len(result.df)} rows from {result.source}")
+                else:
+                    market_data[ticker] = pd.DataFrame()
+                    logger.warning(f"No data returned for {ticker}")
             except Exception as e:
                 logger.warning(f"Failed to fetch data for {ticker}: {e}")
                 market_data[ticker] = pd.DataFrame()
@@ -150,12 +343,13 @@ class PriceService:
         if verbose and cache_hits > 0:
             logger.info(f"Cache efficiency: {cache_hits} hits, {api_calls} API calls")
         
-        return market_data, cache_hits, api_calls
+        return {ticker: market_data[ticker] for ticker in tickers}, cache_hits, api_calls
     
     def get_current_prices(
         self,
         tickers: List[str],
-        verbose: bool = True
+        verbose: bool = True,
+        max_workers: Optional[int] = None
     ) -> Dict[str, Optional[Decimal]]:
         """Fetch current prices for multiple tickers.
         
@@ -171,9 +365,11 @@ class PriceService:
         Args:
             tickers: List of ticker symbols to fetch
             verbose: If True, log progress
+            max_workers: Concurrent fetches (defaults to the service's max_workers)
             
         Returns:
-            Dict mapping ticker to current price (None if fetch fails)
+            Dict mapping ticker to current price (None if fetch fails),
+            in the same order as tickers
             
         Example:
             >>> prices = service.get_current_prices(['AAPL', 'MSFT'])
@@ -184,17 +380,27 @@ class PriceService:
         if verbose:
             logger.info(f"Fetching current prices for {len(tickers)} tickers")
         
-        for ticker in tickers:
-            try:
-                price = self.fetcher.get_current_price(ticker)
-                prices[ticker] = price
-                if price:
-                    logger.debug(f"Fetched current price for {ticker}: ${price}")
-                else:
-                    logger.warning(f"No current price available for {ticker}")
-            except Exception as e:
-                logger.warning(f"Failed to fetch current price for {ticker}: {e}")
+        def fetch(ticker: str) -> Tuple[Any, bool]:
+            return self._fetch_shared(
+                ('current', ticker),
+                lambda: self._rate_limited(ticker, lambda: self.fetcher.get_current_price(ticker))
+            )
+        
+        unique_tickers = list(dict.fromkeys(tickers))
+        outcomes = self._run_batch(unique_tickers, fetch, max_workers)
+        for ticker in unique_tickers:
+            outcome, error = outcomes[ticker]
+            if error is not None:
+                logger.warning(f"Failed to fetch current price for {ticker}: {error}")
                 prices[ticker] = None
+                continue
+            
+            price, _ = outcome
+            prices[ticker] = price
+            if price:
+                logger.debug(f"Fetched current price for {ticker}: ${price}")
+            else:
+                logger.warning(f"No current price available for {ticker}")
         
         return prices
     
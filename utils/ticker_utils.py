@@ -12,10 +12,33 @@ from decimal import Decimal
 
 logger = logging.getLogger(__name__)
 
-# Cache for ticker corrections to avoid repeated API calls
+# In-memory cache for suffix lookups and unresolved tickers; successful
+# corrections are persisted in the shared ticker resolution index
 TICKER_CORRECTION_CACHE = {}
 
 
+def _resolution_index():
+    """Get the shared ticker resolution index, or None if unavailable."""
+    try:
+        from market_data.ticker_resolution import get_resolution_index
+        return get_resolution_index()
+    except Exception as e:
+        logger.debug(f"Ticker resolution index unavailable: {e}")
+        return None
+
+
+def _record_resolution(ticker: str, match: Dict[str, str]) -> None:
+    """Persist a resolved ticker variant so it is not probed again."""
+    index = _resolution_index()
+    if index is None:
+        return
+    try:
+        index.record(ticker, symbol=match['ticker'], exchange=match.get('exchange'),
+                     currency=match.get('currency'))
+    except Exception as e:
+        logger.debug(f"Could not record resolution for {ticker}: {e}")
+
+
 def detect_currency_context(ticker: str, buy_price: float = None) -> str:
     """
     Detect if a ticker is likely Canadian based on context clues.
@@ -49,6 +72,7 @@ def detect_and_correct_ticker(ticker: str, buy_price: float = None) -> str:
     """
     Detect if a ticker is Canadian and automatically add the appropriate suffix.
     Tests all variants (.TO, .V, and no suffix) and asks user if multiple matches found.
+    Tickers already in the resolution index are returned without probing.
     
     Returns the corrected ticker symbol with appropriate suffix.
     """
@@ -58,6 +82,12 @@ def detect_and_correct_ticker(ticker: str, buy_price: float = None) -> str:
     if ticker in TICKER_CORRECTION_CACHE:
         return TICKER_CORRECTION_CACHE[ticker]
     
+    index = _resolution_index()
+    resolution = index.get(ticker) if index is not None else None
+    if resolution:
+        TICKER_CORRECTION_CACHE[ticker] = resolution.symbol
+        return resolution.symbol
+    
     # If already has a suffix, return as-is
     if any(ticker.endswith(suffix) for suffix in ['.TO', '.V', '.CN', '.NE']):
         TICKER_CORRECTION_CACHE[ticker] = ticker
@@ -96,7 +126,8 @@ def detect_and_correct_ticker(ticker: str, buy_price: float = None) -> str:
                         valid_matches.append({
                             'ticker': variant,
                             'exchange': exchange,
-                            'name': name
+                            'name': name,
+                            'currency': info.get('currency')
                         })
             except Exception as e:
                 # Silently skip invalid tickers - don't show 404 errors to user
@@ -111,6 +142,7 @@ def detect_and_correct_ticker(ticker: str, buy_price: float = None) -> str:
         if len(valid_matches) == 1:
             result = valid_matches[0]['ticker']
             TICKER_CORRECTION_CACHE[ticker] = result
+            _record_resolution(ticker, valid_matches[0])
             logger.info(f"Auto-corrected ticker {ticker} to {result}")
             return result
         
@@ -125,11 +157,15 @@ def detect_and_correct_ticker(ticker: str, buy_price: float = None) -> str:
                 if not choice:
                     # Default to original if no choice made
                     result = ticker
+                    for match in valid_matches:
+                        if match['ticker'] == ticker:
+                            _record_resolution(ticker, match)
                     break
                 
                 choice_idx = int(choice) - 1
                 if 0 <= choice_idx < len(valid_matches):
                     result = valid_matches[choice_idx]['ticker']
+                    _record_resolution(ticker, valid_matches[choice_idx])
                     break
                 else:
                     print(f"Please enter a number between 1 and {len(valid_matches)}")
@@ -426,7 +462,16 @@ def get_company_name(ticker: str, currency: str = None) -> str:
         except Exception:
             pass
 
-    if any(key.endswith(suffix) for suffix in ['.TO', '.V', '.CN', '.NE']):
+    # A ticker resolved earlier only needs its known listing
+    index = _resolution_index()
+    resolution = index.get(key) if index is not None else None
+    if resolution and currency and resolution.currency and resolution.currency != currency.upper():
+        # Caller asked for the other listing (e.g. "WEB:USD" vs "WEB.TO")
+        resolution = None
+
+    if resolution:
+        variants_to_try = [resolution.symbol]
+    elif any(key.endswith(suffix) for suffix in ['.TO', '.V', '.CN', '.NE']):
         # Has suffix - try with suffix first, then without
         variants_to_try = [key, key.rsplit('.', 1)[0]]
     elif is_likely_canadian:
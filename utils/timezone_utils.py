@@ -6,10 +6,28 @@ database timestamp requirements.
 """
 
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Union
+from typing import Optional, Tuple, Union
 import pandas as pd
 
 
+# UTC offsets (in hours) of the timezone abbreviations parse_csv_timestamp understands
+CSV_TIMEZONE_OFFSETS = {
+    'PST': -8, 'PDT': -7,
+    'MST': -7, 'MDT': -6,
+    'CST': -6, 'CDT': -5,
+    'EST': -5, 'EDT': -4,
+    'UTC': 0, 'GMT': 0,
+}
+
+# "<date>[ time] [ABBR|±HH[:MM]|Z]" - the formats written to the CSV files
+_CSV_TIMESTAMP_PATTERN = (
+    r'^(?P<local>\d{4}-\d{2}-\d{2}(?:[ T]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?)?)\s*'
+    r'(?:(?P<abbr>' + '|'.join(CSV_TIMEZONE_OFFSETS) + r')'
+    r'|(?P<sign>[+-])(?P<hours>\d{2}):?(?P<minutes>\d{2})?'
+    r'|(?P<zulu>Z))?$'
+)
+
+
 def get_trading_timezone() -> timezone:
     """Get the configured trading timezone object.
     
@@ -257,6 +275,37 @@ def safe_parse_datetime_column(series_or_str: Union[str, pd.Series], column_name
         return pd.to_datetime(series_or_str)
 
 
+def split_csv_timestamps(series: pd.Series) -> Tuple[pd.Series, pd.Series]:
+    """Vectorized parse_csv_timestamp for a whole CSV column.
+
+    Timezone abbreviations and offsets are mapped to UTC offsets in one pass
+    and the local times are parsed with a single ``to_datetime`` call, instead
+    of one parse per row. Timestamps without timezone information are assumed
+    to be in the trading timezone.
+
+    Args:
+        series: Column of timestamp strings, e.g. "2025-09-10 06:30:00 EST"
+
+    Returns:
+        Tuple of (local wall-clock times as naive datetime64, UTC offset of
+        each row as a Timedelta). Rows that are missing or not in a CSV
+        timestamp format are NaT in both.
+    """
+    text = series.astype('string').str.strip()
+    parts = text.str.extract(_CSV_TIMESTAMP_PATTERN)
+
+    local = pd.to_datetime(parts['local'], errors='coerce', format='ISO8601')
+
+    hours = parts['abbr'].map(CSV_TIMEZONE_OFFSETS).astype('float64')
+    signed = parts['sign'].map({'+': 1.0, '-': -1.0})
+    explicit = signed * (parts['hours'].astype('float64') + parts['minutes'].astype('float64').fillna(0) / 60)
+    hours = hours.fillna(explicit).mask(parts['zulu'].notna(), 0.0)
+    trading_hours = get_trading_timezone().utcoffset(None) / timedelta(hours=1)
+    hours = hours.fillna(trading_hours).where(local.notna())
+
+    return local, pd.to_timedelta(hours, unit='h')
+
+
 def get_market_close_time_local() -> int:
     """Get market close hour in user's local timezone.
     
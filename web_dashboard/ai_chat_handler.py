@@ -5,15 +5,162 @@ AI Chat Handler
 
 Orchestrates AI chat across multiple backends (WebAI, GLM, Ollama).
 Handles model detection, context building, and response streaming.
+
+Context sections are fetched and formatted concurrently on a shared thread
+pool, each within its own time budget. Mandatory sections (holdings, thesis,
+cash) hold back the prompt until they arrive or run out of budget; optional
+ones (trades, metrics) are included only if they're ready by then, so the
+model can start streaming without waiting on slow history calculations.
+A section that misses its budget keeps running in the background and lands
+in the cache for the next message. Formatted sections are cached per fund
+and invalidated with that fund's data (see cache_version).
 """
 
 import logging
-from typing import Optional, Dict, Any, List, Generator
-from flask import Response, stream_with_context
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, List, Generator, Callable
+from flask import Response, stream_with_context, copy_current_request_context, has_request_context
 import json
 
+from cache_version import cache_tag
+from flask_cache_utils import cache_data
+
 logger = logging.getLogger(__name__)
 
+PERF_LEVEL = 15  # log_handler.PERF_LEVEL
+
+AI_CONTEXT_WORKERS = int(os.getenv("AI_CONTEXT_WORKERS", "8"))
+
+
+@dataclass(frozen=True)
+class SectionBudget:
+    """How long prompt assembly waits for one context section."""
+    seconds: float  # measured from the start of assembly
+    mandatory: bool = False
+
+
+CONTEXT_SECTION_BUDGETS: Dict[str, SectionBudget] = {
+    'holdings': SectionBudget(20.0, mandatory=True),
+    'thesis': SectionBudget(10.0, mandatory=True),
+    'cash_balances': SectionBudget(10.0, mandatory=True),
+    'trades': SectionBudget(3.0),
+    'metrics': SectionBudget(3.0),
+}
+
+_context_pool: Optional[ThreadPoolExecutor] = None
+_context_pool_lock = threading.Lock()
+
+
+def _get_context_pool() -> ThreadPoolExecutor:
+    """Shared pool for context sections (outlives requests so late sections still get cached)."""
+    global _context_pool
+    if _context_pool is None:
+        with _context_pool_lock:
+            if _context_pool is None:
+                _context_pool = ThreadPoolExecutor(max_workers=max(1, AI_CONTEXT_WORKERS), thread_name_prefix="ai-context")
+    return _context_pool
+
+
+@cache_data(ttl=300, depends_on=lambda fund, **_: [cache_tag("portfolio_positions", fund), cache_tag("trade_log", fund)])
+def _holdings_section(fund: Optional[str], include_price_volume: bool = True, include_fundamentals: bool = True) -> str:
+    from ai_context_builder import format_holdings
+    from flask_data_utils import get_current_positions_flask, get_trade_log_flask
+    
+    positions_df = get_current_positions_flask(fund)
+    trades_df = get_trade_log_flask(limit=1000, fund=fund) if fund else None
+    return format_holdings(
+        positions_df,
+        fund or "Unknown",
+        trades_df=trades_df,
+        include_price_volume=include_price_volume,
+        include_fundamentals=include_fundamentals
+    )
+
+
+@cache_data(ttl=3600, depends_on=lambda fund, **_: [cache_tag("fund_thesis", fund)])  # Matches get_fund_thesis_data_flask
+def _thesis_section(fund: Optional[str]) -> str:
+    from ai_context_builder import format_thesis
+    from flask_data_utils import get_fund_thesis_data_flask
+    
+    thesis_data = get_fund_thesis_data_flask(fund or "")
+    return format_thesis(thesis_data) if thesis_data else ""
+
+
+@cache_data(ttl=300, depends_on=lambda fund, **_: [cache_tag("trade_log", fund)])
+def _trades_section(fund: Optional[str], limit: int = 100) -> str:
+    from ai_context_builder import format_trades
+    from flask_data_utils import get_trade_log_flask
+    
+    return format_trades(get_trade_log_flask(limit=limit, fund=fund), limit)
+
+
+@cache_data(ttl=300, depends_on=lambda fund, **_: [cache_tag("portfolio_positions", fund), cache_tag("trade_log", fund)])
+def _metrics_section(fund: Optional[str]) -> str:
+    from ai_context_builder import format_performance_metrics
+    from flask_data_utils import calculate_portfolio_value_over_time_flask, calculate_performance_metrics_flask
+    
+    portfolio_df = calculate_portfolio_value_over_time_flask(fund, days=365) if fund else None
+    metrics = calculate_performance_metrics_flask(fund) if fund else {}
+    return format_performance_metrics(metrics, portfolio_df)
+
+
+@cache_data(ttl=300, depends_on=lambda fund, **_: [cache_tag("cash_balances", fund)])
+def _cash_balances_section(fund: Optional[str]) -> str:
+    from ai_context_builder import format_cash_balances
+    from flask_data_utils import get_cash_balances_flask
+    
+    return format_cash_balances(get_cash_balances_flask(fund) if fund else {})
+
+
+def _section_task(item_type: str, fund: Optional[str], item_dict: Dict[str, Any],
+                  options: Dict[str, Any]) -> Optional[Callable[[], str]]:
+    """Zero-argument callable producing one formatted section, or None for unsupported types."""
+    if item_type == 'holdings':
+        include_pv = options.get('include_price_volume', True)
+        include_fund = options.get('include_fundamentals', True)
+        return lambda: _holdings_section(fund, include_pv, include_fund)
+    if item_type == 'thesis':
+        return lambda: _thesis_section(fund)
+    if item_type == 'trades':
+        limit = item_dict.get('metadata', {}).get('limit', 100)
+        return lambda: _trades_section(fund, limit)
+    if item_type == 'metrics':
+        return lambda: _metrics_section(fund)
+    if item_type == 'cash_balances':
+        return lambda: _cash_balances_section(fund)
+    return None
+
+
+# Recent time-to-first-token samples (seconds) per backend
+_ttft_samples: Dict[str, deque] = {}
+_ttft_lock = threading.Lock()
+
+
+def _record_ttft(backend: str, model: Optional[str], seconds: float) -> None:
+    with _ttft_lock:
+        _ttft_samples.setdefault(backend, deque(maxlen=200)).append(seconds)
+    logger.log(PERF_LEVEL, f"AI chat time to first token [{backend}/{model}]: {seconds * 1000:.0f}ms")
+
+
+def get_ttft_stats() -> Dict[str, Dict[str, float]]:
+    """Time-to-first-token summary (ms) per backend over recent chats in this process."""
+    with _ttft_lock:
+        samples = {backend: sorted(values) for backend, values in _ttft_samples.items() if values}
+    return {
+        backend: {
+            'count': len(values),
+            'p50_ms': round(values[len(values) // 2] * 1000, 1),
+            'p95_ms': round(values[min(len(values) - 1, int(len(values) * 0.95))] * 1000, 1),
+            'max_ms': round(values[-1] * 1000, 1),
+        }
+        for backend, values in samples.items()
+    }
+
 
 class ChatHandler:
     """Orchestrates AI chat across multiple backends (WebAI, GLM, Ollama)"""
@@ -31,6 +178,7 @@ class ChatHandler:
         self.model = model
         self.fund = fund
         self.backend = self._detect_backend()
+        self._started = time.perf_counter()  # Start of the request, for time-to-first-token
         
     def _detect_backend(self) -> str:
         """
@@ -65,6 +213,10 @@ class ChatHandler:
         """
         Build context string from portfolio data.
         
+        Sections are assembled concurrently; see CONTEXT_SECTION_BUDGETS for
+        how long each one is waited for. Sections that fail or miss their
+        budget are left out.
+        
         Args:
             context_items: List of context item dictionaries
             options: Options dict with include_price_volume, include_fundamentals, etc.
@@ -72,62 +224,37 @@ class ChatHandler:
         Returns:
             Formatted context string
         """
-        from ai_context_builder import (
-            format_holdings, format_thesis, format_trades,
-            format_performance_metrics, format_cash_balances
-        )
-        from flask_data_utils import (
-            get_current_positions_flask, get_trade_log_flask,
-            get_cash_balances_flask, calculate_portfolio_value_over_time_flask,
-            get_fund_thesis_data_flask, calculate_performance_metrics_flask
-        )
-        from chat_context import ContextItemType
-        
-        context_parts = []
+        started = time.perf_counter()
+        pool = _get_context_pool()
+        copy_context = has_request_context()
         
+        # (item_type, budget, future) in the order the items were selected
+        sections = []
         for item_dict in context_items:
-            item_type_str = item_dict['item_type']
-            item_fund = item_dict.get('fund') or self.fund
-            
-            try:
-                item_type = ContextItemType(item_type_str)
-            except ValueError:
+            item_type = item_dict['item_type']
+            task = _section_task(item_type, item_dict.get('fund') or self.fund, item_dict, options)
+            if task is None:
                 continue
-            
+            if copy_context:
+                # Data access reads the user's auth cookie; one context copy per thread
+                task = copy_current_request_context(task)
+            budget = CONTEXT_SECTION_BUDGETS[item_type]
+            sections.append((item_type, budget, pool.submit(task)))
+        
+        # Mandatory sections first: optional ones that finish meanwhile come along for free
+        results = {}
+        for item_type, budget, future in sorted(sections, key=lambda section: not section[1].mandatory):
+            remaining = budget.seconds - (time.perf_counter() - started)
             try:
-                if item_type == ContextItemType.HOLDINGS:
-                    positions_df = get_current_positions_flask(item_fund)
-                    trades_df = get_trade_log_flask(limit=1000, fund=item_fund) if item_fund else None
-                    include_pv = options.get('include_price_volume', True)
-                    include_fund = options.get('include_fundamentals', True)
-                    context_parts.append(
-                        format_holdings(
-                            positions_df,
-                            item_fund or "Unknown",
-                            trades_df=trades_df,
-                            include_price_volume=include_pv,
-                            include_fundamentals=include_fund
-                        )
-                    )
-                elif item_type == ContextItemType.THESIS:
-                    thesis_data = get_fund_thesis_data_flask(item_fund or "")
-                    if thesis_data:
-                        context_parts.append(format_thesis(thesis_data))
-                elif item_type == ContextItemType.TRADES:
-                    limit = item_dict.get('metadata', {}).get('limit', 100)
-                    trades_df = get_trade_log_flask(limit=limit, fund=item_fund)
-                    context_parts.append(format_trades(trades_df, limit))
-                elif item_type == ContextItemType.METRICS:
-                    portfolio_df = calculate_portfolio_value_over_time_flask(item_fund, days=365) if item_fund else None
-                    metrics = calculate_performance_metrics_flask(item_fund) if item_fund else {}
-                    context_parts.append(format_performance_metrics(metrics, portfolio_df))
-                elif item_type == ContextItemType.CASH_BALANCES:
-                    cash = get_cash_balances_flask(item_fund) if item_fund else {}
-                    context_parts.append(format_cash_balances(cash))
+                results[future] = future.result(timeout=max(0.0, remaining))
+            except FutureTimeoutError:
+                logger.warning(f"Context section {item_type} missed its {budget.seconds:g}s budget, continuing without it")
             except Exception as e:
-                logger.warning(f"Error loading {item_type_str}: {e}")
-                continue
+                logger.warning(f"Error loading {item_type}: {e}")
         
+        context_parts = [results[future] for _, _, future in sections if results.get(future)]
+        logger.log(PERF_LEVEL, f"AI context assembled in {(time.perf_counter() - started) * 1000:.0f}ms "
+                               f"({len(context_parts)}/{len(sections)} sections)")
         return "\n\n---\n\n".join(context_parts) if context_parts else ""
     
     def handle_chat(
@@ -241,6 +368,7 @@ class ChatHandler:
             # Send message
             logger.info("Sending message to WebAI...")
             full_response = webai_session.send_sync(full_prompt)
+            _record_ttft('webai', self.model, time.perf_counter() - self._started)  # Not streamed: first token is the full reply
             logger.info(f"WebAI response received, length: {len(full_response) if full_response else 0}")
             
             return jsonify({
@@ -318,6 +446,7 @@ class ChatHandler:
             }
             
             def generate_glm():
+                first_token = True
                 try:
                     r = requests.post(url, json=payload, headers=headers, stream=True, timeout=90)
                     r.raise_for_status()
@@ -336,6 +465,9 @@ class ChatHandler:
                                     delta = c.get("delta") or {}
                                     part = delta.get("content") or ""
                                     if part:
+                                        if first_token:
+                                            first_token = False
+                                            _record_ttft('glm', self.model, time.perf_counter() - self._started)
                                         yield f"data: {json.dumps({'chunk': part, 'done': False})}\n\n"
                                     if c.get("finish_reason") == "stop":
                                         yield f"data: {json.dumps({'chunk': '', 'done': True})}\n\n"
@@ -380,6 +512,7 @@ class ChatHandler:
         
         def generate():
             """Generator for streaming response"""
+            first_token = True
             try:
                 for chunk in client.query_ollama(
                     prompt=full_prompt,
@@ -389,6 +522,9 @@ class ChatHandler:
                     max_tokens=None,
                     system_prompt=system_prompt
                 ):
+                    if first_token and chunk:
+                        first_token = False
+                        _record_ttft('ollama', self.model, time.perf_counter() - self._started)
                     yield f"data: {json.dumps({'chunk': chunk, 'done': False})}\n\n"
                 
                 # Send done signal
@@ -37,6 +37,7 @@ import requests
 import threading
 from flask_cors import CORS
 from flask_cache_utils import cache_data, cache_resource
+from cache_version import cache_tag, invalidate
 from rate_limiter import rate_limit
 
 # Configure logging
@@ -1923,6 +1924,7 @@ def api_admin_assign_fund():
         )
         
         if response.status_code == 200:
+            invalidate(cache_tag("user_funds", fund_name))
             result_data = response.json()
             if isinstance(result_data, dict):
                 # New JSON response format
@@ -1983,6 +1985,7 @@ def api_admin_remove_fund():
         )
         
         if remove_response.status_code in [200, 204]:
+            invalidate(cache_tag("user_funds", fund_name))
             return jsonify({"message": f"Fund '{fund_name}' removed from {user_email}"})
         else:
             return jsonify({"error": "Failed to remove fund"}), 400
@@ -2323,6 +2326,7 @@ def execute_sql():
 
 @app.route('/api/export/portfolio')
 @require_auth
+@rate_limit(limit=30, period=60, per='user', scope='export')
 def export_portfolio():
     """Export portfolio data as JSON for LLM analysis"""
     if not is_admin():
@@ -2358,6 +2362,7 @@ def export_portfolio():
 
 @app.route('/api/export/trades')
 @require_auth
+@rate_limit(limit=30, period=60, per='user', scope='export')
 def export_trades():
     """Export trade data as JSON for LLM analysis"""
     if not is_admin():
@@ -2393,6 +2398,7 @@ def export_trades():
 
 @app.route('/api/export/performance')
 @require_auth
+@rate_limit(limit=30, period=60, per='user', scope='export')
 def export_performance():
     """Export performance metrics for LLM analysis"""
     if not is_admin():
@@ -2425,6 +2431,7 @@ def export_performance():
 
 @app.route('/api/export/cash')
 @require_auth
+@rate_limit(limit=30, period=60, per='user', scope='export')
 def export_cash():
     """Export cash balance data for LLM analysis"""
     if not is_admin():
@@ -3076,9 +3083,12 @@ def _get_ticker_info_cached(
     if not supabase_client and not postgres_client:
         raise ValueError("Unable to connect to databases")
     
-    # Get ticker info
+    # Get ticker info (shared sections come from the ticker profile cache;
+    # portfolio data is cached per user since it's subject to RLS)
     from ticker_utils import get_ticker_info
-    return get_ticker_info(ticker, supabase_client, postgres_client, fund=fund)
+    from flask_auth_utils import get_user_id_flask
+    cache_scope = "admin" if user_is_admin else get_user_id_flask()
+    return get_ticker_info(ticker, supabase_client, postgres_client, fund=fund, cache_scope=cache_scope)
 
 @app.route('/api/v2/ticker/info')
 @require_auth
@@ -3264,27 +3274,92 @@ def request_ticker_reanalysis(ticker: str):
         logger.error(f"Error running re-analysis for {ticker}: {e}", exc_info=True)
         return jsonify({'error': str(e)}), 500
 
-@cache_data(ttl=300)
-def _get_ticker_price_history_cached(
-    ticker: str,
-    days: int,
-    user_is_admin: bool,
-    auth_token: Optional[str],
-    fund: Optional[str]
-):
-    """Get ticker price history with caching (300s TTL)"""
+# Ticker pages use a two-tier cache:
+# - Shared tier: data that isn't user-specific (prices, congress/ETF trades, a
+#   fund's trades) is read with the service-role client and cached by the data's
+#   identity only (ticker, range, funds), so every user hits the same entries.
+# - Authorization tier: _resolve_ticker_fund_scope() works out, per user, which
+#   funds the request may see (cached per user) and rejects funds they can't.
+
+def _get_shared_supabase_client():
+    """Service-role Supabase client for the shared (user-independent) cache tier.
+    
+    Only use it for data that is the same for every user, or after
+    _resolve_ticker_fund_scope() has checked access to the funds queried.
+    The underlying client is shared through the Supabase client registry.
+    """
     from supabase_client import SupabaseClient
+    return SupabaseClient(use_service_role=True)
+
+@cache_data(ttl=300)
+def _get_user_funds_cached(user_id: str) -> List[str]:
+    """Funds assigned to a user (300s TTL)"""
+    from auth import auth_manager
+    return sorted(auth_manager.get_user_funds(user_id))
+
+def _resolve_ticker_fund_scope(user_is_admin: bool, fund: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Per-user authorization for shared ticker data.
     
+    Returns:
+        Funds the request may see: None for all funds (admin without a fund
+        filter), otherwise a sorted tuple (possibly empty)
+    
+    Raises:
+        PermissionError: If the user has no access to the requested fund
+    """
     if user_is_admin:
-        supabase_client = SupabaseClient(use_service_role=True)
-    else:
-        supabase_client = SupabaseClient(user_token=auth_token) if auth_token else None
+        return (fund,) if fund else None
     
-    if not supabase_client:
-        raise ValueError("Unable to connect to database")
+    user_id = getattr(request, 'user_id', None)
+    allowed = _get_user_funds_cached(user_id) if user_id else []
+    if fund:
+        if fund not in allowed:
+            raise PermissionError(f"Access denied to fund {fund}")
+        return (fund,)
+    return tuple(allowed)
+
+@cache_data(
+    ttl=300,
+    depends_on=lambda ticker, days, funds, **_: (
+        [cache_tag("portfolio_positions")] if funds is None else [cache_tag("portfolio_positions", f) for f in funds]
+    )
+)
+def _get_ticker_price_history_shared(ticker: str, days: int, funds: Optional[Tuple[str, ...]]):
+    """Get ticker price history for a set of funds, shared by all users (300s TTL)
     
+    Args:
+        funds: Funds to include (None = all funds); already authorized by the caller
+    """
     from ticker_utils import get_ticker_price_history
-    return get_ticker_price_history(ticker, supabase_client, days=days, fund=fund)
+    return get_ticker_price_history(ticker, _get_shared_supabase_client(), days=days, funds=funds)
+
+@cache_data(
+    ttl=300,
+    depends_on=lambda ticker, range_days, funds, **_: (
+        [cache_tag("trade_log")] if funds is None else [cache_tag("trade_log", f) for f in funds]
+    )
+)
+def _get_ticker_fund_trades_shared(ticker: str, range_days: int, funds: Optional[Tuple[str, ...]]) -> List[Dict[str, Any]]:
+    """Get trades of a ticker within a date range for a set of funds (300s TTL).
+    
+    Args:
+        funds: Funds to include (None = all funds); already authorized by the caller
+    """
+    if funds is not None and not funds:
+        return []
+    
+    start_date = (date.today() - timedelta(days=range_days)).isoformat()
+    end_date = date.today().isoformat()
+    
+    trade_query = _get_shared_supabase_client().supabase.table("trade_log")\
+        .select("*")\
+        .eq("ticker", ticker)\
+        .gte("date", start_date)\
+        .lte("date", end_date)
+    if funds is not None:
+        trade_query = trade_query.in_("fund", list(funds))
+    trade_result = trade_query.order("date", desc=True).execute()
+    return trade_result.data or []
 
 @app.route('/api/v2/ticker/price-history')
 @require_auth
@@ -3299,11 +3374,10 @@ def api_ticker_price_history():
         
         days = int(request.args.get('days', 90))
         fund = _normalize_fund_param(request.args.get('fund'))
-        user_is_admin = is_admin()
-        auth_token = request.cookies.get('auth_token')
+        funds = _resolve_ticker_fund_scope(is_admin(), fund)
         
-        # Get price history (cached)
-        price_df = _get_ticker_price_history_cached(ticker, days, user_is_admin, auth_token, fund)
+        # Get price history (shared cache)
+        price_df = _get_ticker_price_history_shared(ticker, days, funds)
         
         # Convert DataFrame to JSON
         if price_df.empty:
@@ -3315,6 +3389,8 @@ def api_ticker_price_history():
             price_df['date'] = price_df['date'].apply(lambda x: x.isoformat() if hasattr(x, 'isoformat') else str(x))
         
         return jsonify({"data": price_df.to_dict('records')})
+    except PermissionError as e:
+        return jsonify({"error": str(e)}), 403
     except Exception as e:
         logger.error(f"Error fetching price history: {e}", exc_info=True)
         import traceback
@@ -3324,25 +3400,25 @@ def api_ticker_price_history():
             "type": type(e).__name__
         }), 500
 
-@cache_data(ttl=300)
+@cache_data(
+    ttl=300,
+    depends_on=lambda ticker, use_solid, fund, funds, range='3m', **_: [
+        cache_tag("portfolio_positions", fund), cache_tag("congress_trades")
+    ] + ([cache_tag("trade_log")] if funds is None else [cache_tag("trade_log", f) for f in funds])
+)
 def _get_ticker_chart_data_cached(
     ticker: str,
     use_solid: bool,
-    user_is_admin: bool,
-    auth_token: Optional[str],
     fund: Optional[str],
+    funds: Optional[Tuple[str, ...]],
     range: str = '3m'
 ):
-    """Get ticker chart data with caching (300s TTL) - theme applied separately"""
-    from supabase_client import SupabaseClient
+    """Get ticker chart data with caching (300s TTL) - theme applied separately
     
-    if user_is_admin:
-        supabase_client = SupabaseClient(use_service_role=True)
-    else:
-        supabase_client = SupabaseClient(user_token=auth_token) if auth_token else None
-    
-    if not supabase_client:
-        raise ValueError("Unable to connect to database")
+    Keyed by the data shown, not the user: users who may see the same funds
+    share entries. ``funds`` comes from _resolve_ticker_fund_scope().
+    """
+    supabase_client = _get_shared_supabase_client()
     
     # Convert range to days
     range_days = {
@@ -3353,8 +3429,7 @@ def _get_ticker_chart_data_cached(
         '5y': 1825
     }.get(range, 90)
     
-    from ticker_utils import get_ticker_price_history
-    price_df = get_ticker_price_history(ticker, supabase_client, days=range_days, fund=fund)
+    price_df = _get_ticker_price_history_shared(ticker, range_days, funds)
     
     if price_df.empty:
         # Return empty chart data structure instead of raising error
@@ -3384,17 +3459,14 @@ def _get_ticker_chart_data_cached(
     # Fetch congress trades for this ticker within the chart date range
     congress_trades = []
     try:
-        from cache_version import get_cache_version
-        refresh_key = get_cache_version()
-        
         # Calculate date range for congress trades (match chart range)
         start_date = (date.today() - timedelta(days=range_days)).isoformat()
         end_date = date.today().isoformat()
         
-        # Fetch congress trades
+        # Fetch congress trades (client passed by keyword so it's not part of the cache key)
         congress_trades = get_congress_trades_cached(
-            supabase_client,
-            refresh_key,
+            _supabase_client=supabase_client,
+            refresh_key=0,
             ticker_filter=ticker,
             start_date=start_date,
             end_date=end_date,
@@ -3404,23 +3476,10 @@ def _get_ticker_chart_data_cached(
         logger.warning(f"Error fetching congress trades for chart: {e}")
         # Continue without congress trades if there's an error
     
-    # Fetch user trades for this ticker within the chart date range
+    # Fetch trades of the visible funds for this ticker within the chart date range
     user_trades = []
     try:
-        start_date = (date.today() - timedelta(days=range_days)).isoformat()
-        end_date = date.today().isoformat()
-        
-        trade_query = supabase_client.supabase.table("trade_log")\
-            .select("*")\
-            .eq("ticker", ticker)\
-            .gte("date", start_date)\
-            .lte("date", end_date)
-        if fund:
-            trade_query = trade_query.eq("fund", fund)
-        trade_result = trade_query.order("date", desc=True).execute()
-        
-        if trade_result.data:
-            user_trades = trade_result.data
+        user_trades = _get_ticker_fund_trades_shared(ticker, range_days, funds)
     except Exception as e:
         logger.warning(f"Error fetching user trades for chart: {e}")
         # Continue without user trades if there's an error
@@ -3428,18 +3487,7 @@ def _get_ticker_chart_data_cached(
     # Fetch ETF trades for this ticker within the chart date range (from Research DB)
     etf_trades = []
     try:
-        from postgres_client import PostgresClient
-        pc = PostgresClient()
-        
-        start_date = (date.today() - timedelta(days=range_days)).isoformat()
-        end_date = date.today().isoformat()
-        
-        etf_result = pc.execute_query("""
-            SELECT * FROM get_etf_holding_trades(%s, %s::date, %s::date)
-        """, (ticker, start_date, end_date))
-        
-        if etf_result:
-            etf_trades = etf_result
+        etf_trades = _get_ticker_etf_trades_cached(ticker, range)
     except Exception as e:
         logger.warning(f"Error fetching ETF trades for chart: {e}")
         # Continue without ETF trades if there's an error
@@ -3470,7 +3518,6 @@ def _get_ticker_chart_cached(
     ticker: str,
     use_solid: bool,
     user_is_admin: bool,
-    auth_token: Optional[str],
     fund: Optional[str],
     theme: Optional[str] = None,
     range: str = '3m'
@@ -3478,8 +3525,9 @@ def _get_ticker_chart_cached(
     """Get ticker chart with theme applied dynamically (not cached per theme)"""
     import json
     
-    # Get cached chart data (without theme)
-    chart_json_str = _get_ticker_chart_data_cached(ticker, use_solid, user_is_admin, auth_token, fund, range)
+    # Get cached chart data (without theme) for the funds this user may see
+    funds = _resolve_ticker_fund_scope(user_is_admin, fund)
+    chart_json_str = _get_ticker_chart_data_cached(ticker, use_solid, fund, funds, range)
     
     # Parse the JSON
     chart_data = json.loads(chart_json_str)
@@ -3540,12 +3588,12 @@ def _get_ticker_chart_cached(
     return json.dumps(chart_data)
 
 @cache_data(ttl=300)
-def _get_ticker_etf_trades_cached(ticker: str, user_is_admin: bool, auth_token: Optional[str], range: str = '3m'):
+def _get_ticker_etf_trades_cached(ticker: str, range: str = '3m'):
     """Get ETF holding trades for a ticker within a date range (300s TTL).
     
-    Data is fetched from Research DB (not Supabase).
+    Data is fetched from Research DB (not Supabase) and is the same for every
+    user, so it's cached by ticker and range only.
     """
-    from postgres_client import PostgresClient
 
     range_days = {
         '3m': 90,
@@ -3558,7 +3606,9 @@ def _get_ticker_etf_trades_cached(ticker: str, user_is_admin: bool, auth_token:
     start_date = (date.today() - timedelta(days=range_days)).isoformat()
     end_date = date.today().isoformat()
 
-    pc = PostgresClient()
+    pc = get_postgres_client_congress()
+    if pc is None:
+        return []
     result = pc.execute_query("""
         SELECT * FROM get_etf_holding_trades(%s, %s::date, %s::date)
     """, (ticker, start_date, end_date))
@@ -3587,19 +3637,19 @@ def api_ticker_chart():
             chart_range = '3m'
         
         user_is_admin = is_admin()
-        auth_token = request.cookies.get('auth_token')
         
         # Get chart (cached) - use client theme if valid, otherwise fall back to user preference
         chart_json = _get_ticker_chart_cached(
             ticker,
             use_solid,
             user_is_admin,
-            auth_token,
             fund,
             theme=client_theme if client_theme in ['dark', 'light'] else None,
             range=chart_range
         )
         return Response(chart_json, mimetype='application/json')
+    except PermissionError as e:
+        return jsonify({"error": str(e)}), 403
     except Exception as e:
         logger.error(f"Error generating chart for {ticker}: {e}", exc_info=True)
         import traceback
@@ -3614,8 +3664,6 @@ def api_ticker_chart():
 def api_ticker_etf_trades():
     """Get ETF holding trades for a ticker (range-aware)."""
     try:
-        from auth import is_admin
-
         ticker = request.args.get('ticker', '').upper().strip()
         if not ticker:
             return jsonify({"error": "Ticker symbol is required"}), 400
@@ -3624,10 +3672,7 @@ def api_ticker_etf_trades():
         if chart_range not in ['3m', '6m', '1y', '2y', '5y']:
             chart_range = '3m'
 
-        user_is_admin = is_admin()
-        auth_token = request.cookies.get('auth_token')
-
-        trades = _get_ticker_etf_trades_cached(ticker, user_is_admin, auth_token, chart_range)
+        trades = _get_ticker_etf_trades_cached(ticker, chart_range)
         return jsonify({"data": trades})
     except Exception as e:
         logger.error(f"Error fetching ETF trades for {ticker}: {e}", exc_info=True)
@@ -3677,16 +3722,9 @@ def get_postgres_client_congress():
         logger.warning(f"PostgreSQL not available (AI analysis disabled): {e}")
         return None
 
-@cache_data(ttl=3600)
-def get_unique_tickers_congress(_supabase_client, refresh_key: int, _cache_version: Optional[str] = None) -> List[str]:
+@cache_data(ttl=3600, depends_on=[cache_tag("congress_trades")])
+def get_unique_tickers_congress(_supabase_client, refresh_key: int) -> List[str]:
     """Get all unique tickers from congress_trades table (cached 1 hour)"""
-    if _cache_version is None:
-        try:
-            from cache_version import get_cache_version
-            _cache_version = get_cache_version()
-        except ImportError:
-            _cache_version = ""
-    
     try:
         if _supabase_client is None:
             return []
@@ -3723,16 +3761,9 @@ def get_unique_tickers_congress(_supabase_client, refresh_key: int, _cache_versi
         logger.error(f"Error fetching unique tickers: {e}", exc_info=True)
         return []
 
-@cache_data(ttl=3600)
-def get_unique_politicians_congress(_supabase_client, refresh_key: int, _cache_version: Optional[str] = None) -> List[str]:
+@cache_data(ttl=3600, depends_on=[cache_tag("congress_trades")])
+def get_unique_politicians_congress(_supabase_client, refresh_key: int) -> List[str]:
     """Get all unique politicians from congress_trades table (cached 1 hour)"""
-    if _cache_version is None:
-        try:
-            from cache_version import get_cache_version
-            _cache_version = get_cache_version()
-        except ImportError:
-            _cache_version = ""
-    
     try:
         if _supabase_client is None:
             return []
@@ -3791,7 +3822,7 @@ def get_analysis_data_congress(_postgres_client, refresh_key: int) -> Dict[int,
         logger.error(f"Error fetching analysis data: {e}")
         return {}
 
-@cache_data(ttl=21600)
+@cache_data(ttl=21600, depends_on=[cache_tag("congress_trades")])
 def get_congress_trades_cached(
     _supabase_client,
     refresh_key: int,
@@ -3897,16 +3928,9 @@ def get_congress_trades_cached(
         logger.error(f"Error fetching congress trades: {e}", exc_info=True)
         return []
 
-@cache_data(ttl=86400)  # Cache for 24 hours - company names don't change often
-def get_company_names_map_congress(_supabase_client, tickers_tuple: tuple, _cache_version: Optional[str] = None) -> Dict[str, str]:
+@cache_data(ttl=86400, depends_on=[cache_tag("securities")])  # Cache for 24 hours - company names don't change often
+def get_company_names_map_congress(_supabase_client, tickers_tuple: tuple) -> Dict[str, str]:
     """Batch fetch company names from securities table (cached 24 hours)"""
-    if _cache_version is None:
-        try:
-            from cache_version import get_cache_version
-            _cache_version = get_cache_version()
-        except ImportError:
-            _cache_version = ""
-    
     # Convert tuple back to list
     tickers = list(tickers_tuple) if tickers_tuple else []
     
@@ -3959,7 +3983,6 @@ def congress_trades_page():
         from flask_auth_utils import get_user_email_flask, get_auth_token
         from flask_data_utils import get_supabase_client_flask
         from user_preferences import get_user_theme
-        from cache_version import get_cache_version
         from auth import is_admin
         
         user_email = get_user_email_flask()
@@ -4019,9 +4042,8 @@ def congress_trades_page():
             max_score = 0.3
         
         # Get unique values for filters
-        cache_version = get_cache_version()
-        unique_tickers = get_unique_tickers_congress(supabase_client, refresh_key, cache_version)
-        unique_politicians = get_unique_politicians_congress(supabase_client, refresh_key, cache_version)
+        unique_tickers = get_unique_tickers_congress(supabase_client, refresh_key)
+        unique_politicians = get_unique_politicians_congress(supabase_client, refresh_key)
         
         # Lazy load: Pass empty data initially
         trades_data = []
@@ -4085,7 +4107,6 @@ def api_congress_trades_data():
     try:
         from flask_auth_utils import get_auth_token
         from flask_data_utils import get_supabase_client_flask
-        from cache_version import get_cache_version
         from auth import is_admin
         from web_dashboard.utils.logo_utils import get_ticker_logo_url
         
@@ -4140,9 +4161,8 @@ def api_congress_trades_data():
         
         # Get company names (cached) - optimize by only fetching for unique tickers in result
         unique_ticker_list = list(set([t.get('ticker') for t in all_trades if t.get('ticker')]))
-        cache_version = get_cache_version()
         # Fetch company names in chunks is handled by get_company_names_map_congress
-        company_names_map = get_company_names_map_congress(supabase_client, tuple(unique_ticker_list), cache_version)
+        company_names_map = get_company_names_map_congress(supabase_client, tuple(unique_ticker_list))
         
         # Format trades data
         formatted_trades = []
@@ -4465,18 +4485,9 @@ The confidence_score (0.0-1.0) indicates how certain you are about the conflict_
 # Insider Trades Routes (Flask v2)
 # ============================================================================
 
-@cache_data(ttl=3600)
-def get_unique_tickers_insider(
-    _supabase_client, refresh_key: int, _cache_version: Optional[str] = None
-) -> List[str]:
+@cache_data(ttl=3600, depends_on=[cache_tag("insider_trades")])
+def get_unique_tickers_insider(_supabase_client, refresh_key: int) -> List[str]:
     """Get all unique tickers from insider_trades table (cached 1 hour)."""
-    if _cache_version is None:
-        try:
-            from cache_version import get_cache_version
-            _cache_version = get_cache_version()
-        except ImportError:
-            _cache_version = ""
-
     try:
         if _supabase_client is None:
             return []
@@ -4600,18 +4611,9 @@ def normalize_insider_name(name: Optional[str]) -> Optional[str]:
     return " ".join(normalized_tokens)
 
 
-@cache_data(ttl=3600)
-def get_unique_insider_names(
-    _supabase_client, refresh_key: int, _cache_version: Optional[str] = None
-) -> List[str]:
+@cache_data(ttl=3600, depends_on=[cache_tag("insider_trades")])
+def get_unique_insider_names(_supabase_client, refresh_key: int) -> List[str]:
     """Get all unique insider names from insider_trades table (cached 1 hour)."""
-    if _cache_version is None:
-        try:
-            from cache_version import get_cache_version
-            _cache_version = get_cache_version()
-        except ImportError:
-            _cache_version = ""
-
     try:
         if _supabase_client is None:
             return []
@@ -4651,18 +4653,9 @@ def get_unique_insider_names(
         return []
 
 
-@cache_data(ttl=300)
-def get_latest_insider_trade_timestamp(
-    _supabase_client, refresh_key: int, _cache_version: Optional[str] = None
-) -> Optional[str]:
+@cache_data(ttl=300, depends_on=[cache_tag("insider_trades")])
+def get_latest_insider_trade_timestamp(_supabase_client, refresh_key: int) -> Optional[str]:
     """Get the most recent insider trade created_at timestamp (cached 5 min)."""
-    if _cache_version is None:
-        try:
-            from cache_version import get_cache_version
-            _cache_version = get_cache_version()
-        except ImportError:
-            _cache_version = ""
-
     try:
         if _supabase_client is None:
             return None
@@ -4681,18 +4674,9 @@ def get_latest_insider_trade_timestamp(
     return None
 
 
-@cache_data(ttl=300)
-def get_last_job_success_timestamp(
-    job_id: str, refresh_key: int, _cache_version: Optional[str] = None
-) -> Optional[datetime]:
-    """Get the most recent successful execution timestamp for a scheduler job."""
-    if _cache_version is None:
-        try:
-            from cache_version import get_cache_version
-            _cache_version = get_cache_version()
-        except ImportError:
-            _cache_version = ""
-
+@cache_data(ttl=300, depends_on=lambda job_id, **_: [cache_tag("job_executions", job_id)])
+def get_last_job_success_timestamp(job_id: str, refresh_key: int) -> Optional[datetime]:
+    """Get the most recent successful execution timestamp for a scheduler job (cached 5 min)."""
     try:
         from scheduler.scheduler_core import get_job_logs
 
@@ -4706,7 +4690,7 @@ def get_last_job_success_timestamp(
     return None
 
 
-@cache_data(ttl=21600)
+@cache_data(ttl=21600, depends_on=[cache_tag("insider_trades")])
 def get_insider_trades_cached(
     _supabase_client,
     refresh_key: int,
@@ -4716,17 +4700,9 @@ def get_insider_trades_cached(
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
     min_value: Optional[float] = None,
-    sort_by: Optional[str] = None,
-    _cache_version: Optional[str] = None
+    sort_by: Optional[str] = None
 ) -> List[Dict[str, Any]]:
     """Get insider trades with filters (cached 6 hours). Fetches ALL matching rows."""
-    if _cache_version is None:
-        try:
-            from cache_version import get_cache_version
-            _cache_version = get_cache_version()
-        except ImportError:
-            _cache_version = ""
-
     try:
         if _supabase_client is None:
             return []
@@ -4792,7 +4768,6 @@ def insider_trades_page():
         from flask_auth_utils import get_user_email_flask
         from flask_data_utils import get_supabase_client_flask
         from user_preferences import get_user_theme, format_timestamp_in_user_timezone
-        from cache_version import get_cache_version
         from auth import is_admin
 
         user_email = get_user_email_flask()
@@ -4815,8 +4790,7 @@ def insider_trades_page():
                                  error_message="The insider trades database is not available. Check the logs or contact an administrator.",
                                  **nav_context)
 
-        cache_version = get_cache_version()
-        unique_insiders = get_unique_insider_names(supabase_client, refresh_key, cache_version)
+        unique_insiders = get_unique_insider_names(supabase_client, refresh_key)
 
         # Date filter defaults to last 7 days
         today = datetime.utcnow().date()
@@ -4833,9 +4807,7 @@ def insider_trades_page():
         start_date = request.args.get("start_date") or default_start
         end_date = request.args.get("end_date") or default_end
 
-        latest_created_at = get_latest_insider_trade_timestamp(
-            supabase_client, refresh_key, cache_version
-        )
+        latest_created_at = get_latest_insider_trade_timestamp(supabase_client, refresh_key)
         if latest_created_at:
             try:
                 normalized = latest_created_at.replace("Z", "+00:00")
@@ -4847,9 +4819,7 @@ def insider_trades_page():
             except Exception:
                 pass
 
-        last_job_run = get_last_job_success_timestamp(
-            "insider_trades_fetch", refresh_key, cache_version
-        )
+        last_job_run = get_last_job_success_timestamp("insider_trades_fetch", refresh_key)
         if last_job_run:
             try:
                 last_job_run = format_timestamp_in_user_timezone(
@@ -4903,7 +4873,6 @@ def api_insider_trades_data():
     """API endpoint for insider trades data (JSON) - fetches ALL data at once"""
     try:
         from flask_data_utils import get_supabase_client_flask
-        from cache_version import get_cache_version
         from auth import is_admin
         from web_dashboard.utils.logo_utils import get_ticker_logo_url
 
@@ -4937,7 +4906,6 @@ def api_insider_trades_data():
             except ValueError:
                 min_value = None
 
-        cache_version = get_cache_version()
         all_trades = get_insider_trades_cached(
             supabase_client,
             refresh_key,
@@ -4947,8 +4915,7 @@ def api_insider_trades_data():
             start_date=start_date,
             end_date=end_date,
             min_value=min_value,
-            sort_by=sort_by,
-            _cache_version=cache_version
+            sort_by=sort_by
         )
 
         if fund_only and selected_fund and selected_fund.lower() != "all":
@@ -2,43 +2,110 @@
 Cache Version Management
 ========================
 
-Provides a mechanism for background jobs to invalidate Streamlit's cache
-by updating a shared version file. When jobs update portfolio data, they
-bump the cache version, causing cached functions to re-fetch fresh data.
+Provides a mechanism for background jobs to invalidate the dashboard caches
+through shared files, so the scheduler, Flask and Streamlit processes agree
+on what is stale.
+
+Two levels of invalidation are supported:
+
+- **Global**: ``bump_cache_version()`` changes the version every cache key
+  includes, invalidating everything (admin "clear cache" actions).
+- **Tagged**: ``invalidate(*tags)`` publishes a precise invalidation event.
+  Cached functions declare the data they depend on as tags such as
+  ``cache_tag("portfolio_positions", fund)`` or ``cache_tag("ticker", "AAPL")``,
+  and only entries whose tags are related to an event are invalidated.
+
+Tags are ``:``-separated paths. An event and a dependency are related when
+one is a prefix of the other, so invalidating ``portfolio_positions`` (every
+fund) affects an entry for ``portfolio_positions:Project Chimera``, and
+invalidating ``portfolio_positions:Project Chimera`` affects an entry that
+read positions for all funds (tag ``portfolio_positions``), but not one for
+another fund.
 
 Usage in background jobs:
-    from cache_version import bump_cache_version
-    
-    # After updating portfolio data
-    bump_cache_version()
-
-Usage in cached functions:
-    from cache_version import get_cache_version
-    
-    @st.cache_data(ttl=300)
-    def get_portfolio_data(_cache_version=None):
-        if _cache_version is None:
-            _cache_version = get_cache_version()
-        # ... fetch data ...
+    from cache_version import invalidate, cache_tag
+
+    # After updating one fund's positions
+    invalidate(cache_tag("portfolio_positions", fund))
+
+Usage in cached functions (Flask):
+    from flask_cache_utils import cache_data
+
+    @cache_data(ttl=300, depends_on=lambda fund, **_: [cache_tag("portfolio_positions", fund)])
+    def get_positions(fund):
+        ...
+
+``get_cache_version()`` still returns a single coarse version (changing on
+global bumps and on any tagged event) for callers that build their own keys.
+Versions are held in memory; the files are only re-checked every
+VERSION_CHECK_INTERVAL seconds, and only re-read when they changed.
 """
 
+import json
 import os
+import threading
+import time
 from pathlib import Path
 from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
 import logging
 
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
+
 logger = logging.getLogger(__name__)
 
 # Cache version file location (in web_dashboard directory)
 VERSION_FILE = Path(__file__).parent / ".cache_version"
 
+# Tagged invalidation events: {"seq": N, "tags": {tag: seq of last invalidation}}
+TAGS_FILE = Path(__file__).parent / ".cache_tags.json"
+
+# Seconds between checks of the version files for changes by other processes
+VERSION_CHECK_INTERVAL = 2.0
+
+_lock = threading.RLock()
+_base_version: Optional[str] = None
+_tag_seqs: Dict[str, int] = {}
+_seq = 0
+_file_stamps: Tuple[Optional[int], Optional[int]] = (None, None)
+_last_check = 0.0
+_related_memo: Dict[str, int] = {}
+
+
+def cache_tag(*parts) -> str:
+    """Build a dependency/invalidation tag from its parts.
+
+    ``None`` parts are dropped, so ``cache_tag("trade_log", None)`` (all funds)
+    is the table-level tag ``trade_log``.
+
+    Args:
+        *parts: Tag path, e.g. ("portfolio_positions", fund) or ("ticker", "AAPL")
 
-def get_cache_version() -> str:
-    """Get current cache version from file.
-    
     Returns:
-        Cache version string (timestamp or BUILD_TIMESTAMP)
+        Tag string such as "portfolio_positions:Project Chimera"
     """
+    return ":".join(str(part) for part in parts if part is not None)
+
+
+def tags_related(a: str, b: str) -> bool:
+    """Whether two tags overlap (one is the other or a ``:``-prefix of it)."""
+    if a == b:
+        return True
+    shorter, longer = (a, b) if len(a) < len(b) else (b, a)
+    return longer.startswith(shorter + ":")
+
+
+def _stat(path: Path) -> Optional[int]:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def _read_base_version() -> Optional[str]:
     try:
         if VERSION_FILE.exists():
             version = VERSION_FILE.read_text().strip()
@@ -46,20 +113,159 @@ def get_cache_version() -> str:
                 return version
     except Exception as e:
         logger.debug(f"Could not read cache version file: {e}")
-    
-    # Fallback to BUILD_TIMESTAMP (deployment time) or current time
-    return os.getenv("BUILD_TIMESTAMP", datetime.now().strftime("%Y%m%d_%H%M%S"))
+    return None
+
+
+def _read_tags() -> Tuple[int, Dict[str, int]]:
+    try:
+        if TAGS_FILE.exists():
+            data = json.loads(TAGS_FILE.read_text())
+            return int(data.get("seq", 0)), {str(k): int(v) for k, v in data.get("tags", {}).items()}
+    except Exception as e:
+        logger.debug(f"Could not read cache tags file: {e}")
+    return 0, {}
+
+
+def _refresh(force: bool = False) -> None:
+    """Reload versions if the files changed (checked at most every interval)."""
+    global _base_version, _tag_seqs, _seq, _file_stamps, _last_check
+
+    now = time.monotonic()
+    with _lock:
+        if not force and _base_version is not None and now - _last_check < VERSION_CHECK_INTERVAL:
+            return
+        _last_check = now
+
+        stamps = (_stat(VERSION_FILE), _stat(TAGS_FILE))
+        if not force and _base_version is not None and stamps == _file_stamps:
+            return
+        _file_stamps = stamps
+
+        # Fallback to BUILD_TIMESTAMP (deployment time) or process start time
+        _base_version = _read_base_version() or os.getenv(
+            "BUILD_TIMESTAMP", _base_version or datetime.now().strftime("%Y%m%d_%H%M%S")
+        )
+        seq, tags = _read_tags()
+        if seq != _seq or tags != _tag_seqs:
+            _seq, _tag_seqs = seq, tags
+            _related_memo.clear()
+
+
+def get_base_version() -> str:
+    """Get the global cache version (changed only by bump_cache_version()).
+
+    Returns:
+        Cache version string (timestamp or BUILD_TIMESTAMP)
+    """
+    _refresh()
+    return _base_version
+
+
+def get_cache_version() -> str:
+    """Get the coarse cache version.
+
+    Changes on every global bump and on every tagged invalidation event, so
+    keys built from it behave like before tagged invalidation existed.
+
+    Returns:
+        Cache version string (timestamp or BUILD_TIMESTAMP, plus event sequence)
+    """
+    _refresh()
+    with _lock:
+        return _base_version if _seq == 0 else f"{_base_version}.{_seq}"
+
+
+def get_invalidation_seq() -> int:
+    """Sequence number of the latest tagged invalidation event (0 if none)."""
+    _refresh()
+    return _seq
+
+
+def get_tag_seq(tag: str) -> int:
+    """Sequence of the latest event related to a tag (0 if never invalidated)."""
+    _refresh()
+    with _lock:
+        seq = _related_memo.get(tag)
+        if seq is None:
+            seq = max((s for t, s in _tag_seqs.items() if tags_related(t, tag)), default=0)
+            _related_memo[tag] = seq
+        return seq
+
+
+def get_dependency_version(tags: Iterable[str]) -> str:
+    """Get a version string that changes only when one of ``tags`` is invalidated.
+
+    Args:
+        tags: Dependency tags of a cache entry
+
+    Returns:
+        Version combining the global version and the tags' event sequences
+    """
+    parts = [get_base_version()]
+    parts.extend(f"{tag}={get_tag_seq(tag)}" for tag in sorted(set(tags)))
+    return "|".join(parts)
+
+
+def tags_invalidated_since(seq: int) -> List[str]:
+    """Tags invalidated by events after sequence ``seq``."""
+    _refresh()
+    with _lock:
+        return [tag for tag, tag_seq in _tag_seqs.items() if tag_seq > seq]
+
+
+def invalidate(*tags: str) -> None:
+    """Publish an invalidation event for specific tags.
+
+    Only cache entries depending on related tags are invalidated. Safe to
+    call even if it fails - will just log a warning.
+
+    Args:
+        *tags: Tags built with cache_tag()
+    """
+    global _seq, _tag_seqs, _file_stamps
+
+    tags = [tag for tag in tags if tag]
+    if not tags:
+        return
+    try:
+        with _lock:
+            lock_file = open(str(TAGS_FILE) + ".lock", "w") if fcntl else None
+            try:
+                if lock_file:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                # Re-read under the lock so events from other processes aren't lost
+                seq, tag_seqs = _read_tags()
+                seq += 1
+                for tag in tags:
+                    tag_seqs[tag] = seq
+
+                tmp_path = TAGS_FILE.with_name(TAGS_FILE.name + ".tmp")
+                tmp_path.write_text(json.dumps({"seq": seq, "tags": tag_seqs}, sort_keys=True))
+                os.replace(tmp_path, TAGS_FILE)
+            finally:
+                if lock_file:
+                    lock_file.close()
+
+            _seq, _tag_seqs = seq, tag_seqs
+            _related_memo.clear()
+            _file_stamps = (_file_stamps[0], _stat(TAGS_FILE))
+        logger.info(f"Cache invalidated for: {', '.join(tags)}")
+    except Exception as e:
+        logger.warning(f"Failed to invalidate cache tags {tags}: {e}")
+        # Don't raise - cache invalidation failure shouldn't break the job
 
 
 def bump_cache_version() -> None:
     """Update cache version to current timestamp.
-    
-    Call this after updating portfolio data to invalidate Streamlit's cache.
+
+    Invalidates every cache entry. Prefer invalidate() with specific tags
+    after updating data; use this for manual "clear everything" actions.
     Safe to call even if it fails - will just log a warning.
     """
     try:
         new_version = datetime.now().isoformat()
         VERSION_FILE.write_text(new_version)
+        _refresh(force=True)
         logger.info(f"Cache version bumped to: {new_version}")
     except Exception as e:
         logger.warning(f"Failed to bump cache version: {e}")
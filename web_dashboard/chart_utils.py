@@ -25,6 +25,8 @@ from datetime import datetime, timedelta
 import colorsys
 import yfinance as yf
 from utils.market_holidays import MarketHolidays
+from cache_version import cache_tag, invalidate
+from flask_cache_utils import cache_data
 try:
     from log_handler import log_execution_time
 except ImportError:
@@ -324,6 +326,16 @@ def _add_weekend_shading(fig: go.Figure, start_date: datetime, end_date: datetim
             current_date += timedelta(days=1)
 
 
+@cache_data(ttl=3600, depends_on=[cache_tag("benchmark_data")])
+def _get_benchmark_rows(ticker: str, start_day: str, end_day: str) -> Optional[List[Dict]]:
+    """Cached benchmark_data rows for a date range (kept until the benchmark data is refreshed)"""
+    from streamlit_utils import get_supabase_client
+    client = get_supabase_client()
+    if not client:
+        return None
+    return client.get_benchmark_data(ticker, datetime.fromisoformat(start_day), datetime.fromisoformat(end_day))
+
+
 @log_execution_time()
 def _fetch_benchmark_data(ticker: str, start_date: datetime, end_date: datetime) -> Optional[pd.DataFrame]:
     """Fetch benchmark data with database caching.
@@ -341,7 +353,7 @@ def _fetch_benchmark_data(ticker: str, start_date: datetime, end_date: datetime)
             client = get_supabase_client()
             
             if client:
-                cached_data = client.get_benchmark_data(ticker, start_date, end_date)
+                cached_data = _get_benchmark_rows(ticker, start_date.date().isoformat(), end_date.date().isoformat())
                 
                 if cached_data and len(cached_data) > 0:
                     # Convert to DataFrame
@@ -416,7 +428,8 @@ def _fetch_benchmark_data(ticker: str, start_date: datetime, end_date: datetime)
                 
                 if 'Date' in available_cols and 'Close' in available_cols:
                     cache_rows = data[available_cols].to_dict('records')
-                    client.cache_benchmark_data(ticker, cache_rows)
+                    if client.cache_benchmark_data(ticker, cache_rows):
+                        invalidate(cache_tag("benchmark_data"))
                 else:
                     print(f"⚠️ Missing required columns for caching {ticker}")
         except Exception as cache_store_error:
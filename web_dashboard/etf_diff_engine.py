@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+ETF Holdings Diff Engine
+========================
+
+Vectorized change detection used by ``etf_watchtower_job`` ("The Diff
+Engine"). A whole day's ETFs are diffed as one concatenated frame:
+
+1. today's and the previous holdings of every ETF are outer-merged on
+   (etf, ticker) in a single merge
+2. share and percent changes, the significance thresholds and the
+   stock-ticker filter are computed once over all rows with NumPy and
+   precompiled patterns
+3. systematic adjustments are detected per ETF from a histogram of the
+   absolute percent changes in 0.1% bins
+
+The output per ETF is the same list of change records the row-by-row engine
+produced, in the same order.
+"""
+
+import logging
+import re
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Thresholds for "significant" changes
+MIN_SHARE_CHANGE = 1000  # Minimum absolute share change to log
+MIN_PERCENT_CHANGE = 0.5  # Minimum % change relative to previous holdings
+
+# Systematic Adjustment Detection
+# ===============================
+# The change detection logic filters out systematic adjustments (e.g., expense ratio deductions)
+# that affect all holdings proportionally. These are NOT trading activity.
+#
+# A systematic adjustment is detected when:
+# 1. 80%+ of changes cluster around the same percentage (within 0.1%)
+# 2. That percentage is ≤2% (small adjustments, not large trades)
+# 3. All changes are in the same direction (all buys OR all sells)
+#
+# Examples of systematic adjustments:
+# - Expense ratio deductions (~0.5% annually, applied proportionally)
+# - Data normalization/rounding adjustments
+# - Systematic rebalancing calculations
+#
+# Real trading activity shows:
+# - Different percentages for different holdings
+# - Mixed buys and sells
+# - New positions added / old positions removed
+# - Varied change patterns
+SYSTEMATIC_MIN_CHANGES = 5  # Need more changes than this to detect a pattern
+SYSTEMATIC_CLUSTER_SHARE = 0.8
+SYSTEMATIC_MAX_PERCENT = 2.0
+
+# Tickers to exclude from change detection (cash, futures, derivatives, etc.)
+# These are valid holdings but not actionable stock signals
+EXCLUDED_TICKERS = {
+    # Cash and cash equivalents
+    'USD', 'CASH', 'CASHCOLLATERAL', 'MARGIN_CASH', 'MONEY_MARKET',
+    # Futures and derivatives
+    'XTSLA', 'MSFUT', 'SGAFT', 'ESH6', 'ESH5', 'ESM6', 'ESU6', 'ESZ6',
+    'NQH6', 'NQM6', 'NQU6', 'NQZ6', 'RTY', 'RTYM6', 'SPY_FUT',
+    'ETD_USD', 'FUT', 'SWAP', 'FWD',
+    # Treasury/bonds (often in ETFs but not stock signals)
+    'TBILL', 'USINTR', 'BIL',
+}
+
+# Patterns that indicate non-stock holdings
+EXCLUDED_TICKER_PATTERNS = [
+    'FUT',   # Futures
+    '_USD',  # USD-denominated derivatives
+    'SWAP',  # Swaps
+    'FWD',   # Forwards
+]
+
+_EXCLUDED_PATTERN_RE = re.compile('|'.join(re.escape(pattern) for pattern in EXCLUDED_TICKER_PATTERNS))
+_MAX_TICKER_LENGTH = 10
+
+# Private key column for the combined merge
+_ETF = '_etf'
+
+
+def is_stock_ticker(ticker: str) -> bool:
+    """Check if a ticker represents a tradeable stock (not cash/futures/derivatives).
+
+    Args:
+        ticker: Ticker symbol
+
+    Returns:
+        True if it's a stock ticker, False if it should be excluded
+    """
+    if not ticker or not isinstance(ticker, str):
+        return False
+
+    ticker_upper = ticker.upper().strip()
+
+    # Check explicit exclusions
+    if ticker_upper in EXCLUDED_TICKERS:
+        return False
+
+    # Check patterns
+    if _EXCLUDED_PATTERN_RE.search(ticker_upper):
+        return False
+
+    # Exclude tickers that are just numbers (often futures contracts)
+    if ticker_upper.isdigit():
+        return False
+
+    # Exclude very long tickers (usually derivatives or internal codes)
+    if len(ticker_upper) > _MAX_TICKER_LENGTH:
+        return False
+
+    return True
+
+
+def stock_ticker_mask(tickers: pd.Series) -> np.ndarray:
+    """Vectorized is_stock_ticker.
+
+    Returns:
+        Boolean array, True where the ticker is a stock
+    """
+    if not (pd.api.types.is_object_dtype(tickers) or pd.api.types.is_string_dtype(tickers)):
+        return np.zeros(len(tickers), dtype=bool)
+
+    # Non-string values become NaN here and compare as False below
+    upper = tickers.str.upper().str.strip()
+    mask = upper.notna() & tickers.ne('')
+    mask &= ~upper.isin(EXCLUDED_TICKERS)
+    mask &= ~upper.str.contains(_EXCLUDED_PATTERN_RE, na=False)
+    mask &= ~upper.str.isdigit().eq(True)
+    mask &= upper.str.len().le(_MAX_TICKER_LENGTH)
+    return mask.to_numpy(dtype=bool)
+
+
+def percent_bins(percent_change: np.ndarray) -> np.ndarray:
+    """Absolute percent changes in 0.1% bins, i.e. ``round(abs(x), 1) * 10``.
+
+    Matches Python's round() exactly: x * 10 only lands on .5 after
+    floating-point rounding when the true value is at or next to a tie, and
+    those few values are rounded individually.
+    """
+    scaled = np.abs(np.asarray(percent_change, dtype=float)) * 10
+    bins = np.rint(scaled)
+    for i in np.flatnonzero(scaled - np.floor(scaled) == 0.5):
+        bins[i] = round(round(abs(float(percent_change[i])), 1) * 10)
+    return bins.astype(np.int64)
+
+
+def systematic_adjustment(share_diff: np.ndarray, percent_change: np.ndarray) -> Optional[Tuple[float, int]]:
+    """Detect a systematic adjustment among one ETF's significant changes.
+
+    Returns:
+        (clustered percentage, number of changes in the cluster), or None if
+        the changes look like real trading
+    """
+    count = len(share_diff)
+    if count <= SYSTEMATIC_MIN_CHANGES:
+        return None
+
+    bins, bin_counts = np.unique(percent_bins(percent_change), return_counts=True)
+    top = bin_counts.argmax()
+    # An 80% cluster is necessarily the unique mode, so ties don't matter
+    if bin_counts[top] < count * SYSTEMATIC_CLUSTER_SHARE or bins[top] > SYSTEMATIC_MAX_PERCENT * 10:
+        return None
+    if not ((share_diff > 0).all() or (share_diff < 0).all()):
+        return None
+    return bins[top] / 10, int(bin_counts[top])
+
+
+def _combine(frames: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate per-ETF frames with the ETF ticker as a key column."""
+    combined = pd.concat(frames.values(), keys=list(frames), names=[_ETF, None], sort=False)
+    return combined.reset_index(level=0).reset_index(drop=True)
+
+
+def _merge_columns(today: pd.DataFrame, yesterday: pd.DataFrame, overlap: set) -> List[Tuple[str, str]]:
+    """Columns a per-ETF merge on ticker would have, paired with their name in the combined merge.
+
+    A merge keeps the left columns in order, then the right ones without the
+    key; columns on both sides get the _now/_prev suffixes.
+    """
+    columns = []
+    for col in today.columns:
+        if col == 'ticker':
+            columns.append(('ticker', 'ticker'))
+        else:
+            columns.append((f"{col}_now" if col in yesterday.columns else col, f"{col}_now" if col in overlap else col))
+    for col in yesterday.columns:
+        if col != 'ticker':
+            columns.append((f"{col}_prev" if col in today.columns else col, f"{col}_prev" if col in overlap else col))
+    return columns
+
+
+def calculate_diffs(today: Dict[str, pd.DataFrame], previous: Dict[str, pd.DataFrame]) -> Dict[str, List[Dict]]:
+    """Calculate significant holding changes for many ETFs at once.
+
+    Args:
+        today: Today's holdings DataFrame by ETF ticker
+        previous: Previous holdings DataFrame by ETF ticker (missing ETFs are
+            compared against no holdings)
+
+    Returns:
+        List of dicts with significant changes by ETF ticker (filtered to
+        stocks only, excluding systematic adjustments)
+    """
+    if not today:
+        return {}
+    empty = pd.DataFrame(columns=['ticker', 'shares', 'weight_percent'])
+    previous = {etf: previous.get(etf, empty) for etf in today}
+
+    now = _combine(today)
+    prev = _combine(previous)
+    # PostgreSQL returns NUMERIC as Decimal; convert once for the whole day
+    if 'shares' in prev.columns and prev['shares'].dtype != np.float64:
+        prev['shares'] = pd.to_numeric(prev['shares'], errors='coerce').astype(float)
+
+    merged = now.merge(prev, on=[_ETF, 'ticker'], how='outer', suffixes=('_now', '_prev'))
+
+    shares_now = pd.to_numeric(merged['shares_now'], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+    shares_prev = pd.to_numeric(merged['shares_prev'], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+    shares_now = np.nan_to_num(shares_now, nan=0.0, posinf=np.inf, neginf=-np.inf)
+    shares_prev = np.nan_to_num(shares_prev, nan=0.0, posinf=np.inf, neginf=-np.inf)
+    share_diff = shares_now - shares_prev
+    with np.errstate(divide='ignore', invalid='ignore'):
+        percent_change = (share_diff / shares_prev) * 100
+    percent_change[np.isinf(percent_change)] = 100
+
+    merged['shares_now'] = shares_now
+    merged['shares_prev'] = shares_prev
+    merged['share_diff'] = share_diff
+    merged['percent_change'] = percent_change
+
+    # Filter for significant changes, then out non-stock tickers (cash, futures, derivatives)
+    significant = (np.abs(share_diff) >= MIN_SHARE_CHANGE) | (np.abs(percent_change) >= MIN_PERCENT_CHANGE)
+    stocks = significant & stock_ticker_mask(merged['ticker'])
+
+    etf_keys = merged[_ETF].to_numpy()
+    holdings_count = pd.Series(etf_keys).value_counts()
+    significant_count = pd.Series(etf_keys[significant]).value_counts()
+
+    overlap = (set(now.columns) & set(prev.columns)) - {_ETF, 'ticker'}
+    diffs = {}
+    for etf_ticker, rows in pd.Series(np.flatnonzero(stocks)).groupby(etf_keys[stocks], sort=False):
+        diffs[etf_ticker] = rows.to_numpy()
+
+    results = {}
+    for etf_ticker in today:
+        filtered_out = int(significant_count.get(etf_ticker, 0)) - len(diffs.get(etf_ticker, ()))
+        if filtered_out > 0:
+            logger.info(f"🔍 {etf_ticker}: Filtered out {filtered_out} non-stock changes (cash/futures/derivatives)")
+
+        rows = diffs.get(etf_ticker)
+        if rows is None:
+            logger.info(f"📊 {etf_ticker}: No significant stock changes after filtering")
+            results[etf_ticker] = []
+            continue
+
+        systematic = systematic_adjustment(share_diff[rows], percent_change[rows])
+        if systematic:
+            pct, clustered = systematic
+            logger.info(f"🔍 {etf_ticker}: Detected systematic adjustment ({clustered}/{len(rows)} changes at ~{pct:.1f}%) - filtering out")
+            results[etf_ticker] = []
+            continue
+
+        columns = _merge_columns(today[etf_ticker], previous[etf_ticker], overlap)
+        changes = merged.iloc[rows][[source for _, source in columns]]
+        changes.columns = [col for col, _ in columns]
+        changes = changes.assign(
+            share_diff=share_diff[rows],
+            percent_change=percent_change[rows],
+            etf=etf_ticker,
+            action=np.where(share_diff[rows] > 0, 'BUY', 'SELL'),
+        )
+
+        logger.info(f"📊 {etf_ticker}: Found {len(rows)} significant stock changes out of {int(holdings_count[etf_ticker])} holdings")
+        results[etf_ticker] = changes.to_dict('records')
+
+    return results
+
+
+def calculate_diff(today: pd.DataFrame, yesterday: pd.DataFrame, etf_ticker: str) -> List[Dict]:
+    """Calculate significant holding changes.
+
+    Args:
+        today: Today's holdings DataFrame
+        yesterday: Yesterday's holdings DataFrame
+        etf_ticker: ETF ticker for logging
+
+    Returns:
+        List of dicts with significant changes (filtered to stocks only, excluding systematic adjustments)
+    """
+    return calculate_diffs({etf_ticker: today}, {etf_ticker: yesterday})[etf_ticker]
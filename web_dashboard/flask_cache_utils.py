@@ -22,16 +22,23 @@ Features:
     - TTL-based expiration (like Streamlit's ttl parameter)
     - Automatic cache key generation from function arguments
     - Cache version support (for manual invalidation)
+    - Tagged invalidation: entries declare dependencies (depends_on=...) and
+      are evicted only when a job invalidates a related tag (see cache_version)
     - Multiple backend support (SimpleCache, Redis, Memcached)
     - Thread-safe caching
 """
 
 import hashlib
+import inspect
 import json
 import logging
+import os
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from functools import wraps
-from typing import Any, Callable, Optional, Dict
+from typing import Any, Callable, Optional, Dict, Iterable, List, Set, Tuple, Union
 from flask import current_app, has_app_context
 
 logger = logging.getLogger(__name__)
@@ -46,7 +53,10 @@ except ImportError:
 
 # Import cache version system for invalidation
 try:
-    from cache_version import get_cache_version
+    from cache_version import (
+        get_base_version, get_cache_version, get_dependency_version,
+        get_invalidation_seq, tags_invalidated_since, tags_related
+    )
     CACHE_VERSION_AVAILABLE = True
 except ImportError:
     CACHE_VERSION_AVAILABLE = False
@@ -214,6 +224,125 @@ def _make_cache_key(func_name: str, args: tuple, kwargs: dict, cache_version: Op
     return hashlib.sha256(full_key.encode()).hexdigest()
 
 
+# Index tag for entries without declared dependencies (invalidated by any event)
+ALL_TAGS = "*"
+
+# Dependencies: static tags, or a callable taking the call's arguments by name
+DependsOn = Union[Iterable[str], Callable[..., Iterable[str]]]
+
+# Most keys the tag index tracks; the oldest are dropped beyond this. An
+# untracked key is only missed for early eviction, it still expires by TTL
+# and can't be served stale (keys embed their dependency versions).
+TAG_INDEX_MAX_KEYS = int(os.getenv("CACHE_TAG_INDEX_MAX_KEYS", "20000"))
+
+# Seconds between sweeps of TTL-expired keys out of the tag index
+TAG_INDEX_PRUNE_INTERVAL = 60
+
+# tag -> cache keys stored under it, for evicting only affected entries
+_tag_index: Dict[str, Set[str]] = {}
+# cache key -> (expires_at or None, tags), oldest registration first
+_indexed_keys: "OrderedDict[str, Tuple[Optional[float], Tuple[str, ...]]]" = OrderedDict()
+_tag_index_lock = threading.Lock()
+_last_index_prune = 0.0
+_seen_invalidation: Optional[tuple] = None  # (base version, event seq) last processed
+
+
+def _forget_cache_key(cache_key: str) -> None:
+    """Drop a key from the tag index (caller holds _tag_index_lock)."""
+    entry = _indexed_keys.pop(cache_key, None)
+    if entry is None:
+        return
+    for tag in entry[1]:
+        keys = _tag_index.get(tag)
+        if keys is not None:
+            keys.discard(cache_key)
+            if not keys:
+                del _tag_index[tag]
+
+
+def _register_cache_key(cache_key: str, tags: Optional[List[str]], ttl: Optional[int] = None) -> None:
+    """Remember which tags a stored cache key depends on until it expires."""
+    global _last_index_prune
+    now = time.time()
+    with _tag_index_lock:
+        _forget_cache_key(cache_key)
+        tags = tuple(tags or [ALL_TAGS])
+        _indexed_keys[cache_key] = (now + ttl if ttl else None, tags)
+        for tag in tags:
+            _tag_index.setdefault(tag, set()).add(cache_key)
+        
+        if now - _last_index_prune >= TAG_INDEX_PRUNE_INTERVAL:
+            _last_index_prune = now
+            expired = [key for key, (expires_at, _) in _indexed_keys.items()
+                       if expires_at is not None and expires_at <= now]
+            for key in expired:
+                _forget_cache_key(key)
+        while len(_indexed_keys) > TAG_INDEX_MAX_KEYS:
+            _forget_cache_key(next(iter(_indexed_keys)))
+
+
+def _evict_invalidated(cache) -> int:
+    """Delete cache keys whose tags were invalidated since the last check.
+    
+    Keys also embed their dependency versions, so this only frees memory
+    early; correctness doesn't depend on it (e.g. with a shared Redis cache
+    and several processes).
+    
+    Returns:
+        Number of keys evicted
+    """
+    global _seen_invalidation
+    if not CACHE_VERSION_AVAILABLE:
+        return 0
+    try:
+        current = (get_base_version(), get_invalidation_seq())
+    except Exception:
+        return 0
+    if current == _seen_invalidation:
+        return 0
+    
+    with _tag_index_lock:
+        previous = _seen_invalidation
+        _seen_invalidation = current
+        if previous is None:
+            return 0
+        if previous[0] != current[0]:
+            # Global bump: everything is stale
+            stale_tags = list(_tag_index)
+        else:
+            events = tags_invalidated_since(previous[1])
+            stale_tags = [
+                tag for tag in _tag_index
+                if tag == ALL_TAGS or any(tags_related(tag, event) for event in events)
+            ]
+        stale_keys = set()
+        for tag in stale_tags:
+            stale_keys.update(_tag_index.get(tag, ()))
+        for cache_key in stale_keys:
+            _forget_cache_key(cache_key)
+    
+    for cache_key in stale_keys:
+        try:
+            cache.delete(cache_key)
+        except Exception as cache_error:
+            logger.debug(f"Cache delete error during invalidation: {cache_error}")
+    if stale_keys:
+        logger.debug(f"Evicted {len(stale_keys)} cache entries for invalidated tags {stale_tags}")
+    return len(stale_keys)
+
+
+def _resolve_tags(depends_on: Optional[DependsOn], signature: Optional[inspect.Signature],
+                  args: tuple, kwargs: dict) -> Optional[List[str]]:
+    """Work out a call's dependency tags (None if the function declares none)."""
+    if depends_on is None:
+        return None
+    if not callable(depends_on):
+        return list(depends_on)
+    bound = signature.bind_partial(*args, **kwargs)
+    bound.apply_defaults()
+    return [tag for tag in depends_on(**bound.arguments) if tag]
+
+
 def _get_cache_ttl() -> int:
     """Get cache TTL based on market hours (reuses logic from streamlit_utils).
     
@@ -252,7 +381,8 @@ def _get_cache_ttl() -> int:
             return 3600  # 1 hour outside market hours
 
 
-def cache_data(ttl: Optional[int] = None, show_spinner: bool = False, use_market_hours: bool = False):
+def cache_data(ttl: Optional[int] = None, show_spinner: bool = False, use_market_hours: bool = False,
+               depends_on: Optional[DependsOn] = None):
     """
     Decorator for caching function results (similar to @st.cache_data).
     
@@ -261,6 +391,12 @@ def cache_data(ttl: Optional[int] = None, show_spinner: bool = False, use_market
              If use_market_hours=True, this parameter is ignored and TTL is calculated dynamically.
         show_spinner: Not used in Flask (no UI spinner), kept for API compatibility.
         use_market_hours: If True, use market-hours-aware TTL (300s during market hours, 3600s outside).
+        depends_on: Data the result depends on, as cache_version tags. Either a
+             list of tags or a callable receiving the call's arguments by name
+             and returning tags. Entries are then invalidated only by related
+             cache_version.invalidate() events (and global bumps), and any
+             _cache_version argument is ignored. Without it, every
+             invalidation event invalidates the entry.
     
     Usage:
         @cache_data(ttl=300)  # Cache for 5 minutes (static)
@@ -270,12 +406,26 @@ def cache_data(ttl: Optional[int] = None, show_spinner: bool = False, use_market
         @cache_data(use_market_hours=True)  # Dynamic TTL based on market hours
         def get_portfolio_data(fund: str):
             return fetch_portfolio(fund)
+        
+        @cache_data(ttl=300, depends_on=lambda fund, **_: [cache_tag("portfolio_positions", fund)])
+        def get_positions(fund: str):
+            return fetch_positions(fund)
     """
     def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func) if callable(depends_on) else None
+        
+        def _key_for(args: tuple, kwargs: dict):
+            """Cache key and dependency tags for a call (kwargs without _cache_version)."""
+            cache_version = kwargs.pop('_cache_version', None)
+            tags = _resolve_tags(depends_on, signature, args, kwargs)
+            if tags is not None and CACHE_VERSION_AVAILABLE:
+                cache_version = get_dependency_version(tags)
+            return _make_cache_key(func.__name__, args, kwargs, cache_version), tags
+        
         @wraps(func)
         def wrapper(*args, **kwargs):
             # Extract cache_version from kwargs if present (for manual invalidation)
-            cache_version = kwargs.pop('_cache_version', None)
+            cache_key, tags = _key_for(args, kwargs)
             
             # Determine TTL
             if use_market_hours:
@@ -283,11 +433,9 @@ def cache_data(ttl: Optional[int] = None, show_spinner: bool = False, use_market
             else:
                 effective_ttl = ttl
             
-            # Generate cache key
-            cache_key = _make_cache_key(func.__name__, args, kwargs, cache_version)
-            
-            # Try to get from cache
+            # Try to get from cache (after dropping entries invalidated by jobs)
             cache = _get_cache()
+            _evict_invalidated(cache)
             # Flask-Caching: use cache.get() which returns None if not found
             try:
                 cached_value = cache.get(cache_key)
@@ -306,6 +454,7 @@ def cache_data(ttl: Optional[int] = None, show_spinner: bool = False, use_market
             # Store in cache
             try:
                 cache.set(cache_key, result, timeout=effective_ttl)
+                _register_cache_key(cache_key, tags, effective_ttl)
             except Exception as cache_error:
                 logger.warning(f"Cache set error for {func.__name__}: {cache_error}", exc_info=True)
                 # Continue without caching if cache.set fails
@@ -315,8 +464,7 @@ def cache_data(ttl: Optional[int] = None, show_spinner: bool = False, use_market
         # Add cache clearing method to function
         def clear_cache(*args, **kwargs):
             """Clear cache for this function with specific arguments."""
-            cache_version = kwargs.pop('_cache_version', None)
-            cache_key = _make_cache_key(func.__name__, args, kwargs, cache_version)
+            cache_key, _ = _key_for(args, kwargs)
             cache = _get_cache()
             cache.delete(cache_key)
         
@@ -412,6 +560,9 @@ def clear_all_caches():
     """Clear all cached data (useful for manual cache invalidation)."""
     cache = _get_cache()
     cache.clear()
+    with _tag_index_lock:
+        _tag_index.clear()
+        _indexed_keys.clear()
     logger.info("All caches cleared")
 
 
@@ -15,6 +15,9 @@ from datetime import datetime
 from supabase_client import SupabaseClient
 from flask_auth_utils import get_user_id_flask
 from flask_cache_utils import cache_data
+from cache_version import cache_tag
+from keyset_pagination import read_frame
+from portfolio_daily_totals import fetch_daily_totals, daily_value_series
 
 logger = logging.getLogger(__name__)
 
@@ -45,7 +48,7 @@ def get_supabase_client_flask() -> Optional[SupabaseClient]:
         return None
 
 
-@cache_data(ttl=300)
+@cache_data(ttl=300, depends_on=[cache_tag("funds")])
 def get_available_funds_flask() -> List[str]:
     """Get list of available funds for current Flask user (cached 5min)"""
     try:
@@ -75,15 +78,9 @@ def get_available_funds_flask() -> List[str]:
         return []
 
 
-@cache_data(ttl=300)
-def get_current_positions_flask(fund: Optional[str] = None, _cache_version: Optional[str] = None) -> pd.DataFrame:
-    """Get current positions for Flask (cached 5min, with cache_version support)"""
-    if _cache_version is None:
-        try:
-            from cache_version import get_cache_version
-            _cache_version = get_cache_version()
-        except ImportError:
-            _cache_version = ""
+@cache_data(ttl=300, depends_on=lambda fund, **_: [cache_tag("portfolio_positions", fund)])
+def get_current_positions_flask(fund: Optional[str] = None) -> pd.DataFrame:
+    """Get current positions for Flask (cached 5min, invalidated when the fund's positions change)"""
     client = get_supabase_client_flask()
     if not client:
         return pd.DataFrame()
@@ -148,15 +145,9 @@ def get_current_positions_flask(fund: Optional[str] = None, _cache_version: Opti
         return pd.DataFrame()
 
 
-@cache_data(ttl=None)  # Cache forever - historical trades don't change
-def get_trade_log_flask(limit: int = 1000, fund: Optional[str] = None, _cache_version: Optional[str] = None) -> pd.DataFrame:
-    """Get trade log for Flask (cached forever, with cache_version support)"""
-    if _cache_version is None:
-        try:
-            from cache_version import get_cache_version
-            _cache_version = get_cache_version()
-        except ImportError:
-            _cache_version = ""
+@cache_data(ttl=None, depends_on=lambda fund, **_: [cache_tag("trade_log", fund)])  # Cache until trades change
+def get_trade_log_flask(limit: int = 1000, fund: Optional[str] = None) -> pd.DataFrame:
+    """Get trade log for Flask (cached until the fund's trades change)"""
     client = get_supabase_client_flask()
     if not client:
         return pd.DataFrame()
@@ -178,15 +169,9 @@ def get_trade_log_flask(limit: int = 1000, fund: Optional[str] = None, _cache_ve
         return pd.DataFrame()
 
 
-@cache_data(ttl=300)
-def get_cash_balances_flask(fund: Optional[str] = None, _cache_version: Optional[str] = None) -> Dict[str, float]:
-    """Get cash balances by currency for Flask (cached 5min, with cache_version support)"""
-    if _cache_version is None:
-        try:
-            from cache_version import get_cache_version
-            _cache_version = get_cache_version()
-        except ImportError:
-            _cache_version = ""
+@cache_data(ttl=300, depends_on=lambda fund, **_: [cache_tag("cash_balances", fund)])
+def get_cash_balances_flask(fund: Optional[str] = None) -> Dict[str, float]:
+    """Get cash balances by currency for Flask (cached 5min, invalidated when the fund's cash changes)"""
     client = get_supabase_client_flask()
     if not client:
         return {"CAD": 0.0, "USD": 0.0}
@@ -233,7 +218,7 @@ def get_cash_balances_flask(fund: Optional[str] = None, _cache_version: Optional
         return {"CAD": 0.0, "USD": 0.0}
 
 
-@cache_data(ttl=3600)  # Cache for 1 hour - thesis changes infrequently
+@cache_data(ttl=3600, depends_on=lambda fund_name, **_: [cache_tag("fund_thesis", fund_name)])  # Thesis changes infrequently
 def get_fund_thesis_data_flask(fund_name: str) -> Optional[Dict[str, Any]]:
     """Get thesis data for a fund from the database view (Flask version, cached 1hr)"""
     client = get_supabase_client_flask()
@@ -378,8 +363,66 @@ def calculate_performance_metrics_flask(fund: Optional[str] = None) -> Dict[str,
         }
 
 
-@cache_data(ttl=300)
-def calculate_portfolio_value_over_time_flask(fund: str, days: Optional[int] = None, display_currency: Optional[str] = None, _cache_version: Optional[str] = None) -> pd.DataFrame:
+def _daily_totals_from_positions(client: SupabaseClient, fund: Optional[str], cutoff_date: Optional[datetime]) -> Optional[pd.DataFrame]:
+    """Aggregate daily totals client-side from every portfolio_positions row.
+    
+    Fallback for when the get_portfolio_daily_totals RPC is unavailable.
+    Returns None if there are no positions.
+    """
+    # Query with base columns (keyset-paginated, no row cap)
+    filters = []
+    if fund and fund.lower() != 'all':
+        filters.append(("eq", "fund", fund))
+    if cutoff_date:
+        filters.append(("gte", "date", cutoff_date.strftime('%Y-%m-%dT%H:%M:%SZ')))
+    
+    df = read_frame(
+        client.supabase,
+        "portfolio_positions",
+        ["date", "total_value", "cost_basis", "pnl", "fund", "currency",
+         "total_value_base", "cost_basis_base", "pnl_base", "base_currency"],
+        filters
+    )
+    
+    if df.empty:
+        return None
+    
+    df['date'] = pd.to_datetime(df['date']).dt.normalize() + pd.Timedelta(hours=12)
+    
+    # Check for pre-converted values
+    has_preconverted = False
+    if 'total_value_base' in df.columns:
+        preconverted_pct = df['total_value_base'].notna().mean()
+        has_preconverted = preconverted_pct > 0.8
+        
+    if has_preconverted:
+        value_col = 'total_value_base'
+        cost_col = 'cost_basis_base'
+        pnl_col = 'pnl_base'
+    else:
+        # FALLBACK: Runtime conversion (simplified for Flask - could add rate fetching if needed)
+        # For now, warn and use raw values if mixed (this was the bug, but at least we try base cols first)
+        # Ideally we port the rate fetching logic here too, but base cols should exist.
+        value_col = 'total_value'
+        cost_col = 'cost_basis'
+        pnl_col = 'pnl'
+        
+    # Aggregate
+    daily_totals = df.groupby(df['date'].dt.date).agg({
+        value_col: 'sum',
+        cost_col: 'sum',
+        pnl_col: 'sum'
+    }).reset_index()
+    
+    daily_totals.columns = ['date', 'value', 'cost_basis', 'pnl']
+    daily_totals['date'] = pd.to_datetime(daily_totals['date'])
+    daily_totals = daily_totals.sort_values('date').reset_index(drop=True)
+    
+    return daily_totals
+
+
+@cache_data(ttl=300, depends_on=lambda fund, **_: [cache_tag("portfolio_positions", fund)])
+def calculate_portfolio_value_over_time_flask(fund: str, days: Optional[int] = None, display_currency: Optional[str] = None) -> pd.DataFrame:
     """Calculate portfolio value over time (Flask version - Robust)
     
     Match Streamlit implementation:
@@ -388,13 +431,6 @@ def calculate_portfolio_value_over_time_flask(fund: str, days: Optional[int] = N
     - Normalizes performance index to start at 100
     - Uses authenticated client (RLS safe)
     """
-    if _cache_version is None:
-        try:
-            from cache_version import get_cache_version
-            _cache_version = get_cache_version()
-        except ImportError:
-            _cache_version = ""
-            
     client = get_supabase_client_flask()
     if not client:
         return pd.DataFrame()
@@ -412,69 +448,17 @@ def calculate_portfolio_value_over_time_flask(fund: str, days: Optional[int] = N
         if days is not None and days > 0:
             cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
         
-        # Query with base columns
-        all_rows = []
-        batch_size = 1000
-        offset = 0
-        
-        while True:
-            query = client.supabase.table("portfolio_positions").select(
-                "date, total_value, cost_basis, pnl, fund, currency, total_value_base, cost_basis_base, pnl_base, base_currency"
-            )
-            
-            if fund and fund.lower() != 'all':
-                query = query.eq("fund", fund)
-            
-            if cutoff_date:
-                query = query.gte("date", cutoff_date.strftime('%Y-%m-%dT%H:%M:%SZ'))
-            
-            result = query.order("date").order("id").range(offset, offset + batch_size - 1).execute()
-            
-            rows = result.data
-            if not rows:
-                break
-                
-            all_rows.extend(rows)
-            if len(rows) < batch_size:
-                break
-            offset += batch_size
-            if offset > 50000:
-                break
-                
-        if not all_rows:
-            return pd.DataFrame()
-            
-        df = pd.DataFrame(all_rows)
-        df['date'] = pd.to_datetime(df['date']).dt.normalize() + pd.Timedelta(hours=12)
-        
-        # Check for pre-converted values
-        has_preconverted = False
-        if 'total_value_base' in df.columns:
-            preconverted_pct = df['total_value_base'].notna().mean()
-            has_preconverted = preconverted_pct > 0.8
-            
-        if has_preconverted:
-            value_col = 'total_value_base'
-            cost_col = 'cost_basis_base'
-            pnl_col = 'pnl_base'
+        # Per-day totals computed in the database (one row per day)
+        fund_filter = fund if fund and fund.lower() != 'all' else None
+        totals = fetch_daily_totals(client.supabase, fund_filter, cutoff_date)
+        if totals is not None:
+            if totals.empty:
+                return pd.DataFrame()
+            daily_totals, _ = daily_value_series(totals)
         else:
-            # FALLBACK: Runtime conversion (simplified for Flask - could add rate fetching if needed)
-            # For now, warn and use raw values if mixed (this was the bug, but at least we try base cols first)
-            # Ideally we port the rate fetching logic here too, but base cols should exist.
-            value_col = 'total_value'
-            cost_col = 'cost_basis'
-            pnl_col = 'pnl'
-            
-        # Aggregate
-        daily_totals = df.groupby(df['date'].dt.date).agg({
-            value_col: 'sum',
-            cost_col: 'sum',
-            pnl_col: 'sum'
-        }).reset_index()
-        
-        daily_totals.columns = ['date', 'value', 'cost_basis', 'pnl']
-        daily_totals['date'] = pd.to_datetime(daily_totals['date'])
-        daily_totals = daily_totals.sort_values('date').reset_index(drop=True)
+            daily_totals = _daily_totals_from_positions(client, fund, cutoff_date)
+            if daily_totals is None:
+                return pd.DataFrame()
         
         # Performance calculation
         daily_totals['performance_pct'] = np.where(
@@ -507,7 +491,7 @@ def calculate_portfolio_value_over_time_flask(fund: str, days: Optional[int] = N
         return pd.DataFrame()
 
 
-@cache_data(ttl=300)
+@cache_data(ttl=300, depends_on=lambda fund, **_: [cache_tag("dividend_log", fund)])
 def _fetch_dividend_log_flask_cached(days_lookback: int = 365, fund: Optional[str] = None, user_id: Optional[str] = None) -> List[Dict[str, Any]]:
     """
     Internal cached function for fetching dividend log.
@@ -561,7 +545,7 @@ def fetch_dividend_log_flask(days_lookback: int = 365, fund: Optional[str] = Non
     return _fetch_dividend_log_flask_cached(days_lookback=days_lookback, fund=fund, user_id=user_id)
 
 
-@cache_data(ttl=300)
+@cache_data(ttl=300, depends_on=lambda fund, **_: [cache_tag("portfolio_positions", fund)])
 def get_individual_holdings_performance_flask(fund: str, days: int = 7) -> pd.DataFrame:
     """Get performance data for individual holdings in a fund.
     
@@ -591,45 +575,23 @@ def get_individual_holdings_performance_flask(fund: str, days: int = 7) -> pd.Da
         else:
             cutoff_str = None  # All time
         
-        # Fetch position data with pagination - join with securities for sector/industry/currency
-        all_rows = []
-        batch_size = 1000
-        offset = 0
-        
-        while True:
-            # Optimization: Don't join securities here - fetching sector/industry for 36k+ rows is wasteful
-            # Fetch base data only, then batch fetch securities metadata once for unique tickers
-            query = client.supabase.table("portfolio_positions").select(
-                "ticker, date, shares, price, total_value, currency"
-            )
-            
-            query = query.eq("fund", fund)
-            
-            if cutoff_str:
-                query = query.gte("date", f"{cutoff_str}T00:00:00")
-            
-            result = query.order("date").range(offset, offset + batch_size - 1).execute()
-            
-            rows = result.data
-            if not rows:
-                break
-            
-            all_rows.extend(rows)
-            
-            if len(rows) < batch_size:
-                break
-            
-            offset += batch_size
-            
-            # Safety break
-            if offset > 50000:
-                logger.warning("Reached 50,000 row safety limit")
-                break
+        # Fetch position data with keyset pagination (no row cap)
+        # Optimization: Don't join securities here - fetching sector/industry for 36k+ rows is wasteful
+        # Fetch base data only, then batch fetch securities metadata once for unique tickers
+        filters = [("eq", "fund", fund)]
+        if cutoff_str:
+            filters.append(("gte", "date", f"{cutoff_str}T00:00:00"))
+        
+        df = read_frame(
+            client.supabase,
+            "portfolio_positions",
+            ["ticker", "date", "shares", "price", "total_value", "currency"],
+            filters
+        )
         
-        if not all_rows:
+        if df.empty:
             return pd.DataFrame()
         
-        df = pd.DataFrame(all_rows)
         
         # Optimization: Batch fetch security metadata for unique tickers
         # This reduces payload size significantly (e.g. 1.8MB -> 5KB for 1 year history)
@@ -747,7 +709,7 @@ def get_individual_holdings_performance_flask(fund: str, days: int = 7) -> pd.Da
         return pd.DataFrame()
 
 
-@cache_data(ttl=3600)
+@cache_data(ttl=3600, depends_on=[cache_tag("exchange_rates")])
 def fetch_latest_rates_bulk_flask(currencies: List[str], target_currency: str) -> Dict[str, float]:
     """
     Fetch latest exchange rates (Flask version).
@@ -816,7 +778,7 @@ def fetch_latest_rates_bulk_flask(currencies: List[str], target_currency: str) -
         return {c: 1.0 for c in unique_currencies}
 
 
-@cache_data(ttl=300)
+@cache_data(ttl=300, depends_on=lambda fund=None, **_: [cache_tag("user_funds", fund)])
 def get_investor_count_flask(fund: Optional[str] = None) -> int:
     """Get number of unique investors (Flask version)"""
     client = get_supabase_client_flask()
@@ -835,7 +797,7 @@ def get_investor_count_flask(fund: Optional[str] = None) -> int:
         return 0
 
 
-@cache_data(ttl=3600)  # Cache for 1 hour, start date rarely changes
+@cache_data(ttl=3600, depends_on=lambda fund, **_: [cache_tag("trade_log", fund)])  # Start date rarely changes
 def get_portfolio_start_date_flask(fund: Optional[str] = None) -> Optional[str]:
     """Get the date of the very first trade (efficiently)"""
     client = get_supabase_client_flask()
@@ -859,7 +821,7 @@ def get_portfolio_start_date_flask(fund: Optional[str] = None) -> Optional[str]:
         return None
 
 
-@cache_data(ttl=300)
+@cache_data(ttl=300, depends_on=lambda fund, **_: [cache_tag("trade_log", fund)])
 def get_first_trade_dates_flask(fund: Optional[str] = None) -> Dict[str, datetime]:
     """Get first trade dates (Flask version)"""
     client = get_supabase_client_flask()
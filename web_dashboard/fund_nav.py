@@ -0,0 +1,435 @@
+"""
+Fund NAV Store
+==============
+
+Reads and maintains ``fund_nav_daily`` (migrations/add_fund_nav_daily.sql):
+one row per fund per day with the positions' value and cost basis in base
+currency, net contributions, units outstanding and NAV per unit.
+
+Contributor ownership (NAV/unit accounting) needs the fund's value on each
+contribution date. Computing it from portfolio_positions means reading every
+position since the first contribution and re-fetching exchange rates, which
+gets slower every day the fund exists. With the store, callers read only the
+rows for their contribution dates (``get_nav_history``).
+
+Rows are maintained incrementally: each day's row is derived from the
+previous row plus that day's positions and contributions (``next_nav_row``),
+so the price job appends one row per fund (``update_fund_nav``) and the
+backfill rebuilds from its start date onwards (``rebuild_fund_nav``).
+
+Unit accounting:
+- contributions/withdrawals since the previous row are issued/redeemed at
+  the previous row's NAV (1.0 while the fund has no units)
+- NAV = (total_value + net_contributions - cost_basis) / units_outstanding,
+  i.e. positions plus cash not yet invested
+"""
+
+import logging
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+FUND_NAV_TABLE = "fund_nav_daily"
+
+# Keep IN-lists short for URL length
+DATE_CHUNK = 100
+
+# Contribution dates without a row use the closest earlier row within this many days
+LOOKBACK_DAYS = 7
+
+DayLike = Union[str, date, datetime]
+
+
+def _day(value: DayLike) -> str:
+    """Normalize a date, datetime or ISO string to 'YYYY-MM-DD'."""
+    if isinstance(value, (date, datetime)):
+        return value.strftime('%Y-%m-%d')
+    return str(value)[:10]
+
+
+def _contribution_sort_key(record: Dict[str, Any]) -> str:
+    return str(record.get('timestamp') or '')
+
+
+def next_nav_row(
+    fund: str,
+    day: DayLike,
+    total_value: float,
+    cost_basis: float,
+    previous: Optional[Dict[str, Any]],
+    contributions: Iterable[Dict[str, Any]],
+    base_currency: Optional[str] = None
+) -> Dict[str, Any]:
+    """Derive a day's NAV row from the previous row.
+
+    Args:
+        fund: Fund name
+        day: Date of the row
+        total_value: Market value of the day's positions (base currency)
+        cost_basis: Cost basis of the day's positions (base currency)
+        previous: The fund's previous row, or None for the first row
+        contributions: fund_contributions records (amount, contribution_type)
+            dated after the previous row up to and including ``day``, in order
+        base_currency: Fund base currency
+
+    Returns:
+        Row dict ready to upsert into fund_nav_daily
+    """
+    units = float(previous['units_outstanding']) if previous else 0.0
+    net_contributions = float(previous['net_contributions']) if previous else 0.0
+    previous_nav = float(previous['nav_per_unit']) if previous and previous.get('nav_per_unit') else None
+    if not previous_nav or previous_nav <= 0 or units <= 0:
+        previous_nav = 1.0
+
+    for record in contributions:
+        amount = float(record.get('amount') or 0)
+        if str(record.get('contribution_type', 'CONTRIBUTION')).lower() == 'withdrawal':
+            units -= min(amount / previous_nav, units)
+            net_contributions -= amount
+        else:
+            units += amount / previous_nav
+            net_contributions += amount
+
+    fund_value = total_value + net_contributions - cost_basis
+    nav_per_unit = fund_value / units if units > 0 else None
+    if nav_per_unit is not None and nav_per_unit <= 0:
+        logger.error(f"NAV for {fund} on {_day(day)} is {nav_per_unit:.4f} <= 0 - check positions and contributions")
+
+    return {
+        'fund': fund,
+        'date': _day(day),
+        'base_currency': base_currency,
+        'total_value': round(total_value, 2),
+        'cost_basis': round(cost_basis, 2),
+        'net_contributions': round(net_contributions, 2),
+        'units_outstanding': round(units, 6),
+        'nav_per_unit': round(nav_per_unit, 6) if nav_per_unit is not None else None,
+    }
+
+
+def build_nav_rows(
+    fund: str,
+    daily_totals: Sequence[Tuple[DayLike, float, float]],
+    contributions: Sequence[Dict[str, Any]],
+    previous: Optional[Dict[str, Any]] = None,
+    base_currency: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Build consecutive NAV rows.
+
+    Args:
+        fund: Fund name
+        daily_totals: (day, total_value, cost_basis) per day with positions
+        contributions: The fund's contribution records (any order; only those
+            after ``previous`` are applied)
+        previous: Row before the first day, or None to start from inception
+        base_currency: Fund base currency
+
+    Returns:
+        One row per day, in date order
+    """
+    pending = sorted(contributions, key=_contribution_sort_key)
+    after = previous['date'] if previous else None
+    if after:
+        pending = [c for c in pending if _day(c.get('timestamp') or '') > after]
+
+    rows = []
+    index = 0
+    for day, total_value, cost_basis in sorted(daily_totals, key=lambda item: _day(item[0])):
+        day_str = _day(day)
+        start = index
+        while index < len(pending) and _day(pending[index].get('timestamp') or '') <= day_str:
+            index += 1
+        previous = next_nav_row(fund, day_str, total_value, cost_basis, previous,
+                                pending[start:index], base_currency)
+        rows.append(previous)
+    return rows
+
+
+def _fetch_contributions(supabase, fund: str) -> List[Dict[str, Any]]:
+    """All contribution records of a fund (small table - one row per transaction)."""
+    rows = []
+    offset = 0
+    while True:
+        result = supabase.table("fund_contributions")\
+            .select("amount, contribution_type, timestamp")\
+            .eq("fund", fund)\
+            .order("timestamp")\
+            .range(offset, offset + 999)\
+            .execute()
+        rows.extend(result.data or [])
+        if not result.data or len(result.data) < 1000:
+            return rows
+        offset += 1000
+
+
+def _previous_row(supabase, fund: str, before: str) -> Optional[Dict[str, Any]]:
+    result = supabase.table(FUND_NAV_TABLE)\
+        .select("*")\
+        .eq("fund", fund)\
+        .lt("date", before)\
+        .order("date", desc=True)\
+        .limit(1)\
+        .execute()
+    return result.data[0] if result.data else None
+
+
+def _has_rows_after(supabase, fund: str, day: str) -> bool:
+    result = supabase.table(FUND_NAV_TABLE)\
+        .select("date")\
+        .eq("fund", fund)\
+        .gt("date", day)\
+        .limit(1)\
+        .execute()
+    return bool(result.data)
+
+
+def _upsert_rows(supabase, rows: List[Dict[str, Any]]) -> None:
+    for i in range(0, len(rows), 1000):
+        supabase.table(FUND_NAV_TABLE).upsert(rows[i:i + 1000], on_conflict="fund,date").execute()
+
+
+def update_fund_nav(
+    supabase,
+    fund: str,
+    day: DayLike,
+    total_value: float,
+    cost_basis: float,
+    base_currency: Optional[str] = None
+) -> Dict[str, Any]:
+    """Append (or replace) a fund's row for one day.
+
+    Called by the price job with the totals of the positions it just wrote.
+    Costs one read of the previous row and the fund's contributions. Falls
+    back to rebuild_fund_nav() when the fund has no earlier row yet, or has
+    later rows that would otherwise be left inconsistent.
+
+    Args:
+        supabase: Service-role Supabase (postgrest) client
+        fund: Fund name
+        day: Date of the snapshot
+        total_value: Sum of the day's total_value_base
+        cost_basis: Sum of the day's cost_basis_base
+        base_currency: Fund base currency
+
+    Returns:
+        The row written for ``day`` (None if a rebuild didn't produce one)
+    """
+    day_str = _day(day)
+    previous = _previous_row(supabase, fund, day_str)
+    if previous is None or _has_rows_after(supabase, fund, day_str):
+        rows = rebuild_fund_nav(supabase, fund, day_str if previous else None, base_currency)
+        return next((row for row in rows if row['date'] == day_str), None)
+
+    rows = build_nav_rows(fund, [(day_str, total_value, cost_basis)],
+                          _fetch_contributions(supabase, fund), previous, base_currency)
+    _upsert_rows(supabase, rows)
+    logger.info(f"Fund NAV {fund} {day_str}: NAV {rows[0]['nav_per_unit']}, "
+                f"{rows[0]['units_outstanding']} units")
+    return rows[0]
+
+
+def rebuild_fund_nav(supabase, fund: str, start: Optional[DayLike] = None,
+                     base_currency: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Rebuild a fund's rows from ``start`` (or inception) to the latest snapshot.
+
+    Later rows depend on earlier ones through units outstanding, so a rebuild
+    always runs through the latest day rather than stopping at a range end.
+
+    Args:
+        supabase: Service-role Supabase (postgrest) client
+        fund: Fund name
+        start: First day to rebuild, or None for the whole history
+        base_currency: Fund base currency
+
+    Returns:
+        Rows written, in date order
+    """
+    start_str = _day(start) if start else None
+    previous = _previous_row(supabase, fund, start_str) if start_str else None
+    since = datetime.strptime(start_str, '%Y-%m-%d') if start_str else None
+
+    rows = build_nav_rows(fund, _daily_position_totals(supabase, fund, since, base_currency),
+                          _fetch_contributions(supabase, fund), previous, base_currency)
+    _upsert_rows(supabase, rows)
+
+    # Drop rows past the latest snapshot (e.g. positions deleted by a rebuild)
+    stale = supabase.table(FUND_NAV_TABLE).delete().eq("fund", fund)
+    if rows:
+        stale.gt("date", rows[-1]['date']).execute()
+    elif start_str:
+        stale.gte("date", start_str).execute()
+
+    logger.info(f"Rebuilt {len(rows)} fund NAV rows for {fund} from {start_str or 'inception'}")
+    return rows
+
+
+def _daily_position_totals(supabase, fund: str, since: Optional[datetime],
+                           base_currency: Optional[str] = None) -> List[Tuple[str, float, float]]:
+    """(day, total_value, cost_basis) per day with positions, in base currency.
+
+    Days where every position has pre-converted *_base values use the
+    database sums. Other days (older data) are summed per row, converting
+    rows without *_base values at that day's exchange rate; a day that
+    can't be converted is left out rather than stored with partial totals.
+    """
+    from portfolio_daily_totals import fetch_daily_totals
+
+    totals = fetch_daily_totals(supabase, fund, since)
+    if totals is None:
+        days = _converted_position_totals(supabase, fund, since, None, base_currency)
+    else:
+        complete = totals['preconverted_count'] >= totals['position_count']
+        days = {row.date.strftime('%Y-%m-%d'): (row.total_value_base, row.cost_basis_base)
+                for row in totals[complete].itertuples()}
+        partial = [d.strftime('%Y-%m-%d') for d in totals.loc[~complete, 'date']]
+        if partial:
+            logger.info(f"{len(partial)} day(s) of {fund} positions lack pre-converted values, converting per row")
+            converted = _converted_position_totals(
+                supabase, fund, datetime.strptime(partial[0], '%Y-%m-%d'), partial[-1], base_currency)
+            days.update((day, converted[day]) for day in partial if day in converted)
+    return [(day, float(value), float(cost)) for day, (value, cost) in sorted(days.items())]
+
+
+def _converted_position_totals(supabase, fund: str, since: Optional[datetime], until: Optional[str],
+                               base_currency: Optional[str]) -> Dict[str, Tuple[float, float]]:
+    """{day: (total_value, cost_basis)} summed per row in base currency.
+
+    Rows with *_base values use them; other rows are converted from their
+    own currency at the latest exchange rate on or before their day. Days
+    with a row that has no rate are dropped.
+    """
+    import pandas as pd
+    from keyset_pagination import read_frame
+
+    base = (base_currency or 'CAD').upper()
+    filters = [("eq", "fund", fund)]
+    if since:
+        filters.append(("gte", "date", since.strftime('%Y-%m-%dT%H:%M:%S')))
+    if until:
+        filters.append(("lt", "date", (datetime.strptime(until, '%Y-%m-%d') + timedelta(days=1)).strftime('%Y-%m-%d')))
+    df = read_frame(supabase, "portfolio_positions",
+                    ["date", "currency", "total_value", "cost_basis", "total_value_base", "cost_basis_base"], filters)
+    if df.empty:
+        return {}
+
+    df['day'] = df['date'].astype(str).str[:10]
+    df['currency'] = df['currency'].fillna(base).str.upper()
+    for column in ("total_value", "cost_basis", "total_value_base", "cost_basis_base"):
+        df[column] = pd.to_numeric(df[column], errors='coerce')
+
+    unconverted = df['total_value_base'].isna() | df['cost_basis_base'].isna()
+    pairs = df.loc[unconverted & (df['currency'] != base), ['day', 'currency']].drop_duplicates()
+    rates = _exchange_rates(supabase, pairs, base)
+    df['rate'] = [
+        rates.get((day, currency)) if missing and currency != base else 1.0
+        for day, currency, missing in zip(df['day'], df['currency'], unconverted, strict=True)
+    ]
+
+    missing_rate = df.loc[unconverted & df['rate'].isna(), 'day'].unique()
+    if len(missing_rate):
+        logger.warning(f"No exchange rate for {len(missing_rate)} day(s) of {fund} positions "
+                       f"({', '.join(sorted(missing_rate)[:5])}), not storing them")
+        df = df[~df['day'].isin(missing_rate)]
+
+    df['value'] = df['total_value_base'].where(~unconverted, df['total_value'] * df['rate'])
+    df['cost'] = df['cost_basis_base'].where(~unconverted, df['cost_basis'] * df['rate'])
+    grouped = df.groupby('day')[['value', 'cost']].sum()
+    return {day: (float(row.value), float(row.cost)) for day, row in grouped.iterrows()}
+
+
+def _exchange_rates(supabase, pairs, base: str) -> Dict[Tuple[str, str], float]:
+    """{(day, currency): rate to base} from exchange_rates, using the latest rate on or before the day."""
+    if pairs.empty:
+        return {}
+    first = (datetime.strptime(pairs['day'].min(), '%Y-%m-%d') - timedelta(days=LOOKBACK_DAYS)).strftime('%Y-%m-%d')
+    last = (datetime.strptime(pairs['day'].max(), '%Y-%m-%d') + timedelta(days=1)).strftime('%Y-%m-%d')
+
+    history: Dict[str, List[Tuple[str, float]]] = {}
+    for currency in pairs['currency'].unique():
+        series = {}
+        for from_currency, to_currency, invert in ((currency, base, False), (base, currency, True)):
+            result = supabase.table("exchange_rates")\
+                .select("timestamp, rate")\
+                .eq("from_currency", from_currency)\
+                .eq("to_currency", to_currency)\
+                .gte("timestamp", first)\
+                .lt("timestamp", last)\
+                .execute()
+            for row in result.data or []:
+                rate = float(row['rate'] or 0)
+                if rate:
+                    # A direct rate wins over an inverted one for the same day
+                    series.setdefault(str(row['timestamp'])[:10], 1.0 / rate if invert else rate)
+        history[currency] = sorted(series.items())
+
+    rates = {}
+    for day, currency in pairs.itertuples(index=False):
+        earlier = [rate for rate_day, rate in history[currency] if rate_day <= day]
+        if earlier:
+            rates[(day, currency)] = earlier[-1]
+    return rates
+
+
+def get_nav_history(
+    supabase,
+    fund: str,
+    dates: Iterable[DayLike]
+) -> Optional[Tuple[Dict[str, float], Dict[str, float]]]:
+    """Fund value and cost basis on specific dates, from fund_nav_daily.
+
+    Reads only the rows around the requested dates. A date without a row
+    (weekend, holiday) uses the closest earlier row within LOOKBACK_DAYS, or
+    the closest earlier row at all if none is that close.
+
+    Args:
+        supabase: Supabase (postgrest) client
+        fund: Fund name
+        dates: Dates to look up (e.g. contribution timestamps)
+
+    Returns:
+        ({date: total_value}, {date: cost_basis}) keyed by 'YYYY-MM-DD',
+        matching get_historical_fund_values(); None if the store has no rows
+        for the fund (or isn't available), so callers can fall back.
+    """
+    wanted = sorted({_day(d) for d in dates if d})
+    if not wanted:
+        return {}, {}
+
+    try:
+        window = set()
+        for day_str in wanted:
+            day_date = datetime.strptime(day_str, '%Y-%m-%d')
+            window.update((day_date - timedelta(days=back)).strftime('%Y-%m-%d') for back in range(LOOKBACK_DAYS + 1))
+        window = sorted(window)
+
+        rows = {}
+        for i in range(0, len(window), DATE_CHUNK):
+            result = supabase.table(FUND_NAV_TABLE)\
+                .select("date, total_value, cost_basis")\
+                .eq("fund", fund)\
+                .in_("date", window[i:i + DATE_CHUNK])\
+                .execute()
+            for row in result.data or []:
+                rows[_day(row['date'])] = row
+
+        values, cost_basis = {}, {}
+        for day_str in wanted:
+            day_date = datetime.strptime(day_str, '%Y-%m-%d')
+            earliest = _day(day_date - timedelta(days=LOOKBACK_DAYS))
+            closest = max((d for d in rows if earliest <= d <= day_str), default=None)
+            if closest is None:
+                row = _previous_row(supabase, fund, _day(day_date + timedelta(days=1)))
+                if row is None:
+                    continue
+                closest = _day(row['date'])
+                rows[closest] = row
+            values[day_str] = float(rows[closest]['total_value'])
+            cost_basis[day_str] = float(rows[closest]['cost_basis'])
+    except Exception as e:
+        logger.warning(f"Could not read {FUND_NAV_TABLE} for {fund}: {e}")
+        return None
+
+    if not values:
+        return None
+    return values, cost_basis
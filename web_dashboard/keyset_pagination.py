@@ -0,0 +1,145 @@
+"""
+Keyset Pagination
+=================
+
+Streaming reader for large Supabase tables such as ``portfolio_positions``.
+
+OFFSET pagination (``.range(offset, offset + 999)``) makes Postgres walk and
+discard every row before the offset, so each page is slower than the last.
+Keyset pagination orders by a unique key and asks for the rows after the
+last key seen, so page 200 costs the same as page 1 (given an index on the
+filter and key columns, e.g. ``(fund, date, id)``) and no row cap is needed.
+
+Used by SupabaseRepository.get_portfolio_data and the Flask chart/holdings
+queries in flask_data_utils.
+"""
+
+import logging
+from typing import Any, Dict, Iterator, List, Sequence, Tuple, Union
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Supabase returns at most 1000 rows per request
+PAGE_SIZE = 1000
+
+# Default keyset for portfolio_positions: date order, id breaks ties
+POSITION_KEY = ("date", "id")
+
+# (method, column, value) applied to the query, e.g. ("eq", "fund", "Project Chimera")
+Filter = Tuple[str, str, Any]
+
+
+def _requested_columns(columns: Union[str, Sequence[str]]) -> List[str]:
+    """Split a select string or list into column names."""
+    if isinstance(columns, str):
+        return [c.strip() for c in columns.split(",") if c.strip()]
+    return list(columns)
+
+
+def _quote(value: Any) -> str:
+    """Quote a value for a PostgREST logical filter (timestamps contain ':' and '+')."""
+    text = str(value).replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{text}"'
+
+
+def _after_filter(key: Sequence[str], last: Sequence[Any]) -> str:
+    """Build the PostgREST ``or`` filter for rows strictly after ``last``.
+
+    For key (date, id) this is ``date > d OR (date = d AND id > i)``.
+    """
+    clauses = []
+    for i, column in enumerate(key):
+        equal = [f"{key[j]}.eq.{_quote(last[j])}" for j in range(i)]
+        greater = f"{column}.gt.{_quote(last[i])}"
+        clauses.append(f"and({','.join(equal + [greater])})" if equal else greater)
+    return ",".join(clauses)
+
+
+def iter_pages(
+    supabase,
+    table: str,
+    columns: Union[str, Sequence[str]] = "*",
+    filters: Sequence[Filter] = (),
+    key: Sequence[str] = POSITION_KEY,
+    page_size: int = PAGE_SIZE
+) -> Iterator[List[Dict[str, Any]]]:
+    """Stream a table in pages using keyset pagination.
+
+    Args:
+        supabase: Supabase (postgrest) client, e.g. ``SupabaseClient().supabase``
+        table: Table or view name
+        columns: Columns to select ("*" or a list/comma-separated string).
+            Key columns are added to the projection if missing.
+        filters: (method, column, value) filters such as ("gte", "date", "2024-01-01")
+        key: Unique, non-null ordering key
+        page_size: Rows per request
+
+    Yields:
+        Lists of row dicts, in key order
+    """
+    requested = _requested_columns(columns)
+    if requested != ["*"]:
+        requested += [column for column in key if column not in requested]
+    select = ", ".join(requested)
+
+    last = None
+    pages = 0
+    while True:
+        query = supabase.table(table).select(select)
+        for method, column, value in filters:
+            query = getattr(query, method)(column, value)
+        if last is not None:
+            query = query.or_(_after_filter(key, last))
+        for column in key:
+            query = query.order(column)
+
+        rows = query.limit(page_size).execute().data or []
+        if not rows:
+            break
+
+        pages += 1
+        yield rows
+
+        if len(rows) < page_size:
+            break
+        last = tuple(rows[-1][column] for column in key)
+
+    logger.debug(f"Read {table} in {pages} keyset pages")
+
+
+def read_frame(
+    supabase,
+    table: str,
+    columns: Union[str, Sequence[str]] = "*",
+    filters: Sequence[Filter] = (),
+    key: Sequence[str] = POSITION_KEY,
+    page_size: int = PAGE_SIZE
+) -> pd.DataFrame:
+    """Read a table into a DataFrame, building it page by page.
+
+    Each page becomes a small frame as it arrives, so the full result is
+    never held as one large list of dicts. Key columns that were only added
+    for pagination are dropped.
+
+    Args:
+        Same as iter_pages()
+
+    Returns:
+        DataFrame of all matching rows (empty if none)
+    """
+    frames = [
+        pd.DataFrame.from_records(rows)
+        for rows in iter_pages(supabase, table, columns, filters, key, page_size)
+    ]
+    if not frames:
+        return pd.DataFrame()
+
+    df = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+
+    requested = _requested_columns(columns)
+    if requested != ["*"]:
+        added = [column for column in key if column not in requested and column in df.columns]
+        df = df.drop(columns=added)
+    return df
@@ -375,12 +375,24 @@ def get_deployment_timestamp() -> datetime:
     return None
 
 
+def _to_log_time(value: datetime) -> datetime:
+    """Convert a timestamp to the naive Pacific time the log lines are written in."""
+    if value is None or value.tzinfo is None:
+        return value
+    try:
+        from zoneinfo import ZoneInfo
+        return value.astimezone(ZoneInfo("America/Vancouver")).replace(tzinfo=None)
+    except Exception:
+        from datetime import timezone, timedelta
+        return value.astimezone(timezone(timedelta(hours=-8))).replace(tzinfo=None)
+
+
 def read_logs_from_file(n=100, level=None, search=None, return_all=False, exclude_modules=None, since_deployment=False) -> List[Dict]:
-    """Read recent logs from the log file efficiently.
+    """Read recent logs from the log files.
     
-    Reads from the end of the file to avoid loading the entire file into memory.
-    This is much faster for large log files.
-    Now reads from both app.log (current) and app.log.1 (most recent rotated backup).
+    Served from the indexed log store (see log_store.py), which only parses
+    what was appended to app.log since the last call. Falls back to scanning
+    the text files if the store can't be used.
     
     Args:
         n: Number of recent logs to return (ignored if return_all=True)
@@ -391,16 +403,69 @@ def read_logs_from_file(n=100, level=None, search=None, return_all=False, exclud
         since_deployment: If True, only return logs since last deployment timestamp
         
     Returns:
-        List of dicts with timestamp, level, module, message keys
+        List of dicts with timestamp, level, module, message keys (newest first)
+    """
+    deployment_cutoff = _to_log_time(get_deployment_timestamp()) if since_deployment else None
+    
+    try:
+        from log_store import get_log_store
+        
+        store = get_log_store()
+        store.sync()
+        page = store.query(
+            limit=n if n and not return_all else None,
+            level=level,
+            search=search,
+            exclude_modules=exclude_modules,
+            since=deployment_cutoff
+        )
+        logs = page.logs
+        for log in logs:
+            log['timestamp'] = datetime.strptime(log['timestamp'], '%Y-%m-%d %H:%M:%S')
+        return logs
+    except Exception as e:
+        print(f"[LOG_READER] Log store unavailable, scanning log files: {e}")
+        return _scan_log_files(n=n, level=level, search=search, return_all=return_all,
+                               exclude_modules=exclude_modules, deployment_cutoff=deployment_cutoff)
+
+
+def read_log_page(limit=100, before=None, after=None, level=None, search=None, exclude_modules=None, since_deployment=False):
+    """Read one page of logs by cursor from the indexed log store.
+    
+    Args:
+        limit: Number of logs per page
+        before: Cursor (log id) to page back from; None for the newest page
+        after: Cursor (log id) to tail from; only logs written after it
+        level, search, exclude_modules, since_deployment: Same as read_logs_from_file()
+        
+    Returns:
+        LogPage with logs (newest first, timestamps as strings), next_cursor and latest_cursor
+    """
+    from log_store import get_log_store
+    
+    store = get_log_store()
+    store.sync()
+    return store.query(
+        limit=limit,
+        before=before,
+        after=after,
+        level=level,
+        search=search,
+        exclude_modules=exclude_modules,
+        since=_to_log_time(get_deployment_timestamp()) if since_deployment else None
+    )
+
+
+def _scan_log_files(n=100, level=None, search=None, return_all=False, exclude_modules=None, deployment_cutoff=None) -> List[Dict]:
+    """Read recent logs by parsing app.log and its rotated backups directly.
+    
+    Reads from the end of the current file to avoid loading all of it into memory.
     """
     import os
     
     log_dir = os.path.join(os.path.dirname(__file__), 'logs')
     log_file = os.path.join(log_dir, 'app.log')
     
-    # Get deployment timestamp if needed
-    deployment_cutoff = get_deployment_timestamp() if since_deployment else None
-        
     logs = []
     
     # Pre-process filters (used for both files)
@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""
+Indexed log store for the admin log viewer.
+
+``logs/app.log`` (and its rotated backups) stay the source of truth; this
+module keeps a SQLite index of the parsed records next to them, so the
+viewer no longer re-reads and re-parses tens of megabytes per request.
+
+- The text files are ingested incrementally: the store remembers the inode
+  and byte offset it has read ``app.log`` up to, and each sync parses only
+  the bytes appended since. A rotation is detected by the inode changing,
+  in which case the rest of the rotated file is read before starting on the
+  new one. Any process can sync; ingestion is serialized by SQLite.
+- Records are indexed by level, module and timestamp, and pages are
+  addressed by record id (a cursor) instead of an offset, so fetching a page
+  or tailing new records costs the same however large the log grows.
+"""
+
+import os
+import re
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+LOG_STORE_FILENAME = 'app_log_index.db'
+# Records kept in the store; older ones are pruned when app.log rotates
+LOG_STORE_MAX_ROWS = int(os.getenv("LOG_STORE_MAX_ROWS", "500000"))
+# RotatingFileHandler backupCount in log_handler.setup_logging
+LOG_BACKUP_COUNT = 5
+
+_READ_CHUNK = 4 * 1024 * 1024
+_TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+# Shape of _TIMESTAMP_FORMAT; much cheaper than strptime per line
+_TIMESTAMP_RE = re.compile(r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS logs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    level TEXT NOT NULL,
+    module TEXT NOT NULL,
+    message TEXT NOT NULL,
+    formatted TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_logs_timestamp ON logs (timestamp);
+CREATE INDEX IF NOT EXISTS idx_logs_level ON logs (level);
+CREATE INDEX IF NOT EXISTS idx_logs_module ON logs (module);
+CREATE TABLE IF NOT EXISTS log_files (
+    name TEXT PRIMARY KEY,
+    inode INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    start_id INTEGER NOT NULL
+);
+"""
+
+
+def parse_log_line(line: str) -> Optional[Dict]:
+    """Parse one ``timestamp | LEVEL | module | message`` line.
+
+    Returns:
+        Dict with timestamp (str), level, module, message and formatted keys,
+        or None for lines in any other format (e.g. traceback continuations)
+    """
+    parts = line.split(' | ', 3)
+    if len(parts) != 4:
+        return None
+    timestamp_str, level_str, module_str, message_str = parts
+    if not _TIMESTAMP_RE.fullmatch(timestamp_str):
+        return None
+    return {
+        'timestamp': timestamp_str,
+        'level': level_str.strip(),
+        'module': module_str.strip(),
+        'message': message_str.strip(),
+        'formatted': line.strip(),
+    }
+
+
+@dataclass
+class LogPage:
+    """One page of log records, newest first.
+
+    ``next_cursor`` is passed as ``before`` to get the next (older) page and
+    is None on the last page; ``latest_cursor`` is passed as ``after`` to
+    tail records written since.
+    """
+    logs: List[Dict] = field(default_factory=list)
+    next_cursor: Optional[int] = None
+    latest_cursor: Optional[int] = None
+
+
+class LogStore:
+    """SQLite index over app.log and its rotated backups."""
+
+    def __init__(self, log_dir: str, db_path: Optional[str] = None, base_name: str = 'app.log',
+                 max_rows: int = LOG_STORE_MAX_ROWS):
+        """Initialize the store.
+
+        Args:
+            log_dir: Directory containing the log files
+            db_path: Index database path (default: <log_dir>/app_log_index.db)
+            base_name: Name of the current log file
+            max_rows: Records to keep; older ones are pruned on rotation
+        """
+        self.log_dir = log_dir
+        self.base_name = base_name
+        self.max_rows = max_rows
+        self.db_path = db_path or os.path.join(log_dir, LOG_STORE_FILENAME)
+        os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    @property
+    def log_file(self) -> str:
+        return os.path.join(self.log_dir, self.base_name)
+
+    def _rotated_file(self, index: int) -> str:
+        return os.path.join(self.log_dir, f"{self.base_name}.{index}")
+
+    # ------------------------------------------------------------------
+    # Ingestion
+    # ------------------------------------------------------------------
+
+    def sync(self) -> int:
+        """Index everything appended to the log files since the last sync.
+
+        Returns:
+            Number of records added
+        """
+        try:
+            current = os.stat(self.log_file)
+        except FileNotFoundError:
+            return 0
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                added = self._sync_locked(current)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return added
+
+    def _sync_locked(self, current: os.stat_result) -> int:
+        state = self._conn.execute(
+            "SELECT inode, offset, start_id FROM log_files WHERE name = ?", (self.base_name,)
+        ).fetchone()
+
+        added = 0
+        # Look the file up by inode rather than comparing it with app.log's,
+        # since a new app.log can reuse the inode of a deleted backup
+        rotated = self._find_rotated(state['inode']) if state else None
+        rolled_over = state is not None and (rotated is not None or state['inode'] != current.st_ino)
+        if state is None:
+            # First sync: backfill the rotated backups, oldest first
+            for index in range(LOG_BACKUP_COUNT, 0, -1):
+                added += self._ingest(self._rotated_file(index), 0)[0]
+            offset = 0
+        elif rolled_over:
+            # app.log rotated since the last sync: finish the file we were
+            # reading, then read any backups rotated in after it
+            if rotated is not None:
+                added += self._ingest(self._rotated_file(rotated), state['offset'])[0]
+                for index in range(rotated - 1, 0, -1):
+                    added += self._ingest(self._rotated_file(index), 0)[0]
+            offset = 0
+        elif current.st_size < state['offset']:
+            # Truncated in place (e.g. "Clear logs"): drop its records
+            self._conn.execute("DELETE FROM logs WHERE id >= ?", (state['start_id'],))
+            offset = 0
+        else:
+            offset = state['offset']
+
+        if state is None or offset == 0:
+            start_id = self._next_id()
+        else:
+            start_id = state['start_id']
+
+        count, offset = self._ingest(self.log_file, offset)
+        added += count
+        if rolled_over:
+            self._prune()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO log_files (name, inode, offset, start_id) VALUES (?, ?, ?, ?)",
+            (self.base_name, current.st_ino, offset, start_id)
+        )
+        return added
+
+    def _find_rotated(self, inode: int) -> Optional[int]:
+        for index in range(1, LOG_BACKUP_COUNT + 1):
+            try:
+                if os.stat(self._rotated_file(index)).st_ino == inode:
+                    return index
+            except FileNotFoundError:
+                continue
+        return None
+
+    def _next_id(self) -> int:
+        row = self._conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'logs'").fetchone()
+        return (row[0] if row else 0) + 1
+
+    def _ingest(self, path: str, offset: int) -> Tuple[int, int]:
+        """Index complete lines of ``path`` from byte ``offset``.
+
+        A trailing partial line is left for the next sync.
+
+        Returns:
+            (records added, offset of the first unread byte)
+        """
+        try:
+            f = open(path, 'rb')
+        except FileNotFoundError:
+            return 0, offset
+
+        added = 0
+        with f:
+            f.seek(offset)
+            pending = b''
+            while True:
+                chunk = f.read(_READ_CHUNK)
+                if not chunk:
+                    break
+                data = pending + chunk
+                end = data.rfind(b'\n')
+                if end < 0:
+                    pending = data
+                    continue
+                pending = data[end + 1:]
+                records = []
+                for line in data[:end].decode('utf-8', errors='ignore').split('\n'):
+                    record = parse_log_line(line) if line.strip() else None
+                    if record:
+                        records.append(record)
+                if records:
+                    self._conn.executemany(
+                        "INSERT INTO logs (timestamp, level, module, message, formatted) "
+                        "VALUES (:timestamp, :level, :module, :message, :formatted)",
+                        records
+                    )
+                    added += len(records)
+                offset += end + 1
+        return added, offset
+
+    def _prune(self) -> None:
+        self._conn.execute("DELETE FROM logs WHERE id <= ?", (self._next_id() - 1 - self.max_rows,))
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _filters(level=None, search=None, exclude_modules=None, since=None) -> Tuple[List[str], List]:
+        clauses, params = [], []
+        if level:
+            levels = [level] if isinstance(level, str) else list(level)
+            clauses.append(f"level IN ({', '.join('?' * len(levels))})")
+            params.extend(levels)
+        if exclude_modules:
+            modules = [exclude_modules] if isinstance(exclude_modules, str) else list(exclude_modules)
+            clauses.append(f"module NOT IN ({', '.join('?' * len(modules))})")
+            params.extend(modules)
+        if search:
+            # The formatted line contains the level, module and message
+            escaped = search.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+            clauses.append("formatted LIKE ? ESCAPE '\\'")
+            params.append(f"%{escaped}%")
+        if since:
+            clauses.append("timestamp >= ?")
+            params.append(since.strftime(_TIMESTAMP_FORMAT) if isinstance(since, datetime) else since)
+        return clauses, params
+
+    @staticmethod
+    def _record(row: sqlite3.Row) -> Dict:
+        return {
+            'id': row['id'],
+            'timestamp': row['timestamp'],
+            'level': row['level'],
+            'module': row['module'],
+            'message': row['message'],
+            'formatted': row['formatted'],
+        }
+
+    def query(self, limit: int = 100, before: Optional[int] = None, after: Optional[int] = None,
+              level: Union[str, Iterable[str], None] = None, search: Optional[str] = None,
+              exclude_modules: Union[str, Iterable[str], None] = None,
+              since: Union[datetime, str, None] = None) -> LogPage:
+        """Fetch one page of records, newest first.
+
+        Args:
+            limit: Maximum records to return (None = all matching records)
+            before: Cursor; only records older than it (the next page)
+            after: Cursor; only records newer than it (tailing)
+            level: Level or list of levels to include
+            search: Case-insensitive substring of the formatted line
+            exclude_modules: Module/logger name or names to exclude
+            since: Only records at or after this (Pacific) timestamp
+
+        Returns:
+            LogPage
+        """
+        clauses, params = self._filters(level, search, exclude_modules, since)
+        if before is not None:
+            clauses.append("id < ?")
+            params.append(before)
+        if after is not None:
+            clauses.append("id > ?")
+            params.append(after)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        # Tailing reads forward from the cursor so no new record is skipped
+        order = "ASC" if after is not None and before is None else "DESC"
+        sql = f"SELECT * FROM logs {where} ORDER BY id {order}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit + 1)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        has_more = limit is not None and len(rows) > limit
+        rows = rows[:limit] if limit is not None else rows
+        if order == "ASC":
+            rows.reverse()
+        logs = [self._record(row) for row in rows]
+
+        page = LogPage(logs=logs)
+        if order == "DESC" and has_more:
+            page.next_cursor = logs[-1]['id']
+        page.latest_cursor = logs[0]['id'] if logs else after
+        return page
+
+    def count(self, level=None, search=None, exclude_modules=None, since=None) -> int:
+        """Number of records matching the filters."""
+        clauses, params = self._filters(level, search, exclude_modules, since)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM logs {where}", params).fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# Global store instance
+_log_store = None
+_log_store_lock = threading.Lock()
+
+
+def get_log_store() -> LogStore:
+    """Get the global log store for web_dashboard/logs.
+
+    Returns:
+        LogStore instance
+    """
+    global _log_store
+    with _log_store_lock:
+        if _log_store is None:
+            _log_store = LogStore(os.path.join(os.path.dirname(__file__), 'logs'))
+        return _log_store
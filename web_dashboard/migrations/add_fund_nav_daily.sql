@@ -0,0 +1,50 @@
+-- Add fund_nav_daily table
+-- One row per fund per day with the fund's value and unit accounting, so the
+-- contributor NAV calculations no longer re-read every portfolio position and
+-- exchange rate since the fund's first contribution.
+--
+-- Maintained by the scheduler (web_dashboard/fund_nav.py):
+-- - update_portfolio_prices_job appends/updates the row for the day it prices
+-- - backfill_portfolio_prices_range rebuilds rows from its start date onwards
+
+CREATE TABLE IF NOT EXISTS fund_nav_daily (
+    fund VARCHAR(50) NOT NULL REFERENCES funds(name),
+    date DATE NOT NULL,
+    base_currency VARCHAR(3),
+    total_value NUMERIC(15, 2) NOT NULL DEFAULT 0,
+    cost_basis NUMERIC(15, 2) NOT NULL DEFAULT 0,
+    net_contributions NUMERIC(15, 2) NOT NULL DEFAULT 0,
+    units_outstanding NUMERIC(20, 6) NOT NULL DEFAULT 0,
+    nav_per_unit NUMERIC(15, 6),
+    updated_at TIMESTAMP DEFAULT now(),
+    PRIMARY KEY (fund, date)
+);
+
+COMMENT ON TABLE fund_nav_daily IS 'Daily fund value and NAV per unit for contributor ownership calculations';
+COMMENT ON COLUMN fund_nav_daily.total_value IS 'Market value of positions in base currency (sum of portfolio_positions.total_value_base)';
+COMMENT ON COLUMN fund_nav_daily.cost_basis IS 'Cost basis of positions in base currency (sum of portfolio_positions.cost_basis_base)';
+COMMENT ON COLUMN fund_nav_daily.net_contributions IS 'Contributions minus withdrawals up to and including this date';
+COMMENT ON COLUMN fund_nav_daily.units_outstanding IS 'Units after this date''s contributions and withdrawals (issued/redeemed at the previous row''s NAV)';
+COMMENT ON COLUMN fund_nav_daily.nav_per_unit IS '(total_value + net_contributions - cost_basis) / units_outstanding';
+
+ALTER TABLE fund_nav_daily ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Service role full access to fund_nav_daily" ON fund_nav_daily;
+CREATE POLICY "Service role full access to fund_nav_daily" ON fund_nav_daily
+    FOR ALL TO public USING ((auth.role() = 'service_role'::text));
+
+DROP POLICY IF EXISTS "Admins can view all fund NAV" ON fund_nav_daily;
+CREATE POLICY "Admins can view all fund NAV" ON fund_nav_daily
+    FOR SELECT TO public USING ((EXISTS ( SELECT 1
+       FROM user_profiles
+      WHERE ((user_profiles.user_id = auth.uid()) AND ((user_profiles.role)::text = 'admin'::text)))));
+
+DROP POLICY IF EXISTS "Users can view fund NAV for their funds" ON fund_nav_daily;
+CREATE POLICY "Users can view fund NAV for their funds" ON fund_nav_daily
+    FOR SELECT TO public USING ((((fund)::text IN ( SELECT user_funds.fund_name
+       FROM user_funds
+      WHERE (user_funds.user_id = auth.uid()))) OR ((fund)::text IN ( SELECT fund_contributions.fund
+       FROM fund_contributions
+      WHERE (normalize_email((fund_contributions.email)::text) = normalize_email((( SELECT user_profiles.email
+               FROM user_profiles
+              WHERE (user_profiles.user_id = auth.uid())))::text))))));
@@ -9,10 +9,13 @@ Supports streaming responses for real-time chat.
 
 import os
 import json
+import hashlib
 import logging
 import time
 import threading
-from typing import Generator, Optional, List, Dict, Any
+from array import array
+from collections import OrderedDict
+from typing import Generator, Optional, List, Dict, Any, Callable, Hashable
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
@@ -32,6 +35,9 @@ OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://host.docker.internal:1143
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3")
 OLLAMA_TIMEOUT = int(os.getenv("OLLAMA_TIMEOUT", "120"))
 OLLAMA_ENABLED = os.getenv("OLLAMA_ENABLED", "true").lower() == "true"
+OLLAMA_EMBEDDING_MODEL = "nomic-embed-text"
+OLLAMA_EMBED_BATCH_SIZE = int(os.getenv("OLLAMA_EMBED_BATCH_SIZE", "16"))
+OLLAMA_EMBED_CACHE_SIZE = int(os.getenv("OLLAMA_EMBED_CACHE_SIZE", "2000"))
 
 
 def load_model_config() -> Dict[str, Any]:
@@ -55,6 +61,50 @@ def load_model_config() -> Dict[str, Any]:
         return {}
 
 
+def embedding_cache_key(text: str, model: str) -> str:
+    """Content hash identifying an embedding (same text + model = same vector)."""
+    return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """Thread-safe LRU cache of embeddings keyed by content hash.
+    
+    Vectors are stored as float32 arrays (the precision pgvector stores),
+    which keeps 2000 nomic-embed-text vectors around 6 MB.
+    """
+    
+    def __init__(self, max_entries: int = OLLAMA_EMBED_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, array]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: str) -> Optional[List[float]]:
+        """Get a cached embedding, or None."""
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return vector.tolist()
+    
+    def put(self, key: str, embedding: List[float]) -> None:
+        """Store an embedding, evicting the least recently used if full."""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = array('f', embedding)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
 class OllamaClient:
     """Client for interacting with Ollama API."""
     
@@ -98,6 +148,11 @@ class OllamaClient:
         
         # Load model configuration
         self.model_config = load_model_config()
+        
+        # Embeddings already computed, so re-ingested/retried articles aren't re-embedded
+        self.embedding_cache = EmbeddingCache()
+        # Set to False if the server predates the batch /api/embed endpoint
+        self._batch_embed_supported = True
 
     def _load_model_config(self) -> Dict[str, Any]:
         """Deprecated: Use global load_model_config() instead."""
@@ -784,7 +839,7 @@ Return ONLY a raw JSON object with no markdown formatting or code blocks:
             logger.error(f"❌ Error generating streaming summary: {e}", exc_info=True)
             return {}
     
-    def generate_embedding(self, text: str, model: str = "nomic-embed-text") -> List[float]:
+    def generate_embedding(self, text: str, model: str = OLLAMA_EMBEDDING_MODEL) -> List[float]:
         """Generate embedding vector for text using Ollama embedding API.
         
         Args:
@@ -794,11 +849,100 @@ Return ONLY a raw JSON object with no markdown formatting or code blocks:
         Returns:
             List of floats (768 dimensions for nomic-embed-text)
         """
+        return self.generate_embeddings([text], model=model)[0]
+    
+    def generate_embeddings(
+        self,
+        texts: List[str],
+        model: str = OLLAMA_EMBEDDING_MODEL,
+        batch_size: Optional[int] = None
+    ) -> List[List[float]]:
+        """Generate embeddings for many texts, batching requests to Ollama.
+        
+        Texts already embedded (same content and model) come from the cache,
+        duplicates are embedded once, and the rest are sent in chunks of
+        ``batch_size`` per request.
+        
+        Args:
+            texts: Texts to embed
+            model: Embedding model name (defaults to nomic-embed-text)
+            batch_size: Texts per request (defaults to OLLAMA_EMBED_BATCH_SIZE)
+            
+        Returns:
+            One embedding per input text, in order ([] where generation failed)
+        """
         if not self.enabled:
             logger.warning("Ollama embedding generation rejected: AI assistant disabled")
-            return []
+            return [[] for _ in texts]
         
-        # Prepare request payload
+        keys = [embedding_cache_key(text, model) for text in texts]
+        embeddings: Dict[str, List[float]] = {}
+        pending: Dict[str, str] = {}
+        for key, text in zip(keys, texts, strict=True):
+            if key in embeddings or key in pending:
+                continue
+            cached = self.embedding_cache.get(key)
+            if cached is not None:
+                embeddings[key] = cached
+            else:
+                pending[key] = text
+        
+        if pending:
+            batch_size = max(1, batch_size or OLLAMA_EMBED_BATCH_SIZE)
+            pending_keys = list(pending)
+            for i in range(0, len(pending_keys), batch_size):
+                chunk = pending_keys[i:i + batch_size]
+                vectors = self._embed_batch([pending[key] for key in chunk], model)
+                for key, vector in zip(chunk, vectors, strict=True):
+                    if vector:
+                        self.embedding_cache.put(key, vector)
+                        embeddings[key] = vector
+            logger.debug(
+                f"Embedded {len(pending)} text(s) with {model} "
+                f"({len(texts) - len(pending)} cached or duplicate)"
+            )
+        
+        return [embeddings.get(key, []) for key in keys]
+    
+    def _embed_batch(self, texts: List[str], model: str) -> List[List[float]]:
+        """Embed a chunk of texts with one /api/embed request.
+        
+        Falls back to one /api/embeddings request per text on servers that
+        don't have the batch endpoint.
+        """
+        if not self._batch_embed_supported:
+            return [self._embed_single(text, model) for text in texts]
+        
+        try:
+            response = self.session.post(
+                f"{self.base_url}/api/embed",
+                json={"model": model, "input": texts},
+                timeout=self.timeout
+            )
+            if response.status_code == 404 and "model" not in response.text.lower():
+                logger.info("Ollama server has no /api/embed endpoint, using /api/embeddings")
+                self._batch_embed_supported = False
+                return [self._embed_single(text, model) for text in texts]
+            response.raise_for_status()
+            
+            embeddings = response.json().get("embeddings") or []
+            if len(embeddings) != len(texts):
+                logger.warning(f"Expected {len(texts)} embeddings from model {model}, got {len(embeddings)}")
+                return [[] for _ in texts]
+            
+            logger.debug(f"Generated {len(embeddings)} embeddings: {len(embeddings[0])} dimensions")
+            return embeddings
+            
+        except requests.exceptions.Timeout:
+            logger.error(f"❌ Ollama embedding request timed out after {self.timeout}s")
+        except requests.exceptions.ConnectionError as e:
+            logger.error(f"❌ Cannot connect to Ollama API at {self.base_url}: {e}")
+        except Exception as e:
+            logger.error(f"❌ Error generating embeddings: {e}", exc_info=True)
+        return [[] for _ in texts]
+    
+    def _embed_single(self, text: str, model: str) -> List[float]:
+        """Embed one text with the legacy /api/embeddings endpoint."""
         payload = {
             "model": model,
             "prompt": text
@@ -908,6 +1052,79 @@ Return ONLY a raw JSON object with no markdown formatting or code blocks:
             yield f"An error occurred: {str(e)}"
 
 
+class EmbeddingBatcher:
+    """Queue texts during ingestion and embed them in batches.
+    
+    Jobs save each article as soon as it is processed and ``add()`` its text;
+    every ``batch_size`` texts (and on ``flush()``) the queued texts are
+    embedded with one request and handed to ``on_embeddings`` as a
+    ``{key: embedding}`` dict, e.g. ResearchRepository.update_article_embeddings.
+    
+    Usage:
+        batcher = EmbeddingBatcher(ollama_client, research_repo.update_article_embeddings)
+        for article in articles:
+            article_id = research_repo.save_article(...)
+            batcher.add(article_id, content[:6000])
+        batcher.flush()
+    """
+    
+    def __init__(
+        self,
+        client: OllamaClient,
+        on_embeddings: Callable[[Dict[Hashable, List[float]]], Any],
+        batch_size: Optional[int] = None,
+        model: str = OLLAMA_EMBEDDING_MODEL
+    ):
+        self.client = client
+        self.on_embeddings = on_embeddings
+        self.batch_size = max(1, batch_size or OLLAMA_EMBED_BATCH_SIZE)
+        self.model = model
+        self._pending: List[tuple] = []
+        self.embedded = 0
+        self.failed = 0
+    
+    def add(self, key: Hashable, text: str) -> None:
+        """Queue a text, flushing once a full batch is waiting."""
+        self._pending.append((key, text))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+    
+    def flush(self) -> int:
+        """Embed everything queued and pass the results on.
+        
+        Returns:
+            Number of texts embedded successfully
+        """
+        if not self._pending:
+            return 0
+        pending, self._pending = self._pending, []
+        
+        embeddings = self.client.generate_embeddings(
+            [text for _, text in pending], model=self.model, batch_size=self.batch_size
+        )
+        results = {key: embedding for (key, _), embedding in zip(pending, embeddings, strict=True) if embedding}
+        
+        failed = len(pending) - len(results)
+        if failed:
+            logger.warning(f"Failed to generate {failed} of {len(pending)} embedding(s)")
+        self.embedded += len(results)
+        self.failed += failed
+        
+        if results:
+            try:
+                self.on_embeddings(results)
+            except Exception as e:
+                logger.error(f"❌ Error saving {len(results)} embedding(s): {e}", exc_info=True)
+                return 0
+        return len(results)
+    
+    def __enter__(self) -> "EmbeddingBatcher":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.flush()
+
+
 # Global client instance
 _ollama_client: Optional[OllamaClient] = None
 
@@ -27,6 +27,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from auth_utils import is_authenticated, has_admin_access, can_modify_data, get_user_email, redirect_to_login
 from streamlit_utils import get_supabase_client, display_dataframe_with_copy
 from supabase_client import SupabaseClient
+from cache_version import cache_tag, invalidate
 from navigation import render_navigation
 
 # Import shared utilities
@@ -351,6 +352,7 @@ else:
                         # SAFETY: Only clear trades for NON-production funds
                         if not is_production:
                             client.supabase.table("trade_log").delete().eq("fund", wipe_fund).execute()
+                            invalidate(cache_tag("trade_log", wipe_fund))
                         else:
                             st.warning("⚠️ Trade log NOT wiped (production fund - use 'Wipe Portfolio Positions Only' instead)")
                         
@@ -659,6 +661,7 @@ else:
                         # First clear all dependent data (FK constraints use ON DELETE RESTRICT)
                         client.supabase.table("portfolio_positions").delete().eq("fund", delete_fund).execute()
                         client.supabase.table("trade_log").delete().eq("fund", delete_fund).execute()
+                        invalidate(cache_tag("trade_log", delete_fund))
                         client.supabase.table("cash_balances").delete().eq("fund", delete_fund).execute()
                         client.supabase.table("fund_contributions").delete().eq("fund", delete_fund).execute()
                         # Try to delete fund_thesis if it exists
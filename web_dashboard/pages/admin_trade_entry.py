@@ -19,6 +19,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from auth_utils import is_authenticated, has_admin_access, can_modify_data, get_user_email, redirect_to_login
 from streamlit_utils import get_supabase_client, display_dataframe_with_copy, render_sidebar_fund_selector
 from supabase_client import SupabaseClient
+from cache_version import cache_tag, invalidate
 from navigation import render_navigation
 
 # Import shared utilities
@@ -316,6 +317,7 @@ else:
                         }
                         
                         admin_client.supabase.table("trade_log").insert(trade_data).execute()
+                        invalidate(cache_tag("trade_log", trade_fund))
                         
                         # Now update portfolio positions using unified trade entry function
                         try:
@@ -593,6 +595,7 @@ Time: December 19, 2025 09:30 EST""",
                         }
                         
                         admin_client.supabase.table("trade_log").insert(trade_data).execute()
+                        invalidate(cache_tag("trade_log", email_fund))
                         
                         # Update portfolio positions
                         try:
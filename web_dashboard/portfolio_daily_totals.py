@@ -0,0 +1,135 @@
+"""
+Portfolio Daily Totals
+======================
+
+Per-day portfolio totals computed in the database by the
+``get_portfolio_daily_totals`` RPC (migrations/add_portfolio_daily_totals_rpc.sql).
+
+The value-over-time charts used to download every portfolio_positions row
+(tens of thousands) only to ``groupby(date).sum()`` them in pandas. The RPC
+returns one row per day instead, with both the pre-converted base currency
+sums and the raw sums, plus row counts so the ">80% pre-converted" check
+still works.
+
+``fetch_daily_totals`` returns None when the RPC is unavailable (migration
+not applied yet) or fails, and callers fall back to aggregating rows
+client-side.
+
+Used by calculate_portfolio_value_over_time_flask (flask_data_utils) and
+calculate_portfolio_value_over_time (streamlit_utils).
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+RPC_NAME = "get_portfolio_daily_totals"
+
+# Supabase returns at most 1000 rows per request (also for RPC results)
+PAGE_SIZE = 1000
+
+# Share of rows that must have pre-converted values to use the base columns
+PRECONVERTED_THRESHOLD = 0.8
+
+TOTAL_COLUMNS = [
+    "total_value_base", "cost_basis_base", "pnl_base",
+    "total_value", "cost_basis", "pnl",
+    "position_count", "preconverted_count",
+]
+
+# Set once the RPC is known to be missing, so it isn't retried on every call
+_rpc_missing = False
+
+
+def _is_missing_function(error: Exception) -> bool:
+    """Whether PostgREST reported that the function doesn't exist."""
+    message = str(error)
+    return "PGRST202" in message or "Could not find the function" in message
+
+
+def fetch_daily_totals(
+    supabase,
+    fund: Optional[str] = None,
+    since: Optional[datetime] = None,
+    page_size: int = PAGE_SIZE
+) -> Optional[pd.DataFrame]:
+    """Fetch per-day portfolio totals from the database.
+
+    Pages past the row limit by restarting the RPC the day after the last
+    date received, so each request only aggregates the remaining days.
+
+    Args:
+        supabase: Supabase (postgrest) client, e.g. ``SupabaseClient().supabase``
+        fund: Fund name, or None for all funds the client can read
+        since: Only include positions dated at or after this time
+        page_size: Rows per request
+
+    Returns:
+        DataFrame with a ``date`` column (datetime, one row per day, sorted)
+        and TOTAL_COLUMNS, empty if there are no positions. None if the RPC
+        is unavailable, in which case the caller should aggregate rows itself.
+    """
+    global _rpc_missing
+
+    if _rpc_missing:
+        return None
+
+    frames = []
+    start = since
+    try:
+        while True:
+            params = {
+                "fund_name": fund,
+                "start_at": start.strftime('%Y-%m-%dT%H:%M:%S') if start else None,
+            }
+            rows = supabase.rpc(RPC_NAME, params).limit(page_size).execute().data or []
+            if not rows:
+                break
+
+            frames.append(pd.DataFrame.from_records(rows))
+            if len(rows) < page_size:
+                break
+            start = pd.Timestamp(rows[-1]["date"]).normalize().to_pydatetime() + timedelta(days=1)
+    except Exception as e:
+        if _is_missing_function(e):
+            _rpc_missing = True
+            logger.warning(f"{RPC_NAME} RPC not found - aggregating portfolio rows client-side "
+                           f"(apply migrations/add_portfolio_daily_totals_rpc.sql)")
+        else:
+            logger.warning(f"{RPC_NAME} RPC failed, aggregating portfolio rows client-side: {e}")
+        return None
+
+    if not frames:
+        return pd.DataFrame(columns=["date"] + TOTAL_COLUMNS)
+
+    totals = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+    totals["date"] = pd.to_datetime(totals["date"])
+    for column in TOTAL_COLUMNS:
+        totals[column] = pd.to_numeric(totals[column]).astype(float)
+    logger.debug(f"Fetched {len(totals)} daily totals via {RPC_NAME} in {len(frames)} requests")
+    return totals.sort_values("date").reset_index(drop=True)
+
+
+def daily_value_series(totals: pd.DataFrame) -> Tuple[pd.DataFrame, bool]:
+    """Pick the value columns of fetch_daily_totals() output.
+
+    Uses the pre-converted base currency sums when more than
+    PRECONVERTED_THRESHOLD of the rows have them, like the client-side
+    aggregation does, otherwise the raw sums.
+
+    Returns:
+        (DataFrame with columns date, value, cost_basis, pnl;
+         whether the pre-converted base columns were used)
+    """
+    position_count = totals["position_count"].sum() if not totals.empty else 0
+    preconverted = bool(position_count) and totals["preconverted_count"].sum() / position_count > PRECONVERTED_THRESHOLD
+    raw_columns = ["total_value", "cost_basis", "pnl"]
+    columns = [f"{column}_base" for column in raw_columns] if preconverted else raw_columns
+
+    daily = totals[["date"] + columns].copy()
+    daily.columns = ["date", "value", "cost_basis", "pnl"]
+    return daily.reset_index(drop=True), preconverted
@@ -2,12 +2,21 @@
 """
 Postgres client for local database connections
 Handles research articles storage with connection pooling
+
+The pool is shared by every PostgresClient in the process and is safe to use
+from the scheduler's worker threads and Flask request threads at once:
+checkout blocks (up to a timeout) instead of failing when all connections are
+busy, idle connections are health-checked before reuse, and hot queries can
+run as per-connection prepared statements.
 """
 
 import os
 import logging
+import threading
+import time
+from collections import deque
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Callable, Set
 from contextlib import contextmanager
 from dotenv import load_dotenv
 
@@ -32,13 +41,210 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Postgres error codes handled when running prepared statements
+DUPLICATE_PREPARED_STATEMENT = '42P05'
+INVALID_SQL_STATEMENT_NAME = '26000'
+
+
+class PoolTimeoutError(pool.PoolError):
+    """No connection became available within the acquire timeout."""
+
+
+class BlockingConnectionPool:
+    """Thread-safe, bounded Postgres connection pool.
+    
+    Unlike psycopg2's SimpleConnectionPool (not thread-safe) and
+    ThreadedConnectionPool (raises "connection pool exhausted"), getconn()
+    waits for a connection to be returned when all ``maxconn`` are in use.
+    Each checkout hands a connection to exactly one caller. Connections idle
+    for longer than ``health_check_interval`` are validated with ``SELECT 1``
+    on checkout and replaced if dead.
+    """
+    
+    def __init__(
+        self,
+        minconn: int,
+        maxconn: int,
+        dsn: Optional[str] = None,
+        timeout: float = 30.0,
+        health_check_interval: float = 30.0,
+        connect: Optional[Callable[[], Any]] = None
+    ):
+        """Create the pool and open ``minconn`` connections.
+        
+        Args:
+            minconn: Connections opened up front
+            maxconn: Maximum open connections
+            dsn: Connection string (used when ``connect`` is not given)
+            timeout: Default seconds getconn() waits for a free connection
+            health_check_interval: Idle seconds after which a connection is validated
+            connect: Optional factory returning a new connection
+        """
+        self.minconn = minconn
+        self.maxconn = maxconn
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self._connect = connect or (lambda: psycopg2.connect(dsn))
+        
+        self._cond = threading.Condition()
+        self._idle: deque = deque()  # (connection, last_used monotonic time)
+        self._in_use: Dict[int, Any] = {}
+        self._prepared: Dict[int, Set[str]] = {}
+        self._size = 0
+        self._closed = False
+        
+        # Metrics
+        self._acquisitions = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._timeouts = 0
+        self._discarded = 0
+        self._peak_in_use = 0
+        
+        for _ in range(minconn):
+            conn = self._connect()
+            self._size += 1
+            self._idle.append((conn, time.monotonic()))
+    
+    def getconn(self, timeout: Optional[float] = None):
+        """Check out a connection, waiting up to ``timeout`` seconds for one.
+        
+        Raises:
+            PoolTimeoutError: If no connection is free before the timeout
+            PoolError: If the pool has been closed
+        """
+        timeout = self.timeout if timeout is None else timeout
+        start = time.monotonic()
+        deadline = start + timeout
+        
+        while True:
+            conn, last_used = None, None
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise pool.PoolError("connection pool is closed")
+                    if self._idle:
+                        # Most recently used first: warm and least likely to be stale
+                        conn, last_used = self._idle.pop()
+                        break
+                    if self._size < self.maxconn:
+                        self._size += 1
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise PoolTimeoutError(
+                            f"No database connection available after {timeout:.1f}s "
+                            f"({self.maxconn} in use)"
+                        )
+                    self._cond.wait(remaining)
+            
+            # Connect or validate outside the lock so other threads aren't blocked
+            if conn is None:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+            elif not self._is_healthy(conn, last_used):
+                logger.warning("Discarding dead Postgres connection from pool")
+                self._discard(conn)
+                continue
+            
+            with self._cond:
+                wait = time.monotonic() - start
+                self._in_use[id(conn)] = conn
+                self._acquisitions += 1
+                self._wait_total += wait
+                self._wait_max = max(self._wait_max, wait)
+                self._peak_in_use = max(self._peak_in_use, len(self._in_use))
+            return conn
+    
+    def putconn(self, conn, close: bool = False) -> None:
+        """Return a connection; broken or ``close=True`` connections are discarded."""
+        with self._cond:
+            self._in_use.pop(id(conn), None)
+            if not (close or self._closed or conn.closed):
+                self._idle.append((conn, time.monotonic()))
+                self._cond.notify()
+                return
+        self._discard(conn)
+    
+    def prepared_statements(self, conn) -> Set[str]:
+        """Names of statements already prepared on a connection."""
+        with self._cond:
+            return self._prepared.setdefault(id(conn), set())
+    
+    def closeall(self) -> None:
+        """Close idle connections now and in-use ones when they are returned."""
+        with self._cond:
+            self._closed = True
+            idle = [conn for conn, _ in self._idle]
+            self._idle.clear()
+            self._cond.notify_all()
+        for conn in idle:
+            self._discard(conn, count=False)
+    
+    def stats(self) -> Dict[str, Any]:
+        """Pool utilization and wait-time metrics."""
+        with self._cond:
+            in_use = len(self._in_use)
+            return {
+                'max_connections': self.maxconn,
+                'open_connections': self._size,
+                'in_use': in_use,
+                'idle': len(self._idle),
+                'peak_in_use': self._peak_in_use,
+                'utilization': in_use / self.maxconn if self.maxconn else 0.0,
+                'acquisitions': self._acquisitions,
+                'avg_wait_ms': (self._wait_total / self._acquisitions * 1000) if self._acquisitions else 0.0,
+                'max_wait_ms': self._wait_max * 1000,
+                'timeouts': self._timeouts,
+                'discarded_connections': self._discarded,
+            }
+    
+    def _is_healthy(self, conn, last_used: float) -> bool:
+        """Check a connection before handing it out."""
+        if conn.closed:
+            return False
+        if time.monotonic() - last_used < self.health_check_interval:
+            return True
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.close()
+            conn.rollback()
+            return True
+        except Exception as e:
+            logger.debug(f"Postgres connection failed health check: {e}")
+            return False
+    
+    def _discard(self, conn, count: bool = True) -> None:
+        """Close a connection and free its slot."""
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._prepared.pop(id(conn), None)
+            self._size -= 1
+            if count:
+                self._discarded += 1
+            self._cond.notify()
+
 
 class PostgresClient:
     """Client for interacting with local Postgres database"""
     
-    _connection_pool: Optional[pool.SimpleConnectionPool] = None
+    _connection_pool: Optional[BlockingConnectionPool] = None
+    _pool_lock = threading.Lock()
     _min_connections = 1
-    _max_connections = 5
+    # Scheduler runs up to 7 research workers alongside Flask request threads
+    _max_connections = 10
+    _acquire_timeout = 30.0
+    _health_check_interval = 30.0
     
     def __init__(self, database_url: Optional[str] = None):
         """Initialize Postgres client
@@ -56,16 +262,26 @@ class PostgresClient:
             self._create_connection_pool()
     
     def _create_connection_pool(self) -> None:
-        """Create connection pool for database connections"""
+        """Create the shared connection pool (once per process)
+        
+        Pool size and acquire timeout can be overridden with the
+        RESEARCH_DB_POOL_MAX and RESEARCH_DB_POOL_TIMEOUT environment variables.
+        """
+        with PostgresClient._pool_lock:
+            if PostgresClient._connection_pool is not None:
+                return
+            self._open_connection_pool()
+    
+    def _open_connection_pool(self) -> None:
+        """Open the pool, logging connection troubleshooting hints on failure"""
         try:
-            PostgresClient._connection_pool = psycopg2.pool.SimpleConnectionPool(
+            PostgresClient._connection_pool = BlockingConnectionPool(
                 PostgresClient._min_connections,
-                PostgresClient._max_connections,
-                self.database_url
+                int(os.getenv("RESEARCH_DB_POOL_MAX", PostgresClient._max_connections)),
+                self.database_url,
+                timeout=float(os.getenv("RESEARCH_DB_POOL_TIMEOUT", PostgresClient._acquire_timeout)),
+                health_check_interval=PostgresClient._health_check_interval
             )
-            
-            if not PostgresClient._connection_pool:
-                raise ValueError("Failed to create connection pool")
                 
         except psycopg2.OperationalError as e:
             logger.error(f"❌ Connection error: {e}")
@@ -113,16 +329,23 @@ class PostgresClient:
         if PostgresClient._connection_pool is None:
             self._create_connection_pool()
         
-        conn = PostgresClient._connection_pool.getconn()
+        connection_pool = PostgresClient._connection_pool
+        conn = connection_pool.getconn()
+        broken = False
         try:
             yield conn
             conn.commit()
         except Exception as e:
-            conn.rollback()
+            try:
+                conn.rollback()
+            except Exception:
+                broken = True
+            if isinstance(e, (psycopg2.OperationalError, psycopg2.InterfaceError)):
+                broken = True
             logger.error(f"Database error: {e}")
             raise
         finally:
-            PostgresClient._connection_pool.putconn(conn)
+            connection_pool.putconn(conn, close=broken)
     
     def test_connection(self) -> bool:
         """Test database connection"""
@@ -211,11 +434,61 @@ class PostgresClient:
             logger.error(f"❌ Error executing batch update: {e}")
             raise
     
+    def execute_prepared(self, name: str, query: str, params: Optional[tuple] = None) -> List[Dict[str, Any]]:
+        """Execute a hot SELECT as a prepared statement on the checked-out connection
+        
+        The statement is prepared once per pooled connection and reused, so
+        Postgres skips parsing and planning on repeated calls.
+        
+        Args:
+            name: Statement name (unique per query text)
+            query: SQL using $1, $2, ... placeholders
+            params: Optional tuple of parameters
+            
+        Returns:
+            List of dictionaries (one per row)
+        """
+        params = params or ()
+        execute = sql.SQL("EXECUTE {}").format(sql.Identifier(name))
+        if params:
+            execute = sql.SQL("{} ({})").format(execute, sql.SQL(", ").join([sql.Placeholder()] * len(params)))
+        
+        try:
+            with self.get_connection() as conn:
+                prepared = PostgresClient._connection_pool.prepared_statements(conn)
+                cursor = conn.cursor(cursor_factory=RealDictCursor)
+                for attempt in range(2):
+                    try:
+                        if name not in prepared:
+                            cursor.execute(sql.SQL("PREPARE {} AS {}").format(sql.Identifier(name), sql.SQL(query)))
+                            prepared.add(name)
+                        cursor.execute(execute, params)
+                        return [dict(row) for row in cursor.fetchall()]
+                    except psycopg2.Error as e:
+                        # Our bookkeeping disagreed with the server; fix it and retry once
+                        if attempt or e.pgcode not in (DUPLICATE_PREPARED_STATEMENT, INVALID_SQL_STATEMENT_NAME):
+                            raise
+                        conn.rollback()
+                        if e.pgcode == DUPLICATE_PREPARED_STATEMENT:
+                            prepared.add(name)
+                        else:
+                            prepared.discard(name)
+        except Exception as e:
+            logger.error(f"❌ Error executing prepared statement {name}: {e}")
+            raise
+    
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Get connection pool utilization and wait-time metrics"""
+        if PostgresClient._connection_pool is None:
+            return {}
+        return PostgresClient._connection_pool.stats()
+    
     def close_pool(self) -> None:
         """Close all connections in the pool"""
-        if PostgresClient._connection_pool:
-            PostgresClient._connection_pool.closeall()
-            PostgresClient._connection_pool = None
+        with PostgresClient._pool_lock:
+            if PostgresClient._connection_pool:
+                PostgresClient._connection_pool.closeall()
+                PostgresClient._connection_pool = None
     
     def __del__(self):
         """Cleanup on object destruction"""
@@ -1,61 +1,272 @@
+"""
+Request rate limiting for Flask routes.
+
+Limits are enforced with a sliding window counter: each identity (IP or
+user) gets one counter per fixed window, and a request is allowed when
+
+    previous_window_count * (1 - elapsed_fraction) + current_window_count <= limit
+
+so a burst straddling a window boundary can't reach twice the limit. The
+counter is incremented atomically *before* the check, which gives every
+concurrent request a distinct count; a denied request is refunded.
+
+Backends:
+    - MemoryBackend (default): per-process counters. Each update holds one of
+      a fixed set of striped locks for a single integer operation, so
+      requests for different keys don't contend.
+    - RedisBackend: shared across workers/instances using atomic INCR/DECR
+      in one pipelined round trip. Enabled by setting RATE_LIMIT_REDIS_URL
+      (requires the optional ``redis`` package).
+
+Usage:
+    @app.route('/api/auth/login', methods=['POST'])
+    @rate_limit(limit=5, period=60)
+    def login(): ...
+
+    @ai_bp.route('/api/v2/ai/chat', methods=['POST'])
+    @require_auth
+    @rate_limit(limit=20, period=60, per='user')
+    def api_ai_chat(): ...
+"""
+
+from dataclasses import dataclass
 from functools import wraps
 from flask import request, jsonify
+import os
+import threading
 import time
 import logging
-from flask_cache_utils import _get_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
-def rate_limit(limit=5, period=60):
+RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL", "")
+RATE_LIMIT_KEY_PREFIX = "rate_limit"
+
+_LOCK_STRIPES = 64
+
+
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    """Limit applied to one endpoint."""
+    scope: str
+    limit: int
+    period: int
+    per: str = 'ip'  # 'ip' or 'user' (falls back to IP when not signed in)
+
+
+class MemoryBackend:
+    """In-process counters with expiry."""
+
+    def __init__(self):
+        self._counts: Dict[str, List] = {}  # key -> [count, expires_at or None]
+        self._locks = [threading.Lock() for _ in range(_LOCK_STRIPES)]
+        self._last_sweep = 0.0
+
+    def _lock(self, key: str) -> threading.Lock:
+        return self._locks[hash(key) % _LOCK_STRIPES]
+
+    def _incr(self, key: str, amount: int, expires_at: Optional[float] = None, now: float = 0.0) -> int:
+        with self._lock(key):
+            entry = self._counts.get(key)
+            if entry is None or (entry[1] is not None and entry[1] <= now):
+                entry = self._counts[key] = [0, expires_at]
+            entry[0] += amount
+            return entry[0]
+
+    def _get(self, key: str, now: float = 0.0) -> int:
+        entry = self._counts.get(key)
+        return entry[0] if entry is not None and (entry[1] is None or entry[1] > now) else 0
+
+    def hit(self, key: str, previous_key: str, ttl: int, stats_key: str) -> Tuple[int, int]:
+        """Count a request; returns (current window count, previous window count)."""
+        now = time.time()
+        self._sweep(now)
+        self._incr(f"{stats_key}:hits", 1)
+        return self._incr(key, 1, now + ttl, now), self._get(previous_key, now)
+
+    def deny(self, key: str, stats_key: str) -> None:
+        """Refund a denied request and count the denial."""
+        self._incr(key, -1)
+        self._incr(f"{stats_key}:denied", 1)
+
+    def stats(self, stats_keys: Iterable[str]) -> Dict[str, Dict[str, int]]:
+        return {
+            stats_key: {
+                'hits': self._get(f"{stats_key}:hits"),
+                'denied': self._get(f"{stats_key}:denied"),
+            }
+            for stats_key in stats_keys
+        }
+
+    def _sweep(self, now: float) -> None:
+        """Drop expired windows, at most once a minute."""
+        if now - self._last_sweep < 60:
+            return
+        self._last_sweep = now
+        for key, entry in list(self._counts.items()):
+            if entry[1] is not None and entry[1] <= now:
+                with self._lock(key):
+                    if self._counts.get(key) is entry:
+                        del self._counts[key]
+
+
+class RedisBackend:
+    """Counters shared through a Redis-compatible server."""
+
+    def __init__(self, client: Any):
+        self.client = client
+
+    def hit(self, key: str, previous_key: str, ttl: int, stats_key: str) -> Tuple[int, int]:
+        pipe = self.client.pipeline(transaction=False)
+        pipe.incr(key)
+        pipe.expire(key, ttl)
+        pipe.get(previous_key)
+        pipe.hincrby(stats_key, 'hits', 1)
+        current, _, previous, _ = pipe.execute()
+        return int(current), int(previous or 0)
+
+    def deny(self, key: str, stats_key: str) -> None:
+        pipe = self.client.pipeline(transaction=False)
+        pipe.decr(key)
+        pipe.hincrby(stats_key, 'denied', 1)
+        pipe.execute()
+
+    def stats(self, stats_keys: Iterable[str]) -> Dict[str, Dict[str, int]]:
+        stats_keys = list(stats_keys)
+        pipe = self.client.pipeline(transaction=False)
+        for stats_key in stats_keys:
+            pipe.hgetall(stats_key)
+        results = pipe.execute()
+        stats = {}
+        for stats_key, counters in zip(stats_keys, results, strict=True):
+            counters = {(k.decode() if isinstance(k, bytes) else k): int(v) for k, v in (counters or {}).items()}
+            stats[stats_key] = {'hits': counters.get('hits', 0), 'denied': counters.get('denied', 0)}
+        return stats
+
+
+# Policies registered by @rate_limit, by scope
+_policies: Dict[str, RateLimitPolicy] = {}
+
+# Global backend instance (will be initialized on first use)
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def _create_backend():
+    if RATE_LIMIT_REDIS_URL:
+        try:
+            import redis
+            client = redis.Redis.from_url(RATE_LIMIT_REDIS_URL, socket_timeout=0.5, socket_connect_timeout=0.5)
+            logger.info("Rate limiting with shared Redis backend")
+            return RedisBackend(client)
+        except ImportError:
+            logger.warning("RATE_LIMIT_REDIS_URL is set but redis is not installed. Using in-process rate limits. "
+                           "Install with: pip install redis")
+        except Exception as e:
+            logger.warning(f"Failed to connect rate limiter to Redis: {e}. Using in-process rate limits.")
+    return MemoryBackend()
+
+
+def _get_backend():
+    """Get the rate limit backend, initializing if necessary."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = _create_backend()
+    return _backend
+
+
+def _client_ip() -> str:
+    # Prioritize X-Forwarded-For if available (behind proxy)
+    # ProxyFix in app.py should handle this, but checking explicitly is safer
+    ip = request.headers.get('X-Forwarded-For', request.remote_addr)
+    return ip.split(',')[0].strip() if ip else 'unknown'
+
+
+def _identity(per: str) -> str:
+    if per == 'user':
+        user_id = getattr(request, 'user_id', None)
+        if user_id:
+            return f"user:{user_id}"
+    return f"ip:{_client_ip()}"
+
+
+def _stats_key(scope: str) -> str:
+    return f"{RATE_LIMIT_KEY_PREFIX}:stats:{scope}"
+
+
+def check_rate_limit(policy: RateLimitPolicy, identity: str, backend=None) -> bool:
+    """Count a request against a policy.
+
+    Returns:
+        True if the request is allowed, False if it exceeds the limit
     """
-    Rate limiting decorator using the shared cache.
-    Uses a fixed window algorithm.
+    backend = backend or _get_backend()
+    now = time.time()
+    window = int(now // policy.period)
+    elapsed = (now - window * policy.period) / policy.period
+    prefix = f"{RATE_LIMIT_KEY_PREFIX}:{policy.scope}:{identity}"
+    key = f"{prefix}:{window}"
+    stats_key = _stats_key(policy.scope)
+
+    current, previous = backend.hit(key, f"{prefix}:{window - 1}", policy.period * 2 + 10, stats_key)
+    if previous * (1 - elapsed) + current <= policy.limit:
+        return True
+    backend.deny(key, stats_key)
+    return False
+
+
+def get_rate_limit_stats() -> List[Dict[str, Any]]:
+    """Hit/deny counters for every rate-limited endpoint.
+
+    Counters cover this process with the in-process backend and all
+    instances with the Redis backend.
+    """
+    policies = sorted(_policies.values(), key=lambda p: p.scope)
+    backend = _get_backend()
+    counters = backend.stats(_stats_key(policy.scope) for policy in policies)
+    return [
+        {
+            'endpoint': policy.scope,
+            'limit': policy.limit,
+            'period': policy.period,
+            'per': policy.per,
+            'hits': counters[_stats_key(policy.scope)]['hits'],
+            'denied': counters[_stats_key(policy.scope)]['denied'],
+            'backend': 'redis' if isinstance(backend, RedisBackend) else 'memory',
+        }
+        for policy in policies
+    ]
+
+
+def rate_limit(limit=5, period=60, per='ip', scope=None):
+    """
+    Rate limiting decorator using a sliding window counter.
 
     Args:
         limit (int): Number of allowed requests per period.
         period (int): Time window in seconds.
+        per (str): 'ip' to limit per client IP, 'user' to limit per signed-in
+            user (place below @require_auth so the user is known).
+        scope (str): Name the limit is tracked under (default: function name).
+            Endpoints sharing a scope share the limit.
     """
     def decorator(f):
+        policy = RateLimitPolicy(scope=scope or f.__name__, limit=limit, period=period, per=per)
+        _policies[policy.scope] = policy
+
         @wraps(f)
         def wrapped(*args, **kwargs):
             try:
-                cache = _get_cache()
-
-                # Get IP address
-                # Prioritize X-Forwarded-For if available (behind proxy)
-                # ProxyFix in app.py should handle this, but checking explicitly is safer
-                ip = request.headers.get('X-Forwarded-For', request.remote_addr)
-                if ip:
-                    ip = ip.split(',')[0].strip()
-                else:
-                    ip = 'unknown'
-
-                # Create a key based on IP, endpoint, and time window
-                # Fixed window: current_time // period gives a unique bucket index
-                window = int(time.time() // period)
-                key = f"rate_limit:{ip}:{request.endpoint}:{window}"
-
-                # Get current count
-                current_count = cache.get(key)
-
-                if current_count is not None and current_count >= limit:
-                    logger.warning(f"Rate limit exceeded for {ip} on {request.endpoint}")
+                identity = _identity(policy.per)
+                if not check_rate_limit(policy, identity):
+                    logger.warning(f"Rate limit exceeded for {identity} on {request.endpoint}")
                     return jsonify({
                         "error": "Too many requests. Please try again later.",
                         "retry_after": period
-                    }), 429
-
-                # Increment count
-                new_count = (current_count or 0) + 1
-
-                # Set with timeout slightly larger than period to ensure it persists for the full window
-                # Note: SimpleCache.set resets the timeout, which is fine for fixed window keys
-                # because the key changes when the window changes.
-                try:
-                    cache.set(key, new_count, timeout=period + 10)
-                except Exception as cache_error:
-                    logger.warning(f"Failed to set rate limit cache: {cache_error}")
-
+                    }), 429, {'Retry-After': str(period)}
             except Exception as e:
                 # Fail open if rate limiting logic fails
                 logger.error(f"Rate limiting error: {e}", exc_info=True)
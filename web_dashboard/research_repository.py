@@ -10,6 +10,8 @@ from typing import Optional, List, Dict, Any
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 
+from psycopg2.extras import execute_values
+
 from postgres_client import PostgresClient
 
 logger = logging.getLogger(__name__)
@@ -726,7 +728,36 @@ class ResearchRepository:
         except Exception as e:
             logger.error(f"❌ Error updating article {article_id} analysis: {e}")
             return False
-    
+
+    def update_article_embeddings(self, embeddings: Dict[str, List[float]]) -> int:
+        """Set the embedding of several articles in one batch.
+
+        Used with ollama_client.EmbeddingBatcher by the ingestion jobs, which
+        save articles first and embed them in batches afterwards.
+
+        Args:
+            embeddings: Mapping of article UUID to vector embedding (768 floats)
+
+        Returns:
+            Number of articles updated
+        """
+        if not embeddings:
+            return 0
+        try:
+            params_list = [
+                ("[" + ",".join(str(float(x)) for x in embedding) + "]", article_id)
+                for article_id, embedding in embeddings.items()
+            ]
+            self.client.execute_many(
+                "UPDATE research_articles SET embedding = %s::vector WHERE id = %s",
+                params_list
+            )
+            logger.debug(f"Saved embeddings for {len(params_list)} article(s)")
+            return len(params_list)
+        except Exception as e:
+            logger.error(f"❌ Error saving article embeddings: {e}")
+            return 0
+
     def mark_archive_submitted(self, article_id: str, original_url: str) -> bool:
         """Mark an article as submitted to archive service.
         
@@ -1031,13 +1062,127 @@ class ResearchRepository:
             True if article exists, False otherwise
         """
         try:
-            query = "SELECT id FROM research_articles WHERE url = %s LIMIT 1"
-            results = self.client.execute_query(query, (url,))
+            # Called for every candidate article during ingestion, so reuse a prepared plan
+            query = "SELECT id FROM research_articles WHERE url = $1 LIMIT 1"
+            results = self.client.execute_prepared("article_exists", query, (url,))
             return len(results) > 0
         except Exception as e:
             logger.error(f"❌ Error checking if article exists: {e}")
             return False
     
+    def existing_urls(self, urls: List[str]) -> set:
+        """Check which of many URLs are already stored, in one query
+        
+        Args:
+            urls: Article URLs
+            
+        Returns:
+            Set of the given URLs that already exist
+        """
+        if not urls:
+            return set()
+        try:
+            results = self.client.execute_query(
+                "SELECT url FROM research_articles WHERE url = ANY(%s)",
+                (list(set(urls)),)
+            )
+            return {row['url'] for row in results}
+        except Exception as e:
+            logger.error(f"❌ Error checking existing article URLs: {e}")
+            # Fall back to per-URL checks rather than re-ingesting everything
+            return {url for url in set(urls) if self.article_exists(url)}
+    
+    def save_articles(self, articles: List[Dict[str, Any]]) -> Dict[str, str]:
+        """Save many research articles in one multi-row INSERT
+        
+        Each dict takes the same keyword arguments as save_article() (except
+        ``embedding``; embeddings are added afterwards with
+        update_article_embeddings()). Conflicting URLs are updated like
+        save_article() does.
+        
+        Args:
+            articles: Article field dicts (title and url required)
+            
+        Returns:
+            Mapping of URL to article ID (UUID as string) for saved articles
+        """
+        rows = {}
+        for article in articles:
+            if not article.get('title') or not article.get('url'):
+                logger.error("Title and URL are required")
+                continue
+            
+            published_at = article.get('published_at')
+            if isinstance(published_at, datetime):
+                if published_at.tzinfo is None:
+                    published_at = published_at.replace(tzinfo=timezone.utc)
+                published_at = published_at.isoformat()
+            claims = article.get('claims')
+            
+            # Later duplicates win (ON CONFLICT can't touch one row twice per statement)
+            rows[article['url']] = (
+                article.get('tickers') or None,
+                article.get('sector'),
+                article.get('article_type', "ticker_news"),
+                article['title'],
+                article['url'],
+                article.get('summary'),
+                article.get('content'),
+                article.get('source'),
+                published_at or None,
+                article.get('relevance_score'),
+                article.get('fund'),
+                json.dumps(claims) if claims else None,
+                article.get('fact_check'),
+                article.get('conclusion'),
+                article.get('sentiment'),
+                article.get('sentiment_score'),
+                article.get('logic_check')
+            )
+        
+        if not rows:
+            return {}
+        
+        query = """
+            INSERT INTO research_articles (
+                tickers, sector, article_type, title, url, summary, content,
+                source, published_at, relevance_score, fund,
+                claims, fact_check, conclusion, sentiment, sentiment_score, logic_check
+            ) VALUES %s
+            ON CONFLICT (url) DO UPDATE SET
+                tickers = EXCLUDED.tickers,
+                sector = EXCLUDED.sector,
+                article_type = EXCLUDED.article_type,
+                title = EXCLUDED.title,
+                summary = EXCLUDED.summary,
+                content = EXCLUDED.content,
+                source = EXCLUDED.source,
+                published_at = EXCLUDED.published_at,
+                relevance_score = EXCLUDED.relevance_score,
+                fund = EXCLUDED.fund,
+                claims = EXCLUDED.claims,
+                fact_check = EXCLUDED.fact_check,
+                conclusion = EXCLUDED.conclusion,
+                sentiment = EXCLUDED.sentiment,
+                sentiment_score = EXCLUDED.sentiment_score,
+                logic_check = EXCLUDED.logic_check,
+                fetched_at = CURRENT_TIMESTAMP
+            RETURNING url, id
+        """
+        template = "(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s::jsonb, %s, %s, %s, %s, %s)"
+        
+        try:
+            with self.client.get_connection() as conn:
+                cursor = conn.cursor()
+                result = execute_values(cursor, query, list(rows.values()), template=template, fetch=True)
+                conn.commit()
+            saved = {url: str(article_id) for url, article_id in result}
+            logger.info(f"✅ Saved {len(saved)} articles in one batch")
+            return saved
+        except Exception as e:
+            logger.error(f"❌ Error saving batch of {len(rows)} articles: {e}")
+            return {}
+    
     def get_article_statistics(self, days: int = 30) -> Dict[str, Any]:
         """Get statistics about articles
         
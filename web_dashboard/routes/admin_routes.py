@@ -21,6 +21,7 @@ from auth import require_admin
 from supabase_client import SupabaseClient
 from postgres_client import PostgresClient
 from flask_cache_utils import cache_data
+from cache_version import cache_tag, invalidate
 from dashboard_config import (
     WEBAI_COOKIES_PATH,
     COOKIE_REFRESH_LOG_PATH,
@@ -218,6 +219,31 @@ def _get_cached_application_logs(level_filter, search, exclude_modules, since_de
         logger.error(f"Traceback: {traceback.format_exc()}")
         raise
 
+def _application_logs_cursor_response(level_filter, search, exclude_modules, since_deployment, limit):
+    """Cursor-paginated application logs for the `cursor` / `after` request args.
+    
+    `cursor` pages back from a log id (empty for the newest page) and `after`
+    tails logs written after one; neither needs the full log to be counted.
+    """
+    from log_handler import read_log_page
+    
+    cursor = request.args.get('cursor')
+    after = request.args.get('after')
+    page = read_log_page(
+        limit=max(1, min(limit, 10000)),
+        before=int(cursor) if cursor else None,
+        after=int(after) if after else None,
+        level=level_filter,
+        search=search if search else None,
+        exclude_modules=exclude_modules,
+        since_deployment=since_deployment
+    )
+    return jsonify({
+        'logs': page.logs,
+        'next_cursor': page.next_cursor,
+        'latest_cursor': page.latest_cursor
+    })
+
 @cache_data(ttl=5)
 def _get_cached_ollama_log_lines():
     """Get Ollama log lines with caching"""
@@ -576,6 +602,7 @@ def api_admin_update_contributor_email():
             client.supabase.table("fund_contributions").update(
                 {"email": new_email}
             ).eq("contributor", contributor_name).execute()
+            invalidate(cache_tag("fund_contributions"))
             updates_made.append("fund_contributions records")
         except Exception as e:
             logger.warning(f"Could not update fund_contributions: {e}")
@@ -946,6 +973,9 @@ def api_logs_application():
         exclude_heartbeat = request.args.get('exclude_heartbeat', 'true').lower() == 'true'
         exclude_modules = ['scheduler.scheduler_core.heartbeat'] if exclude_heartbeat else None
         
+        if 'cursor' in request.args or 'after' in request.args:
+            return _application_logs_cursor_response(level_filter, search, exclude_modules, since_deployment, limit)
+        
         all_logs = _get_cached_application_logs(level_filter, search, exclude_modules, since_deployment)
         
         # Pagination
@@ -1043,6 +1073,9 @@ def api_admin_logs_application():
         exclude_heartbeat = request.args.get('exclude_heartbeat', 'true').lower() == 'true'
         exclude_modules = ['scheduler.scheduler_core.heartbeat'] if exclude_heartbeat else None
         
+        if 'cursor' in request.args or 'after' in request.args:
+            return _application_logs_cursor_response(level_filter, search, exclude_modules, since_deployment, limit)
+        
         all_logs = _get_cached_application_logs(level_filter, search, exclude_modules, since_deployment)
         
         # Pagination
@@ -1172,6 +1205,18 @@ def api_deployment_info():
             "error": str(e)
         }), 500
 
+@admin_bp.route('/api/admin/system/rate-limits')
+@require_admin
+def api_rate_limits():
+    """Get per-endpoint rate limit policies and hit/deny counters"""
+    try:
+        from rate_limiter import get_rate_limit_stats
+        
+        return jsonify({"rate_limits": get_rate_limit_stats()})
+    except Exception as e:
+        logger.error(f"[System API] Error getting rate limit stats: {e}", exc_info=True)
+        return jsonify({"error": str(e)}), 500
+
 @admin_bp.route('/api/admin/system/cache/clear', methods=['POST'])
 @require_admin
 def api_clear_cache():
@@ -1963,6 +2008,7 @@ def api_submit_trade():
             "date": trade_dt.isoformat()
         }
         admin_client.supabase.table("trade_log").insert(trade_data).execute()
+        invalidate(cache_tag("trade_log", fund))
         
         # 5. Process Portfolio Update
         try:
@@ -2196,6 +2242,7 @@ def api_add_contribution():
         # Service role client
         client = SupabaseClient(use_service_role=True)
         client.supabase.table("fund_contributions").insert(payload).execute()
+        invalidate(cache_tag("fund_contributions", fund))
         
         return jsonify({"success": True, "message": f"{c_type} recorded successfully"})
     except Exception as e:
@@ -3414,6 +3461,7 @@ def api_admin_merge_contributors():
             .update(update_data)\
             .eq("contributor", source_contrib['name'])\
             .execute()
+        invalidate(cache_tag("fund_contributions"))
         
         # Delete source contributor
         client.supabase.table("contributors")\
@@ -3498,6 +3546,7 @@ def api_admin_update_contributor(contributor_id):
                     .execute()
         
         # Clear cache
+        invalidate(cache_tag("fund_contributions"))
         _get_cached_contributors_flask.clear_all_cache()
         
         return jsonify({
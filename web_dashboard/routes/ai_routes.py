@@ -11,6 +11,8 @@ sys.path.append(str(Path(__file__).parent.parent))
 from auth import require_auth
 from flask_auth_utils import get_user_email_flask, get_user_id_flask
 from flask_cache_utils import cache_data
+from cache_version import cache_tag
+from rate_limiter import rate_limit
 from user_preferences import get_user_theme, get_user_ai_model, get_user_preference
 from flask_data_utils import (
     get_available_funds_flask, get_current_positions_flask, get_trade_log_flask,
@@ -172,7 +174,10 @@ def _get_etf_trades_for_portfolio(fund: str, days: int = 7) -> List[Dict]:
         return []
 
 
-@cache_data(ttl=300)
+@cache_data(ttl=300, depends_on=lambda user_id, fund, **_: [
+    cache_tag("portfolio_positions", fund), cache_tag("trade_log", fund), cache_tag("cash_balances", fund),
+    cache_tag("fund_thesis", fund), cache_tag("insider_trades"), cache_tag("congress_trades")
+])
 def _get_context_data_packet(user_id: str, fund: str):
     """Get context data packet with caching (300s TTL)"""
     logger.info(f"Refreshing context data for {user_id}/{fund}")
@@ -459,6 +464,7 @@ def ai_assistant_page():
 
 @ai_bp.route('/api/v2/ai/search', methods=['POST'])
 @require_auth
+@rate_limit(limit=20, period=60, per='user')  # Web search + LLM per request
 def api_ai_search():
     """Perform web search"""
     try:
@@ -482,6 +488,7 @@ def api_ai_search():
 
 @ai_bp.route('/api/v2/ai/preview_context', methods=['POST'])
 @require_auth
+@rate_limit(limit=30, period=60, per='user')
 def api_ai_preview_context():
     """Preview the AI context (debug mode) - Shows the raw data tables sent to LLM"""
     try:
@@ -540,6 +547,7 @@ def api_ai_models():
 
 @ai_bp.route('/api/v2/ai/context/build', methods=['POST'])
 @require_auth
+@rate_limit(limit=30, period=60, per='user')
 def api_ai_context_build():
     """Build context string with portfolio data tables (called by JS before chat)"""
     try:
@@ -673,6 +681,7 @@ def api_ai_context():
 
 @ai_bp.route('/api/v2/ai/repository', methods=['POST'])
 @require_auth
+@rate_limit(limit=20, period=60, per='user')
 def api_ai_repository():
     """Search research repository (RAG)"""
     try:
@@ -715,6 +724,7 @@ def api_ai_repository():
 
 @ai_bp.route('/api/v2/ai/portfolio-intelligence', methods=['POST'])
 @require_auth
+@rate_limit(limit=10, period=60, per='user')  # Runs a full portfolio analysis
 def api_ai_portfolio_intelligence():
     """Check portfolio news from research repository"""
     try:
@@ -780,6 +790,7 @@ def api_ai_portfolio_intelligence():
 
 @ai_bp.route('/api/v2/ai/chat', methods=['POST'])
 @require_auth
+@rate_limit(limit=20, period=60, per='user')  # Each message is an LLM call
 def api_ai_chat():
     """Handle chat message and stream AI response"""
     try:
@@ -818,9 +829,11 @@ def api_ai_chat():
             if not context_items:
                 logger.warning("No context available after waiting, proceeding without context")
         
+        # One handler for the whole request so time-to-first-token covers context assembly
+        handler = ChatHandler(user_id=user_id, model=model, fund=fund)
+        
         # Build context if not provided
         if not context_string and context_items:
-            handler = ChatHandler(user_id=user_id, model=model, fund=fund)
             options = {
                 'include_price_volume': data.get('include_price_volume', True),
                 'include_fundamentals': data.get('include_fundamentals', True),
@@ -834,7 +847,6 @@ def api_ai_chat():
         include_search = data.get('include_search', True)
         
         # Use ChatHandler to route to appropriate backend
-        handler = ChatHandler(user_id=user_id, model=model, fund=fund)
         return handler.handle_chat(
             query=user_query,
             context_string=context_string,
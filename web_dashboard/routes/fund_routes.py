@@ -1,6 +1,7 @@
 from flask import Blueprint, jsonify, request, current_app
 from auth import require_admin, is_admin
 from streamlit_utils import get_supabase_client, SupabaseClient
+from cache_version import cache_tag, invalidate
 import logging
 import os
 import sys
@@ -226,6 +227,7 @@ def wipe_fund_data(fund_name):
                 return jsonify({"warning": "Cannot wipe trades for production fund without force flag"}), 400
                 
             client.supabase.table("trade_log").delete().eq("fund", fund_name).execute()
+            invalidate(cache_tag("trade_log", fund_name))
             
         # Reset cash
         client.supabase.table("cash_balances").update({"amount": 0}).eq("fund", fund_name).execute()
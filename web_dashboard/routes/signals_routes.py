@@ -21,7 +21,7 @@ from auth import require_auth
 from supabase_client import SupabaseClient
 from flask_auth_utils import get_user_email_flask, get_auth_token
 from flask_cache_utils import cache_resource, cache_data
-from cache_version import get_cache_version
+from cache_version import cache_tag
 from auth import is_admin
 from market_data.data_fetcher import MarketDataFetcher
 from web_dashboard.signals.signal_engine import SignalEngine
@@ -51,11 +51,10 @@ def get_supabase_client():
         return None
 
 # Cached helper functions
-@cache_data(ttl=300)
+@cache_data(ttl=300, depends_on=[cache_tag("watched_tickers")])
 def get_cached_watchlist_signals(
     _supabase_client,
-    _refresh_key: int = 0,
-    _cache_version: str = ""
+    _refresh_key: int = 0
 ) -> List[Dict[str, Any]]:
     """Get signals for all watchlist tickers (cached)"""
     try:
@@ -373,7 +372,6 @@ def api_watchlist_signals():
     """Get signals for all watchlist tickers"""
     try:
         refresh_key = int(request.args.get('refresh_key', 0))
-        cache_version = get_cache_version()
         
         supabase_client = get_supabase_client()
         if not supabase_client:
@@ -382,11 +380,7 @@ def api_watchlist_signals():
                 'error': 'Database connection unavailable'
             }), 503
         
-        signals = get_cached_watchlist_signals(
-            supabase_client,
-            refresh_key,
-            cache_version
-        )
+        signals = get_cached_watchlist_signals(supabase_client, refresh_key)
         
         # Calculate summary metrics
         total = len(signals)
@@ -23,7 +23,7 @@ from supabase_client import SupabaseClient
 from flask_auth_utils import get_user_email_flask, get_auth_token
 from flask_cache_utils import cache_resource, cache_data
 from user_preferences import get_user_preference
-from cache_version import get_cache_version
+from cache_version import cache_tag
 from auth import is_admin
 
 # Try to import zoneinfo for timezone conversion (Python 3.9+)
@@ -114,12 +114,11 @@ def get_sentiment_color(label: Optional[str]) -> str:
     return color_map.get(label_upper, "gray")
 
 # Cached data fetching functions
-@cache_data(ttl=60)
+@cache_data(ttl=60, depends_on=[cache_tag("watched_tickers")])
 def get_cached_dynamic_watchlist(
     _supabase_client,
     _postgres_client,
-    _refresh_key: int = 0,
-    _cache_version: str = ""
+    _refresh_key: int = 0
 ) -> List[Dict[str, Any]]:
     """Get dynamic watchlist tickers from multiple sources (cached)"""
     try:
@@ -310,11 +309,10 @@ def get_cached_dynamic_watchlist(
         logger.error(f"Error fetching dynamic watchlist: {e}", exc_info=True)
         return []
 
-@cache_data(ttl=60)
+@cache_data(ttl=60, depends_on=[cache_tag("social_metrics")])
 def get_cached_extreme_alerts(
     _client,
-    _refresh_key: int = 0,
-    _cache_version: str = ""
+    _refresh_key: int = 0
 ) -> List[Dict[str, Any]]:
     """Get EUPHORIC or FEARFUL sentiment alerts from last 24 hours (cached)"""
     try:
@@ -353,11 +351,10 @@ def get_cached_ai_analyses(
         logger.error(f"Error fetching AI analyses: {e}", exc_info=True)
         return []
 
-@cache_data(ttl=60)
+@cache_data(ttl=60, depends_on=[cache_tag("social_metrics")])
 def get_cached_latest_sentiment(
     _client,
-    _refresh_key: int = 0,
-    _cache_version: str = ""
+    _refresh_key: int = 0
 ) -> List[Dict[str, Any]]:
     """Get the most recent sentiment metric for each ticker/platform combination (cached)"""
     try:
@@ -385,7 +382,6 @@ def social_sentiment_page():
         user_email = get_user_email_flask()
         user_theme = get_user_preference('theme', default='system')
         refresh_key = int(request.args.get('refresh_key', 0))
-        cache_version = get_cache_version()
         
         # Get database clients
         postgres_client = get_postgres_client()
@@ -406,13 +402,12 @@ def social_sentiment_page():
         watchlist_tickers = get_cached_dynamic_watchlist(
             supabase_client,
             postgres_client,
-            refresh_key,
-            cache_version
+            refresh_key
         )
         
-        alerts = get_cached_extreme_alerts(postgres_client, refresh_key, cache_version)
+        alerts = get_cached_extreme_alerts(postgres_client, refresh_key)
         ai_analyses = get_cached_ai_analyses(postgres_client, refresh_key)
-        latest_sentiment = get_cached_latest_sentiment(postgres_client, refresh_key, cache_version)
+        latest_sentiment = get_cached_latest_sentiment(postgres_client, refresh_key)
         
         # Calculate summary statistics
         watchlist_summary = {
@@ -469,7 +464,6 @@ def api_watchlist():
     """API endpoint for dynamic watchlist tickers"""
     try:
         refresh_key = int(request.args.get('refresh_key', 0))
-        cache_version = get_cache_version()
         
         postgres_client = get_postgres_client()
         supabase_client = get_supabase_client()
@@ -477,8 +471,7 @@ def api_watchlist():
         watchlist = get_cached_dynamic_watchlist(
             supabase_client,
             postgres_client,
-            refresh_key,
-            cache_version
+            refresh_key
         )
         
         return jsonify({
@@ -495,13 +488,12 @@ def api_alerts():
     """API endpoint for extreme sentiment alerts"""
     try:
         refresh_key = int(request.args.get('refresh_key', 0))
-        cache_version = get_cache_version()
         
         postgres_client = get_postgres_client()
         if postgres_client is None:
             return jsonify({'success': False, 'error': 'Postgres client unavailable'}), 500
         
-        alerts = get_cached_extreme_alerts(postgres_client, refresh_key, cache_version)
+        alerts = get_cached_extreme_alerts(postgres_client, refresh_key)
         
         # Format alerts for frontend
         formatted_alerts = []
@@ -569,7 +561,6 @@ def api_latest_sentiment():
     """API endpoint for latest sentiment per ticker"""
     try:
         refresh_key = int(request.args.get('refresh_key', 0))
-        cache_version = get_cache_version()
         show_only_watchlist = request.args.get('show_only_watchlist', 'false') == 'true'
         
         postgres_client = get_postgres_client()
@@ -578,7 +569,7 @@ def api_latest_sentiment():
         if postgres_client is None:
             return jsonify({'success': False, 'error': 'Postgres client unavailable'}), 500
         
-        latest_sentiment = get_cached_latest_sentiment(postgres_client, refresh_key, cache_version)
+        latest_sentiment = get_cached_latest_sentiment(postgres_client, refresh_key)
         ai_analyses = get_cached_ai_analyses(postgres_client, refresh_key)
         
         # Get watchlist for filtering
@@ -587,8 +578,7 @@ def api_latest_sentiment():
             watchlist_tickers = get_cached_dynamic_watchlist(
                 supabase_client,
                 postgres_client,
-                refresh_key,
-                cache_version
+                refresh_key
             )
         watchlist_ticker_set = set([t.get('ticker') for t in watchlist_tickers]) if watchlist_tickers else set()
         
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+RSS Ingestion Pipeline
+======================
+
+Staged, concurrent pipeline used by ``rss_feed_ingest_job``:
+
+1. **fetch**   - feeds are fetched concurrently, with a per-domain politeness
+                 limit instead of fixed sleeps between feeds
+2. **dedupe**  - one bulk URL-existence check per feed (the job's filter callback)
+3. **process** - new items go to a bounded worker pool for content
+                 extraction and summarization
+4. **save**    - processed records are written in batches
+
+Every stage records item counts, busy time and throughput in a
+PipelineMetrics instance, logged when the run finishes.
+
+The pipeline is source-agnostic: the job supplies the fetch, filter,
+process and save callbacks, so it can be exercised with fakes in tests.
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# Concurrency defaults (override via environment)
+RSS_FEED_WORKERS = int(os.getenv("RSS_FEED_WORKERS", "4"))
+RSS_ITEM_WORKERS = int(os.getenv("RSS_ITEM_WORKERS", "3"))
+RSS_SAVE_BATCH_SIZE = int(os.getenv("RSS_SAVE_BATCH_SIZE", "20"))
+
+# Politeness: concurrent requests per domain and minimum gap between them
+RSS_DOMAIN_CONCURRENCY = int(os.getenv("RSS_DOMAIN_CONCURRENCY", "2"))
+RSS_DOMAIN_INTERVAL = float(os.getenv("RSS_DOMAIN_INTERVAL", "1.0"))
+
+
+def domain_of(url: str) -> str:
+    """Get the host a URL points to (``unknown`` if it can't be parsed)."""
+    try:
+        return (urlparse(url).hostname or "unknown").lower()
+    except Exception:
+        return "unknown"
+
+
+class DomainLimiter:
+    """Per-domain politeness limit shared by all pipeline workers.
+
+    At most ``max_concurrent`` requests run against one domain at a time and
+    consecutive requests to a domain start at least ``min_interval`` seconds
+    apart. Different domains never wait on each other.
+    """
+
+    def __init__(self, max_concurrent: int = RSS_DOMAIN_CONCURRENCY, min_interval: float = RSS_DOMAIN_INTERVAL):
+        self.max_concurrent = max(1, max_concurrent)
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._next_start: Dict[str, float] = {}
+
+    @contextmanager
+    def slot(self, url: str) -> Iterator[None]:
+        """Hold a request slot for the URL's domain.
+
+        Usage:
+            with limiter.slot(url):
+                response = session.get(url)
+        """
+        domain = domain_of(url)
+        with self._lock:
+            semaphore = self._slots.get(domain)
+            if semaphore is None:
+                semaphore = self._slots[domain] = threading.BoundedSemaphore(self.max_concurrent)
+
+        with semaphore:
+            with self._lock:
+                now = time.monotonic()
+                start = max(now, self._next_start.get(domain, now))
+                self._next_start[domain] = start + self.min_interval
+            if start > now:
+                time.sleep(start - now)
+            yield
+
+
+@dataclass
+class StageMetrics:
+    """Throughput counters for one pipeline stage."""
+    name: str
+    items: int = 0
+    errors: int = 0
+    busy_seconds: float = 0.0
+    first_start: Optional[float] = None
+    last_end: Optional[float] = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def record(self, items: int = 1, seconds: float = 0.0, error: bool = False) -> None:
+        """Record work done by the stage."""
+        end = time.monotonic()
+        with self._lock:
+            self.items += items
+            self.errors += int(error)
+            self.busy_seconds += seconds
+            if self.first_start is None or end - seconds < self.first_start:
+                self.first_start = end - seconds
+            self.last_end = end
+
+    @contextmanager
+    def timed(self, items: int = 1) -> Iterator[None]:
+        """Time a block of work; exceptions are counted as errors and re-raised."""
+        start = time.monotonic()
+        try:
+            yield
+        except Exception:
+            self.record(items, time.monotonic() - start, error=True)
+            raise
+        self.record(items, time.monotonic() - start)
+
+    @property
+    def elapsed_seconds(self) -> float:
+        """Wall-clock time from the stage's first to last recorded work."""
+        if self.first_start is None or self.last_end is None:
+            return 0.0
+        return self.last_end - self.first_start
+
+    @property
+    def throughput(self) -> float:
+        """Items per wall-clock second while the stage was active."""
+        elapsed = self.elapsed_seconds
+        return self.items / elapsed if elapsed > 0 else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"{self.name}: {self.items} items, {self.errors} errors, "
+            f"{self.throughput:.2f}/s, busy {self.busy_seconds:.1f}s"
+        )
+
+
+class PipelineMetrics:
+    """Per-stage metrics for one pipeline run."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stages: Dict[str, StageMetrics] = {}
+        self.started = time.monotonic()
+
+    def stage(self, name: str) -> StageMetrics:
+        """Get (creating on first use) the metrics for a stage."""
+        with self._lock:
+            metrics = self.stages.get(name)
+            if metrics is None:
+                metrics = self.stages[name] = StageMetrics(name)
+            return metrics
+
+    def as_dict(self) -> Dict[str, Dict[str, Any]]:
+        """Metrics as plain values (for job messages or JSON)."""
+        return {
+            name: {
+                'items': stage.items,
+                'errors': stage.errors,
+                'busy_seconds': round(stage.busy_seconds, 3),
+                'throughput_per_s': round(stage.throughput, 3),
+            }
+            for name, stage in self.stages.items()
+        }
+
+    def log_summary(self) -> None:
+        """Log one line per stage plus total wall time."""
+        total = time.monotonic() - self.started
+        logger.info(f"📊 RSS pipeline finished in {total:.1f}s")
+        for stage in self.stages.values():
+            logger.info(f"  📊 {stage.summary()}")
+
+
+def run_pipeline(
+    feeds: List[Dict[str, Any]],
+    fetch_feed: Callable[[Dict[str, Any]], Optional[List[Dict[str, Any]]]],
+    filter_new: Callable[[Dict[str, Any], List[Dict[str, Any]]], List[Dict[str, Any]]],
+    process_item: Callable[[Dict[str, Any], Dict[str, Any]], Optional[Dict[str, Any]]],
+    save_batch: Callable[[List[Dict[str, Any]]], int],
+    metrics: Optional[PipelineMetrics] = None,
+    limiter: Optional[DomainLimiter] = None,
+    feed_workers: int = RSS_FEED_WORKERS,
+    item_workers: int = RSS_ITEM_WORKERS,
+    batch_size: int = RSS_SAVE_BATCH_SIZE
+) -> PipelineMetrics:
+    """Run feeds through fetch -> dedupe -> process -> save.
+
+    Args:
+        feeds: Feed rows; each needs a ``url`` key
+        fetch_feed: Returns a feed's items (None/empty if the fetch failed)
+        filter_new: Returns the items of a feed that still need processing
+            (e.g. one bulk URL-existence query)
+        process_item: Turns an item into a record to save, or None to skip.
+            Runs on the item worker pool.
+        save_batch: Saves a list of records, returning how many were saved
+        metrics: Metrics to fill in (a new instance if omitted)
+        limiter: Per-domain politeness limit for feed fetches
+        feed_workers: Concurrent feed fetches
+        item_workers: Concurrent item workers
+        batch_size: Records per save_batch call
+
+    Returns:
+        The PipelineMetrics for the run
+    """
+    metrics = metrics or PipelineMetrics()
+    limiter = limiter or DomainLimiter()
+    fetch_stage = metrics.stage('fetch')
+    dedupe_stage = metrics.stage('dedupe')
+    process_stage = metrics.stage('process')
+    save_stage = metrics.stage('save')
+
+    def fetch(feed):
+        with limiter.slot(feed['url']):
+            with fetch_stage.timed():
+                return fetch_feed(feed)
+
+    def process(feed, item):
+        with process_stage.timed():
+            return process_item(feed, item)
+
+    batch: List[Dict[str, Any]] = []
+
+    def flush():
+        if not batch:
+            return
+        records = list(batch)
+        batch.clear()
+        try:
+            with save_stage.timed(len(records)):
+                save_batch(records)
+        except Exception as e:
+            logger.error(f"❌ Error saving batch of {len(records)} RSS articles: {e}", exc_info=True)
+
+    with ThreadPoolExecutor(max_workers=max(1, feed_workers), thread_name_prefix="rss-feed") as feed_pool, \
+            ThreadPoolExecutor(max_workers=max(1, item_workers), thread_name_prefix="rss-item") as item_pool:
+        feed_futures = {feed_pool.submit(fetch, feed): feed for feed in feeds}
+        item_futures = set()
+        pending = set(feed_futures)
+
+        while pending or item_futures:
+            done, _ = wait(pending | item_futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future in pending:
+                    pending.discard(future)
+                    feed = feed_futures[future]
+                    try:
+                        items = future.result()
+                    except Exception as e:
+                        logger.error(f"Error fetching feed '{feed.get('name', feed['url'])}': {e}")
+                        continue
+                    if not items:
+                        continue
+
+                    try:
+                        with dedupe_stage.timed(len(items)):
+                            new_items = filter_new(feed, items)
+                    except Exception as e:
+                        logger.error(f"Error checking items of feed '{feed.get('name', feed['url'])}': {e}")
+                        continue
+                    for item in new_items:
+                        item_futures.add(item_pool.submit(process, feed, item))
+                else:
+                    item_futures.discard(future)
+                    try:
+                        record = future.result()
+                    except Exception as e:
+                        logger.error(f"Error processing RSS item: {e}")
+                        continue
+                    if record:
+                        batch.append(record)
+                        if len(batch) >= batch_size:
+                            flush()
+        flush()
+
+    return metrics
@@ -578,6 +578,13 @@ def fetch_congress_trades_job() -> None:
         log_job_execution(job_id, success=True, message=message, duration_ms=duration_ms)
         mark_job_completed('congress_trades', target_date, None, [], duration_ms=duration_ms, message=message)
         logger.info(f"✅ Congress trades job completed: {message} in {duration_ms/1000:.2f}s")
+
+        # Invalidate cached congress trades so pages show the new trades
+        try:
+            from cache_version import invalidate, cache_tag
+            invalidate(cache_tag("congress_trades"))
+        except Exception as cache_error:
+            logger.warning(f"⚠️  Failed to invalidate congress trades cache: {cache_error}")
         
     except Exception as e:
         duration_ms = int((time.time() - start_time) * 1000)
@@ -1109,6 +1116,13 @@ def scrape_congress_trades_job(months_back: Optional[int] = None, page_size: int
             log_job_execution(job_id, success=True, message=message, duration_ms=duration_ms)
             mark_job_completed('scrape_congress_trades', target_date, None, [], duration_ms=duration_ms, message=message)
             logger.info(f"✅ {message}")
+
+            # Invalidate cached congress trades so pages show the new trades
+            try:
+                from cache_version import invalidate, cache_tag
+                invalidate(cache_tag("congress_trades"))
+            except Exception as cache_error:
+                logger.warning(f"⚠️  Failed to invalidate congress trades cache: {cache_error}")
         else:
             duration_ms = int((time.time() - start_time) * 1000)
             # Use last 10 lines as error snippet
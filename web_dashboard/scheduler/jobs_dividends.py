@@ -531,6 +531,7 @@ def process_dividends_job(lookback_days: int = 7) -> None:
             processed_keys.add((row['fund'], row['ticker'], row['ex_date']))
             
         stats = {'processed': 0, 'skipped': 0, 'errors': 0}
+        funds_with_dividends = set()
         
         # Lookback window
         today = date.today()
@@ -561,6 +562,7 @@ def process_dividends_job(lookback_days: int = 7) -> None:
                     success = insert_drip_transaction(fund, ticker, evt, fund_type, client)
                     if success:
                         stats['processed'] += 1
+                        funds_with_dividends.add(fund)
                         # Add to processed set to prevent double counting in same run
                         processed_keys.add((fund, ticker, evt.pay_date.isoformat()))
                     else:
@@ -569,6 +571,18 @@ def process_dividends_job(lookback_days: int = 7) -> None:
             except Exception as e:
                 logger.error(f"Error processing {ticker}: {e}")
                 stats['errors'] += 1
+        
+        # DRIP inserts add trades and dividends - invalidate only those funds' cached data
+        if funds_with_dividends:
+            try:
+                from cache_version import invalidate, cache_tag
+                invalidate(*(
+                    cache_tag(table, fund)
+                    for fund in funds_with_dividends
+                    for table in ("dividend_log", "trade_log", "portfolio_positions")
+                ))
+            except Exception as cache_error:
+                logger.warning(f"Failed to invalidate dividend caches: {cache_error}")
                 
         duration = int((time.time() - start_time) * 1000)
         msg = f"Processed {stats['processed']}, Skipped {stats['skipped']}, Errors {stats['errors']}"
@@ -42,11 +42,25 @@ Pagination:
 For ETFs with >1000 holdings (IWM, IWC, IWO), the job uses pagination to fetch
 all holdings from the database. This prevents false positives where holdings
 beyond the 1000-row limit appear as "new" positions.
+
+Scaling:
+--------
+Holdings files are downloaded concurrently (ETF_FETCH_WORKERS threads, at
+most ETF_HOST_CONCURRENCY requests per provider host), the previous
+snapshots of all ETFs are loaded with a single query, and each snapshot is
+written with COPY into a staging table followed by one INSERT ... ON
+CONFLICT merge. Job runtime is bounded by the slowest provider rather than
+the sum of all downloads. Change detection runs over all ETFs at once in
+the vectorized diff engine (etf_diff_engine.py).
 """
 
+import io
 import logging
+import os
 import sys
 import base64
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Optional, Tuple
@@ -59,6 +73,16 @@ sys.path.append(str(Path(__file__).resolve().parent.parent))
 from supabase_client import SupabaseClient
 from research_repository import ResearchRepository
 from postgres_client import PostgresClient
+from rss_pipeline import DomainLimiter
+from etf_diff_engine import calculate_diff, calculate_diffs, stock_ticker_mask
+# Re-exported for debug scripts that import the filters from this module
+from etf_diff_engine import (  # noqa: F401
+    EXCLUDED_TICKER_PATTERNS,
+    EXCLUDED_TICKERS,
+    MIN_PERCENT_CHANGE,
+    MIN_SHARE_CHANGE,
+    is_stock_ticker,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -153,86 +177,10 @@ ETF_NAMES = {
     "OIH": "VanEck Oil Services ETF",
 }
 
-# Thresholds for "significant" changes
-MIN_SHARE_CHANGE = 1000  # Minimum absolute share change to log
-MIN_PERCENT_CHANGE = 0.5  # Minimum % change relative to previous holdings
-
-# Systematic Adjustment Detection
-# ===============================
-# The change detection logic filters out systematic adjustments (e.g., expense ratio deductions)
-# that affect all holdings proportionally. These are NOT trading activity.
-#
-# A systematic adjustment is detected when:
-# 1. 80%+ of changes cluster around the same percentage (within 0.1%)
-# 2. That percentage is ≤2% (small adjustments, not large trades)
-# 3. All changes are in the same direction (all buys OR all sells)
-#
-# Examples of systematic adjustments:
-# - Expense ratio deductions (~0.5% annually, applied proportionally)
-# - Data normalization/rounding adjustments
-# - Systematic rebalancing calculations
-#
-# Real trading activity shows:
-# - Different percentages for different holdings
-# - Mixed buys and sells
-# - New positions added / old positions removed
-# - Varied change patterns
-
-# Tickers to exclude from change detection (cash, futures, derivatives, etc.)
-# These are valid holdings but not actionable stock signals
-EXCLUDED_TICKERS = {
-    # Cash and cash equivalents
-    'USD', 'CASH', 'CASHCOLLATERAL', 'MARGIN_CASH', 'MONEY_MARKET',
-    # Futures and derivatives
-    'XTSLA', 'MSFUT', 'SGAFT', 'ESH6', 'ESH5', 'ESM6', 'ESU6', 'ESZ6',
-    'NQH6', 'NQM6', 'NQU6', 'NQZ6', 'RTY', 'RTYM6', 'SPY_FUT',
-    'ETD_USD', 'FUT', 'SWAP', 'FWD',
-    # Treasury/bonds (often in ETFs but not stock signals)
-    'TBILL', 'USINTR', 'BIL',
-}
-
-# Patterns that indicate non-stock holdings
-EXCLUDED_TICKER_PATTERNS = [
-    'FUT',   # Futures
-    '_USD',  # USD-denominated derivatives
-    'SWAP',  # Swaps
-    'FWD',   # Forwards
-]
-
-
-def is_stock_ticker(ticker: str) -> bool:
-    """Check if a ticker represents a tradeable stock (not cash/futures/derivatives).
-    
-    Args:
-        ticker: Ticker symbol
-        
-    Returns:
-        True if it's a stock ticker, False if it should be excluded
-    """
-    if not ticker or not isinstance(ticker, str):
-        return False
-    
-    ticker_upper = ticker.upper().strip()
-    
-    # Check explicit exclusions
-    if ticker_upper in EXCLUDED_TICKERS:
-        return False
-    
-    # Check patterns
-    for pattern in EXCLUDED_TICKER_PATTERNS:
-        if pattern in ticker_upper:
-            return False
-    
-    # Exclude tickers that are just numbers (often futures contracts)
-    if ticker_upper.isdigit():
-        return False
-    
-    # Exclude very long tickers (usually derivatives or internal codes)
-    if len(ticker_upper) > 10:
-        return False
-    
-    return True
-
+# Concurrent downloads (override via environment)
+ETF_FETCH_WORKERS = int(os.getenv("ETF_FETCH_WORKERS", "8"))
+ETF_HOST_CONCURRENCY = int(os.getenv("ETF_HOST_CONCURRENCY", "2"))
+ETF_HOST_INTERVAL = float(os.getenv("ETF_HOST_INTERVAL", "0.5"))
 
 def save_raw_etf_file(etf_ticker: str, file_content: bytes, file_extension: str, date: datetime) -> Optional[Path]:
     """Save raw ETF file for later reprocessing.
@@ -660,7 +608,7 @@ def fetch_direxion_holdings(etf_ticker: str, csv_url: str, date: Optional[dateti
         df['ticker'] = df['ticker'].astype(str).str.upper().str.strip()
         
         # Filter to valid stock tickers only (exclude cash, futures, etc.)
-        df = df[df['ticker'].apply(is_stock_ticker)]
+        df = df[stock_ticker_mask(df['ticker'])]
         
         # Convert numeric columns
         if 'shares' in df.columns:
@@ -776,7 +724,7 @@ def fetch_vaneck_holdings(etf_ticker: str, xlsx_url: str, date: Optional[datetim
         df['ticker'] = df['ticker'].astype(str).str.split().str[0].str.upper().str.strip()
         
         # Filter to valid stock tickers only
-        df = df[df['ticker'].apply(is_stock_ticker)]
+        df = df[stock_ticker_mask(df['ticker'])]
         
         # Convert numeric columns
         if 'shares' in df.columns:
@@ -802,153 +750,135 @@ def fetch_vaneck_holdings(etf_ticker: str, xlsx_url: str, date: Optional[datetim
         return None
 
 
-def get_previous_holdings(pc: PostgresClient, etf_ticker: str, date: datetime) -> pd.DataFrame:
-    """Fetch latest available previous holdings from Research DB.
+# Holdings downloader per provider: fetch(etf_ticker, url, date) -> DataFrame or None
+PROVIDER_FETCHERS = {
+    'ARK': fetch_ark_holdings,
+    'iShares': fetch_ishares_holdings,
+    'SPDR': fetch_spdr_holdings,
+    'Global X': fetch_globalx_holdings,
+    'Direxion': fetch_direxion_holdings,
+    'VanEck': fetch_vaneck_holdings,
+}
+
+
+def fetch_all_holdings(configs: Dict[str, Dict], date: datetime, max_workers: int = ETF_FETCH_WORKERS,
+                       limiter: Optional[DomainLimiter] = None) -> Dict[str, Optional[pd.DataFrame]]:
+    """Download today's holdings for all ETFs concurrently.
     
     Args:
-        pc: PostgresClient for research database
-        etf_ticker: ETF ticker
-        date: Current processing date
+        configs: ETF configs by ticker (see ETF_CONFIGS)
+        date: Date for raw file organization
+        max_workers: Download threads
+        limiter: Per-host request limit (defaults to ETF_HOST_CONCURRENCY
+            concurrent requests, ETF_HOST_INTERVAL seconds apart)
         
     Returns:
-        DataFrame with previous holdings
+        Holdings DataFrame (None if the download failed) by ETF ticker, for
+        every ETF with a supported provider
     """
-    date_str = date.strftime('%Y-%m-%d')
+    limiter = limiter or DomainLimiter(ETF_HOST_CONCURRENCY, ETF_HOST_INTERVAL)
     
-    try:
-        # 1. Find latest date before today
-        date_res = pc.execute_query("""
-            SELECT date FROM etf_holdings_log
-            WHERE etf_ticker = %s AND date < %s
-            ORDER BY date DESC
-            LIMIT 1
-        """, (etf_ticker, date_str))
+    supported = {}
+    for etf_ticker, config in configs.items():
+        if config['provider'] in PROVIDER_FETCHERS:
+            supported[etf_ticker] = config
+        else:
+            logger.warning(f"⚠️ Provider {config['provider']} not yet implemented")
+    if not supported:
+        return {}
+    
+    def fetch(etf_ticker: str, config: Dict) -> Optional[pd.DataFrame]:
+        with limiter.slot(config['url']):
+            return PROVIDER_FETCHERS[config['provider']](etf_ticker, config['url'], date)
+    
+    results = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(supported))), thread_name_prefix="etf-fetch") as executor:
+        future_to_etf = {executor.submit(fetch, etf_ticker, config): etf_ticker for etf_ticker, config in supported.items()}
+        for future in as_completed(future_to_etf):
+            etf_ticker = future_to_etf[future]
+            try:
+                results[etf_ticker] = future.result()
+            except Exception as e:
+                logger.error(f"❌ Error downloading {etf_ticker} holdings: {e}")
+                results[etf_ticker] = None
+    return results
 
-        if not date_res:
-            logger.info(f"ℹ️  No previous history found for {etf_ticker} before {date_str}")
-            return pd.DataFrame(columns=['ticker', 'shares', 'weight_percent'])
 
-        previous_date = date_res[0]['date']
-        logger.info(f"Comparing {etf_ticker} against latest snapshot: {previous_date}")
-
-        # 2. Fetch holdings for that date
-        result = pc.execute_query("""
-            SELECT holding_ticker, shares_held, weight_percent
-            FROM etf_holdings_log
-            WHERE etf_ticker = %s AND date = %s
-        """, (etf_ticker, previous_date))
-        
-        if not result:
-            return pd.DataFrame(columns=['ticker', 'shares', 'weight_percent'])
-        
-        df = pd.DataFrame(result)
-        # Rename to match expected schema
-        df = df.rename(columns={
-            'holding_ticker': 'ticker',
-            'shares_held': 'shares'
-        })
-        
-        return df
-        
-    except Exception as e:
-        logger.error(f"Error getting previous holdings: {e}")
-        return pd.DataFrame(columns=['ticker', 'shares', 'weight_percent'])
+def _empty_holdings() -> pd.DataFrame:
+    return pd.DataFrame(columns=['ticker', 'shares', 'weight_percent'])
 
 
-def calculate_diff(today: pd.DataFrame, yesterday: pd.DataFrame, etf_ticker: str) -> List[Dict]:
-    """Calculate significant holding changes.
+def get_previous_holdings_bulk(pc: PostgresClient, etf_tickers: List[str], date: datetime) -> Dict[str, pd.DataFrame]:
+    """Fetch the latest snapshot before ``date`` for many ETFs in one query.
     
     Args:
-        today: Today's holdings DataFrame
-        yesterday: Yesterday's holdings DataFrame
-        etf_ticker: ETF ticker for logging
+        pc: PostgresClient for research database
+        etf_tickers: ETF tickers
+        date: Current processing date
         
     Returns:
-        List of dicts with significant changes (filtered to stocks only, excluding systematic adjustments)
+        DataFrame with previous holdings by ETF ticker (empty if there is no
+        earlier snapshot)
     """
-    # Convert shares to float to avoid Decimal/float type mismatch
-    # PostgreSQL returns NUMERIC as Decimal, but pandas operations need float
-    if 'shares' in yesterday.columns:
-        yesterday = yesterday.copy()
-        yesterday['shares'] = pd.to_numeric(yesterday['shares'], errors='coerce').astype(float)
-    
-    # Merge on ticker
-    merged = today.merge(
-        yesterday,
-        on='ticker',
-        how='outer',
-        suffixes=('_now', '_prev')
-    )
-    
-    # Fill NaN (new/removed positions)
-    merged['shares_now'] = merged['shares_now'].fillna(0)
-    merged['shares_prev'] = merged['shares_prev'].fillna(0)
-    
-    # Ensure both are float for arithmetic operations
-    merged['shares_now'] = pd.to_numeric(merged['shares_now'], errors='coerce').astype(float).fillna(0)
-    merged['shares_prev'] = pd.to_numeric(merged['shares_prev'], errors='coerce').astype(float).fillna(0)
+    date_str = date.strftime('%Y-%m-%d')
+    previous = {etf_ticker: _empty_holdings() for etf_ticker in etf_tickers}
+    if not etf_tickers:
+        return previous
     
-    # Calculate absolute and percentage change
-    merged['share_diff'] = merged['shares_now'] - merged['shares_prev']
-    merged['percent_change'] = ((merged['share_diff'] / merged['shares_prev']) * 100).replace([float('inf'), -float('inf')], 100)
+    try:
+        # Latest date per ETF via the (etf_ticker, date) index, then that day's holdings
+        result = pc.execute_query("""
+            SELECT e.etf_ticker, latest.date, h.holding_ticker, h.shares_held, h.weight_percent
+            FROM unnest(%s::text[]) AS e(etf_ticker)
+            CROSS JOIN LATERAL (
+                SELECT date FROM etf_holdings_log
+                WHERE etf_ticker = e.etf_ticker AND date < %s
+                ORDER BY date DESC
+                LIMIT 1
+            ) latest
+            JOIN etf_holdings_log h ON h.etf_ticker = e.etf_ticker AND h.date = latest.date
+        """, (list(etf_tickers), date_str))
+    except Exception as e:
+        logger.error(f"Error getting previous holdings: {e}")
+        return previous
     
-    # Filter for significant changes
-    significant = merged[
-        (merged['share_diff'].abs() >= MIN_SHARE_CHANGE) |
-        (merged['percent_change'].abs() >= MIN_PERCENT_CHANGE)
-    ].copy()
+    if result:
+        df = pd.DataFrame(result).rename(columns={
+            'holding_ticker': 'ticker',
+            'shares_held': 'shares'
+        })
+        # PostgreSQL returns NUMERIC as Decimal; convert once instead of in every diff
+        df['shares'] = pd.to_numeric(df['shares'], errors='coerce').astype(float)
+        for etf_ticker, group in df.groupby('etf_ticker', sort=False):
+            logger.info(f"Comparing {etf_ticker} against latest snapshot: {group['date'].iloc[0]}")
+            previous[etf_ticker] = group[['ticker', 'shares', 'weight_percent']].reset_index(drop=True)
     
-    # Filter out non-stock tickers (cash, futures, derivatives)
-    before_filter = len(significant)
-    significant = significant[significant['ticker'].apply(is_stock_ticker)].copy()
-    filtered_out = before_filter - len(significant)
-
-    if filtered_out > 0:
-        logger.info(f"🔍 {etf_ticker}: Filtered out {filtered_out} non-stock changes (cash/futures/derivatives)")
+    for etf_ticker, holdings in previous.items():
+        if holdings.empty:
+            logger.info(f"ℹ️  No previous history found for {etf_ticker} before {date_str}")
+    return previous
 
-    # Early return if all changes were filtered out
-    if len(significant) == 0:
-        logger.info(f"📊 {etf_ticker}: No significant stock changes after filtering")
-        return []
 
-    # Detect and filter systematic adjustments (e.g., expense ratio deductions)
-    # Systematic adjustments affect all holdings by approximately the same percentage
-    # This is NOT trading activity - it's administrative adjustments like fee deductions
-    # See documentation at top of file for detection criteria
-    if len(significant) > 5:  # Need enough data points to detect pattern
-        from collections import Counter
-        # Round percentages to 0.1% to detect clustering
-        rounded_pcts = [round(abs(row['percent_change']), 1) for _, row in significant.iterrows()]
-        pct_counts = Counter(rounded_pcts)
-        most_common_pct, most_common_count = pct_counts.most_common(1)[0]
-        
-        # If 80%+ of changes cluster around the same percentage, it's likely systematic
-        if most_common_count >= len(significant) * 0.8:
-            # Additional check: ensure it's a small percentage (systematic adjustments are typically <2%)
-            if most_common_pct <= 2.0:
-                # Check if all changes are in same direction (systematic adjustments are uniform)
-                all_same_direction = (
-                    all(row['share_diff'] > 0 for _, row in significant.iterrows()) or
-                    all(row['share_diff'] < 0 for _, row in significant.iterrows())
-                )
-                
-                if all_same_direction:
-                    logger.info(f"🔍 {etf_ticker}: Detected systematic adjustment ({most_common_count}/{len(significant)} changes at ~{most_common_pct:.1f}%) - filtering out")
-                    # Return empty list - these aren't real trading changes
-                    return []
-    
-    # Add context
-    significant['etf'] = etf_ticker
-    significant['action'] = significant['share_diff'].apply(lambda x: 'BUY' if x > 0 else 'SELL')
-    
-    logger.info(f"📊 {etf_ticker}: Found {len(significant)} significant stock changes out of {len(merged)} holdings")
+def get_previous_holdings(pc: PostgresClient, etf_ticker: str, date: datetime) -> pd.DataFrame:
+    """Fetch latest available previous holdings from Research DB.
     
-    return significant.to_dict('records')
+    Args:
+        pc: PostgresClient for research database
+        etf_ticker: ETF ticker
+        date: Current processing date
+        
+    Returns:
+        DataFrame with previous holdings
+    """
+    return get_previous_holdings_bulk(pc, [etf_ticker], date)[etf_ticker]
 
 
 def save_holdings_snapshot(pc: PostgresClient, etf_ticker: str, holdings: pd.DataFrame, date: datetime):
     """Save today's holdings snapshot to Research DB.
     
+    Rows are COPYed into a temporary staging table and merged into
+    etf_holdings_log with a single INSERT ... ON CONFLICT.
+    
     Args:
         pc: PostgresClient for research database
         etf_ticker: ETF ticker
@@ -987,50 +917,57 @@ def save_holdings_snapshot(pc: PostgresClient, etf_ticker: str, holdings: pd.Dat
     if duplicates_removed > 0:
         logger.info(f"📊 {etf_ticker}: Aggregated {duplicates_removed} duplicate ticker entries")
     
-    # Prepare records
-    records = []
-    for _, row in aggregated.iterrows():
-        record = (
-            date_str,
-            etf_ticker,
-            row['ticker'],
-            str(row.get('name', '')) if pd.notna(row.get('name')) else '',
-            float(row['shares']) if row.get('shares', 0) > 0 else None,
-            float(row['weight_percent']) if row.get('weight_percent', 0) > 0 else None,
-        )
-        records.append(record)
+    # Prepare records (NaN is written as NULL)
+    records = pd.DataFrame({
+        'date': date_str,
+        'etf_ticker': etf_ticker,
+        'holding_ticker': aggregated['ticker'],
+        'holding_name': aggregated['name'].where(aggregated['name'].notna(), '').astype(str),
+        'shares_held': aggregated['shares'].where(aggregated['shares'] > 0).astype(float),
+        'weight_percent': aggregated['weight_percent'].where(aggregated['weight_percent'] > 0).astype(float),
+    })
     
     skipped_count = len(holdings) - duplicates_before
     if skipped_count > 0:
         logger.warning(f"⚠️ Skipped {skipped_count} rows with invalid/empty tickers for {etf_ticker}")
     
-    if not records:
+    if records.empty:
         logger.error(f"❌ No valid records to save for {etf_ticker}")
         return
     
-    # Batch upsert with error handling using PostgresClient
+    buffer = io.StringIO()
+    records.to_csv(buffer, index=False, header=False)
+    buffer.seek(0)
+    
+    # COPY into staging, then merge with one upsert
     try:
-        batch_size = 500
         with pc.get_connection() as conn:
             cursor = conn.cursor()
-            
-            for i in range(0, len(records), batch_size):
-                batch = records[i:i + batch_size]
-                
-                # Use executemany with ON CONFLICT for upsert
-                cursor.executemany("""
-                    INSERT INTO etf_holdings_log 
-                    (date, etf_ticker, holding_ticker, holding_name, shares_held, weight_percent)
-                    VALUES (%s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (date, etf_ticker, holding_ticker) DO UPDATE SET
-                        holding_name = EXCLUDED.holding_name,
-                        shares_held = EXCLUDED.shares_held,
-                        weight_percent = EXCLUDED.weight_percent
-                """, batch)
-                
-                if len(records) > batch_size:
-                    logger.debug(f"  Saved batch {i//batch_size + 1} ({len(batch)} records)")
-            
+            cursor.execute("""
+                CREATE TEMP TABLE etf_holdings_staging (
+                    date DATE,
+                    etf_ticker TEXT,
+                    holding_ticker TEXT,
+                    holding_name TEXT,
+                    shares_held NUMERIC,
+                    weight_percent NUMERIC
+                ) ON COMMIT DROP
+            """)
+            cursor.copy_expert("""
+                COPY etf_holdings_staging
+                (date, etf_ticker, holding_ticker, holding_name, shares_held, weight_percent)
+                FROM STDIN WITH (FORMAT csv, FORCE_NOT_NULL (holding_name))
+            """, buffer)
+            cursor.execute("""
+                INSERT INTO etf_holdings_log 
+                (date, etf_ticker, holding_ticker, holding_name, shares_held, weight_percent)
+                SELECT date, etf_ticker, holding_ticker, holding_name, shares_held, weight_percent
+                FROM etf_holdings_staging
+                ON CONFLICT (date, etf_ticker, holding_ticker) DO UPDATE SET
+                    holding_name = EXCLUDED.holding_name,
+                    shares_held = EXCLUDED.shares_held,
+                    weight_percent = EXCLUDED.weight_percent
+            """)
             conn.commit()
         
         logger.info(f"💾 Saved {len(records)} holdings for {etf_ticker} on {date_str}")
@@ -1214,39 +1151,46 @@ def etf_watchtower_job():
     failed_etfs = []
     
     try:
+        # 1. Download today's holdings for all ETFs (concurrent, per-host limits)
+        fetch_start = time.time()
+        fetched = fetch_all_holdings(ETF_CONFIGS, today)
+        downloaded = [etf_ticker for etf_ticker, holdings in fetched.items()
+                      if holdings is not None and not holdings.empty]
+        logger.info(f"📥 Downloaded holdings for {len(downloaded)}/{len(fetched)} ETFs in {time.time() - fetch_start:.1f}s")
+        
+        # 2. Get previous holdings for all ETFs in one query (from Research DB)
+        previous_holdings = get_previous_holdings_bulk(pc, downloaded, today)
+        
+        # 3. Diff all ETFs with history as one frame
+        with_history = [etf_ticker for etf_ticker in downloaded if not previous_holdings[etf_ticker].empty]
+        try:
+            diffs = calculate_diffs({etf_ticker: fetched[etf_ticker] for etf_ticker in with_history},
+                                    {etf_ticker: previous_holdings[etf_ticker] for etf_ticker in with_history})
+        except Exception as e:
+            logger.warning(f"⚠️ Combined diff failed, diffing ETFs one at a time: {e}")
+            diffs = {}
+        
         for etf_ticker, config in ETF_CONFIGS.items():
+            if etf_ticker not in fetched:
+                continue  # Provider not implemented
             try:
                 logger.info(f"\n{'='*60}")
                 logger.info(f"Processing {etf_ticker} ({config['provider']})")
                 logger.info(f"{'='*60}")
                 
-                # 1. Download today's holdings
-                if config['provider'] == 'ARK':
-                    today_holdings = fetch_ark_holdings(etf_ticker, config['url'], today)
-                elif config['provider'] == 'iShares':
-                    today_holdings = fetch_ishares_holdings(etf_ticker, config['url'], today)
-                elif config['provider'] == 'SPDR':
-                    today_holdings = fetch_spdr_holdings(etf_ticker, config['url'], today)
-                elif config['provider'] == 'Global X':
-                    today_holdings = fetch_globalx_holdings(etf_ticker, config['url'], today)
-                elif config['provider'] == 'Direxion':
-                    today_holdings = fetch_direxion_holdings(etf_ticker, config['url'], today)
-                elif config['provider'] == 'VanEck':
-                    today_holdings = fetch_vaneck_holdings(etf_ticker, config['url'], today)
-                else:
-                    logger.warning(f"⚠️ Provider {config['provider']} not yet implemented")
-                    continue
-                
+                today_holdings = fetched[etf_ticker]
                 if today_holdings is None or today_holdings.empty:
                     logger.warning(f"⚠️ No holdings data for {etf_ticker}, skipping")
                     continue
                 
-                # 2. Get yesterday's holdings (from Research DB)
-                yesterday_holdings = get_previous_holdings(pc, etf_ticker, today)
+                yesterday_holdings = previous_holdings[etf_ticker]
                 
-                # 3. Calculate diff and generate article (only if we have previous data)
+                # Generate article (only if we have previous data)
                 if not yesterday_holdings.empty:
-                    changes = calculate_diff(today_holdings, yesterday_holdings, etf_ticker)
+                    if etf_ticker in diffs:
+                        changes = diffs[etf_ticker]
+                    else:
+                        changes = calculate_diff(today_holdings, yesterday_holdings, etf_ticker)
                     
                     if changes:
                         num_changes = len(changes)
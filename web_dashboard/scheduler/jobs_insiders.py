@@ -481,6 +481,13 @@ def fetch_insider_trades_job() -> None:
         mark_job_completed('insider_trades', target_date, None, [], duration_ms=duration_ms, message=message)
         logger.info(f"✅ Insider trades job completed: {message} in {duration_ms/1000:.2f}s")
 
+        # Invalidate cached insider trades so pages show the new trades
+        try:
+            from cache_version import invalidate, cache_tag
+            invalidate(cache_tag("insider_trades"))
+        except Exception as cache_error:
+            logger.warning(f"⚠️  Failed to invalidate insider trades cache: {cache_error}")
+
     except Exception as e:
         duration_ms = int((time.time() - start_time) * 1000)
         message = f"Error: {str(e)}"
@@ -149,11 +149,11 @@ def benchmark_refresh_job() -> None:
         
         # Clear cache to ensure fresh data is used in charts
         try:
-            from cache_version import bump_cache_version
-            bump_cache_version()
-            logger.info("🔄 Cache version bumped - charts will use fresh benchmark data")
+            from cache_version import invalidate, cache_tag
+            invalidate(cache_tag("benchmark_data"))
+            logger.info("🔄 Benchmark cache invalidated - charts will use fresh benchmark data")
         except Exception as cache_error:
-            logger.warning(f"⚠️  Failed to bump cache version: {cache_error}")
+            logger.warning(f"⚠️  Failed to invalidate benchmark cache: {cache_error}")
         
         duration_ms = int((time.time() - start_time) * 1000)
         message = f"Updated {benchmarks_updated} benchmarks ({total_rows_cached} rows), {benchmarks_failed} failed"
@@ -248,6 +248,13 @@ def refresh_exchange_rates_job() -> None:
             log_job_execution(job_id, success=True, message=message, duration_ms=duration_ms)
             mark_job_completed('exchange_rates', target_date, None, [], duration_ms=duration_ms, message=message)
             logger.info(f"✅ {message}")
+            
+            # Invalidate cached exchange rates so conversions use the new rate
+            try:
+                from cache_version import invalidate, cache_tag
+                invalidate(cache_tag("exchange_rates"))
+            except Exception as cache_error:
+                logger.warning(f"⚠️  Failed to invalidate exchange rates cache: {cache_error}")
         else:
             duration_ms = int((time.time() - start_time) * 1000)
             message = "Failed to fetch today's exchange rate from API"
@@ -1000,6 +1000,20 @@ def update_portfolio_prices_job(
                             funds_completed.append(fund_name)  # Track successful completion
                             
                             logger.info(f"  ✅ Upserted {upserted_count} positions for {fund_name}")
+                            
+                            # Append this day to the fund NAV store (contributor ownership reads it)
+                            try:
+                                from fund_nav import update_fund_nav
+                                update_fund_nav(
+                                    client.supabase,
+                                    fund_name,
+                                    target_date,
+                                    sum(pos['total_value_base'] for pos in updated_positions),
+                                    sum(pos['cost_basis_base'] for pos in updated_positions),
+                                    base_currency
+                                )
+                            except Exception as nav_error:
+                                logger.warning(f"  ⚠️  Failed to update fund NAV for {fund_name}: {nav_error}")
                         except Exception as upsert_error:
                             # Upsert failed - log error but don't fail entire job
                             # The delete already happened, but upsert failure is less likely than insert failure
@@ -1025,13 +1039,18 @@ def update_portfolio_prices_job(
             # Mark job as completed successfully
             mark_job_completed('update_portfolio_prices', target_date, None, funds_completed, duration_ms=duration_ms, message=message)
         
-            # Clear cache to ensure fresh data is used in charts
+            # Invalidate cached data of the updated funds so charts use fresh positions
             try:
-                from cache_version import bump_cache_version
-                bump_cache_version()
-                logger.info("🔄 Cache version bumped - charts will use fresh portfolio data")
+                from cache_version import invalidate, cache_tag
+                # Trades entered since the last run (CLI, admin pages) are picked up here too
+                invalidate(*(
+                    cache_tag(table, fund_name)
+                    for fund_name in funds_completed
+                    for table in ("portfolio_positions", "trade_log")
+                ))
+                logger.info(f"🔄 Cache invalidated for {len(funds_completed)} fund(s) - charts will use fresh portfolio data")
             except Exception as cache_error:
-                logger.warning(f"⚠️  Failed to bump cache version: {cache_error}")
+                logger.warning(f"⚠️  Failed to invalidate cache: {cache_error}")
         
         except Exception as e:
             duration_ms = int((time.time() - start_time) * 1000)
@@ -1131,7 +1150,7 @@ def backfill_portfolio_prices_range(start_date: date, end_date: date) -> None:
             from utils.market_holidays import MarketHolidays
             from supabase_client import SupabaseClient
             from utils.job_tracking import mark_job_completed, add_to_retry_queue
-            from cache_version import bump_cache_version
+            from cache_version import invalidate, cache_tag
             import pytz
             
             # Initialize components
@@ -2149,12 +2168,26 @@ def backfill_portfolio_prices_range(start_date: date, end_date: date) -> None:
                 logger.warning(f"      3. Validation failed for all days")
                 logger.warning(f"      4. Not all funds completed for any day")
         
-            # Bump cache version to force UI refresh
+            # Rebuild the fund NAV store from the first backfilled day onwards
+            from fund_nav import rebuild_fund_nav
+            for fund_name, base_currency in funds:
+                if fund_name not in successful_funds:
+                    continue
+                try:
+                    rebuild_fund_nav(client.supabase, fund_name, trading_days[0], base_currency)
+                except Exception as e:
+                    logger.warning(f"Failed to rebuild fund NAV for {fund_name}: {e}")
+            
+            # Invalidate cached positions of the backfilled funds to force UI refresh
             try:
-                bump_cache_version()
-                logger.info("Cache version bumped - Streamlit will show fresh data")
+                invalidate(*(
+                    cache_tag(table, fund_name)
+                    for fund_name in all_production_funds
+                    for table in ("portfolio_positions", "trade_log")
+                ))
+                logger.info("Cache invalidated for backfilled funds - UI will show fresh data")
             except Exception as e:
-                logger.warning(f"Failed to bump cache version: {e}")
+                logger.warning(f"Failed to invalidate cache: {e}")
             
             duration_ms = int((time.time() - start_time) * 1000)
             
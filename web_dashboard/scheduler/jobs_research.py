@@ -6,7 +6,9 @@ Jobs for fetching and storing market research articles from various sources.
 """
 
 import logging
+import threading
 import time
+from collections import Counter
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 
@@ -70,7 +72,7 @@ def market_research_job() -> None:
         try:
             from searxng_client import get_searxng_client, check_searxng_health
             from research_utils import extract_article_content
-            from ollama_client import get_ollama_client
+            from ollama_client import get_ollama_client, EmbeddingBatcher
             from research_repository import ResearchRepository
         except ImportError as e:
             duration_ms = int((time.time() - start_time) * 1000)
@@ -100,6 +102,8 @@ def market_research_job() -> None:
         
         # Initialize research repository
         research_repo = ResearchRepository()
+        # Articles are saved first and embedded in batches
+        embedding_batcher = EmbeddingBatcher(ollama_client, research_repo.update_article_embeddings) if ollama_client else None
         
         # Load domain blacklist
         from settings import get_research_domain_blacklist
@@ -287,12 +291,11 @@ def market_research_job() -> None:
                     logger.warning(f"⏱️  Not enough time for AI processing ({remaining_time:.1f}s remaining) - skipping: {title[:50]}...")
                     continue
                 
-                # Generate summary and embedding using Ollama (if available)
+                # Generate summary using Ollama (if available); embedding is batched after save
                 summary = None
                 summary_data = {}
                 extracted_tickers = []
                 extracted_sector = None
-                embedding = None
                 if ollama_client:
                     logger.info(f"  Generating summary for: {title[:50]}...")
                     summary_data = ollama_client.generate_summary(content)
@@ -346,12 +349,6 @@ def market_research_job() -> None:
                             f"Reason: {reason or 'No market relevance detected'}"
                         )
                         continue
-
-                    # Generate embedding for semantic search
-                    logger.debug(f"Generating embedding for: {title[:50]}...")
-                    embedding = ollama_client.generate_embedding(content[:6000])  # Truncate to avoid token limits
-                    if not embedding:
-                        logger.warning(f"Failed to generate embedding for {title[:50]}...")
                 else:
                     logger.debug("Ollama not available - skipping summary and embedding generation")
                 
@@ -373,7 +370,7 @@ def market_research_job() -> None:
                     source=extracted.get('source'),
                     published_at=extracted.get('published_at'),
                     relevance_score=relevance_score,
-                    embedding=embedding,
+                    embedding=None,
                     claims=summary_data.get("claims") if isinstance(summary_data, dict) else None,
                     fact_check=summary_data.get("fact_check") if isinstance(summary_data, dict) else None,
                     conclusion=summary_data.get("conclusion") if isinstance(summary_data, dict) else None,
@@ -388,6 +385,10 @@ def market_research_job() -> None:
                     articles_saved += 1
                     logger.info(f"✅ Saved article in {article_duration:.1f}s: {title[:50]}...")
                     
+                    # Queue embedding for semantic search (truncated to avoid token limits)
+                    if embedding_batcher:
+                        embedding_batcher.add(article_id, content[:6000])
+                    
                     # Extract and save relationships (GraphRAG edges)
                     if isinstance(summary_data, dict) and logic_check and logic_check != "HYPE_DETECTED":
                         relationships = summary_data.get("relationships", [])
@@ -435,6 +436,9 @@ def market_research_job() -> None:
                 logger.error(f"❌ Error processing article after {article_duration:.1f}s '{title_safe}...': {e}")
                 continue
         
+        if embedding_batcher:
+            embedding_batcher.flush()
+        
         duration_ms = int((time.time() - start_time) * 1000)
         duration_min = duration_ms / 60000
         message = (
@@ -466,6 +470,11 @@ def rss_feed_ingest_job() -> None:
     3. Applies junk filtering before AI processing
     4. Saves high-quality articles to research database
     
+    Runs as a staged pipeline (see rss_pipeline): feeds are fetched
+    concurrently under per-domain politeness limits, each feed's URLs are
+    checked against the database in one query, extraction and summarization
+    run on a bounded worker pool, and articles are inserted in batches.
+    
     Robots.txt enforcement: Controlled by ENABLE_ROBOTS_TXT_CHECKS environment variable.
     When enabled, checks robots.txt before fetching RSS feeds and article URLs.
     """
@@ -485,8 +494,9 @@ def rss_feed_ingest_job() -> None:
         # Import dependencies
         try:
             from rss_utils import get_rss_client
+            from rss_pipeline import DomainLimiter, PipelineMetrics, run_pipeline
             from research_utils import extract_article_content
-            from ollama_client import get_ollama_client
+            from ollama_client import get_ollama_client, EmbeddingBatcher
             from research_repository import ResearchRepository
             from postgres_client import PostgresClient
         except ImportError as e:
@@ -501,6 +511,8 @@ def rss_feed_ingest_job() -> None:
         ollama_client = get_ollama_client()
         research_repo = ResearchRepository()
         postgres_client = PostgresClient()
+        # Articles are saved first and embedded in batches
+        embedding_batcher = EmbeddingBatcher(ollama_client, research_repo.update_article_embeddings) if ollama_client else None
         
         # Fetch enabled RSS feeds from database
         try:
@@ -523,13 +535,13 @@ def rss_feed_ingest_job() -> None:
         
         logger.info(f"Found {len(feeds_result)} enabled RSS feeds")
         
-        total_articles_processed = 0
-        total_articles_saved = 0
-        total_articles_skipped = 0
-        total_articles_irrelevant = 0
-        total_junk_filtered = 0  # NEW: Track junk filtering
-        feeds_processed = 0
-        feeds_failed = 0
+        counts = Counter()
+        counts_lock = threading.Lock()
+        
+        def count(key: str, amount: int = 1) -> None:
+            # Stages run on worker threads
+            with counts_lock:
+                counts[key] += amount
         
         # Get owned tickers for relevance scoring
         from supabase_client import SupabaseClient
@@ -543,246 +555,278 @@ def rss_feed_ingest_job() -> None:
             if positions_result.data:
                 owned_tickers = set(pos['ticker'] for pos in positions_result.data)
         
-        # Process each feed
-        for feed in feeds_result:
-            feed_id = feed['id']
+        # Politeness limits replace the fixed sleeps between feeds and articles
+        limiter = DomainLimiter()
+        metrics = PipelineMetrics()
+        extract_stage = metrics.stage('extract')
+        summarize_stage = metrics.stage('summarize')
+        queued_urls = set()  # Same article listed by several feeds
+        
+        def fetch_feed(feed):
+            """Stage 1 (feed workers): fetch and parse one feed."""
             feed_name = feed['name']
             feed_url = feed['url']
+            logger.info(f"📡 Fetching feed: {feed_name}")
+            
+            # Check robots.txt compliance for feed URL (if enabled)
+            try:
+                from robots_utils import check_url_allowed
+                if not check_url_allowed(feed_url):
+                    logger.info(f"  Skipping feed disallowed by robots.txt: {feed_url[:60]}...")
+                    count('feeds_failed')
+                    return None
+            except ImportError:
+                # robots_utils not available, skip check
+                pass
             
+            # Fetch and parse RSS feed
             try:
-                logger.info(f"📡 Fetching feed: {feed_name}")
+                feed_data = rss_client.fetch_feed(feed_url)
+            except Exception as e:
+                logger.warning(f"Error fetching feed {feed_name}: {e}")
+                count('feeds_failed')
+                return None
+            
+            if not feed_data or not feed_data.get('items'):
+                logger.warning(f"No items found in feed: {feed_name}")
+                count('feeds_failed')
+                return None
+            
+            items = feed_data['items']
+            junk_filtered = feed_data.get('junk_filtered', 0)
+            count('junk_filtered', junk_filtered)
+            logger.info(f"  Found {len(items)} items in {feed_name} (filtered {junk_filtered} junk articles)")
+            
+            # Update feed's last_fetched_at timestamp
+            try:
+                postgres_client.execute_update(
+                    "UPDATE rss_feeds SET last_fetched_at = NOW() WHERE id = %s",
+                    (feed['id'],)
+                )
+            except Exception as e:
+                logger.warning(f"Failed to update last_fetched_at for {feed_name}: {e}")
+            
+            count('feeds_processed')
+            return items
+        
+        def filter_new(feed, items):
+            """Stage 2 (pipeline thread): drop disallowed and already-stored items."""
+            candidates = []
+            for item in items:
+                url = item.get('url')
+                if not url or not item.get('title') or url in queued_urls:
+                    continue
                 
-                # Check robots.txt compliance for feed URL (if enabled)
+                # Check robots.txt compliance (if enabled)
                 try:
                     from robots_utils import check_url_allowed
-                    if not check_url_allowed(feed_url):
-                        logger.info(f"  Skipping feed disallowed by robots.txt: {feed_url[:60]}...")
-                        feeds_failed += 1
+                    if not check_url_allowed(url):
+                        logger.info(f"  Skipping URL disallowed by robots.txt: {url[:60]}...")
+                        count('skipped')
                         continue
                 except ImportError:
                     # robots_utils not available, skip check
                     pass
+                candidates.append(item)
+            
+            # One existence query per feed instead of one per item
+            existing = research_repo.existing_urls([item['url'] for item in candidates])
+            if existing:
+                logger.debug(f"  {len(existing)} article(s) from {feed['name']} already exist")
+                count('skipped', len(existing))
+            
+            new_items = [item for item in candidates if item['url'] not in existing]
+            queued_urls.update(item['url'] for item in new_items)
+            return new_items
+        
+        def process_item(feed, item):
+            """Stage 3 (item workers): extract content and summarize one article."""
+            url = item['url']
+            title = item['title']
+            content = item.get('content', '')
+            
+            # Use RSS content if available, otherwise fetch from URL
+            if not content or len(content) < 200:
+                logger.info(f"  Extracting full content: {title[:40]}...")
+                with limiter.slot(url), extract_stage.timed():
+                    extracted = extract_article_content(url)
                 
-                # Fetch and parse RSS feed
-                feed_data = rss_client.fetch_feed(feed_url)
+                # Check for paid subscription articles
+                if extracted.get('error') == 'paid_subscription':
+                    # Check if archive was submitted
+                    if extracted.get('archive_submitted'):
+                        logger.info(f"  Paywalled article submitted to archive, saving for retry: {title[:40]}...")
+                        # Save article with minimal content so retry job can find it
+                        return {
+                            'article': dict(
+                                tickers=None,
+                                sector=None,
+                                article_type="Market News",
+                                title=title,
+                                url=url,
+                                summary="[Paywalled - Submitted to archive for processing]",
+                                content="[Paywalled - Submitted to archive for processing]",
+                                source=item.get('source'),
+                                published_at=item.get('published_at'),
+                                relevance_score=0.0
+                            ),
+                            'archive_submitted': True
+                        }
+                    logger.info(f"  Skipping paid subscription article: {title[:40]}...")
+                    count('skipped')
+                    return None
+                
+                content = extracted.get('content', '')
+                if not content:
+                    logger.warning(f"Failed to extract content for {title[:40]}...")
+                    return None
+            
+            # Generate AI summary (embedding is batched after save)
+            summary = None
+            summary_data = {}
+            extracted_tickers = list(item.get('tickers', []) or [])  # May be from RSS metadata
+            extracted_sector = None
+            
+            if ollama_client:
+                with summarize_stage.timed():
+                    summary_data = ollama_client.generate_summary(content)
+                
+                if isinstance(summary_data, str):
+                    summary = summary_data
+                elif isinstance(summary_data, dict) and summary_data:
+                    summary = summary_data.get("summary", "")
+                    
+                    # Extract tickers from AI if not already from RSS
+                    if not extracted_tickers:
+                        ai_tickers = summary_data.get("tickers", [])
+                        from research_utils import validate_ticker_format, normalize_ticker
+                        for ticker in ai_tickers:
+                            # Only validate format, trust AI inference (AI marks uncertain tickers with '?')
+                            if validate_ticker_format(ticker):
+                                normalized = normalize_ticker(ticker)
+                                if normalized:
+                                    extracted_tickers.append(normalized)
+                    
+                    # Extract sector
+                    sectors = summary_data.get("sectors", [])
+                    if sectors:
+                        extracted_sector = sectors[0]
+                
+                market_relevance = summary_data.get("market_relevance") if isinstance(summary_data, dict) else None
+                if not extracted_tickers and market_relevance == "NOT_MARKET_RELATED":
+                    reason = summary_data.get("market_relevance_reason", "")
+                    count('irrelevant')
+                    logger.info(
+                        f"  🚫 Skipping non-market RSS item: {title[:40]}... "
+                        f"Reason: {reason or 'No market relevance detected'}"
+                    )
+                    return None
+            
+            # Calculate relevance score
+            relevance_score = calculate_relevance_score(
+                extracted_tickers if extracted_tickers else [],
+                extracted_sector,
+                owned_tickers=list(owned_tickers) if owned_tickers else None
+            )
+            
+            # Extract logic_check for relationship confidence
+            logic_check = summary_data.get("logic_check") if isinstance(summary_data, dict) else None
+            
+            count('processed')
+            return {
+                'article': dict(
+                    tickers=extracted_tickers if extracted_tickers else None,
+                    sector=extracted_sector,
+                    article_type="Market News",  # RSS feeds are general news
+                    title=title,
+                    url=url,
+                    summary=summary,
+                    content=content,
+                    source=item.get('source'),
+                    published_at=item.get('published_at'),
+                    relevance_score=relevance_score,
+                    claims=summary_data.get("claims") if isinstance(summary_data, dict) else None,
+                    fact_check=summary_data.get("fact_check") if isinstance(summary_data, dict) else None,
+                    conclusion=summary_data.get("conclusion") if isinstance(summary_data, dict) else None,
+                    sentiment=summary_data.get("sentiment") if isinstance(summary_data, dict) else None,
+                    sentiment_score=summary_data.get("sentiment_score") if isinstance(summary_data, dict) else None,
+                    logic_check=logic_check
+                ),
+                'summary_data': summary_data
+            }
+        
+        def save_batch(records):
+            """Stage 4 (pipeline thread): insert a batch, then relationships and embeddings."""
+            saved = research_repo.save_articles([record['article'] for record in records])
+            
+            for record in records:
+                article = record['article']
+                title = article['title']
+                article_id = saved.get(article['url'])
+                if not article_id:
+                    logger.warning(f"  Failed to save: {title[:40]}...")
+                    continue
                 
-                if not feed_data or not feed_data.get('items'):
-                    logger.warning(f"No items found in feed: {feed_name}")
-                    feeds_failed += 1
+                if record.get('archive_submitted'):
+                    # Mark as archive submitted
+                    research_repo.mark_archive_submitted(article_id, article['url'])
+                    count('skipped')
+                    logger.info(f"  Saved paywalled article for archive retry: {article_id}")
                     continue
                 
-                items = feed_data['items']
-                junk_filtered = feed_data.get('junk_filtered', 0)
-                total_junk_filtered += junk_filtered
+                count('saved')
+                logger.info(f"  ✅ Saved: {title[:40]}...")
                 
-                logger.info(f"  Found {len(items)} items (filtered {junk_filtered} junk articles)")
+                if embedding_batcher:
+                    embedding_batcher.add(article_id, article['content'][:6000])
                 
-                # Process each item
-                for item in items:
-                    try:
-                        url = item.get('url')
-                        title = item.get('title')
-                        content = item.get('content', '')
-                        
-                        if not url or not title:
-                            continue
-                        
-                        # Check robots.txt compliance (if enabled)
-                        try:
-                            from robots_utils import check_url_allowed
-                            if not check_url_allowed(url):
-                                logger.info(f"  Skipping URL disallowed by robots.txt: {url[:60]}...")
-                                total_articles_skipped += 1
-                                continue
-                        except ImportError:
-                            # robots_utils not available, skip check
-                            pass
-                        
-                        # Check if already exists
-                        if research_repo.article_exists(url):
-                            logger.debug(f"Article already exists: {title[:50]}...")
-                            total_articles_skipped += 1
-                            continue
-                        
-                        # Use RSS content if available, otherwise fetch from URL
-                        if not content or len(content) < 200:
-                            logger.info(f"  Extracting full content: {title[:40]}...")
-                            extracted = extract_article_content(url)
-                            
-                            # Check for paid subscription articles
-                            if extracted.get('error') == 'paid_subscription':
-                                # Check if archive was submitted
-                                if extracted.get('archive_submitted'):
-                                    logger.info(f"  Paywalled article submitted to archive, saving for retry: {title[:40]}...")
-                                    # Save article with minimal content so retry job can find it
-                                    article_id = research_repo.save_article(
-                                        tickers=None,
-                                        sector=None,
-                                        article_type="Market News",
-                                        title=title,
-                                        url=url,
-                                        summary="[Paywalled - Submitted to archive for processing]",
-                                        content="[Paywalled - Submitted to archive for processing]",
-                                        source=item.get('source'),
-                                        published_at=item.get('published_at'),
-                                        relevance_score=0.0,
-                                        embedding=None
-                                    )
-                                    if article_id:
-                                        # Mark as archive submitted
-                                        research_repo.mark_archive_submitted(article_id, url)
-                                        total_articles_skipped += 1
-                                        logger.info(f"  Saved paywalled article for archive retry: {article_id}")
-                                else:
-                                    logger.info(f"  Skipping paid subscription article: {title[:40]}...")
-                                    total_articles_skipped += 1
-                                continue
-                            
-                            content = extracted.get('content', '')
-                            if not content:
-                                logger.warning(f"Failed to extract content for {title[:40]}...")
-                                continue
-                        
-                        # Generate AI summary and embedding
-                        summary = None
-                        summary_data = {}
-                        extracted_tickers = item.get('tickers', []) or []  # May be from RSS metadata
-                        extracted_sector = None
-                        embedding = None
+                # Extract and save relationships
+                summary_data = record['summary_data']
+                logic_check = article['logic_check']
+                if isinstance(summary_data, dict) and logic_check and logic_check != "HYPE_DETECTED":
+                    relationships = summary_data.get("relationships", [])
+                    if relationships and isinstance(relationships, list):
+                        if logic_check == "DATA_BACKED":
+                            initial_confidence = 0.8
+                        else:
+                            initial_confidence = 0.4
                         
-                        if ollama_client:
-                            summary_data = ollama_client.generate_summary(content)
-                            
-                            if isinstance(summary_data, str):
-                                summary = summary_data
-                            elif isinstance(summary_data, dict) and summary_data:
-                                summary = summary_data.get("summary", "")
+                        from research_utils import normalize_relationship
+                        relationships_saved = 0
+                        for rel in relationships:
+                            if isinstance(rel, dict):
+                                source = rel.get("source", "").strip()
+                                target = rel.get("target", "").strip()
+                                rel_type = rel.get("type", "").strip()
                                 
-                                # Extract tickers from AI if not already from RSS
-                                if not extracted_tickers:
-                                    ai_tickers = summary_data.get("tickers", [])
-                                    from research_utils import validate_ticker_format, normalize_ticker
-                                    for ticker in ai_tickers:
-                                        # Only validate format, trust AI inference (AI marks uncertain tickers with '?')
-                                        if validate_ticker_format(ticker):
-                                            normalized = normalize_ticker(ticker)
-                                            if normalized:
-                                                extracted_tickers.append(normalized)
-                                
-                                # Extract sector
-                                sectors = summary_data.get("sectors", [])
-                                if sectors:
-                                    extracted_sector = sectors[0]
-                            
-                            market_relevance = summary_data.get("market_relevance") if isinstance(summary_data, dict) else None
-                            if not extracted_tickers and market_relevance == "NOT_MARKET_RELATED":
-                                reason = summary_data.get("market_relevance_reason", "")
-                                total_articles_irrelevant += 1
-                                logger.info(
-                                    f"  🚫 Skipping non-market RSS item: {title[:40]}... "
-                                    f"Reason: {reason or 'No market relevance detected'}"
-                                )
-                                continue
-
-                            # Generate embedding
-                            embedding = ollama_client.generate_embedding(content[:6000])
-                        
-                        # Calculate relevance score
-                        relevance_score = calculate_relevance_score(
-                            extracted_tickers if extracted_tickers else [],
-                            extracted_sector,
-                            owned_tickers=list(owned_tickers) if owned_tickers else None
-                        )
-                        
-                        # Extract logic_check for relationship confidence
-                        logic_check = summary_data.get("logic_check") if isinstance(summary_data, dict) else None
-                        
-                        # Save article
-                        article_id = research_repo.save_article(
-                            tickers=extracted_tickers if extracted_tickers else None,
-                            sector=extracted_sector,
-                            article_type="Market News",  # RSS feeds are general news
-                            title=title,
-                            url=url,
-                            summary=summary,
-                            content=content,
-                            source=item.get('source'),
-                            published_at=item.get('published_at'),
-                            relevance_score=relevance_score,
-                            embedding=embedding,
-                            claims=summary_data.get("claims") if isinstance(summary_data, dict) else None,
-                            fact_check=summary_data.get("fact_check") if isinstance(summary_data, dict) else None,
-                            conclusion=summary_data.get("conclusion") if isinstance(summary_data, dict) else None,
-                            sentiment=summary_data.get("sentiment") if isinstance(summary_data, dict) else None,
-                            sentiment_score=summary_data.get("sentiment_score") if isinstance(summary_data, dict) else None,
-                            logic_check=logic_check
-                        )
-                        
-                        if article_id:
-                            total_articles_saved += 1
-                            logger.info(f"  ✅ Saved: {title[:40]}...")
-                            
-                            # Extract and save relationships
-                            if isinstance(summary_data, dict) and logic_check and logic_check != "HYPE_DETECTED":
-                                relationships = summary_data.get("relationships", [])
-                                if relationships and isinstance(relationships, list):
-                                    if logic_check == "DATA_BACKED":
-                                        initial_confidence = 0.8
-                                    else:
-                                        initial_confidence = 0.4
-                                    
-                                    from research_utils import normalize_relationship
-                                    relationships_saved = 0
-                                    for rel in relationships:
-                                        if isinstance(rel, dict):
-                                            source = rel.get("source", "").strip()
-                                            target = rel.get("target", "").strip()
-                                            rel_type = rel.get("type", "").strip()
-                                            
-                                            if source and target and rel_type:
-                                                norm_source, norm_target, norm_type = normalize_relationship(source, target, rel_type)
-                                                rel_id = research_repo.save_relationship(
-                                                    source_ticker=norm_source,
-                                                    target_ticker=norm_target,
-                                                    relationship_type=norm_type,
-                                                    initial_confidence=initial_confidence,
-                                                    source_article_id=article_id
-                                                )
-                                                if rel_id:
-                                                    relationships_saved += 1
-                                    
-                                    if relationships_saved > 0:
-                                        logger.info(f"  ✅ Saved {relationships_saved} relationship(s)")
-                        
-                        total_articles_processed += 1
-                        time.sleep(0.5)  # Small delay between articles
+                                if source and target and rel_type:
+                                    norm_source, norm_target, norm_type = normalize_relationship(source, target, rel_type)
+                                    rel_id = research_repo.save_relationship(
+                                        source_ticker=norm_source,
+                                        target_ticker=norm_target,
+                                        relationship_type=norm_type,
+                                        initial_confidence=initial_confidence,
+                                        source_article_id=article_id
+                                    )
+                                    if rel_id:
+                                        relationships_saved += 1
                         
-                    except Exception as e:
-                        logger.error(f"Error processing RSS item: {e}")
-                        continue
-                
-                # Update feed's last_fetched_at timestamp
-                try:
-                    postgres_client.execute_update(
-                        "UPDATE rss_feeds SET last_fetched_at = NOW() WHERE id = %s",
-                        (feed_id,)
-                    )
-                except Exception as e:
-                    logger.warning(f"Failed to update last_fetched_at for {feed_name}: {e}")
-                
-                feeds_processed += 1
-                time.sleep(2)  # Delay between feeds
-                
-            except Exception as e:
-                logger.error(f"Error processing feed '{feed_name}': {e}")
-                feeds_failed += 1
-                continue
+                        if relationships_saved > 0:
+                            logger.info(f"  ✅ Saved {relationships_saved} relationship(s)")
+            return len(saved)
+        
+        run_pipeline(feeds_result, fetch_feed, filter_new, process_item, save_batch,
+                     metrics=metrics, limiter=limiter)
+        
+        if embedding_batcher:
+            embedding_batcher.flush()
+        metrics.log_summary()
         
         duration_ms = int((time.time() - start_time) * 1000)
         message = (
-            f"Processed {feeds_processed} feeds: {total_articles_saved} saved, "
-            f"{total_articles_skipped} skipped, {total_articles_irrelevant} non-market, "
-            f"{total_junk_filtered} junk filtered"
+            f"Processed {counts['feeds_processed']} feeds: {counts['saved']} saved, "
+            f"{counts['skipped']} skipped, {counts['irrelevant']} non-market, "
+            f"{counts['junk_filtered']} junk filtered"
         )
         log_job_execution(job_id, success=True, message=message, duration_ms=duration_ms)
         mark_job_completed('rss_feed_ingest', target_date, None, [], duration_ms=duration_ms, message=message)
@@ -828,7 +872,7 @@ def ticker_research_job() -> None:
         try:
             from searxng_client import get_searxng_client, check_searxng_health
             from research_utils import extract_article_content
-            from ollama_client import get_ollama_client
+            from ollama_client import get_ollama_client, EmbeddingBatcher
             from research_repository import ResearchRepository
             from supabase_client import SupabaseClient
         except ImportError as e:
@@ -849,6 +893,8 @@ def ticker_research_job() -> None:
         searxng_client = get_searxng_client()
         ollama_client = get_ollama_client()
         research_repo = ResearchRepository()
+        # Articles are saved first and embedded in batches
+        embedding_batcher = EmbeddingBatcher(ollama_client, research_repo.update_article_embeddings) if ollama_client else None
         
         if not searxng_client:
             duration_ms = int((time.time() - start_time) * 1000)
@@ -1016,10 +1062,9 @@ def ticker_research_job() -> None:
                         if not content:
                             continue
                         
-                        # Summarize and generate embedding
+                        # Summarize (embedding is batched after save)
                         summary = None
                         summary_data = {}
-                        embedding = None
                         if ollama_client:
                             summary_data = ollama_client.generate_summary(content)
                             
@@ -1027,11 +1072,6 @@ def ticker_research_job() -> None:
                                 summary = summary_data
                             elif isinstance(summary_data, dict) and summary_data:
                                 summary = summary_data.get("summary", "")
-                            
-                            # Generate embedding for semantic search
-                            embedding = ollama_client.generate_embedding(content[:6000])
-                            if not embedding:
-                                logger.warning(f"Failed to generate embedding for sector {sector}")
                         
                         # Extract logic_check for relationship confidence scoring
                         logic_check = summary_data.get("logic_check") if isinstance(summary_data, dict) else None
@@ -1048,7 +1088,7 @@ def ticker_research_job() -> None:
                             source=extracted.get('source'),
                             published_at=extracted.get('published_at'),
                             relevance_score=0.7,  # Slightly lower relevance for sector-level news
-                            embedding=embedding,
+                            embedding=None,
                             claims=summary_data.get("claims") if isinstance(summary_data, dict) else None,
                             fact_check=summary_data.get("fact_check") if isinstance(summary_data, dict) else None,
                             conclusion=summary_data.get("conclusion") if isinstance(summary_data, dict) else None,
@@ -1061,6 +1101,9 @@ def ticker_research_job() -> None:
                             articles_saved += 1
                             logger.info(f"  ✅ Saved sector news: {title[:30]}")
                             
+                            if embedding_batcher:
+                                embedding_batcher.add(article_id, content[:6000])
+                            
                             # Extract and save relationships (GraphRAG edges)
                             if isinstance(summary_data, dict) and logic_check and logic_check != "HYPE_DETECTED":
                                 relationships = summary_data.get("relationships", [])
@@ -1171,12 +1214,11 @@ def ticker_research_job() -> None:
                         if not content:
                             continue
                         
-                        # Summarize and generate embedding
+                        # Summarize (embedding is batched after save)
                         summary = None
                         summary_data = {}
                         extracted_tickers = []
                         extracted_sector = None
-                        embedding = None
                         if ollama_client:
                             summary_data = ollama_client.generate_summary(content)
                             
@@ -1216,11 +1258,6 @@ def ticker_research_job() -> None:
                                 # Log extracted metadata
                                 if tickers or sectors or summary_data.get("key_themes"):
                                     logger.debug(f"Extracted metadata - Tickers: {tickers}, Sectors: {sectors}, Themes: {summary_data.get('key_themes', [])}")
-                            
-                            # Generate embedding for semantic search
-                            embedding = ollama_client.generate_embedding(content[:6000])  # Truncate to avoid token limits
-                            if not embedding:
-                                logger.warning(f"Failed to generate embedding for {ticker}")
                         
                         # If AI didn't extract any tickers, use the search ticker (we're searching for it, so it's relevant)
                         if not extracted_tickers:
@@ -1244,7 +1281,7 @@ def ticker_research_job() -> None:
                             source=extracted.get('source'),
                             published_at=extracted.get('published_at'),
                             relevance_score=relevance_score,
-                            embedding=embedding,
+                            embedding=None,
                             claims=summary_data.get("claims") if isinstance(summary_data, dict) else None,
                             fact_check=summary_data.get("fact_check") if isinstance(summary_data, dict) else None,
                             conclusion=summary_data.get("conclusion") if isinstance(summary_data, dict) else None,
@@ -1257,6 +1294,9 @@ def ticker_research_job() -> None:
                             articles_saved += 1
                             logger.info(f"  ✅ Saved: {title[:30]}")
                             
+                            if embedding_batcher:
+                                embedding_batcher.add(article_id, content[:6000])  # Truncate to avoid token limits
+                            
                             # Extract and save relationships (GraphRAG edges)
                             if isinstance(summary_data, dict) and logic_check and logic_check != "HYPE_DETECTED":
                                 relationships = summary_data.get("relationships", [])
@@ -1309,6 +1349,9 @@ def ticker_research_job() -> None:
             except Exception as e:
                 logger.error(f"Error searching for {ticker}: {e}")
         
+        if embedding_batcher:
+            embedding_batcher.flush()
+        
         duration_ms = int((time.time() - start_time) * 1000)
         message_parts = [f"Processed {tickers_processed} tickers"]
         if sectors_researched > 0:
@@ -1361,7 +1404,7 @@ def archive_retry_job() -> None:
             from research_utils import extract_article_content
             from archive_service import check_archived, get_archived_content
             from paywall_detector import is_paywalled_article
-            from ollama_client import get_ollama_client
+            from ollama_client import get_ollama_client, EmbeddingBatcher
             from postgres_client import PostgresClient
         except ImportError as e:
             duration_ms = int((time.time() - start_time) * 1000)
@@ -1373,6 +1416,8 @@ def archive_retry_job() -> None:
         # Get clients
         research_repo = ResearchRepository()
         ollama_client = get_ollama_client()
+        # Articles are updated first and embedded in batches
+        embedding_batcher = EmbeddingBatcher(ollama_client, research_repo.update_article_embeddings) if ollama_client else None
         
         # Get owned tickers for relevance scoring
         from supabase_client import SupabaseClient
@@ -1472,12 +1517,11 @@ def archive_retry_job() -> None:
                                     research_repo.mark_archive_checked(article_id, None, success=False)
                                     continue
                                 
-                                # Generate AI summary and embedding
+                                # Generate AI summary (embedding is batched after update)
                                 summary = None
                                 summary_data = {}
                                 extracted_tickers = []
                                 extracted_sector = None
-                                embedding = None
                                 
                                 if ollama_client:
                                     summary_data = ollama_client.generate_summary(extracted_content)
@@ -1500,9 +1544,6 @@ def archive_retry_job() -> None:
                                         sectors = summary_data.get("sectors", [])
                                         if sectors:
                                             extracted_sector = sectors[0]
-                                    
-                                    # Generate embedding
-                                    embedding = ollama_client.generate_embedding(extracted_content[:6000])
                                 
                                 # Calculate relevance score
                                 relevance_score = calculate_relevance_score(
@@ -1521,7 +1562,6 @@ def archive_retry_job() -> None:
                                     summary=summary,
                                     tickers=extracted_tickers if extracted_tickers else None,
                                     sector=extracted_sector,
-                                    embedding=embedding,
                                     relevance_score=relevance_score,
                                     claims=summary_data.get("claims") if isinstance(summary_data, dict) else None,
                                     fact_check=summary_data.get("fact_check") if isinstance(summary_data, dict) else None,
@@ -1540,6 +1580,9 @@ def archive_retry_job() -> None:
                                 if success:
                                     articles_processed += 1
                                     logger.info(f"✅ Processed archived article: {title[:40]}...")
+                                    
+                                    if embedding_batcher:
+                                        embedding_batcher.add(article_id, extracted_content[:6000])
                                 else:
                                     logger.warning(f"⚠️ Failed to update article {article_id}")
                             else:
@@ -1563,6 +1606,9 @@ def archive_retry_job() -> None:
                 logger.error(f"Error processing article {article.get('id', 'unknown')}: {e}", exc_info=True)
                 continue
         
+        if embedding_batcher:
+            embedding_batcher.flush()
+        
         # Log completion
         duration_ms = int((time.time() - start_time) * 1000)
         message = f"Checked {articles_checked} articles, found {articles_archived} archived, processed {articles_processed}"
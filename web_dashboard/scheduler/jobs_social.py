@@ -226,6 +226,13 @@ def fetch_social_sentiment_job() -> None:
         mark_job_completed('social_sentiment', target_date, None, [], duration_ms=duration_ms, message=message)
         logger.info(f"✅ Social sentiment job completed: {message} in {duration_min:.1f} minutes")
         
+        # Invalidate cached sentiment so the dashboard shows the new metrics
+        try:
+            from cache_version import invalidate, cache_tag
+            invalidate(cache_tag("social_metrics"))
+        except Exception as cache_error:
+            logger.warning(f"⚠️  Failed to invalidate social metrics cache: {cache_error}")
+        
         # Log failed tickers if any
         if failed_tickers:
             logger.warning(f"❌ Failed tickers ({len(failed_tickers)}): {', '.join(failed_tickers[:10])}{'...' if len(failed_tickers) > 10 else ''}")
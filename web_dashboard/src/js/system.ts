@@ -27,12 +27,61 @@ interface JobLog {
     message: string;
 }
 
+interface RateLimitStat {
+    endpoint: string;
+    limit: number;
+    period: number;
+    per: string;
+    hits: number;
+    denied: number;
+    backend: string;
+}
+
+interface RateLimitsResponse {
+    rate_limits: RateLimitStat[];
+}
+
 document.addEventListener('DOMContentLoaded', () => {
     fetchSystemStatus();
     fetchDeploymentInfo();
     loadRegistrationStatus();
+    fetchRateLimits();
 });
 
+async function fetchRateLimits(): Promise<void> {
+    const tbody = document.getElementById('rate-limits-table-body');
+    try {
+        const response = await fetch('/api/admin/system/rate-limits');
+        const data: RateLimitsResponse = await response.json();
+        const limits = data.rate_limits || [];
+
+        const backendEl = document.getElementById('rate-limits-backend');
+        if (backendEl && limits.length > 0) {
+            backendEl.textContent = limits[0].backend === 'redis'
+                ? 'Requests allowed and denied per rate-limited endpoint (shared Redis backend, all instances).'
+                : 'Requests allowed and denied per rate-limited endpoint (in-process backend, this instance since start).';
+        }
+
+        if (tbody && limits.length > 0) {
+            tbody.innerHTML = limits.map(limit => `
+                <tr class="bg-dashboard-surface border-b border-border hover:bg-dashboard-hover">
+                    <td class="px-6 py-4 font-medium text-text-primary">${limit.endpoint}</td>
+                    <td class="px-6 py-4 text-text-secondary">${limit.limit} / ${limit.period}s per ${limit.per}</td>
+                    <td class="px-6 py-4 text-text-secondary">${limit.hits}</td>
+                    <td class="px-6 py-4 ${limit.denied > 0 ? 'text-theme-error-text' : 'text-text-secondary'}">${limit.denied}</td>
+                </tr>
+            `).join('');
+        } else if (tbody) {
+            tbody.innerHTML = `<tr><td colspan="4" class="px-6 py-4 text-center text-text-secondary">No rate-limited endpoints</td></tr>`;
+        }
+    } catch (error) {
+        console.error("Error fetching rate limits:", error);
+        if (tbody) {
+            tbody.innerHTML = `<tr><td colspan="4" class="px-6 py-4 text-center text-theme-error-text">Failed to load rate limits</td></tr>`;
+        }
+    }
+}
+
 async function fetchDeploymentInfo(): Promise<void> {
     try {
         const response = await fetch('/api/admin/system/deployment-info');
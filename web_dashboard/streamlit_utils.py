@@ -3,13 +3,22 @@
 Streamlit utilities for fetching data from Supabase
 """
 
+import functools
+import inspect
 import os
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, Iterable, List, Optional, Any, Union
 import pandas as pd
 import numpy as np
 from dotenv import load_dotenv
 
+from cache_version import cache_tag, get_dependency_version
+from portfolio_daily_totals import fetch_daily_totals, daily_value_series
+from fund_nav import get_nav_history
+from portfolio.ownership_ledger import (
+    parse_contributions, unit_ledger, INVESTOR_ALLOCATION_RULES, USER_METRICS_RULES
+)
+
 # Load environment variables
 load_dotenv()
 
@@ -35,6 +44,44 @@ except ImportError:
 _startup_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
 CACHE_VERSION = os.getenv("BUILD_TIMESTAMP", _startup_timestamp)
 
+
+def tagged_cache_data(ttl: Optional[int], depends_on: Union[Iterable[str], Callable[..., Iterable[str]]]):
+    """st.cache_data that is invalidated by related cache_version.invalidate() events.
+    
+    Streamlit doesn't hash arguments starting with ``_``, so ``_cache_version``
+    never reaches the key. Instead the call's dependency version (see
+    cache_version.get_dependency_version) is added to it, matching
+    flask_cache_utils.cache_data(depends_on=...).
+    
+    Args:
+        ttl: Time to live in seconds (None = until a dependency is invalidated)
+        depends_on: cache_version tags, or a callable receiving the call's
+            arguments by name and returning them
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+        
+        def cached(data_version: str, *args, **kwargs):
+            return func(*args, **kwargs)
+        
+        # st.cache_data keys functions by module and qualified name (plus source)
+        cached.__module__, cached.__name__, cached.__qualname__ = func.__module__, func.__name__, func.__qualname__
+        cached = st.cache_data(ttl=ttl)(cached)
+        
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if callable(depends_on):
+                bound = signature.bind_partial(*args, **kwargs)
+                bound.apply_defaults()
+                tags = [tag for tag in depends_on(**bound.arguments) if tag]
+            else:
+                tags = list(depends_on)
+            return cached(get_dependency_version(tags), *args, **kwargs)
+        
+        wrapper.clear = cached.clear
+        return wrapper
+    return decorator
+
 # ============================================================
 # CURRENCY REGISTRY - Extensible currency support
 # ============================================================
@@ -157,7 +204,7 @@ def convert_to_display_currency(value: float, from_currency: str, date: Optional
     return value * float(rate)
 
 
-@st.cache_data(ttl=3600)  # Cache for 1 hour - exchange rates are relatively stable
+@tagged_cache_data(ttl=3600, depends_on=[cache_tag("exchange_rates")])  # Exchange rates are relatively stable
 def fetch_latest_rates_bulk(currencies: List[str], target_currency: str) -> Dict[str, float]:
     """
     Fetch latest exchange rates for a list of currencies to the target currency in one go.
@@ -465,11 +512,11 @@ def get_available_funds() -> List[str]:
 
 
 @log_execution_time()
-@st.cache_data(ttl=300)
+@tagged_cache_data(ttl=300, depends_on=lambda fund=None, **_: [cache_tag("portfolio_positions", fund)])
 def get_current_positions(fund: Optional[str] = None, _cache_version: str = CACHE_VERSION) -> pd.DataFrame:
     """Get current portfolio positions as DataFrame.
     
-    CACHED: 5 min TTL. Bump CACHE_VERSION to force immediate invalidation.
+    CACHED: 5 min TTL, or until the fund's positions are invalidated.
     """
     import logging
     logger = logging.getLogger(__name__)
@@ -523,11 +570,11 @@ def get_current_positions(fund: Optional[str] = None, _cache_version: str = CACH
 
 
 @log_execution_time()
-@st.cache_data(ttl=None)  # Cache forever - historical trades don't change
+@tagged_cache_data(ttl=None, depends_on=lambda fund=None, **_: [cache_tag("trade_log", fund)])  # Cache until trades change
 def get_trade_log(limit: int = 1000, fund: Optional[str] = None, _cache_version: str = CACHE_VERSION) -> pd.DataFrame:
     """Get trade log entries as DataFrame with company names from securities table.
     
-    CACHED: Permanently. Bump CACHE_VERSION to invalidate after bug fixes.
+    CACHED: Until the fund's trades are invalidated.
     """
     import logging
     logger = logging.getLogger(__name__)
@@ -557,7 +604,7 @@ def get_trade_log(limit: int = 1000, fund: Optional[str] = None, _cache_version:
 
 
 @log_execution_time()
-@st.cache_data(ttl=300)
+@tagged_cache_data(ttl=300, depends_on=lambda fund=None, **_: [cache_tag("trade_log", fund)])
 def get_realized_pnl(fund: Optional[str] = None, display_currency: Optional[str] = None, _cache_version: str = CACHE_VERSION) -> Dict[str, Any]:
     """Calculate realized P&L from closed positions (SELL trades).
     
@@ -738,7 +785,7 @@ def get_realized_pnl(fund: Optional[str] = None, display_currency: Optional[str]
 
 
 @log_execution_time()
-@st.cache_data(ttl=300)
+@tagged_cache_data(ttl=300, depends_on=lambda fund=None, **_: [cache_tag("trade_log", fund), cache_tag("portfolio_positions", fund)])
 def get_first_trade_dates(fund: Optional[str] = None) -> Dict[str, datetime]:
     """Get the first trade date for each ticker.
     
@@ -832,7 +879,7 @@ def get_first_trade_dates(fund: Optional[str] = None) -> Dict[str, datetime]:
 
 
 @log_execution_time()
-@st.cache_data(ttl=300)
+@tagged_cache_data(ttl=300, depends_on=lambda fund=None, **_: [cache_tag("cash_balances", fund)])
 def get_cash_balances(fund: Optional[str] = None) -> Dict[str, float]:
     """Get cash balances by currency"""
     import logging
@@ -888,8 +935,251 @@ def get_cash_balances(fund: Optional[str] = None) -> Dict[str, float]:
         return {"CAD": 0.0, "USD": 0.0}
 
 
+def _daily_totals_from_positions(client: SupabaseClient, fund: Optional[str], cutoff_date: Optional[datetime],
+                                 display_currency: str) -> pd.DataFrame:
+    """Aggregate daily totals client-side from every portfolio_positions row.
+    
+    Fallback for calculate_portfolio_value_over_time when the
+    get_portfolio_daily_totals RPC is unavailable or its values aren't
+    pre-converted. Converts to display_currency at runtime if needed.
+    Returns columns date, value, cost_basis, pnl (empty if no positions).
+    """
+    import logging
+    import time
+    logger = logging.getLogger(__name__)
+    
+    # Query portfolio_positions to get daily snapshots with actual market values
+    # Include currency for proper USD→CAD conversion
+    
+    # WE MUST PAGINATE - Supabase has a hard limit of 1000 rows per request
+    all_rows = []
+    batch_size = 1000
+    offset = 0
+    query_start = time.time()
+    
+    while True:
+        # Build query for this batch
+        # Include base currency columns for pre-converted values (performance optimization)
+        query = client.supabase.table("portfolio_positions").select(
+            "date, total_value, cost_basis, pnl, fund, currency, "
+            "total_value_base, cost_basis_base, pnl_base, base_currency"
+        )
+    
+        if fund:
+            query = query.eq("fund", fund)
+    
+        # Apply date filter if specified (for performance with large datasets)
+        if cutoff_date:
+            query = query.gte("date", cutoff_date.strftime('%Y-%m-%dT%H:%M:%SZ'))
+    
+        # Order by date AND id to ensure consistent pagination (stable sort)
+        # Use range() for pagination
+        # Note: range is 0-indexed and inclusive for start, inclusive for end in PostgREST logic usually,
+        # but supabase-py .range(start, end) handles it.
+        result = query.order("date").order("id").range(offset, offset + batch_size - 1).execute()
+    
+        rows = result.data
+        if not rows:
+            break
+        
+        all_rows.extend(rows)
+    
+        # If we got fewer rows than batch_size, we're done
+        if len(rows) < batch_size:
+            break
+        
+        offset += batch_size
+    
+        # Safety break to prevent infinite loops (e.g. max 50k rows = 50 batches)
+        if offset > 50000:
+            print("Warning: Reached 50,000 row safety limit in pagination")
+            break
+    
+    query_time = time.time() - query_start
+    logger.info(f"⏱️ calculate_portfolio_value_over_time - DB queries: {query_time:.2f}s ({len(all_rows)} rows)")
+    
+    if not all_rows:
+        return pd.DataFrame()
+    
+    df = pd.DataFrame(all_rows)
+    logger.debug(f"Loaded {len(df)} total portfolio position rows from Supabase (paginated)")
+    
+    # Normalize to noon (12:00) for consistent charting with benchmarks
+    # Noon is more sensible than midnight for market data
+    df['date'] = pd.to_datetime(df['date']).dt.normalize() + pd.Timedelta(hours=12)
+    
+    # Log date range for debugging
+    if not df.empty:
+        min_date = df['date'].min()
+        max_date = df['date'].max()
+        logger.debug(f"Date range: {min_date.date()} to {max_date.date()}")
+    
+    # Check if we should use pre-converted values or runtime conversion
+    has_preconverted = False
+    if 'total_value_base' in df.columns and 'base_currency' in df.columns:
+        # FIX: Require that MOST records (>80%) have pre-converted values, not just "any"
+        # Otherwise adding new data with values to a dataset with NULL values corrupts the graph
+        preconverted_pct = df['total_value_base'].notna().mean()
+        has_preconverted = preconverted_pct > 0.8
+        if df['total_value_base'].notna().any() and not has_preconverted:
+            logger.warning(f"Only {preconverted_pct*100:.1f}% of records have pre-converted values - using fallback")
+    
+    if has_preconverted:
+        # USE PRE-CONVERTED VALUES (FAST PATH) - no exchange rate fetching needed!
+        logger.info("⚡ Using pre-converted base currency values (FAST PATH)")
+        value_col = 'total_value_base'
+        cost_col = 'cost_basis_base'
+        pnl_col = 'pnl_base'
+    else:
+        # FALLBACK: Runtime currency conversion for old data without base columns
+        logger.warning("⚠️ Using runtime currency conversion (SLOW PATH - data not pre-converted)")
+    
+        # Check if we have positions in currencies other than display currency
+        needs_conversion = False
+        if 'currency' in df.columns:
+            currencies = df['currency'].str.upper().fillna('CAD').unique()
+            needs_conversion = any(c != display_currency.upper() for c in currencies)
+    
+        if needs_conversion:
+            # Apply currency conversion to positions
+            convert_start = time.time()
+        
+            # OPTIMIZATION: Get unique date-currency pairs to minimize rate lookups
+            df['date_normalized'] = pd.to_datetime(df['date']).dt.normalize()
+            df['currency_normalized'] = df['currency'].str.upper().fillna('CAD')
+        
+            # Get unique combinations
+            unique_combos = df[['date_normalized', 'currency_normalized']].drop_duplicates()
+        
+            # BULK FETCH all needed rates in one query instead of 170+ individual queries
+            rate_list = []
+            unique_dates = unique_combos['date_normalized'].unique()
+            unique_currencies = unique_combos['currency_normalized'].unique()
+        
+            # Build SQL to fetch all rates at once
+            try:
+                client = get_supabase_client()
+                if client and len(unique_dates) > 0:
+                    # Query for all rates matching our date range and currencies
+                    min_date = pd.to_datetime(unique_dates.min()).strftime('%Y-%m-%d')
+                    max_date = pd.to_datetime(unique_dates.max()).strftime('%Y-%m-%d')
+                
+                    # Fetch rates for both USD<->CAD directions
+                    rates_response = client.supabase.table('exchange_rates').select('*') \
+                        .gte('timestamp', min_date) \
+                        .lte('timestamp', max_date) \
+                        .execute()
+                
+                    # Build lookup dictionary from bulk results
+                    rates_dict = {}
+                    if rates_response.data:
+                        for row in rates_response.data:
+                            date_key = pd.to_datetime(row['timestamp']).normalize()
+                            from_curr = row.get('from_currency', '').upper()
+                            to_curr = row.get('to_currency', '').upper()
+                            rate_val = float(row.get('rate', 1.0))
+                            rates_dict[(date_key, from_curr, to_curr)] = rate_val
+                
+                    # Now build rate_list using the bulk-fetched data
+                    for _, row in unique_combos.iterrows():
+                        date_val = row['date_normalized']
+                        curr_val = row['currency_normalized']
+                    
+                        if curr_val == display_currency.upper():
+                            rate_list.append({'date_normalized': date_val, 'currency_normalized': curr_val, 'conversion_rate': 1.0})
+                        else:
+                            # Try direct rate from bulk data
+                            rate = rates_dict.get((date_val, curr_val, display_currency.upper()))
+                        
+                            # Try inverse rate
+                            if rate is None:
+                                inverse_rate = rates_dict.get((date_val, display_currency.upper(), curr_val))
+                                if inverse_rate and inverse_rate != 0:
+                                    rate = 1.0 / inverse_rate
+                        
+                            # Fallback to default rates if not found
+                            if rate is None:
+                                if curr_val == 'USD' and display_currency.upper() == 'CAD':
+                                    rate = 1.35
+                                elif curr_val == 'CAD' and display_currency.upper() == 'USD':
+                                    rate = 1.0 / 1.35
+                                else:
+                                    rate = 1.0
+                        
+                            rate_list.append({'date_normalized': date_val, 'currency_normalized': curr_val, 'conversion_rate': rate})
+                else:
+                    # Fallback if client not available
+                    for _, row in unique_combos.iterrows():
+                        date_val = row['date_normalized']
+                        curr_val = row['currency_normalized']
+                        if curr_val == display_currency.upper():
+                            rate = 1.0
+                        elif curr_val == 'USD' and display_currency.upper() == 'CAD':
+                            rate = 1.35
+                        elif curr_val == 'CAD' and display_currency.upper() == 'USD':
+                            rate = 1.0 / 1.35
+                        else:
+                            rate = 1.0
+                        rate_list.append({'date_normalized': date_val, 'currency_normalized': curr_val, 'conversion_rate': rate})
+        
+            except Exception as e:
+                import logging
+                logger = logging.getLogger(__name__)
+                logger.error(f"Error bulk fetching exchange rates: {e}")
+                # Fallback to defaults
+                for _, row in unique_combos.iterrows():
+                    date_val = row['date_normalized']
+                    curr_val = row['currency_normalized']
+                    if curr_val == display_currency.upper():
+                        rate = 1.0
+                    elif curr_val == 'USD' and display_currency.upper() == 'CAD':
+                        rate = 1.35
+                    elif curr_val == 'CAD' and display_currency.upper() == 'USD':
+                        rate = 1.0 / 1.35
+                    else:
+                        rate = 1.0
+                    rate_list.append({'date_normalized': date_val, 'currency_normalized': curr_val, 'conversion_rate': rate})
+        
+            # Create rate lookup df and merge (FULLY VECTORIZED - no apply!)
+            rate_df = pd.DataFrame(rate_list)
+            df = df.merge(rate_df, on=['date_normalized', 'currency_normalized'], how='left')
+            df['conversion_rate'] = df['conversion_rate'].fillna(1.0)
+        
+            # Vectorized conversion (no loops!)
+            df['total_value_display'] = df['total_value'].astype(float) * df['conversion_rate']
+            df['cost_basis_display'] = df['cost_basis'].astype(float) * df['conversion_rate']
+            df['pnl_display'] = df['pnl'].astype(float) * df['conversion_rate']
+        
+            convert_time = time.time() - convert_start
+            logger.info(f"⏱️ calculate_portfolio_value_over_time - Currency conversion: {convert_time:.2f}s ({len(unique_combos)} unique date-currency pairs)")
+        
+            value_col = 'total_value_display'
+            cost_col = 'cost_basis_display'
+            pnl_col = 'pnl_display'
+        else:
+            # All positions already in display currency, use values as-is
+            value_col = 'total_value'
+            cost_col = 'cost_basis'
+            pnl_col = 'pnl'
+    
+    # Aggregate by date to get daily portfolio totals
+    agg_start = time.time()
+    # Sum all positions' values for each day
+    daily_totals = df.groupby(df['date'].dt.date).agg({
+        value_col: 'sum',
+        cost_col: 'sum',
+        pnl_col: 'sum'
+    }).reset_index()
+    
+    daily_totals.columns = ['date', 'value', 'cost_basis', 'pnl']
+    daily_totals['date'] = pd.to_datetime(daily_totals['date'])
+    daily_totals = daily_totals.sort_values('date').reset_index(drop=True)
+    
+    return daily_totals
+
+
 @log_execution_time()
-@st.cache_data(ttl=300)
+@tagged_cache_data(ttl=300, depends_on=lambda fund, **_: [cache_tag("portfolio_positions", fund), cache_tag("exchange_rates")])
 def calculate_portfolio_value_over_time(fund: str, days: Optional[int] = None, display_currency: Optional[str] = None) -> pd.DataFrame:
     """Calculate portfolio value over time from portfolio_positions table.
     
@@ -942,232 +1232,21 @@ def calculate_portfolio_value_over_time(fund: str, days: Optional[int] = None, d
         if days is not None and days > 0:
             cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
         
-        # Query portfolio_positions to get daily snapshots with actual market values
-        # Include currency for proper USD→CAD conversion
-        
-        # WE MUST PAGINATE - Supabase has a hard limit of 1000 rows per request
-        all_rows = []
-        batch_size = 1000
-        offset = 0
-        query_start = time.time()
-        
-        while True:
-            # Build query for this batch
-            # Include base currency columns for pre-converted values (performance optimization)
-            query = client.supabase.table("portfolio_positions").select(
-                "date, total_value, cost_basis, pnl, fund, currency, "
-                "total_value_base, cost_basis_base, pnl_base, base_currency"
-            )
-            
-            if fund:
-                query = query.eq("fund", fund)
-            
-            # Apply date filter if specified (for performance with large datasets)
-            if cutoff_date:
-                query = query.gte("date", cutoff_date.strftime('%Y-%m-%dT%H:%M:%SZ'))
-            
-            # Order by date AND id to ensure consistent pagination (stable sort)
-            # Use range() for pagination
-            # Note: range is 0-indexed and inclusive for start, inclusive for end in PostgREST logic usually,
-            # but supabase-py .range(start, end) handles it.
-            result = query.order("date").order("id").range(offset, offset + batch_size - 1).execute()
-            
-            rows = result.data
-            if not rows:
-                break
-                
-            all_rows.extend(rows)
-            
-            # If we got fewer rows than batch_size, we're done
-            if len(rows) < batch_size:
-                break
-                
-            offset += batch_size
-            
-            # Safety break to prevent infinite loops (e.g. max 50k rows = 50 batches)
-            if offset > 50000:
-                print("Warning: Reached 50,000 row safety limit in pagination")
-                break
-        
-        query_time = time.time() - query_start
-        logger.info(f"⏱️ calculate_portfolio_value_over_time - DB queries: {query_time:.2f}s ({len(all_rows)} rows)")
-        
-        if not all_rows:
-            return pd.DataFrame()
-        
-        df = pd.DataFrame(all_rows)
-        logger.debug(f"Loaded {len(df)} total portfolio position rows from Supabase (paginated)")
-        
-        # Normalize to noon (12:00) for consistent charting with benchmarks
-        # Noon is more sensible than midnight for market data
-        df['date'] = pd.to_datetime(df['date']).dt.normalize() + pd.Timedelta(hours=12)
-        
-        # Log date range for debugging
-        if not df.empty:
-            min_date = df['date'].min()
-            max_date = df['date'].max()
-            logger.debug(f"Date range: {min_date.date()} to {max_date.date()}")
-        
-        # Check if we should use pre-converted values or runtime conversion
-        has_preconverted = False
-        if 'total_value_base' in df.columns and 'base_currency' in df.columns:
-            # FIX: Require that MOST records (>80%) have pre-converted values, not just "any"
-            # Otherwise adding new data with values to a dataset with NULL values corrupts the graph
-            preconverted_pct = df['total_value_base'].notna().mean()
-            has_preconverted = preconverted_pct > 0.8
-            if df['total_value_base'].notna().any() and not has_preconverted:
-                logger.warning(f"Only {preconverted_pct*100:.1f}% of records have pre-converted values - using fallback")
-        
-        if has_preconverted:
-            # USE PRE-CONVERTED VALUES (FAST PATH) - no exchange rate fetching needed!
-            logger.info("⚡ Using pre-converted base currency values (FAST PATH)")
-            value_col = 'total_value_base'
-            cost_col = 'cost_basis_base'
-            pnl_col = 'pnl_base'
-        else:
-            # FALLBACK: Runtime currency conversion for old data without base columns
-            logger.warning("⚠️ Using runtime currency conversion (SLOW PATH - data not pre-converted)")
-            
-            # Check if we have positions in currencies other than display currency
-            needs_conversion = False
-            if 'currency' in df.columns:
-                currencies = df['currency'].str.upper().fillna('CAD').unique()
-                needs_conversion = any(c != display_currency.upper() for c in currencies)
-            
-            if needs_conversion:
-                # Apply currency conversion to positions
-                convert_start = time.time()
-                
-                # OPTIMIZATION: Get unique date-currency pairs to minimize rate lookups
-                df['date_normalized'] = pd.to_datetime(df['date']).dt.normalize()
-                df['currency_normalized'] = df['currency'].str.upper().fillna('CAD')
-                
-                # Get unique combinations
-                unique_combos = df[['date_normalized', 'currency_normalized']].drop_duplicates()
-                
-                # BULK FETCH all needed rates in one query instead of 170+ individual queries
-                rate_list = []
-                unique_dates = unique_combos['date_normalized'].unique()
-                unique_currencies = unique_combos['currency_normalized'].unique()
-                
-                # Build SQL to fetch all rates at once
-                try:
-                    client = get_supabase_client()
-                    if client and len(unique_dates) > 0:
-                        # Query for all rates matching our date range and currencies
-                        min_date = pd.to_datetime(unique_dates.min()).strftime('%Y-%m-%d')
-                        max_date = pd.to_datetime(unique_dates.max()).strftime('%Y-%m-%d')
-                        
-                        # Fetch rates for both USD<->CAD directions
-                        rates_response = client.supabase.table('exchange_rates').select('*') \
-                            .gte('timestamp', min_date) \
-                            .lte('timestamp', max_date) \
-                            .execute()
-                        
-                        # Build lookup dictionary from bulk results
-                        rates_dict = {}
-                        if rates_response.data:
-                            for row in rates_response.data:
-                                date_key = pd.to_datetime(row['timestamp']).normalize()
-                                from_curr = row.get('from_currency', '').upper()
-                                to_curr = row.get('to_currency', '').upper()
-                                rate_val = float(row.get('rate', 1.0))
-                                rates_dict[(date_key, from_curr, to_curr)] = rate_val
-                        
-                        # Now build rate_list using the bulk-fetched data
-                        for _, row in unique_combos.iterrows():
-                            date_val = row['date_normalized']
-                            curr_val = row['currency_normalized']
-                            
-                            if curr_val == display_currency.upper():
-                                rate_list.append({'date_normalized': date_val, 'currency_normalized': curr_val, 'conversion_rate': 1.0})
-                            else:
-                                # Try direct rate from bulk data
-                                rate = rates_dict.get((date_val, curr_val, display_currency.upper()))
-                                
-                                # Try inverse rate
-                                if rate is None:
-                                    inverse_rate = rates_dict.get((date_val, display_currency.upper(), curr_val))
-                                    if inverse_rate and inverse_rate != 0:
-                                        rate = 1.0 / inverse_rate
-                                
-                                # Fallback to default rates if not found
-                                if rate is None:
-                                    if curr_val == 'USD' and display_currency.upper() == 'CAD':
-                                        rate = 1.35
-                                    elif curr_val == 'CAD' and display_currency.upper() == 'USD':
-                                        rate = 1.0 / 1.35
-                                    else:
-                                        rate = 1.0
-                                
-                                rate_list.append({'date_normalized': date_val, 'currency_normalized': curr_val, 'conversion_rate': rate})
-                    else:
-                        # Fallback if client not available
-                        for _, row in unique_combos.iterrows():
-                            date_val = row['date_normalized']
-                            curr_val = row['currency_normalized']
-                            if curr_val == display_currency.upper():
-                                rate = 1.0
-                            elif curr_val == 'USD' and display_currency.upper() == 'CAD':
-                                rate = 1.35
-                            elif curr_val == 'CAD' and display_currency.upper() == 'USD':
-                                rate = 1.0 / 1.35
-                            else:
-                                rate = 1.0
-                            rate_list.append({'date_normalized': date_val, 'currency_normalized': curr_val, 'conversion_rate': rate})
-                
-                except Exception as e:
-                    import logging
-                    logger = logging.getLogger(__name__)
-                    logger.error(f"Error bulk fetching exchange rates: {e}")
-                    # Fallback to defaults
-                    for _, row in unique_combos.iterrows():
-                        date_val = row['date_normalized']
-                        curr_val = row['currency_normalized']
-                        if curr_val == display_currency.upper():
-                            rate = 1.0
-                        elif curr_val == 'USD' and display_currency.upper() == 'CAD':
-                            rate = 1.35
-                        elif curr_val == 'CAD' and display_currency.upper() == 'USD':
-                            rate = 1.0 / 1.35
-                        else:
-                            rate = 1.0
-                        rate_list.append({'date_normalized': date_val, 'currency_normalized': curr_val, 'conversion_rate': rate})
-                
-                # Create rate lookup df and merge (FULLY VECTORIZED - no apply!)
-                rate_df = pd.DataFrame(rate_list)
-                df = df.merge(rate_df, on=['date_normalized', 'currency_normalized'], how='left')
-                df['conversion_rate'] = df['conversion_rate'].fillna(1.0)
-                
-                # Vectorized conversion (no loops!)
-                df['total_value_display'] = df['total_value'].astype(float) * df['conversion_rate']
-                df['cost_basis_display'] = df['cost_basis'].astype(float) * df['conversion_rate']
-                df['pnl_display'] = df['pnl'].astype(float) * df['conversion_rate']
-                
-                convert_time = time.time() - convert_start
-                logger.info(f"⏱️ calculate_portfolio_value_over_time - Currency conversion: {convert_time:.2f}s ({len(unique_combos)} unique date-currency pairs)")
-                
-                value_col = 'total_value_display'
-                cost_col = 'cost_basis_display'
-                pnl_col = 'pnl_display'
+        # Per-day totals computed in the database (one row per day). Only usable
+        # when values are pre-converted; otherwise rows need runtime conversion below.
+        daily_totals = None
+        totals = fetch_daily_totals(client.supabase, fund, cutoff_date)
+        if totals is not None:
+            if totals.empty:
+                return pd.DataFrame()
+            daily_totals, preconverted = daily_value_series(totals)
+            if preconverted:
+                logger.info(f"⚡ Using database daily totals ({len(daily_totals)} days)")
             else:
-                # All positions already in display currency, use values as-is
-                value_col = 'total_value'
-                cost_col = 'cost_basis'
-                pnl_col = 'pnl'
-        
-        # Aggregate by date to get daily portfolio totals
-        agg_start = time.time()
-        # Sum all positions' values for each day
-        daily_totals = df.groupby(df['date'].dt.date).agg({
-            value_col: 'sum',
-            cost_col: 'sum',
-            pnl_col: 'sum'
-        }).reset_index()
-        
-        daily_totals.columns = ['date', 'value', 'cost_basis', 'pnl']
-        daily_totals['date'] = pd.to_datetime(daily_totals['date'])
-        daily_totals = daily_totals.sort_values('date').reset_index(drop=True)
+                daily_totals = None
+        
+        if daily_totals is None:
+            daily_totals = _daily_totals_from_positions(client, fund, cutoff_date, display_currency)
         
         if daily_totals.empty:
             return pd.DataFrame()
@@ -1491,7 +1570,7 @@ def get_investor_count(fund: str) -> int:
         return 0
 
 
-@st.cache_data(ttl=3600)  # 1 hour - contributor list changes infrequently
+@tagged_cache_data(ttl=3600, depends_on=lambda fund, **_: [cache_tag("fund_contributions", fund), cache_tag("portfolio_positions", fund)])
 def get_investor_allocations(fund: str, user_email: Optional[str] = None, is_admin: bool = False, _cache_version: str = CACHE_VERSION) -> pd.DataFrame:
     """Get investor allocation data with privacy masking
     
@@ -1540,191 +1619,21 @@ def get_investor_allocations(fund: str, user_email: Optional[str] = None, is_adm
         if not all_contributions:
             return pd.DataFrame()
         
-        # Parse and sort contributions chronologically
-        from datetime import datetime
-        contributions = []
-        for record in all_contributions:
-            timestamp_raw = record.get('timestamp', '')
-            timestamp = None
-            if timestamp_raw:
-                try:
-                    if isinstance(timestamp_raw, datetime):
-                        timestamp = timestamp_raw
-                    elif isinstance(timestamp_raw, str):
-                        try:
-                            from data.repositories.field_mapper import TypeTransformers
-                            timestamp = TypeTransformers.iso_to_datetime(timestamp_raw)
-                        except ImportError:
-                            from datetime import datetime as dt
-                            try:
-                                timestamp = dt.fromisoformat(timestamp_raw.replace('Z', '+00:00'))
-                            except (ValueError, AttributeError):
-                                for fmt in ['%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M:%S', '%Y-%m-%d']:
-                                    try:
-                                        timestamp = dt.strptime(timestamp_raw.split('+')[0].split('.')[0], fmt)
-                                        break
-                                    except ValueError:
-                                        continue
-                except Exception:
-                    pass
-            
-            contributions.append({
-                'contributor': record.get('contributor', 'Unknown'),
-                'email': record.get('email', ''),
-                'amount': float(record.get('amount', 0)),
-                'type': record.get('contribution_type', 'CONTRIBUTION').lower(),
-                'timestamp': timestamp
-            })
-        
-        contributions.sort(key=lambda x: x['timestamp'] or datetime.min)
+        # Parse contributions in bulk (sorted chronologically)
+        contributions = parse_contributions(all_contributions)
         
         # Get contribution dates for historical fund value lookup
-        contrib_dates = [c['timestamp'] for c in contributions if c['timestamp']]
+        contrib_dates = list(pd.to_datetime(contributions['day'].dropna().unique()))
         
         # Fetch historical fund values AND cost basis (for uninvested cash calculation)
         # Returns: (stock_values_dict, cost_basis_dict)
         historical_values, historical_cost_basis = get_historical_fund_values(fund, contrib_dates)
         
-        # Calculate NAV-based ownership using same logic as get_user_investment_metrics
-        contributor_units = {}
-        contributor_data = {}
-        total_units = 0.0
-        running_contributions = 0.0  # Track total contributions for uninvested cash
-        
-        # Track state at start of each day for same-day contribution NAV calculation
-        units_at_start_of_day = 0.0
-        contributions_at_start_of_day = 0.0
-        last_contribution_date = None
-        
-        for contrib in contributions:
-            contributor = contrib['contributor']
-            amount = contrib['amount']
-            contrib_type = contrib['type']
-            timestamp = contrib['timestamp']
-            
-            # Same-day NAV fix - calculate date_str BEFORE withdrawal/contribution logic
-            date_str = timestamp.strftime('%Y-%m-%d') if timestamp else None
-            if date_str != last_contribution_date:
-                units_at_start_of_day = total_units
-                contributions_at_start_of_day = running_contributions
-                last_contribution_date = date_str
-            
-            if contributor not in contributor_units:
-                contributor_units[contributor] = 0.0
-                contributor_data[contributor] = {
-                    'email': contrib['email'],
-                    'net_contribution': 0.0
-                }
-            
-            if contrib_type == 'withdrawal':
-                contributor_data[contributor]['net_contribution'] -= amount
-                running_contributions -= amount  # Track for uninvested cash calculation
-                
-                # Redeem units
-                if total_units > 0 and contributor_units[contributor] > 0:
-                    # date_str already calculated above
-                    if date_str and date_str in historical_values:
-                        fund_value_at_date = historical_values[date_str]
-                        nav_at_withdrawal = fund_value_at_date / total_units if total_units > 0 else 1.0
-                    else:
-                        nav_at_withdrawal = 1.0
-                    
-                    units_to_redeem = amount / nav_at_withdrawal if nav_at_withdrawal > 0 else amount
-                    actual_units_redeemed = min(units_to_redeem, contributor_units[contributor])
-                    contributor_units[contributor] -= actual_units_redeemed
-                    total_units -= actual_units_redeemed
-            else:
-                contributor_data[contributor]['net_contribution'] += amount
-                
-                # Calculate NAV
-                # date_str already calculated above
-                
-                if total_units == 0:
-                    # First contribution to the fund - NAV starts at 1.0
-                    nav_at_contribution = 1.0
-                    last_valid_nav = 1.0  # Initialize for future sanity checks
-                    import logging
-                    logger = logging.getLogger(__name__)
-                    logger.info(f"NAV calculation: First contribution to fund, using inception NAV = 1.0")
-                elif date_str and date_str in historical_values:
-                    stock_value_at_date = historical_values[date_str]
-                    cost_basis_at_date = historical_cost_basis.get(date_str, 0.0)
-                    
-                    unit_price_source = "stock_plus_net_cash"
-                    
-                    # PROPER NAV FIX: Fund Value = Stock Value + Net Cash
-                    # Net Cash = Contributions - Cost Basis.
-                    # Crucially, we allow this to be NEGATIVE.
-                    # Why? If we bought stock ($8k) but contributions are delayed/missing in DB ($5k),
-                    # we have a temporary "liability" of -$3k. 
-                    # Fund Equity = $8k (Asset) - $3k (Liability) = $5k.
-                    # This prevents NAV inflation (and dilution) when records lag trades.
-                    
-                    net_cash = contributions_at_start_of_day - cost_basis_at_date
-                    fund_value_at_date = stock_value_at_date + net_cash
-                    
-                    nav_at_contribution = fund_value_at_date / units_for_nav if units_for_nav > 0 else 1.0
-                    
-                    # Use units_at_start_of_day for same-day contributions
-                    units_for_nav = units_at_start_of_day if units_at_start_of_day > 0 else total_units
-                    nav_at_contribution = fund_value_at_date / units_for_nav if units_for_nav > 0 else 1.0
-                else:
-                    # Date not found (e.g., weekend/holiday contribution)
-                    # Look backwards up to 7 days for the closest prior trading day
-                    nav_at_contribution = 1.0  # Default fallback
-                    units_for_nav = units_at_start_of_day if units_at_start_of_day > 0 else total_units
-                    if date_str and units_for_nav > 0:
-                        from datetime import datetime, timedelta
-                        contribution_date = datetime.strptime(date_str, '%Y-%m-%d')
-                        
-                        for days_back in range(1, 8):  # Check up to 7 days prior
-                            prior_date = contribution_date - timedelta(days=days_back)
-                            prior_date_str = prior_date.strftime('%Y-%m-%d')
-                            
-                            if prior_date_str in historical_values:
-                                fund_value_at_prior_date = historical_values[prior_date_str]
-                                nav_at_contribution = fund_value_at_prior_date / units_for_nav
-                                
-                                # Log the fallback for transparency
-                                import logging
-                                logger = logging.getLogger(__name__)
-                                logger.warning(f"NAV fallback: {date_str} (weekend/holiday) -> using {prior_date_str} NAV = {nav_at_contribution:.4f}")
-                                break
-                        
-                        # If still 1.0 after search, log as potential issue
-                        if nav_at_contribution == 1.0:
-                            import logging
-                            logger = logging.getLogger(__name__)
-                            logger.error(f"NAV calculation: No historical data found within 7 days of {date_str}, falling back to NAV=1.0")
-                
-                if nav_at_contribution <= 0:
-                    import logging
-                    logger = logging.getLogger(__name__)
-                    logger.error(f"NAV calculation: Calculated NAV <= 0 ({nav_at_contribution}) for {date_str}, falling back to NAV=1.0 - THIS MAY CORRUPT DATA!")
-                    nav_at_contribution = 1.0
-                
-                units_purchased = amount / nav_at_contribution
-                contributor_units[contributor] += units_purchased
-                total_units += units_purchased
-                running_contributions += amount  # Track for uninvested cash calculation
-        
-        # Build result DataFrame
-        result_data = []
-        for contributor, data in contributor_data.items():
-            result_data.append({
-                'contributor': contributor,
-                'email': data['email'],
-                'net_contribution': data['net_contribution'],
-                'units': contributor_units.get(contributor, 0.0)
-            })
-        
-        df = pd.DataFrame(result_data)
-        
-        # Calculate ownership percentages based on UNITS (NAV-based), not dollars
-        if total_units > 0:
-            df['ownership_pct'] = (df['units'] / total_units) * 100
-        else:
-            df['ownership_pct'] = 0.0
+        # Calculate NAV-based units (see portfolio/ownership_ledger.py); ownership_pct
+        # is based on UNITS, not dollars
+        ledger = unit_ledger(contributions, None, historical_values, historical_cost_basis,
+                             rules=INVESTOR_ALLOCATION_RULES)
+        df = ledger.holdings.reset_index()[['contributor', 'email', 'net_contribution', 'units', 'ownership_pct']]
         
         # Sort by ownership percentage (descending) for consistent masking
         df = df.sort_values('ownership_pct', ascending=False).reset_index(drop=True)
@@ -1754,14 +1663,16 @@ def get_investor_allocations(fund: str, user_email: Optional[str] = None, is_adm
         return pd.DataFrame()
 
 
-@st.cache_data(ttl=None)  # Cache forever - historical data doesn't change
+@tagged_cache_data(ttl=None, depends_on=lambda fund, **_: [cache_tag("portfolio_positions", fund)])  # Cache until positions are rebuilt
 def get_historical_fund_values(fund: str, dates: List[datetime], _cache_version: str = CACHE_VERSION) -> Dict[str, float]:
     """Get historical fund values for specific dates.
     
-    Queries portfolio_positions to calculate total fund value at each date.
-    Returns the closest available date if exact date not found.
+    Reads the fund_nav_daily store (see fund_nav.py), falling back to
+    calculating total fund value from portfolio_positions when the store
+    has no rows for the fund. Returns the closest available date if exact
+    date not found.
     
-    CACHED: Permanently cached. Bump CACHE_VERSION in streamlit_utils.py to invalidate after bug fixes.
+    CACHED: Until the fund's positions are invalidated (e.g. by the price update job).
     
     Args:
         fund: Fund name
@@ -1783,9 +1694,14 @@ def get_historical_fund_values(fund: str, dates: List[datetime], _cache_version:
         if not date_strs:
             return {}, {}
         
+        # Read the daily NAV store (rows around the requested dates only) when it's built
+        nav_history = get_nav_history(client.supabase, fund, date_strs)
+        if nav_history is not None:
+            return nav_history
+        
         min_date = min(date_strs)
         
-        # Query portfolio_positions for this fund, from earliest contribution date onwards
+        # Fallback: query portfolio_positions for this fund, from earliest contribution date onwards
         # WE MUST PAGINATE - Supabase has a hard limit of 1000 rows per request
         all_rows = []
         batch_size = 1000
@@ -1951,7 +1867,7 @@ def get_historical_fund_values(fund: str, dates: List[datetime], _cache_version:
         return {}, {}
 
 
-@st.cache_data(ttl=300)
+@tagged_cache_data(ttl=300, depends_on=lambda fund, **_: [cache_tag("fund_contributions", fund), cache_tag("portfolio_positions", fund)])
 def get_user_investment_metrics(fund: str, total_portfolio_value: float, include_cash: bool = True, session_id: str = "unknown", display_currency: Optional[str] = None, _cache_version: str = CACHE_VERSION) -> Optional[Dict[str, Any]]:
     """Get investment metrics for the currently logged-in user using NAV-based calculation.
     
@@ -1986,7 +1902,7 @@ def get_user_investment_metrics(fund: str, total_portfolio_value: float, include
     if display_currency is None:
         display_currency = get_user_display_currency()
     from auth_utils import get_user_email
-    from datetime import datetime, timezone, timedelta
+    from datetime import timedelta
     
     # Get user email
     user_email = get_user_email()
@@ -2057,60 +1973,15 @@ def get_user_investment_metrics(fund: str, total_portfolio_value: float, include
             log_message(f"[{session_id}] PERF: get_user_investment_metrics - Fund value <= 0, returning None (total: {time.time() - func_start:.2f}s)", level='DEBUG')
             return None
         
-        # Parse and sort contributions chronologically
+        # Parse contributions in bulk (sorted chronologically)
         t0 = time.time()
-        contributions = []
-        for record in all_contributions:
-            timestamp_raw = record.get('timestamp', '')
-            timestamp = None
-            if timestamp_raw:
-                try:
-                    if isinstance(timestamp_raw, datetime):
-                        timestamp = timestamp_raw
-                    elif isinstance(timestamp_raw, str):
-                        # Use the same ISO parser that the repository uses for database timestamps
-                        try:
-                            from data.repositories.field_mapper import TypeTransformers
-                            timestamp = TypeTransformers.iso_to_datetime(timestamp_raw)
-                        except ImportError:
-                            # Fallback to manual parsing if import fails
-                            from datetime import datetime as dt
-                            try:
-                                timestamp = dt.fromisoformat(timestamp_raw.replace('Z', '+00:00'))
-                            except (ValueError, AttributeError):
-                                # Last resort: try basic formats
-                                for fmt in ['%Y-%m-%dT%H:%M:%S', '%Y-%m-%d %H:%M:%S', '%Y-%m-%d']:
-                                    try:
-                                        timestamp = dt.strptime(timestamp_raw.split('+')[0].split('.')[0], fmt)
-                                        break
-                                    except ValueError:
-                                        continue
-                    else:
-                        # Use print for streamlit utilities (logger may not be available)
-                        print(f"⚠️  Unexpected timestamp type '{type(timestamp_raw)}' for contributor {record.get('contributor', 'Unknown')}")
-                except Exception as e:
-                    print(f"⚠️  Could not parse timestamp '{timestamp_raw}' for contributor {record.get('contributor', 'Unknown')}: {e}")
-            
-            contributions.append({
-                'contributor': record.get('contributor', 'Unknown'),
-                'email': record.get('email', ''),
-                'amount': float(record.get('amount', 0)),
-                'type': record.get('contribution_type', 'CONTRIBUTION').lower(),
-                'timestamp': timestamp
-            })
-        
-        contributions.sort(key=lambda x: x['timestamp'] or datetime.min)
+        contributions = parse_contributions(all_contributions)
         log_message(f"[{session_id}] PERF: get_user_investment_metrics - Parse contributions: {time.time() - t0:.2f}s", level='DEBUG')
         
         # Get all contribution dates AND previous dates (for NAV lookup)
         # We need previous day's value to calculate NAV *before* the new capital affects value
-        contrib_dates = []
-        for c in contributions:
-            if c['timestamp']:
-                ts = c['timestamp']
-                contrib_dates.append(ts)
-                # Add previous day
-                contrib_dates.append(ts - timedelta(days=1))
+        contrib_days = pd.to_datetime(contributions['day'].dropna().unique())
+        contrib_dates = sorted(set(contrib_days) | set(contrib_days - timedelta(days=1)))
         
         # Fetch ACTUAL historical fund values AND cost basis from portfolio_positions
         t0 = time.time()
@@ -2131,175 +2002,48 @@ def get_user_investment_metrics(fund: str, total_portfolio_value: float, include
         log_message(f"[{session_id}] PERF: get_user_investment_metrics - get_historical_fund_values: {time.time() - t0:.2f}s ({len(historical_values)} dates)", level='DEBUG')
         
         # Check if we have sufficient historical data
-        use_historical = bool(historical_values)
         if not historical_values:
             log_message(f"[{session_id}] NAV WARNING: No historical fund values found for {fund}. Using time-weighted estimation.", level='WARNING')
             print(f"⚠️  NAV WARNING: No historical fund values found for {fund}. Using time-weighted estimation.")
-        elif len(historical_values) < len(set(d.strftime('%Y-%m-%d') for d in contrib_dates if d)):
-            log_message(f"[{session_id}] NAV WARNING: Only {len(historical_values)} historical dates found for {len(set(d.strftime('%Y-%m-%d') for d in contrib_dates if d))} contribution dates. Some will use fallback.", level='WARNING')
+        elif len(historical_values) < len(contrib_dates):
+            log_message(f"[{session_id}] NAV WARNING: Only {len(historical_values)} historical dates found for {len(contrib_dates)} contribution dates. Some will use fallback.", level='WARNING')
             print(f"⚠️  NAV WARNING: Only {len(historical_values)} historical dates found, some contributions will use fallback estimation.")
         
-        # Calculate time-weighted estimation parameters for fallback
-        # This matches the logic in position_calculator.py
-        total_net_contributions = sum(
-            -c['amount'] if c['type'] == 'withdrawal' else c['amount'] 
-            for c in contributions
-        )
-        growth_rate = fund_total_value / total_net_contributions if total_net_contributions > 0 else 1.0
-        
-        timestamps = [c['timestamp'] for c in contributions if c['timestamp']]
-        if timestamps:
-            first_timestamp = min(timestamps)
-            # Ensure now is timezone aware (UTC) to match database timestamps
-            now = datetime.now(timezone.utc)
-            total_days = max((now - first_timestamp).days, 1)
-        else:
-            first_timestamp = None
-            total_days = 1
-        
-        # Calculate NAV-based ownership using actual historical data
+        # Calculate NAV-based ownership using actual historical data (see portfolio/ownership_ledger.py)
+        # CRITICAL: Units are priced at the PREVIOUS DAY'S closing NAV to avoid self-referential inflation
         t0 = time.time()
-        contributor_units = {}
-        contributor_data = {}
-        total_units = 0.0
-        running_total_contributions = 0.0  # Total contributions up to this point
-        
-        # Track state at start of each day for same-day NAV calculation
-        units_at_start_of_day = 0.0
-        contributions_at_start_of_day = 0.0
-        last_contribution_date = None
-        
-        for contrib in contributions:
-            contributor = contrib['contributor']
-            amount = contrib['amount']
-            contrib_type = contrib['type']
-            timestamp = contrib['timestamp']
-            
-            # Same-day NAV fix - capture state at START of each new day
-            date_str = timestamp.strftime('%Y-%m-%d') if timestamp else None
-            if date_str != last_contribution_date:
-                units_at_start_of_day = total_units
-                contributions_at_start_of_day = running_total_contributions
-                last_contribution_date = date_str
-            
-            if contributor not in contributor_units:
-                contributor_units[contributor] = 0.0
-                contributor_data[contributor] = {
-                    'email': contrib['email'],
-                    'contributions': 0.0,
-                    'withdrawals': 0.0,
-                    'net_contribution': 0.0
-                }
-            
-            # Determine NAV for this transaction
-            # CRITICAL: Use PREVIOUS DAY'S Closing NAV to avoid self-referential inflation
-            # For same-day contributions, use start-of-day units to ensure fairness
-            nav_at_transaction = 1.0  # Default to inception NAV
-            nav_source = "inception"
-            
-            # Use start-of-day units for same-day fairness
-            # All contributors on the same day should get the same NAV
-            units_for_nav = units_at_start_of_day if units_at_start_of_day > 0 else total_units
-            
-            if units_for_nav > 0:
-                # Try to find historical fund value, looking back up to 7 days
-                # This handles weekends, holidays, gaps in trading, and infrequent position updates
-                found_nav = False
-                
-                for days_back in range(1, 8):
-                    check_date = (timestamp - timedelta(days=days_back)).strftime('%Y-%m-%d') if timestamp else None
-                    
-                    if check_date and check_date in historical_values and historical_values[check_date] > 0:
-                        stock_value_at_date = historical_values[check_date]
-                        cost_basis_at_date = historical_cost_basis.get(check_date, 0.0)
-                        
-                        # Apply same Logic as get_investor_allocations
-                        # Fund Value = Stock + (Contribs - Cost)
-                        # Allow negative cash flow to handle unrecorded capital injection
-                        net_cash = contributions_at_start_of_day - cost_basis_at_date
-                        fund_value_at_date = stock_value_at_date + net_cash
-                        
-                        nav_at_transaction = fund_value_at_date / units_for_nav
-                        nav_source = f"lookback_{days_back}d ({check_date})"
-                        found_nav = True
-                        break
-                
-                # If no historical data found in past 7 days, use fallback strategies
-                if not found_nav:
-                    # Try time-weighted estimation if we have timestamp info
-                    if first_timestamp and timestamp:
-                        elapsed_days = (timestamp - first_timestamp).days
-                        time_fraction = elapsed_days / total_days
-                        nav_at_transaction = 1.0 + (growth_rate - 1.0) * time_fraction
-                        nav_source = "time_weighted"
-                    # Last resort: average cost NAV
-                    elif units_for_nav > 0:
-                        nav_at_transaction = (running_total_contributions / units_for_nav)
-                        nav_source = "average_cost"
-            
-            if contrib_type == 'withdrawal':
-                contributor_data[contributor]['withdrawals'] += amount
-                contributor_data[contributor]['net_contribution'] -= amount
-                
-                if total_units > 0 and contributor_units[contributor] > 0:
-                    units_to_redeem = amount / nav_at_transaction if nav_at_transaction > 0 else amount
-                    # Cap redemption
-                    actual_units_redeemed = min(units_to_redeem, contributor_units[contributor])
-                    contributor_units[contributor] -= actual_units_redeemed
-                    total_units -= actual_units_redeemed
-                elif contributor_units[contributor] <= 0 and amount > 0:
-                    log_message(f"[{session_id}] NAV WARNING: Withdrawal of ${amount} from {contributor} skipped - no units to redeem", level='WARNING')
-                    print(f"⚠️  Withdrawal of ${amount} from {contributor} skipped - no units to redeem")
-                
-                running_total_contributions -= amount
-            else:
-                contributor_data[contributor]['contributions'] += amount
-                contributor_data[contributor]['net_contribution'] += amount
-                
-                units_issued = amount / nav_at_transaction
-                contributor_units[contributor] += units_issued
-                total_units += units_issued
-                running_total_contributions += amount
-                
-                # Log unit issuance for debugging
-                if nav_at_transaction != 10.0:
-                    log_message(f"[{session_id}] NAV DEBUG: {contributor} added ${amount} at NAV ${nav_at_transaction:.4f} ({nav_source}) -> {units_issued:.2f} units", level='DEBUG')
-        
-        log_message(f"[{session_id}] PERF: get_user_investment_metrics - NAV calculations: {time.time() - t0:.2f}s ({len(contributions)} contributions)", level='DEBUG')
+        ledger = unit_ledger(contributions, fund_total_value, historical_values, historical_cost_basis,
+                             rules=USER_METRICS_RULES)
+        total_units = ledger.total_units
+        log_message(f"[{session_id}] PERF: get_user_investment_metrics - NAV calculations: {time.time() - t0:.2f}s ({len(contributions)} contributions, {ledger.fallback_count} estimated NAVs)", level='DEBUG')
         
         if total_units <= 0:
             log_message(f"[{session_id}] PERF: get_user_investment_metrics - Total units <= 0, returning None (total: {time.time() - func_start:.2f}s)", level='DEBUG')
             return None
         
         # Find the current user's data
-        user_email_lower = user_email.lower()
-        user_contributor = None
-        user_units = 0.0
-        
-        for contributor, data in contributor_data.items():
-            contrib_email = data.get('email', '')
-            if contrib_email and contrib_email.lower() == user_email_lower:
-                user_contributor = contributor
-                user_units = contributor_units.get(contributor, 0.0)
-                break
+        holdings = ledger.holdings
+        user_rows = holdings[holdings['email'].fillna('').astype(str).str.lower() == user_email.lower()]
         
-        if user_contributor is None or user_units <= 0:
+        if user_rows.empty or user_rows['units'].iloc[0] <= 0:
             log_message(f"[{session_id}] PERF: get_user_investment_metrics - User not found or no units, returning None (total: {time.time() - func_start:.2f}s)", level='DEBUG')
             return None
         
-        user_data = contributor_data[user_contributor]
-        user_net_contribution = user_data['net_contribution']
+        user_contributor = user_rows.index[0]
+        user_data = user_rows.iloc[0]
+        user_net_contribution = float(user_data['net_contribution'])
         
         if user_net_contribution <= 0:
             log_message(f"[{session_id}] PERF: get_user_investment_metrics - User net contribution <= 0, returning None (total: {time.time() - func_start:.2f}s)", level='DEBUG')
             return None
         
-        # Calculate current NAV and user's value
-        current_nav = fund_total_value / total_units
-        current_value = user_units * current_nav
-        ownership_pct = (user_units / total_units) * 100
-        gain_loss = current_value - user_net_contribution
-        gain_loss_pct = (gain_loss / user_net_contribution) * 100 if user_net_contribution > 0 else 0.0
+        # Current NAV and user's value
+        user_units = float(user_data['units'])
+        current_nav = ledger.unit_price
+        current_value = float(user_data['current_value'])
+        ownership_pct = float(user_data['ownership_pct'])
+        gain_loss = float(user_data['gain_loss'])
+        gain_loss_pct = float(user_data['gain_loss_pct'])
         
         log_message(f"[{session_id}] PERF: get_user_investment_metrics - SUCCESS, total time: {time.time() - func_start:.2f}s", level='DEBUG')
         
@@ -2337,7 +2081,7 @@ def get_user_investment_metrics(fund: str, total_portfolio_value: float, include
 
 
 @log_execution_time()
-@st.cache_data(ttl=3600)  # Cache for 1 hour - thesis doesn't change frequently
+@tagged_cache_data(ttl=3600, depends_on=lambda fund_name, **_: [cache_tag("fund_thesis", fund_name)])  # Thesis doesn't change frequently
 def get_fund_thesis_data(fund_name: str) -> Optional[Dict[str, Any]]:
     """Get thesis data for a fund from the database view.
     
@@ -35,6 +35,11 @@ except ImportError:
     print("   You should see (venv) in your prompt when activated.")
     raise ImportError("Supabase client not available. Activate virtual environment.")
 
+try:
+    from supabase_registry import get_client_registry
+except ImportError:
+    from web_dashboard.supabase_registry import get_client_registry
+
 logger = logging.getLogger(__name__)
 
 class SupabaseClient:
@@ -43,8 +48,13 @@ class SupabaseClient:
     def __init__(self, user_token: Optional[str] = None, refresh_token: Optional[str] = None, use_service_role: bool = False):
         """Initialize Supabase client
         
+        The underlying supabase clients are reused across instances (see
+        supabase_registry), so constructing SupabaseClient per request is cheap.
+        
         Args:
             user_token: Optional JWT token from authenticated user (respects RLS)
+            refresh_token: Optional refresh token, used to refresh the session
+                when the access token is about to expire
             use_service_role: If True, use service role key (bypasses RLS, admin only)
         """
         self.url = os.getenv("SUPABASE_URL")
@@ -64,116 +74,140 @@ class SupabaseClient:
             logger.error(f"Missing environment variables - URL: {bool(self.url)}, KEY: {bool(self.key)}")
             raise ValueError("SUPABASE_URL and appropriate key must be set")
         
-        # Create client with publishable/service role key
+        # Reuse registry clients instead of creating one per instance
+        registry = get_client_registry()
+        if user_token and not use_service_role:
+            self.supabase, self._user_token = registry.user_client(
+                user_token, refresh_token, self._create_user_client, self._refresh_user_session
+            )
+        else:
+            # Service-role and anonymous clients carry no user state - share one per key
+            self.supabase = registry.shared_client(self.url, self.key, lambda: create_client(self.url, self.key))
+    
+    def _create_user_client(self, user_token: str, refresh_token: Optional[str] = None) -> Client:
+        """Create a client authenticated with a user's token (called by the registry)."""
+        # Create client with publishable key
         self.supabase: Client = create_client(self.url, self.key)
         
-        # If user token provided, set it as the auth session
-        if user_token and not use_service_role:
-            # Store token for use in queries
-            self._user_token = user_token
-            
-            logger.debug(f"[SUPABASE_CLIENT] Initializing with user token (length: {len(user_token)})")
-            
-            # CRITICAL: Set Authorization header on ALL request paths
-            # The Supabase Python SDK uses multiple internal clients (postgrest, auth, etc.)
-            # We need to ensure the Authorization header is set for ALL of them
-            
-            try:
-                # Method 1: Set session via auth client (standard approach)
-                # This is the CORRECT way - it sets auth headers globally for ALL requests
-                # including RPC calls, table queries, etc.
-                if refresh_token:
-                    # Use both tokens for proper session
-                    self.supabase.auth.set_session(
-                        access_token=user_token,
-                        refresh_token=refresh_token
-                    )
-                    logger.debug("[SUPABASE_CLIENT] ✅ Successfully called auth.set_session() with refresh_token")
+        # Store token for use in queries
+        self._user_token = user_token
+        
+        logger.debug(f"[SUPABASE_CLIENT] Initializing with user token (length: {len(user_token)})")
+        
+        # CRITICAL: Set Authorization header on ALL request paths
+        # The Supabase Python SDK uses multiple internal clients (postgrest, auth, etc.)
+        # We need to ensure the Authorization header is set for ALL of them
+        
+        try:
+            # Method 1: Set session via auth client (standard approach)
+            # This is the CORRECT way - it sets auth headers globally for ALL requests
+            # including RPC calls, table queries, etc.
+            if refresh_token:
+                # Use both tokens for proper session
+                self.supabase.auth.set_session(
+                    access_token=user_token,
+                    refresh_token=refresh_token
+                )
+                logger.debug("[SUPABASE_CLIENT] ✅ Successfully called auth.set_session() with refresh_token")
+            else:
+                # Try with empty refresh_token as fallback
+                self.supabase.auth.set_session(
+                    access_token=user_token,
+                    refresh_token=""
+                )
+                logger.debug("[SUPABASE_CLIENT] ⚠️ Called auth.set_session() without refresh_token (may not work for RPC)")
+        except Exception as e:
+            logger.warning(f"[SUPABASE_CLIENT] ❌ auth.set_session() failed: {e}")
+        
+        # Method 2: Set Authorization header directly on postgrest client
+        # This ensures table queries work
+        try:
+            logger.debug(f"[SUPABASE_CLIENT] postgrest exists: {hasattr(self.supabase, 'postgrest')}")
+            if hasattr(self.supabase, 'postgrest') and self.supabase.postgrest:
+                logger.debug(f"[SUPABASE_CLIENT] postgrest.session exists: {hasattr(self.supabase.postgrest, 'session')}")
+                logger.debug(f"[SUPABASE_CLIENT] postgrest.auth exists: {hasattr(self.supabase.postgrest, 'auth')}")
+                # The postgrest client should have a session attribute with headers
+                if hasattr(self.supabase.postgrest, 'session'):
+                    # Set Authorization header directly on the session
+                    self.supabase.postgrest.session.headers["Authorization"] = f"Bearer {user_token}"
+                    logger.debug("[SUPABASE_CLIENT] ✅ Set Authorization header on postgrest.session")
+                # Also try the auth() method if it exists
+                elif hasattr(self.supabase.postgrest, 'auth'):
+                    self.supabase.postgrest.auth(user_token)
+                    logger.debug("[SUPABASE_CLIENT] ✅ Called postgrest.auth()")
                 else:
-                    # Try with empty refresh_token as fallback
-                    self.supabase.auth.set_session(
-                        access_token=user_token,
-                        refresh_token=""
-                    )
-                    logger.debug("[SUPABASE_CLIENT] ⚠️ Called auth.set_session() without refresh_token (may not work for RPC)")
-            except Exception as e:
-                logger.warning(f"[SUPABASE_CLIENT] ❌ auth.set_session() failed: {e}")
-            
-            # Method 2: Set Authorization header directly on postgrest client
-            # This ensures table queries work
-            try:
-                logger.debug(f"[SUPABASE_CLIENT] postgrest exists: {hasattr(self.supabase, 'postgrest')}")
-                if hasattr(self.supabase, 'postgrest') and self.supabase.postgrest:
-                    logger.debug(f"[SUPABASE_CLIENT] postgrest.session exists: {hasattr(self.supabase.postgrest, 'session')}")
-                    logger.debug(f"[SUPABASE_CLIENT] postgrest.auth exists: {hasattr(self.supabase.postgrest, 'auth')}")
-                    # The postgrest client should have a session attribute with headers
-                    if hasattr(self.supabase.postgrest, 'session'):
-                        # Set Authorization header directly on the session
-                        self.supabase.postgrest.session.headers["Authorization"] = f"Bearer {user_token}"
-                        logger.debug("[SUPABASE_CLIENT] ✅ Set Authorization header on postgrest.session")
-                    # Also try the auth() method if it exists
-                    elif hasattr(self.supabase.postgrest, 'auth'):
-                        self.supabase.postgrest.auth(user_token)
-                        logger.debug("[SUPABASE_CLIENT] ✅ Called postgrest.auth()")
-                    else:
-                        logger.warning("[SUPABASE_CLIENT] ❌ No postgrest.session or postgrest.auth() available")
-            except Exception as e:
-                logger.warning(f"[SUPABASE_CLIENT] ❌ Could not set postgrest headers: {e}")
-            
-            # Method 3: CRITICAL FIX - Set headers on the underlying httpx/requests client
-            # RPC calls use the same client, so this ensures auth.uid() works
-            try:
-                # The Supabase client stores options which contain headers
-                logger.debug(f"[SUPABASE_CLIENT] options exists: {hasattr(self.supabase, 'options')}")
-                if hasattr(self.supabase, 'options') and self.supabase.options:
-                    logger.debug(f"[SUPABASE_CLIENT] options.headers exists: {hasattr(self.supabase.options, 'headers')}")
-                    # Update the headers in options
-                    if not hasattr(self.supabase.options, 'headers'):
-                        self.supabase.options.headers = {}
-                    self.supabase.options.headers["Authorization"] = f"Bearer {user_token}"
-                    logger.debug("[SUPABASE_CLIENT] ✅ Set Authorization header in client options")
-                
-                # Also try to set on the rest client directly
-                logger.debug(f"[SUPABASE_CLIENT] rest exists: {hasattr(self.supabase, 'rest')}")
-                if hasattr(self.supabase, 'rest') and self.supabase.rest:
-                    logger.debug(f"[SUPABASE_CLIENT] rest.session exists: {hasattr(self.supabase.rest, 'session')}")
-                    if hasattr(self.supabase.rest, 'session'):
-                        self.supabase.rest.session.headers["Authorization"] = f"Bearer {user_token}"
-                        logger.debug("[SUPABASE_CLIENT] ✅ Set Authorization header on rest.session")
-                
-                # For SDK v2+, also check for _client attribute
-                logger.debug(f"[SUPABASE_CLIENT] _client exists: {hasattr(self.supabase, '_client')}")
-                if hasattr(self.supabase, '_client'):
-                    logger.debug(f"[SUPABASE_CLIENT] _client.headers exists: {hasattr(self.supabase._client, 'headers')}")
-                    if hasattr(self.supabase._client, 'headers'):
-                        self.supabase._client.headers["Authorization"] = f"Bearer {user_token}"
-                        logger.debug("[SUPABASE_CLIENT] ✅ Set Authorization header on _client")
-                
-                # NEW: Try to find where RPC calls are actually made
-                logger.debug(f"[SUPABASE_CLIENT] Client attributes: {[attr for attr in dir(self.supabase) if not attr.startswith('_')]}")
-                
-                # CRITICAL DEBUG: Inspect postgrest.session deeply
-                if hasattr(self.supabase, 'postgrest') and self.supabase.postgrest:
-                    if hasattr(self.supabase.postgrest, 'session'):
-                        session = self.supabase.postgrest.session
-                        logger.debug(f"[SUPABASE_CLIENT] postgrest.session type: {type(session)}")
-                        logger.debug(f"[SUPABASE_CLIENT] postgrest.session.headers type: {type(session.headers)}")
-                        logger.debug(f"[SUPABASE_CLIENT] postgrest.session.headers keys: {list(session.headers.keys())}")
-                        logger.debug(f"[SUPABASE_CLIENT] Authorization in headers: {'Authorization' in session.headers}")
-                        if 'Authorization' in session.headers:
-                            auth_val = session.headers['Authorization']
-                            logger.debug(f"[SUPABASE_CLIENT] Current Authorization header: {auth_val[:50]}..." if len(auth_val) > 50 else f"[SUPABASE_CLIENT] Current Authorization header: {auth_val}")
-                
-                # Check if there's a shared session for RPC
-                # Try to access the actual HTTP client used by rpc method
-                if hasattr(self.supabase.postgrest, '_client'):
-                    logger.info(f"[SUPABASE_CLIENT] postgrest has _client: {type(self.supabase.postgrest._client)}")
+                    logger.warning("[SUPABASE_CLIENT] ❌ No postgrest.session or postgrest.auth() available")
+        except Exception as e:
+            logger.warning(f"[SUPABASE_CLIENT] ❌ Could not set postgrest headers: {e}")
+        
+        # Method 3: CRITICAL FIX - Set headers on the underlying httpx/requests client
+        # RPC calls use the same client, so this ensures auth.uid() works
+        try:
+            # The Supabase client stores options which contain headers
+            logger.debug(f"[SUPABASE_CLIENT] options exists: {hasattr(self.supabase, 'options')}")
+            if hasattr(self.supabase, 'options') and self.supabase.options:
+                logger.debug(f"[SUPABASE_CLIENT] options.headers exists: {hasattr(self.supabase.options, 'headers')}")
+                # Update the headers in options
+                if not hasattr(self.supabase.options, 'headers'):
+                    self.supabase.options.headers = {}
+                self.supabase.options.headers["Authorization"] = f"Bearer {user_token}"
+                logger.debug("[SUPABASE_CLIENT] ✅ Set Authorization header in client options")
+        
+            # Also try to set on the rest client directly
+            logger.debug(f"[SUPABASE_CLIENT] rest exists: {hasattr(self.supabase, 'rest')}")
+            if hasattr(self.supabase, 'rest') and self.supabase.rest:
+                logger.debug(f"[SUPABASE_CLIENT] rest.session exists: {hasattr(self.supabase.rest, 'session')}")
+                if hasattr(self.supabase.rest, 'session'):
+                    self.supabase.rest.session.headers["Authorization"] = f"Bearer {user_token}"
+                    logger.debug("[SUPABASE_CLIENT] ✅ Set Authorization header on rest.session")
+        
+            # For SDK v2+, also check for _client attribute
+            logger.debug(f"[SUPABASE_CLIENT] _client exists: {hasattr(self.supabase, '_client')}")
+            if hasattr(self.supabase, '_client'):
+                logger.debug(f"[SUPABASE_CLIENT] _client.headers exists: {hasattr(self.supabase._client, 'headers')}")
+                if hasattr(self.supabase._client, 'headers'):
+                    self.supabase._client.headers["Authorization"] = f"Bearer {user_token}"
+                    logger.debug("[SUPABASE_CLIENT] ✅ Set Authorization header on _client")
+        
+            # NEW: Try to find where RPC calls are actually made
+            logger.debug(f"[SUPABASE_CLIENT] Client attributes: {[attr for attr in dir(self.supabase) if not attr.startswith('_')]}")
+        
+            # CRITICAL DEBUG: Inspect postgrest.session deeply
+            if hasattr(self.supabase, 'postgrest') and self.supabase.postgrest:
+                if hasattr(self.supabase.postgrest, 'session'):
+                    session = self.supabase.postgrest.session
+                    logger.debug(f"[SUPABASE_CLIENT] postgrest.session type: {type(session)}")
+                    logger.debug(f"[SUPABASE_CLIENT] postgrest.session.headers type: {type(session.headers)}")
+                    logger.debug(f"[SUPABASE_CLIENT] postgrest.session.headers keys: {list(session.headers.keys())}")
+                    logger.debug(f"[SUPABASE_CLIENT] Authorization in headers: {'Authorization' in session.headers}")
+                    if 'Authorization' in session.headers:
+                        auth_val = session.headers['Authorization']
+                        logger.debug(f"[SUPABASE_CLIENT] Current Authorization header: {auth_val[:50]}..." if len(auth_val) > 50 else f"[SUPABASE_CLIENT] Current Authorization header: {auth_val}")
+        
+            # Check if there's a shared session for RPC
+            # Try to access the actual HTTP client used by rpc method
+            if hasattr(self.supabase.postgrest, '_client'):
+                logger.info(f"[SUPABASE_CLIENT] postgrest has _client: {type(self.supabase.postgrest._client)}")
+        
 
-                        
-            except Exception as e:
-                logger.warning(f"[SUPABASE_CLIENT] ❌ Could not set client-level headers: {e}")
-            
-            logger.debug("[SUPABASE_CLIENT] Completed user token initialization")
+        except Exception as e:
+            logger.warning(f"[SUPABASE_CLIENT] ❌ Could not set client-level headers: {e}")
+        
+        logger.debug("[SUPABASE_CLIENT] Completed user token initialization")
+        return self.supabase
+    
+    @staticmethod
+    def _refresh_user_session(client: Client, refresh_token: str) -> Optional[tuple]:
+        """Exchange a refresh token for a new session (called by the registry).
+        
+        Returns:
+            (access_token, refresh_token) of the new session, or None
+        """
+        response = client.auth.refresh_session(refresh_token)
+        session = getattr(response, 'session', None)
+        if session and session.access_token:
+            return session.access_token, session.refresh_token
+        return None
     
     def test_connection(self) -> bool:
         """Test database connection"""
@@ -436,6 +470,9 @@ class SupabaseClient:
             # Insert trades (no upsert needed for trade log)
             result = self.supabase.table("trade_log").insert(trades).execute()
             logger.info(f"✅ Inserted {len(trades)} trade log entries")
+
+            from cache_version import invalidate, cache_tag
+            invalidate(cache_tag("trade_log"))
             return True
             
         except Exception as e:
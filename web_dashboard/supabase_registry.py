@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Supabase Client Registry
+========================
+
+Keeps the underlying supabase ``Client`` objects alive between
+SupabaseClient instances instead of calling ``create_client`` (and, for user
+tokens, ``auth.set_session``) on every request or job run:
+
+- one shared service-role client and one shared anonymous client per key
+- an LRU of clients authenticated with user tokens, keyed by a token hash
+- token refresh: a cached user client whose access token is about to expire
+  is refreshed with its refresh token and rebuilt for the new token
+- a shared keep-alive HTTP connection pool for the PostgREST sessions
+
+SupabaseClient uses the registry transparently, so callers keep writing
+``SupabaseClient(use_service_role=True)`` / ``SupabaseClient(user_token=...)``.
+The registry itself has no supabase dependency; clients are built by the
+factory callbacks SupabaseClient passes in.
+"""
+
+import base64
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Authenticated user clients kept alive (least recently used are dropped)
+SUPABASE_USER_CLIENT_CACHE_SIZE = int(os.getenv("SUPABASE_USER_CLIENT_CACHE_SIZE", "128"))
+
+# Refresh user sessions this many seconds before the access token expires
+SUPABASE_TOKEN_REFRESH_MARGIN = int(os.getenv("SUPABASE_TOKEN_REFRESH_MARGIN", "60"))
+
+# Shared keep-alive HTTP pool for PostgREST requests (set to 0 to disable)
+SUPABASE_HTTP_POOL_SIZE = int(os.getenv("SUPABASE_HTTP_POOL_SIZE", "20"))
+
+
+def token_expiry(token: Optional[str]) -> Optional[float]:
+    """Read the ``exp`` claim of a JWT without verifying it (None if unknown)."""
+    if not token:
+        return None
+    try:
+        payload = token.split('.')[1]
+        payload += '=' * (-len(payload) % 4)
+        exp = json.loads(base64.urlsafe_b64decode(payload)).get('exp')
+        return float(exp) if exp is not None else None
+    except Exception:
+        return None
+
+
+def _token_key(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+@dataclass
+class _UserClient:
+    """A client authenticated with one user's session."""
+    client: Any
+    access_token: str
+    refresh_token: Optional[str]
+    expires_at: Optional[float]
+
+    def needs_refresh(self, margin: float) -> bool:
+        return self.expires_at is not None and self.expires_at - margin <= time.time()
+
+
+class SupabaseClientRegistry:
+    """Process-wide cache of supabase clients (see module docstring)."""
+
+    def __init__(self, max_user_clients: int = SUPABASE_USER_CLIENT_CACHE_SIZE,
+                 refresh_margin: float = SUPABASE_TOKEN_REFRESH_MARGIN,
+                 http_pool_size: int = SUPABASE_HTTP_POOL_SIZE):
+        self.max_user_clients = max_user_clients
+        self.refresh_margin = refresh_margin
+        self.http_pool_size = http_pool_size
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._shared: Dict[str, Any] = {}
+        self._users: "OrderedDict[str, _UserClient]" = OrderedDict()
+        self._transport = None
+        self.created = 0
+        self.hits = 0
+        self.refreshed = 0
+
+    def shared_client(self, url: str, key: str, create: Callable[[], Any]) -> Any:
+        """Get the shared client for a key (service-role or anonymous).
+
+        Args:
+            url: Supabase URL
+            key: API key the client is created with
+            create: Builds a new client
+        """
+        cache_key = _token_key(f"{url}|{key}")
+        with self._lock:
+            client = self._shared.get(cache_key)
+            if client is not None:
+                self.hits += 1
+                return client
+
+        client = self._attach_http_pool(create())
+        with self._lock:
+            # Another thread may have created it meanwhile - keep the first
+            existing = self._shared.setdefault(cache_key, client)
+            if existing is client:
+                self.created += 1
+            return existing
+
+    def user_client(
+        self,
+        user_token: str,
+        refresh_token: Optional[str],
+        create: Callable[[str, Optional[str]], Any],
+        refresh: Callable[[Any, str], Optional[Tuple[str, Optional[str]]]]
+    ) -> Tuple[Any, str]:
+        """Get a client authenticated as the token's user.
+
+        Args:
+            user_token: The user's access token (JWT)
+            refresh_token: The user's refresh token, if known. Supabase refresh
+                tokens are single-use, so only pass one when this process owns
+                the session (not a browser's cookie)
+            create: Builds a client for (access_token, refresh_token)
+            refresh: Exchanges a refresh token using a client, returning the new
+                (access_token, refresh_token) or None
+
+        Returns:
+            (client, access token it is authenticated with) - the token differs
+            from ``user_token`` if the session was refreshed
+        """
+        cache_key = _token_key(user_token)
+        with self._lock:
+            entry = self._users.get(cache_key)
+            if entry is not None:
+                self._users.move_to_end(cache_key)
+                if refresh_token and not entry.refresh_token:
+                    entry.refresh_token = refresh_token
+
+        if entry is None:
+            entry = _UserClient(self._attach_http_pool(create(user_token, refresh_token)),
+                                user_token, refresh_token, token_expiry(user_token))
+            with self._lock:
+                self.created += 1
+                self._store(cache_key, entry)
+        elif entry.needs_refresh(self.refresh_margin) and entry.refresh_token:
+            entry = self._refresh(cache_key, entry, create, refresh)
+        else:
+            with self._lock:
+                self.hits += 1
+        return entry.client, entry.access_token
+
+    def _refresh(self, cache_key: str, entry: _UserClient, create, refresh) -> _UserClient:
+        """Refresh an expiring session; the old token keeps mapping to the new client.
+
+        Refreshes are serialized: refresh tokens are single-use, so a thread
+        arriving second uses the session the first one obtained.
+        """
+        with self._refresh_lock:
+            with self._lock:
+                current = self._users.get(cache_key)
+            if current is not None and current is not entry:
+                return current
+
+            try:
+                tokens = refresh(entry.client, entry.refresh_token)
+            except Exception as e:
+                logger.warning(f"Supabase session refresh failed: {e}")
+                tokens = None
+            if not tokens or not tokens[0]:
+                return entry
+
+            access_token, refresh_token = tokens
+            refreshed = _UserClient(self._attach_http_pool(create(access_token, refresh_token)),
+                                    access_token, refresh_token, token_expiry(access_token))
+            with self._lock:
+                self.refreshed += 1
+                self._store(cache_key, refreshed)
+                self._store(_token_key(access_token), refreshed)
+        logger.debug("Refreshed Supabase user session in client registry")
+        return refreshed
+
+    def _store(self, cache_key: str, entry: _UserClient) -> None:
+        """Insert a user client, dropping the least recently used (lock held)."""
+        self._users[cache_key] = entry
+        self._users.move_to_end(cache_key)
+        while len(self._users) > self.max_user_clients:
+            self._users.popitem(last=False)
+
+    def _attach_http_pool(self, client: Any) -> Any:
+        """Route a client's PostgREST session through the shared keep-alive pool.
+
+        Only the connection pool (transport) is shared; each session keeps its
+        own headers, so user tokens never leak between clients.
+        """
+        if self.http_pool_size <= 0:
+            return client
+        try:
+            import httpx
+            session = getattr(getattr(client, 'postgrest', None), 'session', None)
+            if isinstance(session, httpx.Client) and hasattr(session, '_transport'):
+                session._transport = self._get_transport(httpx)
+        except Exception as e:
+            logger.debug(f"Could not attach shared HTTP pool to Supabase client: {e}")
+        return client
+
+    def _get_transport(self, httpx):
+        with self._lock:
+            if self._transport is None:
+                self._transport = httpx.HTTPTransport(limits=httpx.Limits(
+                    max_connections=self.http_pool_size,
+                    max_keepalive_connections=self.http_pool_size,
+                    keepalive_expiry=30.0,
+                ))
+            return self._transport
+
+    def clear(self) -> None:
+        """Drop every cached client (e.g. after rotating keys)."""
+        with self._lock:
+            self._shared.clear()
+            self._users.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Registry counters, for monitoring."""
+        with self._lock:
+            return {
+                'shared_clients': len(self._shared),
+                'user_clients': len(self._users),
+                'created': self.created,
+                'hits': self.hits,
+                'refreshed': self.refreshed,
+            }
+
+
+_registry = SupabaseClientRegistry()
+
+
+def get_client_registry() -> SupabaseClientRegistry:
+    """Get the process-wide Supabase client registry."""
+    return _registry
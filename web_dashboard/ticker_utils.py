@@ -7,10 +7,16 @@ Utility functions for fetching ticker information from all databases
 and generating clickable links to ticker details pages.
 """
 
+import copy
 import logging
+import os
 import re
+import threading
+import time
 import pandas as pd
-from typing import Dict, List, Optional, Any
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta, timezone
 from flask import current_app
 
@@ -28,6 +34,16 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
+def _resolution_index():
+    """Get the shared ticker resolution index, or None if unavailable."""
+    try:
+        from market_data.ticker_resolution import get_resolution_index
+        return get_resolution_index()
+    except Exception as e:
+        logger.debug(f"Ticker resolution index unavailable: {e}")
+        return None
+
+
 def _normalize_fund_filter(fund: Optional[str]) -> Optional[str]:
     """Normalize fund filter values from requests/UI."""
     if not fund:
@@ -184,129 +200,111 @@ def get_all_unique_tickers(supabase_client=None, postgres_client=None) -> List[s
     return sorted(tickers)
 
 
-def get_ticker_info(
-    ticker: str,
-    supabase_client=None,
-    postgres_client=None,
-    fund: Optional[str] = None
-) -> Dict[str, Any]:
-    """Get comprehensive ticker information from all databases.
+# Section TTLs (seconds) for the ticker profile cache
+TICKER_SECTION_TTLS = {
+    'basic_info': 3600,
+    'portfolio_data': 300,
+    'research_articles': 600,
+    'social_sentiment': 300,
+    'congress_trades': 3600,
+    'insider_trades': 3600,
+    'watchlist_status': 300,
+}
+
+# Per-section timeouts (seconds); basic_info may fall back to yfinance
+TICKER_SECTION_TIMEOUT = float(os.getenv("TICKER_SECTION_TIMEOUT", "5"))
+TICKER_BASIC_INFO_TIMEOUT = float(os.getenv("TICKER_BASIC_INFO_TIMEOUT", "15"))
+
+# Workers shared by all ticker lookups and number of cached tickers
+TICKER_INFO_WORKERS = int(os.getenv("TICKER_INFO_WORKERS", "16"))
+TICKER_PROFILE_CACHE_SIZE = int(os.getenv("TICKER_PROFILE_CACHE_SIZE", "500"))
+
+
+class TickerProfileCache:
+    """Per-ticker cache of get_ticker_info sections, each with its own TTL.
     
-    Aggregates ticker data from multiple sources (Supabase and Postgres) including
-    basic security info, portfolio data, research articles, social sentiment,
-    congress trades, and watchlist status.
+    Entries are keyed by (ticker, section, scope). Sections that depend on
+    who is asking (portfolio data behind RLS, fund filters) carry a scope;
+    the others are shared by every user. The least recently used tickers are
+    dropped beyond ``max_tickers``.
+    """
     
-    Args:
-        ticker: Ticker symbol (e.g., "AAPL", "XMA.TO")
-        supabase_client: Optional SupabaseClient instance for accessing securities,
-            positions, trades, congress data, and watchlist
-        postgres_client: Optional PostgresClient instance for accessing research
-            articles and social sentiment metrics
-        fund: Optional fund name to filter portfolio data (positions/trades)
-        
-    Returns:
-        Dictionary with the following structure:
-        {
-            'ticker': str,  # Uppercase ticker symbol
-            'found': bool,  # True if any data found for this ticker
-            'basic_info': dict | None,  # From securities table
-                {
-                    'ticker': str,
-                    'company_name': str,
-                    'sector': str,
-                    'industry': str,
-                    'currency': str,  # 'USD', 'CAD', etc.
-                    'exchange': str,   # 'NASDAQ', 'NYSE', 'TSX', etc.
-                    'description': str  # Company business description (or ETF fund description)
-                }
-            'portfolio_data': dict | None,
-                {
-                    'positions': list[dict],  # Latest 100 positions
-                    'trades': list[dict],     # Latest 100 trades
-                    'has_positions': bool,
-                    'has_trades': bool
-                }
-            'research_articles': list[dict],  # Last 30 days, limit 50
-                [
-                    {
-                        'id': int,
-                        'title': str,
-                        'url': str,
-                        'summary': str,
-                        'source': str,
-                        'published_at': datetime,
-                        'fetched_at': datetime,
-                        'relevance_score': float,
-                        'sentiment': str,  # 'positive', 'negative', 'neutral'
-                        'sentiment_score': float,
-                        'article_type': str
-                    }
-                ]
-            'social_sentiment': dict | None,
-                {
-                    'latest_metrics': list[dict],  # Latest per platform
-                    'alerts': list[dict]           # Extreme alerts (24h)
-                }
-            'congress_trades': list[dict],  # Last 30 days, limit 50
-                [
-                    {
-                        'ticker': str,
-                        'politician': str,
-                        'chamber': str,  # 'House' or 'Senate'
-                        'party': str,
-                        'type': str,     # 'Purchase' or 'Sale'
-                        'amount': str,
-                        'transaction_date': date
-                    }
-                ]
-            'watchlist_status': dict | None,
-                {
-                    'ticker': str,
-                    'priority_tier': str,  # 'A', 'B', or 'C'
-                    'source': str,
-                    'is_active': bool
-                }
-        }
+    def __init__(self, max_tickers: int = TICKER_PROFILE_CACHE_SIZE):
+        self.max_tickers = max_tickers
+        self._lock = threading.Lock()
+        self._tickers: "OrderedDict[str, Dict[tuple, tuple]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
     
-    Example:
-        >>> from supabase_client import SupabaseClient
-        >>> from postgres_client import PostgresClient
-        >>> 
-        >>> sb_client = SupabaseClient()
-        >>> pg_client = PostgresClient()
-        >>> 
-        >>> # Get info for Apple
-        >>> info = get_ticker_info("AAPL", sb_client, pg_client)
-        >>> print(info['basic_info']['company_name'])
-        'Apple Inc.'
-        >>> print(f"Found {len(info['research_articles'])} articles")
-        Found 15 articles
-        >>> 
-        >>> # Canadian ticker
-        >>> info = get_ticker_info("XMA.TO", sb_client, pg_client)
-        >>> print(info['basic_info']['exchange'])
-        'TSX'
+    def get(self, ticker: str, section: str, scope: Optional[str] = None) -> Tuple[bool, Any]:
+        """Get a cached section as (found, value)."""
+        with self._lock:
+            entries = self._tickers.get(ticker)
+            entry = entries.get((section, scope)) if entries else None
+            if entry is None or entry[1] <= time.monotonic():
+                self.misses += 1
+                return False, None
+            self._tickers.move_to_end(ticker)
+            self.hits += 1
+            return True, copy.deepcopy(entry[0])
     
-    Note:
-        - Function makes 6 separate database queries (can be slow for large datasets)
-        - Returns empty lists/None for missing data rather than raising exceptions
-        - All timestamps should be timezone-aware (UTC)
-        - Warnings logged for individual query failures (doesn't fail entire function)
+    def set(self, ticker: str, section: str, value: Any, ttl: float, scope: Optional[str] = None) -> None:
+        """Cache a section for ``ttl`` seconds."""
+        value = copy.deepcopy(value)
+        with self._lock:
+            entries = self._tickers.setdefault(ticker, {})
+            self._tickers.move_to_end(ticker)
+            entries[(section, scope)] = (value, time.monotonic() + ttl)
+            while len(self._tickers) > self.max_tickers:
+                self._tickers.popitem(last=False)
+    
+    def invalidate(self, ticker: Optional[str] = None) -> None:
+        """Drop one ticker's sections, or everything."""
+        with self._lock:
+            if ticker is None:
+                self._tickers.clear()
+            else:
+                self._tickers.pop(ticker.upper().strip(), None)
+    
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'tickers': len(self._tickers), 'hits': self.hits, 'misses': self.misses}
+
+
+_profile_cache = TickerProfileCache()
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_ticker_profile_cache() -> TickerProfileCache:
+    """Get the process-wide ticker profile cache."""
+    return _profile_cache
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Get the worker pool shared by ticker lookups (created on first use)."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=TICKER_INFO_WORKERS, thread_name_prefix="ticker-info")
+    return _executor
+
+
+def _get_logo_url(ticker: str) -> Optional[str]:
+    from web_dashboard.utils.logo_utils import get_ticker_logo_url
+    return get_ticker_logo_url(ticker)
+
+
+def _fetch_basic_info(ticker_upper: str, supabase_client) -> Optional[Dict[str, Any]]:
+    """Security info from the securities table, completed from yfinance if needed.
+    
+    Raises the lookup error when nothing was found because a lookup failed, so
+    a transient failure isn't cached as a missing security.
     """
-    ticker_upper = ticker.upper().strip()
-    result = {
-        'ticker': ticker_upper,
-        'basic_info': None,
-        'portfolio_data': None,
-        'research_articles': [],
-        'social_sentiment': None,
-        'congress_trades': [],
-        'insider_trades': [],
-        'watchlist_status': None,
-        'found': False
-    }
+    basic_info = None
+    lookup_error = None
     
-    # 1. Get basic info from securities table
     if supabase_client:
         try:
             sec_result = supabase_client.supabase.table("securities")\
@@ -315,36 +313,38 @@ def get_ticker_info(
                 .execute()
             
             if sec_result.data and len(sec_result.data) > 0:
-                result['basic_info'] = sec_result.data[0]
+                basic_info = sec_result.data[0]
                 # Add logo URL for frontend display
                 try:
-                    from web_dashboard.utils.logo_utils import get_ticker_logo_url
-                    logo_url = get_ticker_logo_url(ticker_upper)
+                    logo_url = _get_logo_url(ticker_upper)
                     if logo_url:
-                        result['basic_info']['logo_url'] = logo_url
+                        basic_info['logo_url'] = logo_url
                 except Exception as e:
                     logger.warning(f"Error fetching logo URL for {ticker_upper}: {e}")
                 
-                # If no description exists, try to fetch it (async, won't block)
-                if not result['basic_info'].get('description'):
+                # If no description exists, try to fetch it
+                if not basic_info.get('description'):
                     try:
                         from web_dashboard.utils.company_description import ensure_company_description
                         description = ensure_company_description(ticker_upper, supabase_client, force_refresh=False)
                         if description:
-                            result['basic_info']['description'] = description
+                            basic_info['description'] = description
                     except Exception as e:
                         logger.debug(f"Could not fetch company description for {ticker_upper}: {e}")
-                
-                result['found'] = True
         except Exception as e:
             logger.warning(f"Error fetching basic info for {ticker_upper}: {e}")
+            lookup_error = e
+    
+    # Resolved tickers are looked up on their known listing (e.g. CGL -> CGL.TO)
+    resolution_index = _resolution_index()
+    lookup_symbol = resolution_index.resolve(ticker_upper) if resolution_index else ticker_upper
     
     # If no basic info found, try fetching from yfinance
-    if not result['basic_info']:
+    if not basic_info:
         try:
             import yfinance as yf
-            logger.info(f"Looking up {ticker_upper} from Yahoo Finance...")
-            ticker_obj = yf.Ticker(ticker_upper)
+            logger.info(f"Looking up {lookup_symbol} from Yahoo Finance...")
+            ticker_obj = yf.Ticker(lookup_symbol)
             info = ticker_obj.info
             
             if info and info.get('symbol'):
@@ -391,7 +391,7 @@ def get_ticker_info(
                 )
                 
                 # Create basic_info structure from yfinance data
-                result['basic_info'] = {
+                basic_info = {
                     'ticker': ticker_upper,
                     'company_name': company_name,
                     'sector': sector if sector else None,
@@ -404,19 +404,24 @@ def get_ticker_info(
                 
                 # Add logo URL
                 try:
-                    from web_dashboard.utils.logo_utils import get_ticker_logo_url
-                    logo_url = get_ticker_logo_url(ticker_upper)
+                    logo_url = _get_logo_url(ticker_upper)
                     if logo_url:
-                        result['basic_info']['logo_url'] = logo_url
+                        basic_info['logo_url'] = logo_url
                 except Exception as e:
                     logger.warning(f"Error fetching logo URL for {ticker_upper}: {e}")
                 
-                result['found'] = True
+                # Remember the listing so other lookups don't probe for it
+                if resolution_index:
+                    try:
+                        resolution_index.record(ticker_upper, symbol=lookup_symbol,
+                                                exchange=exchange, currency=currency)
+                    except Exception as e:
+                        logger.debug(f"Could not record resolution for {ticker_upper}: {e}")
                 
                 # Save to database for future lookups
                 if supabase_client:
                     try:
-                        supabase_client.supabase.table("securities").insert(result['basic_info']).execute()
+                        supabase_client.supabase.table("securities").insert(basic_info).execute()
                         logger.info(f"Saved ticker {ticker_upper} ({company_name}) to securities table from yfinance")
                     except Exception as insert_error:
                         # If insert fails (e.g., duplicate), just log it - we still have the data
@@ -425,33 +430,34 @@ def get_ticker_info(
                 logger.warning(f"Could not find ticker information for {ticker_upper} in yfinance")
         except Exception as e:
             logger.warning(f"Error fetching from yfinance for {ticker_upper}: {e}")
+            lookup_error = e
     
     # If we have basic_info but it's incomplete (None values for sector/industry/pe), try to enrich from yfinance
-    if result['basic_info'] and (result['basic_info'].get('sector') is None or result['basic_info'].get('industry') is None or result['basic_info'].get('trailing_pe') is None):
+    if basic_info and (basic_info.get('sector') is None or basic_info.get('industry') is None or basic_info.get('trailing_pe') is None):
         try:
             import yfinance as yf
             logger.info(f"Re-fetching {ticker_upper} from yfinance due to incomplete data")
             
-            ticker_obj = yf.Ticker(ticker_upper)
+            ticker_obj = yf.Ticker(lookup_symbol)
             info = ticker_obj.info
             
             if info and info.get('symbol'):
                 # Try to get missing fields
-                sector = result['basic_info'].get('sector') or info.get('sector') or info.get('sectorDisp') or info.get('sectorKey')
-                industry = result['basic_info'].get('industry') or info.get('industry') or info.get('industryDisp') or info.get('industryKey')
-                trailing_pe = result['basic_info'].get('trailingPE') or info.get('trailingPE')
+                sector = basic_info.get('sector') or info.get('sector') or info.get('sectorDisp') or info.get('sectorKey')
+                industry = basic_info.get('industry') or info.get('industry') or info.get('industryDisp') or info.get('industryKey')
+                trailing_pe = basic_info.get('trailingPE') or info.get('trailingPE')
                 
                 # Update if we got new data
                 if sector or industry or trailing_pe:
                     updates = {}
                     if sector:
-                        result['basic_info']['sector'] = sector
+                        basic_info['sector'] = sector
                         updates['sector'] = sector
                     if industry:
-                        result['basic_info']['industry'] = industry
+                        basic_info['industry'] = industry
                         updates['industry'] = industry
                     if trailing_pe:
-                        result['basic_info']['trailing_pe'] = trailing_pe
+                        basic_info['trailing_pe'] = trailing_pe
                         updates['trailing_pe'] = trailing_pe
                     
                     # Update database
@@ -467,162 +473,338 @@ def get_ticker_info(
         except Exception as e:
             logger.warning(f"Error re-fetching data for {ticker_upper}: {e}")
     
-    fund_filter = _normalize_fund_filter(fund)
+    if basic_info is None and lookup_error is not None:
+        raise lookup_error
+    return basic_info
 
-    # 2. Get portfolio data (positions and trades)
-    if supabase_client:
-        try:
-            # Get current positions
-            pos_query = supabase_client.supabase.table("portfolio_positions")\
-                .select("*")\
-                .eq("ticker", ticker_upper)
-            if fund_filter:
-                pos_query = pos_query.eq("fund", fund_filter)
-            pos_result = pos_query.order("date", desc=True).limit(100).execute()
-            
-            # Get trade history
-            trade_query = supabase_client.supabase.table("trade_log")\
-                .select("*")\
-                .eq("ticker", ticker_upper)
-            if fund_filter:
-                trade_query = trade_query.eq("fund", fund_filter)
-            trade_result = trade_query.order("date", desc=True).limit(100).execute()
-            
-            if pos_result.data or trade_result.data:
-                result['portfolio_data'] = {
-                    'positions': pos_result.data if pos_result.data else [],
-                    'trades': trade_result.data if trade_result.data else [],
-                    'has_positions': len(pos_result.data) > 0 if pos_result.data else False,
-                    'has_trades': len(trade_result.data) > 0 if trade_result.data else False
-                }
-                result['found'] = True
-        except Exception as e:
-            logger.warning(f"Error fetching portfolio data for {ticker_upper}: {e}")
+
+def _fetch_portfolio_data(ticker_upper: str, supabase_client, fund_filter: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Latest positions and trades for the ticker (optionally one fund)."""
+    # Get current positions
+    pos_query = supabase_client.supabase.table("portfolio_positions")\
+        .select("*")\
+        .eq("ticker", ticker_upper)
+    if fund_filter:
+        pos_query = pos_query.eq("fund", fund_filter)
+    pos_result = pos_query.order("date", desc=True).limit(100).execute()
     
-    # 3. Get research articles (last 30 days)
-    if postgres_client:
-        try:
-            thirty_days_ago = datetime.now(timezone.utc) - timedelta(days=30)
-            query = """
-                SELECT id, title, url, summary, source, published_at, fetched_at,
-                       relevance_score, sentiment, sentiment_score, article_type
-                FROM research_articles
-                WHERE tickers @> ARRAY[%s]::text[]
-                   OR ticker = %s
-                AND fetched_at >= %s
-                ORDER BY fetched_at DESC
-                LIMIT 50
-            """
-            articles = postgres_client.execute_query(
-                query, 
-                (ticker_upper, ticker_upper, thirty_days_ago.isoformat())
-            )
-            
-            if articles:
-                result['research_articles'] = articles
-                result['found'] = True
-        except Exception as e:
-            logger.warning(f"Error fetching research articles for {ticker_upper}: {e}")
+    # Get trade history
+    trade_query = supabase_client.supabase.table("trade_log")\
+        .select("*")\
+        .eq("ticker", ticker_upper)
+    if fund_filter:
+        trade_query = trade_query.eq("fund", fund_filter)
+    trade_result = trade_query.order("date", desc=True).limit(100).execute()
     
-    # 4. Get social sentiment (latest metrics)
-    if postgres_client:
-        try:
-            query = """
-                SELECT DISTINCT ON (platform)
-                    ticker, platform, volume, sentiment_label, sentiment_score,
-                    bull_bear_ratio, created_at
-                FROM social_metrics
-                WHERE ticker = %s
-                ORDER BY platform, created_at DESC
-                LIMIT 10
-            """
-            sentiment_data = postgres_client.execute_query(query, (ticker_upper,))
-            
-            # Get extreme alerts (last 24 hours) - deduplicated by platform and sentiment_label
-            query_alerts = """
-                SELECT DISTINCT ON (platform, sentiment_label)
-                    ticker, platform, sentiment_label, sentiment_score, created_at
-                FROM social_metrics
-                WHERE ticker = %s
-                  AND sentiment_label IN ('EUPHORIC', 'FEARFUL', 'BULLISH')
-                  AND created_at > NOW() - INTERVAL '24 hours'
-                ORDER BY platform, sentiment_label, created_at DESC
-                LIMIT 10
-            """
-            alerts = postgres_client.execute_query(query_alerts, (ticker_upper,))
-            
-            if sentiment_data or alerts:
-                result['social_sentiment'] = {
-                    'latest_metrics': sentiment_data if sentiment_data else [],
-                    'alerts': alerts if alerts else []
-                }
-                result['found'] = True
-        except Exception as e:
-            logger.warning(f"Error fetching social sentiment for {ticker_upper}: {e}")
+    if not (pos_result.data or trade_result.data):
+        return None
+    return {
+        'positions': pos_result.data if pos_result.data else [],
+        'trades': trade_result.data if trade_result.data else [],
+        'has_positions': len(pos_result.data) > 0 if pos_result.data else False,
+        'has_trades': len(trade_result.data) > 0 if trade_result.data else False
+    }
+
+
+def _fetch_research_articles(ticker_upper: str, postgres_client) -> List[Dict[str, Any]]:
+    """Research articles mentioning the ticker (last 30 days)."""
+    thirty_days_ago = datetime.now(timezone.utc) - timedelta(days=30)
+    query = """
+        SELECT id, title, url, summary, source, published_at, fetched_at,
+               relevance_score, sentiment, sentiment_score, article_type
+        FROM research_articles
+        WHERE tickers @> ARRAY[%s]::text[]
+           OR ticker = %s
+        AND fetched_at >= %s
+        ORDER BY fetched_at DESC
+        LIMIT 50
+    """
+    articles = postgres_client.execute_query(
+        query, 
+        (ticker_upper, ticker_upper, thirty_days_ago.isoformat())
+    )
+    return articles or []
+
+
+def _fetch_social_sentiment(ticker_upper: str, postgres_client) -> Optional[Dict[str, Any]]:
+    """Latest social metrics per platform plus extreme alerts (24h)."""
+    query = """
+        SELECT DISTINCT ON (platform)
+            ticker, platform, volume, sentiment_label, sentiment_score,
+            bull_bear_ratio, created_at
+        FROM social_metrics
+        WHERE ticker = %s
+        ORDER BY platform, created_at DESC
+        LIMIT 10
+    """
+    sentiment_data = postgres_client.execute_query(query, (ticker_upper,))
     
-    # 5. Get congress trades (all trades for this ticker)
-    if supabase_client:
-        try:
-            congress_result = supabase_client.supabase.table("congress_trades_enriched")\
-                .select("*")\
-                .eq("ticker", ticker_upper)\
-                .order("transaction_date", desc=True)\
-                .execute()
-            
-            if congress_result.data:
-                result['congress_trades'] = congress_result.data
-                result['found'] = True
-        except Exception as e:
-            logger.warning(f"Error fetching congress trades for {ticker_upper}: {e}")
+    # Get extreme alerts (last 24 hours) - deduplicated by platform and sentiment_label
+    query_alerts = """
+        SELECT DISTINCT ON (platform, sentiment_label)
+            ticker, platform, sentiment_label, sentiment_score, created_at
+        FROM social_metrics
+        WHERE ticker = %s
+          AND sentiment_label IN ('EUPHORIC', 'FEARFUL', 'BULLISH')
+          AND created_at > NOW() - INTERVAL '24 hours'
+        ORDER BY platform, sentiment_label, created_at DESC
+        LIMIT 10
+    """
+    alerts = postgres_client.execute_query(query_alerts, (ticker_upper,))
+    
+    if not (sentiment_data or alerts):
+        return None
+    return {
+        'latest_metrics': sentiment_data if sentiment_data else [],
+        'alerts': alerts if alerts else []
+    }
 
-    # 6. Get insider trades (recent for this ticker)
-    if supabase_client:
-        try:
-            from web_dashboard.utils.logo_utils import get_ticker_logo_url
 
-            insider_result = supabase_client.supabase.table("insider_trades")\
-                .select("ticker, insider_name, insider_title, transaction_date, disclosure_date, "
-                        "type, shares, price_per_share, value, shares_held_after, percent_change, notes, created_at")\
-                .eq("ticker", ticker_upper)\
-                .order("transaction_date", desc=True)\
-                .limit(50)\
-                .execute()
+def _fetch_congress_trades(ticker_upper: str, supabase_client) -> List[Dict[str, Any]]:
+    """All congress trades for the ticker."""
+    congress_result = supabase_client.supabase.table("congress_trades_enriched")\
+        .select("*")\
+        .eq("ticker", ticker_upper)\
+        .order("transaction_date", desc=True)\
+        .execute()
+    return congress_result.data or []
 
-            if insider_result.data:
-                logo_url = get_ticker_logo_url(ticker_upper)
-                formatted_trades = []
-                for trade in insider_result.data:
-                    formatted_trade = dict(trade)
-                    formatted_trade["_logo_url"] = logo_url
-                    formatted_trades.append(formatted_trade)
 
-                result['insider_trades'] = formatted_trades
-                result['found'] = True
-        except Exception as e:
-            logger.warning(f"Error fetching insider trades for {ticker_upper}: {e}")
+def _fetch_insider_trades(ticker_upper: str, supabase_client) -> List[Dict[str, Any]]:
+    """Recent insider trades for the ticker, with the ticker logo attached."""
+    insider_result = supabase_client.supabase.table("insider_trades")\
+        .select("ticker, insider_name, insider_title, transaction_date, disclosure_date, "
+                "type, shares, price_per_share, value, shares_held_after, percent_change, notes, created_at")\
+        .eq("ticker", ticker_upper)\
+        .order("transaction_date", desc=True)\
+        .limit(50)\
+        .execute()
+    
+    if not insider_result.data:
+        return []
+    logo_url = _get_logo_url(ticker_upper)
+    formatted_trades = []
+    for trade in insider_result.data:
+        formatted_trade = dict(trade)
+        formatted_trade["_logo_url"] = logo_url
+        formatted_trades.append(formatted_trade)
+    return formatted_trades
 
-    # 7. Get watchlist status
-    if supabase_client:
+
+def _fetch_watchlist_status(ticker_upper: str, supabase_client) -> Optional[Dict[str, Any]]:
+    """Watchlist row for the ticker, if watched."""
+    watchlist_result = supabase_client.supabase.table("watched_tickers")\
+        .select("*")\
+        .eq("ticker", ticker_upper)\
+        .execute()
+    if watchlist_result.data and len(watchlist_result.data) > 0:
+        return watchlist_result.data[0]
+    return None
+
+
+def get_ticker_info(
+    ticker: str,
+    supabase_client=None,
+    postgres_client=None,
+    fund: Optional[str] = None,
+    cache_scope: Optional[str] = None,
+    use_cache: bool = True
+) -> Dict[str, Any]:
+    """Get comprehensive ticker information from all databases.
+    
+    Aggregates ticker data from multiple sources (Supabase and Postgres) including
+    basic security info, portfolio data, research articles, social sentiment,
+    congress trades, and watchlist status.
+    
+    Args:
+        ticker: Ticker symbol (e.g., "AAPL", "XMA.TO")
+        supabase_client: Optional SupabaseClient instance for accessing securities,
+            positions, trades, congress data, and watchlist
+        postgres_client: Optional PostgresClient instance for accessing research
+            articles and social sentiment metrics
+        fund: Optional fund name to filter portfolio data (positions/trades)
+        cache_scope: Identifies whose view of the data this is (e.g. user id or
+            "admin"). Portfolio data is only cached when a scope is given;
+            the other sections are shared across callers.
+        use_cache: Set False to bypass the ticker profile cache
+        
+    Returns:
+        Dictionary with the following structure:
+        {
+            'ticker': str,  # Uppercase ticker symbol
+            'found': bool,  # True if any data found for this ticker
+            'basic_info': dict | None,  # From securities table
+                {
+                    'ticker': str,
+                    'company_name': str,
+                    'sector': str,
+                    'industry': str,
+                    'currency': str,  # 'USD', 'CAD', etc.
+                    'exchange': str,   # 'NASDAQ', 'NYSE', 'TSX', etc.
+                    'description': str  # Company business description (or ETF fund description)
+                }
+            'portfolio_data': dict | None,
+                {
+                    'positions': list[dict],  # Latest 100 positions
+                    'trades': list[dict],     # Latest 100 trades
+                    'has_positions': bool,
+                    'has_trades': bool
+                }
+            'research_articles': list[dict],  # Last 30 days, limit 50
+                [
+                    {
+                        'id': int,
+                        'title': str,
+                        'url': str,
+                        'summary': str,
+                        'source': str,
+                        'published_at': datetime,
+                        'fetched_at': datetime,
+                        'relevance_score': float,
+                        'sentiment': str,  # 'positive', 'negative', 'neutral'
+                        'sentiment_score': float,
+                        'article_type': str
+                    }
+                ]
+            'social_sentiment': dict | None,
+                {
+                    'latest_metrics': list[dict],  # Latest per platform
+                    'alerts': list[dict]           # Extreme alerts (24h)
+                }
+            'congress_trades': list[dict],  # Last 30 days, limit 50
+                [
+                    {
+                        'ticker': str,
+                        'politician': str,
+                        'chamber': str,  # 'House' or 'Senate'
+                        'party': str,
+                        'type': str,     # 'Purchase' or 'Sale'
+                        'amount': str,
+                        'transaction_date': date
+                    }
+                ]
+            'watchlist_status': dict | None,
+                {
+                    'ticker': str,
+                    'priority_tier': str,  # 'A', 'B', or 'C'
+                    'source': str,
+                    'is_active': bool
+                }
+        }
+    
+    Example:
+        >>> from supabase_client import SupabaseClient
+        >>> from postgres_client import PostgresClient
+        >>> 
+        >>> sb_client = SupabaseClient()
+        >>> pg_client = PostgresClient()
+        >>> 
+        >>> # Get info for Apple
+        >>> info = get_ticker_info("AAPL", sb_client, pg_client)
+        >>> print(info['basic_info']['company_name'])
+        'Apple Inc.'
+        >>> print(f"Found {len(info['research_articles'])} articles")
+        Found 15 articles
+        >>> 
+        >>> # Canadian ticker
+        >>> info = get_ticker_info("XMA.TO", sb_client, pg_client)
+        >>> print(info['basic_info']['exchange'])
+        'TSX'
+    
+    Note:
+        - Sections are fetched concurrently on a shared worker pool, each with its
+          own timeout (TICKER_SECTION_TIMEOUT, TICKER_BASIC_INFO_TIMEOUT); a section
+          that times out is returned empty and cached once it completes
+        - Sections are cached per ticker with their own TTLs (TICKER_SECTION_TTLS)
+        - Returns empty lists/None for missing data rather than raising exceptions
+        - All timestamps should be timezone-aware (UTC)
+        - Warnings logged for individual query failures (doesn't fail entire function)
+    """
+    ticker_upper = ticker.upper().strip()
+    fund_filter = _normalize_fund_filter(fund)
+    result = {
+        'ticker': ticker_upper,
+        'basic_info': None,
+        'portfolio_data': None,
+        'research_articles': [],
+        'social_sentiment': None,
+        'congress_trades': [],
+        'insider_trades': [],
+        'watchlist_status': None,
+        'found': False
+    }
+    
+    # (section, label, fetch, client available, scope) - scope None means shared by all users;
+    # portfolio data is behind RLS and fund-filtered, so it's cached per caller scope only
+    portfolio_scope = f"{cache_scope}|{fund_filter or ''}" if cache_scope else None
+    sections = [
+        ('basic_info', "basic info", lambda: _fetch_basic_info(ticker_upper, supabase_client), True, ''),
+        ('portfolio_data', "portfolio data", lambda: _fetch_portfolio_data(ticker_upper, supabase_client, fund_filter),
+         supabase_client is not None, portfolio_scope),
+        ('research_articles', "research articles", lambda: _fetch_research_articles(ticker_upper, postgres_client),
+         postgres_client is not None, ''),
+        ('social_sentiment', "social sentiment", lambda: _fetch_social_sentiment(ticker_upper, postgres_client),
+         postgres_client is not None, ''),
+        ('congress_trades', "congress trades", lambda: _fetch_congress_trades(ticker_upper, supabase_client),
+         supabase_client is not None, ''),
+        ('insider_trades', "insider trades", lambda: _fetch_insider_trades(ticker_upper, supabase_client),
+         supabase_client is not None, ''),
+        ('watchlist_status', "watchlist status", lambda: _fetch_watchlist_status(ticker_upper, supabase_client),
+         supabase_client is not None, ''),
+    ]
+    
+    # Serve what we can from the profile cache, fetch the rest concurrently
+    pending = {}
+    for section, label, fetch, available, scope in sections:
+        if not available:
+            continue
+        cacheable = use_cache and scope is not None
+        if cacheable:
+            hit, value = _profile_cache.get(ticker_upper, section, scope)
+            if hit:
+                result[section] = value
+                continue
+        if cacheable:
+            future = _get_executor().submit(_fetch_and_cache, fetch, ticker_upper, section, scope)
+        else:
+            future = _get_executor().submit(fetch)
+        pending[future] = (section, label)
+    
+    # Each section gets its own deadline; slow ones are left empty (and cached when they finish)
+    started = time.monotonic()
+    for future, (section, label) in pending.items():
+        timeout = TICKER_BASIC_INFO_TIMEOUT if section == 'basic_info' else TICKER_SECTION_TIMEOUT
         try:
-            watchlist_result = supabase_client.supabase.table("watched_tickers")\
-                .select("*")\
-                .eq("ticker", ticker_upper)\
-                .execute()
-            
-            if watchlist_result.data and len(watchlist_result.data) > 0:
-                result['watchlist_status'] = watchlist_result.data[0]
-                result['found'] = True
+            value = future.result(timeout=max(0.0, started + timeout - time.monotonic()))
+        except FutureTimeoutError:
+            logger.warning(f"Timed out fetching {label} for {ticker_upper} after {timeout:.0f}s")
+            continue
         except Exception as e:
-            logger.warning(f"Error fetching watchlist status for {ticker_upper}: {e}")
+            logger.warning(f"Error fetching {label} for {ticker_upper}: {e}")
+            continue
+        if value is not None:
+            result[section] = value
     
+    result['found'] = any(result[section] for section, *_ in sections)
     return result
 
 
+def _fetch_and_cache(fetch, ticker: str, section: str, scope: str) -> Any:
+    """Fetch a section and store it in the profile cache (errors aren't cached).
+    
+    Runs on the worker, so a section that outlives its timeout is still cached.
+    """
+    value = fetch()
+    _profile_cache.set(ticker, section, value, TICKER_SECTION_TTLS[section], scope)
+    return value
+
+
 def get_ticker_price_history(
     ticker: str,
     supabase_client=None,
     days: int = 90,
-    fund: Optional[str] = None
+    fund: Optional[str] = None,
+    funds: Optional[Tuple[str, ...]] = None
 ) -> pd.DataFrame:
     """Get historical price data for a ticker from portfolio_positions or yfinance.
     
@@ -634,6 +816,8 @@ def get_ticker_price_history(
         supabase_client: Optional SupabaseClient instance
         days: Number of days to look back (default: 90 for 3 months)
         fund: Optional fund name to filter portfolio data
+        funds: Optional funds to restrict portfolio data to (for clients that
+            bypass RLS); an empty tuple skips portfolio data
         
     Returns:
         DataFrame with columns: date, price, normalized (baseline 100)
@@ -648,7 +832,7 @@ def get_ticker_price_history(
     start_date = end_date - timedelta(days=days)
     
     # Try portfolio_positions first
-    if supabase_client:
+    if supabase_client and (funds is None or funds):
         try:
             pos_query = supabase_client.supabase.table("portfolio_positions")\
                 .select("date, price")\
@@ -656,6 +840,8 @@ def get_ticker_price_history(
                 .gte("date", start_date.isoformat())
             if fund_filter:
                 pos_query = pos_query.eq("fund", fund_filter)
+            if funds is not None:
+                pos_query = pos_query.in_("fund", list(funds))
             pos_result = pos_query.order("date").execute()
             
             if pos_result.data and len(pos_result.data) >= 10:
@@ -13,7 +13,6 @@ import os
 from pathlib import Path
 from datetime import datetime, date, timedelta
 from decimal import Decimal
-from collections import defaultdict, deque
 import logging
 
 # Add project root to path
@@ -44,6 +43,9 @@ except Exception:
     )
     logger = logging.getLogger(__name__)
 
+# Snapshots per bulk write; cancellation is checked between batches
+SAVE_BATCH_SIZE = 20
+
 
 def rebuild_fund_from_date(fund_name: str, start_date: date, job_id: str = None) -> dict:
     """
@@ -68,12 +70,9 @@ def rebuild_fund_from_date(fund_name: str, start_date: date, job_id: str = None)
         # Import dependencies
         from web_dashboard.supabase_client import SupabaseClient
         from data.repositories.supabase_repository import SupabaseRepository
-        from data.models.portfolio import Position, PortfolioSnapshot
+        from portfolio.snapshot_rebuilder import SnapshotRebuilder
         from market_data.data_fetcher import MarketDataFetcher
         from market_data.market_hours import MarketHours
-        from utils.market_holidays import MarketHolidays
-        from utils.timezone_utils import get_trading_timezone
-        import pandas as pd
         
         # Update job status if job_id provided
         if job_id:
@@ -144,7 +143,7 @@ def rebuild_fund_from_date(fund_name: str, start_date: date, job_id: str = None)
                 'message': msg
             }
         
-        # Step 3: Rebuild positions using FIFO
+        # Step 3: Rebuild positions with a single sweep of the trade log
         logger.info(f"Step 3: Rebuilding positions from {start_date}...")
         if job_id:
             _update_job_status(job_id, 'running', f'Step 3 of 5: Calculating positions for {len(trades)} trades')
@@ -163,88 +162,18 @@ def rebuild_fund_from_date(fund_name: str, start_date: date, job_id: str = None)
         
         logger.info(f"   Need to rebuild {len(trading_days_to_rebuild)} trading days")
         
-        # Calculate positions for each day using FIFO
-        # We need to process ALL trades from beginning to maintain FIFO integrity
-        running_positions = defaultdict(lambda: {
-            'shares': Decimal('0'),
-            'cost': Decimal('0'),
-            'currency': 'USD'
-        })
-        lots_by_ticker = defaultdict(deque)  # FIFO lot tracking
-        
-        # Convert trades to DataFrame for easier processing
-        trade_data = []
-        for trade in trades:
-            trade_data.append({
-                'Date': trade.timestamp,
-                'Ticker': trade.ticker,
-                'Shares': float(trade.shares),
-                'Price': float(trade.price),
-                'Action': trade.action if hasattr(trade, 'action') else 'BUY',
-                'Currency': trade.currency if hasattr(trade, 'currency') else 'USD'
-            })
-        trade_df = pd.DataFrame(trade_data)
-        trade_df['Date'] = pd.to_datetime(trade_df['Date'])
-        trade_df = trade_df.sort_values('Date')
-        
-        # Build positions day by day
-        date_positions = {}
-        all_dates = sorted(trade_df['Date'].dt.date.unique())
-        
-        for trading_day in all_dates:
-            day_trades = trade_df[trade_df['Date'].dt.date == trading_day]
-            
-            for _, trade in day_trades.iterrows():
-                ticker = trade['Ticker']
-                shares = Decimal(str(trade['Shares']))
-                price = Decimal(str(trade['Price']))
-                action = str(trade['Action']).upper()
-                
-                if action == 'SELL':
-                    # FIFO sell - consume lots
-                    remaining = shares
-                    while remaining > 0 and lots_by_ticker[ticker]:
-                        lot_shares, lot_price = lots_by_ticker[ticker][0]
-                        if lot_shares <= remaining:
-                            remaining -= lot_shares
-                            lots_by_ticker[ticker].popleft()
-                        else:
-                            lots_by_ticker[ticker][0] = (lot_shares - remaining, lot_price)
-                            remaining = Decimal('0')
-                    
-                    # Update running positions
-                    if running_positions[ticker]['shares'] > 0:
-                        cost_per_share = running_positions[ticker]['cost'] / running_positions[ticker]['shares']
-                        running_positions[ticker]['shares'] -= shares
-                        running_positions[ticker]['cost'] -= shares * cost_per_share
-                        # Prevent negative
-                        if running_positions[ticker]['shares'] < 0:
-                            running_positions[ticker]['shares'] = Decimal('0')
-                        if running_positions[ticker]['cost'] < 0:
-                            running_positions[ticker]['cost'] = Decimal('0')
-                else:
-                    # BUY - add lot
-                    lots_by_ticker[ticker].append((shares, price))
-                    running_positions[ticker]['shares'] += shares
-                    running_positions[ticker]['cost'] += shares * price
-                    running_positions[ticker]['currency'] = trade['Currency']
-            
-            # Store positions snapshot for this date
-            date_positions[trading_day] = dict(running_positions)
+        # Positions carry forward across days without trades, so every trading day
+        # in the window gets a snapshot (not only the days that had trades)
+        rebuilder = SnapshotRebuilder(repository)
+        tickers_to_price = set()
+        for _, held in rebuilder.iter_daily_positions(trades, start_date, today, trading_days_to_rebuild):
+            tickers_to_price.update(held.keys())
         
-        # Step 4: Fetch current prices for positions we need to rebuild
+        # Step 4: Fetch prices for positions we need to rebuild
         logger.info("Step 4: Fetching current prices...")
         if job_id:
             _update_job_status(job_id, 'running', f'Step 4 of 5: Fetching market prices for {len(tickers_to_price)} tickers')
         
-        # Get unique tickers that have positions in rebuild period
-        tickers_to_price = set()
-        for trading_day in trading_days_to_rebuild:
-            if trading_day in date_positions:
-                for ticker in date_positions[trading_day]:
-                    if date_positions[trading_day][ticker]['shares'] > 0:
-                        tickers_to_price.add(ticker)
-        
         logger.info(f"   Fetching prices for {len(tickers_to_price)} tickers")
         
         # Fetch prices - NO FALLBACKS, exact prices only
@@ -258,9 +187,9 @@ def rebuild_fund_from_date(fund_name: str, start_date: date, job_id: str = None)
                 result = fetcher.fetch_price_data(ticker, start=start_dt, end=end_dt)
                 
                 if result.df is not None and not result.df.empty:
-                    for idx, row in result.df.iterrows():
+                    for idx, close in result.df['Close'].items():
                         price_date = idx.date() if hasattr(idx, 'date') else idx
-                        price = Decimal(str(row['Close']))
+                        price = Decimal(str(close))
                         if price > 0:
                             price_cache[(ticker, price_date)] = price
             except Exception as e:
@@ -271,83 +200,38 @@ def rebuild_fund_from_date(fund_name: str, start_date: date, job_id: str = None)
         if job_id:
             _update_job_status(job_id, 'running', f'Step 5 of 5: Saving {len(trading_days_to_rebuild)} snapshots')
         
+        # Exact prices only: positions without a price for the day are left out
+        snapshots = rebuilder.build_snapshots(
+            trades, start_date, today,
+            price_lookup=lambda ticker, day: price_cache.get((ticker, day)),
+            forward_fill=False,
+            fallback_to_cost=False,
+            trading_days=trading_days_to_rebuild
+        )
+        
         positions_created = 0
-        trading_tz = get_trading_timezone()
-        
-        for idx, trading_day in enumerate(trading_days_to_rebuild):
-            # Check for cancellation periodically (every 10 days or at start)
-            if job_id and (idx % 10 == 0 or idx == 0):
-                if _check_job_cancelled(job_id):
-                    msg = f"Rebuild cancelled after processing {idx} of {len(trading_days_to_rebuild)} days"
-                    logger.info(msg)
-                    _update_job_status(job_id, 'failed', msg)
-                    return {
-                        'success': False,
-                        'dates_rebuilt': idx,
-                        'positions_updated': positions_created,
-                        'message': msg
-                    }
-                # Update progress every 10 days
-                if idx > 0 and idx % 10 == 0:
-                    progress_pct = int((idx / len(trading_days_to_rebuild)) * 100)
-                    _update_job_status(job_id, 'running', f'Step 5 of 5: Saving snapshots ({idx}/{len(trading_days_to_rebuild)}, {progress_pct}%)')
-            
-            if trading_day not in date_positions:
-                continue
-                
-            positions_on_day = date_positions[trading_day]
-            snapshot_positions = []
-            
-            for ticker, pos_data in positions_on_day.items():
-                if pos_data['shares'] <= 0:
-                    continue
-                
-                # Get EXACT price for this trading day - no fallbacks
-                current_price = price_cache.get((ticker, trading_day))
-                if current_price is None:
-                    logger.error(f"CRITICAL: No price for {ticker} on TRADING DAY {trading_day} - skipping position")
-                    continue
-                
-                # Create Position object
-                shares = pos_data['shares']
-                cost_basis = pos_data['cost']
-                avg_price = cost_basis / shares if shares > 0 else Decimal('0')
-                market_value = shares * current_price
-                pnl = market_value - cost_basis
-                
-                position = Position(
-                    ticker=ticker,
-                    shares=shares,
-                    avg_price=avg_price,
-                    cost_basis=cost_basis,
-                    current_price=current_price,
-                    market_value=market_value,
-                    unrealized_pnl=pnl,
-                    currency=pos_data['currency']
-                )
-                snapshot_positions.append(position)
+        for idx in range(0, len(snapshots), SAVE_BATCH_SIZE):
+            # Check for cancellation between bulk writes
+            if job_id and _check_job_cancelled(job_id):
+                msg = f"Rebuild cancelled after processing {idx} of {len(snapshots)} days"
+                logger.info(msg)
+                _update_job_status(job_id, 'failed', msg)
+                return {
+                    'success': False,
+                    'dates_rebuilt': idx,
+                    'positions_updated': positions_created,
+                    'message': msg
+                }
+            if job_id and idx > 0:
+                progress_pct = int((idx / len(snapshots)) * 100)
+                _update_job_status(job_id, 'running', f'Step 5 of 5: Saving snapshots ({idx}/{len(snapshots)}, {progress_pct}%)')
             
-            if snapshot_positions:
-                # Create snapshot timestamp (4pm ET on trading day)
-                snapshot_time = datetime.combine(trading_day, datetime.min.time().replace(hour=16, minute=0))
-                
-                # Handle timezone localization compatible with both pytz and zoneinfo
-                if hasattr(trading_tz, 'localize'):
-                    snapshot_time = trading_tz.localize(snapshot_time)
-                else:
-                    snapshot_time = snapshot_time.replace(tzinfo=trading_tz)
-                
-                snapshot = PortfolioSnapshot(
-                    positions=snapshot_positions,
-                    timestamp=snapshot_time
-                )
-                
-                # Save to database
-                try:
-                    repository.save_portfolio_snapshot(snapshot)
-                    positions_created += len(snapshot_positions)
-                except Exception as e:
-                    logger.error(f"Failed to save snapshot for {trading_day}: {e}")
+            batch = snapshots[idx:idx + SAVE_BATCH_SIZE]
+            try:
+                repository.save_portfolio_snapshots(batch)
+                positions_created += sum(len(s.positions) for s in batch)
+            except Exception as e:
+                logger.error(f"Failed to save snapshots {batch[0].timestamp.date()}..{batch[-1].timestamp.date()}: {e}")
         
         # Success
         msg = f"Rebuilt {len(trading_days_to_rebuild)} days, created {positions_created} position records"